@@ -0,0 +1,31 @@
+"""Cluster-Snek: Kubernetes GitOps automation.
+
+The project-settings API lives in :mod:`cluster_snek.cluster_snek` and is
+re-exported here on first use, so importing a subpackage (for example for
+shell completion) does not pull in YAML parsing and logging setup.
+"""
+
+_SETTINGS_API = (
+    "ClusterConfiguration",
+    "ClusterSize",
+    "DeploymentMode",
+    "DeploymentTarget",
+    "SourceConfiguration",
+    "UserSettings",
+    "VectorStoreType",
+    "VectorWaveConfiguration",
+    "generate_project_structure",
+    "load_env_file",
+    "load_project_structure",
+    "load_user_settings",
+)
+
+__all__ = list(_SETTINGS_API)
+
+
+def __getattr__(name):
+    if name in _SETTINGS_API:
+        from cluster_snek import cluster_snek as settings
+
+        return getattr(settings, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -2,36 +2,69 @@
 """
 VectorWeight CLI Interface
 Command-line interface for VectorWeight Homelab deployment automation
+
+Only click and the standard library are imported at module level. Each
+command imports what it needs when it runs, so ``--help`` and light commands
+such as ``validate`` and ``status`` never load the generators, bundle
+signing or Kubernetes client they do not use.
 """
 
+import contextlib
 import logging
+import os
 import click
 import sys
 from pathlib import Path
-from typing import Optional, Dict, Any
-import yaml
-import json
-
-from vectorweight.config.schema import (
-    VectorWaveConfiguration, EXAMPLE_CONFIGURATIONS
-)
-from vectorweight.config.loader import ConfigurationLoader, ConfigurationValidator
-from vectorweight.generators.enhanced import EnhancedVectorWeightGenerator
-from vectorweight.utils.logging import setup_logging
-from vectorweight.utils.exceptions import ConfigurationError, ValidationError
+from typing import Optional, Dict, Any, List, TYPE_CHECKING
+
+from cluster_snek.cli.completion import CONTEXTS, COMPONENTS, SNAPSHOTS, completer
+from cluster_snek.cli.output import EventEmitter, OutputFormat, get_emitter
+
+if TYPE_CHECKING:
+    from vectorweight.config.schema import VectorWaveConfiguration
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Parsed configurations by resolved path, reused while the file is unchanged.
+# Only a long-running `serve` process loads the same file twice.
+_configuration_cache: Dict[str, Any] = {}
+
+
+def _load_configuration(config_file: str):
+    """Load a configuration file, reusing the parsed result if unchanged
+
+    Each fresh load also refreshes the shell completion index.
+    """
+    from vectorweight.config.loader import ConfigurationLoader
+    from cluster_snek.cli.completion import index_configuration
+    from cluster_snek.deployment.verification_cache import FileFingerprint
+    
+    path = Path(config_file).resolve()
+    fingerprint = FileFingerprint.of(path)
+    cached = _configuration_cache.get(str(path))
+    if cached is not None and cached[0] == fingerprint:
+        return cached[1]
+    configuration = ConfigurationLoader().load_from_file(path)
+    _configuration_cache[str(path)] = (fingerprint, configuration)
+    index_configuration(configuration)
+    return configuration
+
 
 @click.group()
 @click.option('--verbose', '-v', is_flag=True, help='Enable verbose logging')
 @click.option('--config-file', '-c', type=click.Path(exists=True), 
               help='Configuration file path')
+@click.option('--lock-timeout', type=click.FloatRange(min=0), default=600, show_default=True,
+              help='Seconds to wait for a concurrent run on the same cluster (0 fails immediately)')
+@click.option('--output-format', type=click.Choice([f.value for f in OutputFormat]), default='text',
+              show_default=True, help='Human readable text, or one JSON event per line')
 @click.pass_context
-def cli(ctx, verbose: bool, config_file: Optional[str]):
+def cli(ctx, verbose: bool, config_file: Optional[str], lock_timeout: float, output_format: str):
     """VectorWeight Homelab - Kubernetes GitOps Deployment Automation"""
     
+    from vectorweight.utils.logging import setup_logging
+    
     # Setup logging
     log_level = logging.DEBUG if verbose else logging.INFO
     setup_logging(log_level)
@@ -40,6 +73,8 @@ def cli(ctx, verbose: bool, config_file: Optional[str]):
     ctx.ensure_object(dict)
     ctx.obj['verbose'] = verbose
     ctx.obj['config_file'] = config_file
+    ctx.obj['lock_timeout'] = lock_timeout
+    ctx.obj['output'] = EventEmitter(OutputFormat(output_format))
     
     logger.info("VectorWeight Homelab CLI initialized")
 
@@ -51,8 +86,14 @@ def cli(ctx, verbose: bool, config_file: Optional[str]):
               type=click.Choice(['minimal_dev', 'production_full', 'airgapped_enterprise']),
               default='minimal_dev', help='Configuration template to use')
 @click.option('--interactive', '-i', is_flag=True, help='Interactive configuration wizard')
-def init(output: str, template: str, interactive: bool):
+@click.option('--fleet-config', 'fleet_configs', multiple=True, type=click.Path(exists=True),
+              help='Existing configuration whose clusters, domains and address ranges the wizard '
+                   'must not reuse (repeatable)')
+def init(output: str, template: str, interactive: bool, fleet_configs: tuple):
     """Initialize a new VectorWeight configuration"""
+    from vectorweight.config.schema import EXAMPLE_CONFIGURATIONS
+    from vectorweight.config.loader import ConfigurationLoader
+    out = get_emitter()
     
     output_path = Path(output)
     
@@ -61,7 +102,9 @@ def init(output: str, template: str, interactive: bool):
     
     try:
         if interactive:
-            config = _interactive_configuration_wizard()
+            config = _interactive_configuration_wizard(
+                [_load_configuration(path) for path in fleet_configs]
+            )
         else:
             # Use predefined template
             config_data = EXAMPLE_CONFIGURATIONS[template]
@@ -72,13 +115,14 @@ def init(output: str, template: str, interactive: bool):
         loader = ConfigurationLoader()
         loader.save_to_file(config, output_path)
         
-        click.echo(f"✅ Configuration initialized: {output_path}")
-        click.echo(f"📝 Template used: {template}")
-        click.echo(f"🔧 Edit the configuration file and run 'vectorweight generate' to deploy")
+        out.emit("config_initialized", path=str(output_path), template=template)
+        out.echo(f"✅ Configuration initialized: {output_path}")
+        out.echo(f"📝 Template used: {template}")
+        out.echo(f"🔧 Edit the configuration file and run 'vectorweight generate' to deploy")
         
     except Exception as e:
         logger.error(f"Configuration initialization failed: {e}")
-        click.echo(f"❌ Failed to initialize configuration: {e}", err=True)
+        out.echo(f"❌ Failed to initialize configuration: {e}", err=True)
         sys.exit(1)
 
 
@@ -89,74 +133,329 @@ def init(output: str, template: str, interactive: bool):
               help='Output directory for generated deployment')
 @click.option('--dry-run', is_flag=True, help='Validate configuration without generating')
 @click.option('--force', is_flag=True, help='Force regeneration even if no changes detected')
+@click.option('--watch', is_flag=True,
+              help='Keep running and regenerate the affected clusters when inputs change')
+@click.option('--watch-path', 'watch_paths', multiple=True, type=click.Path(),
+              help='Extra template or source directory to watch (repeatable)')
 @click.pass_context
-def generate(ctx, config: Optional[str], output: str, dry_run: bool, force: bool):
+def generate(ctx, config: Optional[str], output: str, dry_run: bool, force: bool, watch: bool,
+             watch_paths: tuple):
     """Generate VectorWeight homelab deployment"""
+    import time
+    from vectorweight.config.loader import ConfigurationValidator
+    from vectorweight.utils.exceptions import ConfigurationError
+    from cluster_snek.utils.locking import LockUnavailable
+    out = get_emitter()
+    timings: Dict[str, float] = {}
     
     config_file = config or ctx.obj.get('config_file')
     
     if not config_file:
-        click.echo("❌ No configuration file specified. Use --config or init command first.", err=True)
+        out.echo("❌ No configuration file specified. Use --config or init command first.", err=True)
         sys.exit(1)
     
     try:
         # Load configuration
-        loader = ConfigurationLoader()
-        configuration = loader.load_from_file(Path(config_file))
+        started = time.monotonic()
+        configuration = _load_configuration(config_file)
+        timings["load"] = time.monotonic() - started
         
-        click.echo(f"📋 Loaded configuration: {configuration.project_name}")
-        click.echo(f"🌍 Environment: {configuration.environment}")
-        click.echo(f"🔧 Deployment mode: {configuration.deployment_mode.value}")
-        click.echo(f"📦 Clusters: {len(configuration.clusters)}")
+        out.emit(
+            "config_loaded",
+            project=configuration.project_name,
+            environment=configuration.environment,
+            deployment_mode=configuration.deployment_mode.value,
+            clusters=[cluster.name for cluster in configuration.clusters]
+        )
+        out.echo(f"📋 Loaded configuration: {configuration.project_name}")
+        out.echo(f"🌍 Environment: {configuration.environment}")
+        out.echo(f"🔧 Deployment mode: {configuration.deployment_mode.value}")
+        out.echo(f"📦 Clusters: {len(configuration.clusters)}")
         
         # Validate configuration
+        started = time.monotonic()
         validator = ConfigurationValidator()
         validation_messages = validator.validate(configuration)
+        timings["validate"] = time.monotonic() - started
         
         if validation_messages:
-            click.echo("\n📊 Validation Results:")
+            out.echo("\n📊 Validation Results:")
             for message in validation_messages:
+                out.emit("validation", level=_message_level(message), message=message)
                 if message.startswith("Error:"):
-                    click.echo(f"❌ {message}", err=True)
+                    out.echo(f"❌ {message}", err=True)
                 elif message.startswith("Warning:"):
-                    click.echo(f"⚠️  {message}")
+                    out.echo(f"⚠️  {message}")
                 else:
-                    click.echo(f"ℹ️  {message}")
+                    out.echo(f"ℹ️  {message}")
         
         # Check for errors
         errors = [msg for msg in validation_messages if msg.startswith("Error:")]
         if errors:
-            click.echo(f"\n❌ Configuration validation failed with {len(errors)} error(s)")
+            out.echo(f"\n❌ Configuration validation failed with {len(errors)} error(s)")
             sys.exit(1)
         
         if dry_run:
-            click.echo("\n✅ Configuration validation completed (dry run)")
+            out.emit("generate_complete", dry_run=True)
+            out.echo("\n✅ Configuration validation completed (dry run)")
             return
         
         # Generate deployment
-        click.echo("\n🚀 Generating VectorWeight deployment...")
+        out.echo("\n🚀 Generating VectorWeight deployment...")
         
-        generator = EnhancedVectorWeightGenerator(configuration)
-        generator.output_path = Path(output)
+        _generate_recorded(ctx, config_file, configuration, output, force, timings)
         
-        if force:
-            generator.state_manager.state["configuration_hash"] = None
+        out.emit("generate_complete", dry_run=False, output=str(Path(output).absolute()))
+        out.echo(f"\n✅ Deployment generated successfully!")
+        out.echo(f"📂 Output directory: {Path(output).absolute()}")
+        out.echo(f"🚀 Next step: cd {output} && ./deploy.sh")
         
-        generator.generate_complete_deployment()
-        
-        click.echo(f"\n✅ Deployment generated successfully!")
-        click.echo(f"📂 Output directory: {Path(output).absolute()}")
-        click.echo(f"🚀 Next step: cd {output} && ./deploy.sh")
+        if watch:
+            _watch_and_regenerate(ctx, config_file, output, watch_paths)
         
     except ConfigurationError as e:
-        click.echo(f"❌ Configuration error: {e}", err=True)
+        out.echo(f"❌ Configuration error: {e}", err=True)
+        sys.exit(1)
+    except LockUnavailable as e:
+        out.echo(f"🔒 Another run is generating the same clusters: {e}", err=True)
         sys.exit(1)
     except Exception as e:
         logger.error(f"Generation failed: {e}")
-        click.echo(f"❌ Generation failed: {e}", err=True)
+        out.echo(f"❌ Generation failed: {e}", err=True)
         sys.exit(1)
 
 
+def _generate_clusters(ctx, configuration, output: str, force: bool, clusters=None):
+    """Run the generator, limited to the named clusters when given"""
+    import copy
+    import shutil
+    import tempfile
+    from vectorweight.generators.enhanced import EnhancedVectorWeightGenerator
+    from cluster_snek.utils.locking import lock_clusters
+    
+    if clusters is not None:
+        configuration = copy.copy(configuration)
+        configuration.clusters = [c for c in configuration.clusters if c.name in clusters]
+    
+    output_path = Path(output)
+    timeout = ctx.obj.get('lock_timeout')
+    with lock_clusters(output_path, [cluster.name for cluster in configuration.clusters], timeout=timeout):
+        configuration = _fetch_named_sources(configuration, output_path / ".sources")
+        # Generate into a private directory next to the output; only moving
+        # the results into place needs the lock on the shared files
+        output_path.absolute().parent.mkdir(parents=True, exist_ok=True)
+        staging = Path(tempfile.mkdtemp(prefix=f".{output_path.name}-", dir=output_path.absolute().parent))
+        try:
+            generator = EnhancedVectorWeightGenerator(configuration)
+            generator.output_path = staging
+            
+            if force:
+                generator.state_manager.state["configuration_hash"] = None
+            
+            generator.generate_complete_deployment()
+            _publish_generated(staging, output_path, timeout=timeout)
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+    
+    out = get_emitter(ctx)
+    for cluster in configuration.clusters:
+        out.emit("cluster", name=cluster.name, status="generated", output=str(output_path.absolute()))
+
+
+def _publish_generated(staging: Path, output: Path, timeout: Optional[float] = None) -> None:
+    """Move generated files into the output directory
+
+    The orchestration repository, deploy.sh and generator state are rewritten
+    by every run, so the move happens under the output directory's shared
+    lock; the callers already hold the locks of their clusters.
+    """
+    from cluster_snek.utils.locking import FileLock, shared_lock_path
+    
+    with FileLock(shared_lock_path(output), timeout=timeout):
+        for path in sorted(staging.rglob("*")):
+            if path.is_dir() and not path.is_symlink():
+                continue
+            target = output / path.relative_to(staging)
+            target.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(path, target)
+
+
+def _fetch_named_sources(configuration, work_dir: Path):
+    """Fetch the configuration's named sources concurrently
+
+    Each source is fetched with its own timeout into ``work_dir / <name>``.
+    The returned configuration points every named source at its local copy,
+    so generation reads the fetched files instead of fetching them again.
+
+    Raises:
+        ValueError: If any source failed or timed out
+    """
+    import copy
+    import dataclasses
+    from cluster_snek.config.schema import DeploymentMode
+    from cluster_snek.utils.source_manager import MultiSourceManager
+    
+    sources = getattr(configuration, 'sources', None) or {}
+    if not sources:
+        return configuration
+    
+    out = get_emitter()
+    report = MultiSourceManager(sources, work_dir).fetch_sources()
+    for result in report.results.values():
+        out.emit("source", name=result.name, status=result.status.value,
+                 duration=round(result.duration, 3), error=result.error)
+    if not report.ok:
+        raise ValueError(report.summary())
+    out.echo(f"📥 Fetched {len(sources)} source(s) in {report.elapsed:.1f}s")
+    
+    configuration = copy.copy(configuration)
+    configuration.sources = {
+        name: dataclasses.replace(sources[name], type=DeploymentMode.AIRGAPPED_LOCAL, path=path)
+        for name, path in report.paths().items()
+    }
+    return configuration
+
+
+def _configured_sources(configuration) -> List[tuple]:
+    """(record name, source config) for every source the configuration declares"""
+    sources = []
+    if getattr(configuration, 'source', None) is not None:
+        sources.append(("source", configuration.source))
+    for name, source in (getattr(configuration, 'sources', None) or {}).items():
+        sources.append((f"sources/{name}", source))
+    return sources
+
+
+def _output_scope(output) -> str:
+    """State store scope of generate runs, kept apart from deployed clusters"""
+    return f"generate:{Path(output).absolute()}"
+
+
+def _generate_recorded(ctx, config_file: str, configuration, output: str, force: bool,
+                       timings: Dict[str, float]) -> None:
+    """Generate all clusters and write a run record that ``replay`` can reproduce"""
+    import time
+    from cluster_snek.deployment.run_records import RunRecordStore, new_record
+    from cluster_snek.deployment.state import RunStatus, StateStore
+    out = get_emitter()
+    
+    started = time.monotonic()
+    store = RunRecordStore()
+    config_input = store.capture("config", Path(config_file))
+    inputs = [store.capture(".env", Path(".env"))] if Path(".env").is_file() else []
+    for name, source in _configured_sources(configuration):
+        inputs.append(store.capture(name, getattr(source, 'path', None), url=getattr(source, 'url', None)))
+    timings["capture"] = time.monotonic() - started
+    
+    state = StateStore()
+    run_id = state.start_run(_output_scope(output), "generate", config_hash=config_input.digest)
+    started = time.monotonic()
+    try:
+        _generate_clusters(ctx, configuration, output, force)
+    except Exception as e:
+        state.finish_run(run_id, RunStatus.FAILED, error=str(e))
+        raise
+    timings["generate"] = time.monotonic() - started
+    
+    record = new_record(
+        run_id, config_input, Path(output),
+        inputs=inputs,
+        clusters=[cluster.name for cluster in configuration.clusters],
+        timings={phase: round(seconds, 3) for phase, seconds in timings.items()},
+        output_digest=store.tree_digest(Path(output))
+    )
+    store.save(record)
+    state.finish_run(run_id, RunStatus.SUCCEEDED)
+    out.emit("run_record", run_id=run_id, config=config_input.digest,
+             output_digest=record.output_digest, timings=record.timings)
+    out.echo(f"🧾 Recorded run #{run_id} (replay with 'replay {run_id}')")
+
+
+def _watch_and_regenerate(ctx, config_file: str, output: str, watch_paths: tuple):
+    """Regenerate the clusters affected by each batch of input changes"""
+    from vectorweight.config.loader import ConfigurationValidator
+    from cluster_snek.utils.watcher import FileWatcher, changed_clusters, cluster_digests
+    out = get_emitter()
+    
+    config_path = Path(config_file)
+    inputs = [config_path, Path('.env'), *(Path(p) for p in watch_paths)]
+    digests = cluster_digests(_load_configuration(config_file))
+    pending = set()
+    
+    with FileWatcher(inputs) as watcher:
+        out.echo(f"\n👀 Watching {len(inputs)} input(s) via {watcher.backend} (Ctrl+C to stop)")
+        try:
+            while True:
+                changed = watcher.wait()
+                try:
+                    configuration = _load_configuration(config_file)
+                    errors = [
+                        msg for msg in ConfigurationValidator().validate(configuration)
+                        if msg.startswith("Error:")
+                    ]
+                    if errors:
+                        for error in errors:
+                            out.echo(f"❌ {error}", err=True)
+                        out.emit("regenerate", status="invalid", paths=sorted(map(str, changed)))
+                        continue
+                    
+                    after = cluster_digests(configuration)
+                    clusters = pending | changed_clusters(digests, after, changed, [config_path])
+                    digests = after
+                    if not clusters:
+                        out.emit("regenerate", status="unchanged", paths=sorted(map(str, changed)))
+                        out.echo("💤 No cluster inputs changed")
+                        continue
+                    
+                    out.echo(f"🔄 Regenerating: {', '.join(sorted(clusters))}")
+                    pending = clusters
+                    _generate_clusters(ctx, configuration, output, force=True, clusters=clusters)
+                    pending = set()
+                    out.emit("regenerate", status="succeeded", clusters=sorted(clusters))
+                    out.echo("✅ Regenerated")
+                except Exception as e:
+                    logger.error(f"Regeneration failed: {e}")
+                    out.emit("regenerate", status="failed", clusters=sorted(pending), error=str(e))
+                    out.echo(f"❌ Regeneration failed: {e}", err=True)
+        except KeyboardInterrupt:
+            out.echo("\n⏹️  Watch stopped")
+
+
+def _message_level(message: str) -> str:
+    """Level of a validator message from its prefix"""
+    for prefix, level in (("Error:", "error"), ("Warning:", "warning")):
+        if message.startswith(prefix):
+            return level
+    return "info"
+
+
+def _emit_apply_result(out: EventEmitter, cluster: str):
+    """ApplyEngine callback streaming one event per resource"""
+    def emit(result):
+        out.emit(
+            "resource",
+            cluster=cluster,
+            key=result.key,
+            status=result.status.value,
+            error=result.error,
+            duration=round(result.duration, 3)
+        )
+    return emit
+
+
+def _emit_apply_summary(out: EventEmitter, cluster: str, report) -> None:
+    out.emit(
+        "apply_summary",
+        cluster=cluster,
+        ok=report.ok,
+        total=len(report.results),
+        unchanged=len(report.unchanged),
+        failed=len(report.failed),
+        skipped=len(report.skipped),
+        elapsed=round(report.elapsed, 3)
+    )
+
+
 @cli.command()
 @click.option('--config', '-c', type=click.Path(exists=True),
               help='Configuration file path')
@@ -164,60 +463,71 @@ def generate(ctx, config: Optional[str], output: str, dry_run: bool, force: bool
 @click.pass_context
 def validate(ctx, config: Optional[str], detailed: bool):
     """Validate VectorWeight configuration"""
+    from vectorweight.config.loader import ConfigurationValidator
+    out = get_emitter()
     
     config_file = config or ctx.obj.get('config_file')
     
     if not config_file:
-        click.echo("❌ No configuration file specified", err=True)
+        out.echo("❌ No configuration file specified", err=True)
         sys.exit(1)
     
     try:
         # Load and validate configuration
-        loader = ConfigurationLoader()
-        configuration = loader.load_from_file(Path(config_file))
+        configuration = _load_configuration(config_file)
         
         validator = ConfigurationValidator()
         validation_messages = validator.validate(configuration)
         
         # Display results
-        click.echo(f"📋 Validating: {configuration.project_name}")
-        
-        if not validation_messages:
-            click.echo("✅ Configuration validation passed!")
-            return
+        out.echo(f"📋 Validating: {configuration.project_name}")
+        for message in validation_messages:
+            out.emit("validation", level=_message_level(message), message=message)
         
         # Categorize messages
         errors = [msg for msg in validation_messages if msg.startswith("Error:")]
         warnings = [msg for msg in validation_messages if msg.startswith("Warning:")]
         recommendations = [msg for msg in validation_messages if msg.startswith("Recommendation:")]
+        out.emit(
+            "validation_summary",
+            project=configuration.project_name,
+            ok=not errors,
+            errors=len(errors),
+            warnings=len(warnings),
+            recommendations=len(recommendations)
+        )
+        
+        if not validation_messages:
+            out.echo("✅ Configuration validation passed!")
+            return
         
         # Display summary
-        click.echo(f"\n📊 Validation Summary:")
-        click.echo(f"   Errors: {len(errors)}")
-        click.echo(f"   Warnings: {len(warnings)}")
-        click.echo(f"   Recommendations: {len(recommendations)}")
+        out.echo(f"\n📊 Validation Summary:")
+        out.echo(f"   Errors: {len(errors)}")
+        out.echo(f"   Warnings: {len(warnings)}")
+        out.echo(f"   Recommendations: {len(recommendations)}")
         
         if detailed or errors:
             if errors:
-                click.echo(f"\n❌ Errors ({len(errors)}):")
+                out.echo(f"\n❌ Errors ({len(errors)}):")
                 for error in errors:
-                    click.echo(f"   {error}")
+                    out.echo(f"   {error}")
             
             if warnings and detailed:
-                click.echo(f"\n⚠️  Warnings ({len(warnings)}):")
+                out.echo(f"\n⚠️  Warnings ({len(warnings)}):")
                 for warning in warnings:
-                    click.echo(f"   {warning}")
+                    out.echo(f"   {warning}")
             
             if recommendations and detailed:
-                click.echo(f"\nℹ️  Recommendations ({len(recommendations)}):")
+                out.echo(f"\nℹ️  Recommendations ({len(recommendations)}):")
                 for rec in recommendations:
-                    click.echo(f"   {rec}")
+                    out.echo(f"   {rec}")
         
         if errors:
             sys.exit(1)
             
     except Exception as e:
-        click.echo(f"❌ Validation failed: {e}", err=True)
+        out.echo(f"❌ Validation failed: {e}", err=True)
         sys.exit(1)
 
 
@@ -227,45 +537,409 @@ def validate(ctx, config: Optional[str], detailed: bool):
 @click.option('--deployment-dir', '-d', type=click.Path(exists=True),
               help='Deployment directory path')
 @click.option('--wait', is_flag=True, help='Wait for deployment completion')
+@click.option('--parallelism', type=click.IntRange(min=1), default=8, show_default=True,
+              help='Maximum number of resources applied concurrently')
+@click.option('--context', 'kube_context', shell_complete=completer(CONTEXTS),
+              help='Kubeconfig context to deploy to')
+@click.option('--full-reconcile', is_flag=True,
+              help='Apply every resource, including those unchanged since the last deploy')
+@click.option('--tui', is_flag=True,
+              help='Show a live dashboard of apply progress and application health (implies --wait)')
 @click.pass_context
-def deploy(ctx, config: Optional[str], deployment_dir: Optional[str], wait: bool):
+def deploy(ctx, config: Optional[str], deployment_dir: Optional[str], wait: bool, parallelism: int,
+           kube_context: Optional[str], full_reconcile: bool, tui: bool):
     """Deploy VectorWeight homelab to Kubernetes"""
+    from kubernetes import config as kube_config
+    from cluster_snek.cli.completion import update_index
+    from cluster_snek.deployment.apply import ApplyEngine, KubernetesApplier, load_manifests
+    from cluster_snek.deployment.apply_cache import manifest_hash
+    from cluster_snek.deployment.snapshots import SnapshotStore
+    from cluster_snek.deployment.state import RunStatus, StateStore, StateStoreResourceCache
+    out = get_emitter()
+    if tui and out.jsonl:
+        raise click.UsageError("--tui cannot be combined with --output-format jsonl")
+    wait = wait or tui
     
     if not deployment_dir:
         deployment_dir = "./vectorweight-deployment"
     
     deployment_path = Path(deployment_dir)
-    deploy_script = deployment_path / "deploy.sh"
+    manifest_dirs = [
+        deployment_path / "orchestration-repo" / "bootstrap",
+        deployment_path / "orchestration-repo" / "applicationsets"
+    ]
+    
+    if not any(d.is_dir() for d in manifest_dirs):
+        out.echo(f"❌ No generated manifests found in: {deployment_path}")
+        out.echo("💡 Run 'vectorweight generate' first to create deployment")
+        sys.exit(1)
     
-    if not deploy_script.exists():
-        click.echo(f"❌ Deploy script not found: {deploy_script}")
-        click.echo("💡 Run 'vectorweight generate' first to create deployment")
+    try:
+        out.echo("🚀 Deploying VectorWeight homelab...")
+        
+        if not kube_context:
+            kube_context = kube_config.list_kube_config_contexts()[1]["name"]
+        resources = load_manifests(manifest_dirs)
+        dashboard = None
+        on_result = _emit_apply_result(out, kube_context)
+        if tui:
+            from cluster_snek.cli.dashboard import DeploymentDashboard
+            dashboard = DeploymentDashboard(title=f"Deploying to {kube_context}")
+            dashboard.expect(len(resources))
+            on_result = dashboard.on_result
+        
+        with dashboard or contextlib.nullcontext():
+            state = StateStore()
+            run_id = state.start_run(
+                kube_context, "deploy", config_hash=manifest_hash([r.body for r in resources])
+            )
+            try:
+                with state.cluster_lease(kube_context, timeout=ctx.obj.get('lock_timeout')):
+                    engine = ApplyEngine(
+                        KubernetesApplier(context=kube_context),
+                        max_workers=parallelism,
+                        cache=StateStoreResourceCache(state, kube_context),
+                        full_reconcile=full_reconcile,
+                        on_result=on_result
+                    )
+                    report = engine.apply(resources)
+                    state.record_apply_components(run_id, resources, report)
+                    if report.ok:
+                        snapshot = SnapshotStore().record(resources, scope=kube_context)
+            except Exception as e:
+                state.finish_run(run_id, RunStatus.FAILED, error=str(e))
+                raise
+            _emit_apply_summary(out, kube_context, report)
+            out.echo(report.summary())
+        
+            if report.ok:
+                state.finish_run(run_id, RunStatus.SUCCEEDED, snapshot_id=snapshot.id)
+                update_index(
+                    contexts=[kube_context],
+                    snapshots=[snapshot.id],
+                    components=[c["name"] for c in state.components(run_id)]
+                )
+                out.emit("snapshot", cluster=kube_context, id=snapshot.id, resources=len(snapshot.resources))
+                out.echo(f"📸 Recorded snapshot {snapshot.id}")
+                out.echo("✅ Deployment initiated successfully!")
+                if wait:
+                    out.echo("⏳ Monitoring deployment progress...")
+                    _monitor_deployment_progress(kube_context, dashboard=dashboard)
+            else:
+                state.finish_run(run_id, RunStatus.FAILED, error=report.summary())
+                out.echo("❌ Deployment failed!")
+                sys.exit(1)
+            
+    except Exception as e:
+        out.echo(f"❌ Deployment execution failed: {e}", err=True)
         sys.exit(1)
+
+
+@cli.command()
+@click.option('--to', 'snapshot_id', shell_complete=completer(SNAPSHOTS),
+              help='Snapshot id (or unique prefix) to roll back to')
+@click.option('--list', 'list_snapshots', is_flag=True, help='List recorded snapshots')
+@click.option('--context', 'kube_context', shell_complete=completer(CONTEXTS),
+              help='Kubeconfig context to roll back')
+@click.option('--parallelism', type=click.IntRange(min=1), default=8, show_default=True,
+              help='Maximum number of resources applied concurrently')
+@click.pass_context
+def rollback(ctx, snapshot_id: Optional[str], list_snapshots: bool, kube_context: Optional[str],
+             parallelism: int):
+    """Roll a cluster back to a previously deployed snapshot"""
+    from kubernetes import config as kube_config
+    from cluster_snek.cli.completion import update_index
+    from cluster_snek.deployment.apply import ApplyEngine, KubernetesApplier
+    from cluster_snek.deployment.snapshots import SnapshotStore
+    from cluster_snek.deployment.state import RunStatus, StateStore, StateStoreResourceCache
+    out = get_emitter()
     
     try:
-        import subprocess
+        if not kube_context:
+            kube_context = kube_config.list_kube_config_contexts()[1]["name"]
+        store = SnapshotStore()
+        
+        if list_snapshots or not snapshot_id:
+            snapshots = store.list(kube_context)
+            update_index(snapshots=[s.id for s in reversed(snapshots)])
+            if not snapshots:
+                out.echo(f"No snapshots recorded for {kube_context}")
+            for snapshot in reversed(snapshots):
+                out.emit(
+                    "snapshot",
+                    cluster=kube_context,
+                    id=snapshot.id,
+                    created=snapshot.created,
+                    resources=len(snapshot.resources)
+                )
+                out.echo(f"   {snapshot.id}  {snapshot.created}  {len(snapshot.resources)} resource(s)")
+            return
         
-        click.echo("🚀 Deploying VectorWeight homelab...")
+        state = StateStore()
+        # Diff against what was actually applied: a failed or partial deploy
+        # leaves no snapshot but does change the cluster
+        applied = state.resource_hashes(kube_context)
+        plan = store.plan_rollback(snapshot_id, applied)
+        if plan.target.scope != kube_context:
+            out.echo(f"❌ Snapshot {plan.target.id} belongs to {plan.target.scope}, not {kube_context}")
+            sys.exit(1)
         
-        # Execute deployment script
-        result = subprocess.run(
-            [str(deploy_script)],
-            cwd=deployment_path,
-            capture_output=False,
-            text=True
+        out.emit(
+            "rollback_plan",
+            cluster=kube_context,
+            target=plan.target.id,
+            changed=plan.changed,
+            unchanged=len(plan.unchanged),
+            orphaned=plan.orphaned
         )
+        out.echo(f"⏪ Rolling back to {plan.target.id}: "
+                 f"{len(plan.changed)} changed, {len(plan.unchanged)} unchanged")
+        if plan.orphaned:
+            out.echo(f"⚠️  {len(plan.orphaned)} resource(s) created since are left in place:")
+            for key in plan.orphaned:
+                out.echo(f"   - {key}")
+        
+        run_id = state.start_run(kube_context, "rollback")
+        try:
+            with state.cluster_lease(kube_context, timeout=ctx.obj.get('lock_timeout')):
+                engine = ApplyEngine(
+                    KubernetesApplier(context=kube_context),
+                    max_workers=parallelism,
+                    cache=StateStoreResourceCache(state, kube_context),
+                    on_result=_emit_apply_result(out, kube_context)
+                )
+                report = store.rollback(plan.target.id, engine, applied)
+        except Exception as e:
+            state.finish_run(run_id, RunStatus.FAILED, error=str(e))
+            raise
+        _emit_apply_summary(out, kube_context, report)
+        out.echo(report.summary())
         
-        if result.returncode == 0:
-            click.echo("✅ Deployment initiated successfully!")
-            if wait:
-                click.echo("⏳ Monitoring deployment progress...")
-                _monitor_deployment_progress()
+        if report.ok:
+            state.finish_run(run_id, RunStatus.SUCCEEDED, snapshot_id=store.latest(kube_context).id)
+            out.echo("✅ Rollback complete")
         else:
-            click.echo("❌ Deployment failed!")
+            state.finish_run(run_id, RunStatus.FAILED, error=report.summary())
+            out.echo("❌ Rollback failed!")
             sys.exit(1)
-            
+    
     except Exception as e:
-        click.echo(f"❌ Deployment execution failed: {e}", err=True)
+        out.echo(f"❌ Rollback failed: {e}", err=True)
+        sys.exit(1)
+
+
+@cli.command()
+@click.option('--cluster', shell_complete=completer(CONTEXTS),
+              help='Show recent runs for one cluster (kubeconfig context)')
+@click.option('--component', shell_complete=completer(COMPONENTS),
+              help='Show recent results of one component across clusters')
+@click.option('--limit', type=click.IntRange(min=1), default=20, show_default=True,
+              help='Number of runs to show with --cluster or --component')
+def history(cluster: Optional[str], component: Optional[str], limit: int):
+    """Show deployment history"""
+    from datetime import datetime
+    from cluster_snek.deployment.state import StateStore
+    out = get_emitter()
+    
+    def when(timestamp):
+        return datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d %H:%M:%S") if timestamp else "-"
+    
+    state = StateStore()
+    if component:
+        results = state.component_results(component, limit=limit)
+        if not results:
+            out.echo(f"No results recorded for {component}")
+        for result in results:
+            out.emit("component", name=component, **result)
+            icon = "✅" if result["status"] == "succeeded" else "❌"
+            version = f" {result['version']}" if result["version"] else ""
+            out.echo(f"   {icon} #{result['run_id']} {result['cluster']}{version} {when(result['started_at'])}")
+        return
+    if cluster:
+        runs = state.runs(cluster, limit=limit)
+        if not runs:
+            out.echo(f"No runs recorded for {cluster}")
+        for run in runs:
+            _emit_run(out, run)
+            icon = {"succeeded": "✅", "failed": "❌"}.get(run.status.value, "⏳")
+            line = f"   {icon} #{run.id} {run.kind} {when(run.started_at)}"
+            if run.duration is not None:
+                line += f" ({run.duration:.1f}s)"
+            if run.snapshot_id:
+                line += f" snapshot {run.snapshot_id}"
+            out.echo(line)
+        return
+    
+    last = state.last_successful_runs("deploy")
+    if not last:
+        out.echo("No successful deploys recorded")
+    out.echo("📜 Last successful deploy per cluster:")
+    for name, run in last.items():
+        _emit_run(out, run)
+        out.echo(f"   {name}: #{run.id} at {when(run.finished_at)} snapshot {run.snapshot_id or '-'}")
+
+
+@cli.command()
+@click.argument('run_id', type=int)
+@click.option('--output', '-o', type=click.Path(),
+              help="Output directory (default: the original output with a '-replay-<run-id>' suffix)")
+@click.pass_context
+def replay(ctx, run_id: int, output: Optional[str]):
+    """Regenerate a recorded generate run from its stored inputs
+
+    Inputs still unchanged at their original paths are used in place and
+    the rest are restored from the run store, so nothing is fetched. The
+    configuration is not validated again, since it is the exact one that
+    run validated. The new output is compared with the recorded one.
+    """
+    import copy
+    import tempfile
+    import time
+    from cluster_snek.config.schema import DeploymentMode
+    from cluster_snek.deployment.run_records import REMOTE, RunRecordStore, new_record
+    from cluster_snek.deployment.state import RunStatus, StateStore
+    out = get_emitter()
+    
+    try:
+        store = RunRecordStore()
+        record = store.load(run_id)
+        out.echo(f"⏪ Replaying run #{run_id} from {record.created} "
+                 f"(cluster-snek {record.tool_version}, Python {record.python_version})")
+        for item in record.remote_inputs:
+            out.echo(f"⚠️  {item.name} was fetched from {item.path} and is not stored; it will be fetched again")
+        
+        started = time.monotonic()
+        workspace = Path(tempfile.mkdtemp(prefix=f"cluster-snek-replay-{run_id}-"))
+        resolved: Dict[str, Path] = {}
+        for item in [record.config, *record.inputs]:
+            if item.kind == REMOTE:
+                continue
+            if store.unchanged(item):
+                resolved[item.name] = Path(item.path)
+            else:
+                resolved[item.name] = store.restore(
+                    item, workspace / item.name.replace("/", "_") / Path(item.path).name
+                )
+                out.echo(f"📦 Restored {item.name} from the run store")
+            if item.name == ".env":
+                # The generator reads .env from its working directory
+                store.restore(item, workspace / ".env")
+        timings = {"restore": time.monotonic() - started}
+        
+        configuration = copy.deepcopy(_load_configuration(str(resolved["config"])))
+        for name, source in _configured_sources(configuration):
+            if name in resolved:
+                source.path = resolved[name]
+                if name.startswith("sources/"):
+                    # Copy the stored tree instead of fetching the source again
+                    source.type = DeploymentMode.AIRGAPPED_LOCAL
+        if record.clusters:
+            configuration.clusters = [c for c in configuration.clusters if c.name in record.clusters]
+        
+        output_path = Path(output or f"{record.output}-replay-{run_id}").absolute()
+        state = StateStore()
+        replay_id = state.start_run(_output_scope(output_path), "replay", config_hash=record.config.digest)
+        started = time.monotonic()
+        try:
+            with contextlib.chdir(workspace):
+                _generate_clusters(ctx, configuration, str(output_path), force=True)
+        except Exception as e:
+            state.finish_run(replay_id, RunStatus.FAILED, error=str(e))
+            raise
+        timings["generate"] = time.monotonic() - started
+        
+        replayed = new_record(
+            replay_id, record.config, output_path,
+            inputs=record.inputs,
+            clusters=record.clusters,
+            timings={phase: round(seconds, 3) for phase, seconds in timings.items()},
+            output_digest=store.tree_digest(output_path),
+            replay_of=run_id
+        )
+        store.save(replayed)
+        state.finish_run(replay_id, RunStatus.SUCCEEDED)
+        identical = replayed.output_digest == record.output_digest
+        
+        out.emit("replay", run_id=replay_id, replay_of=run_id, output=str(output_path),
+                 identical=identical, timings=replayed.timings, original_timings=record.timings)
+        original = record.timings.get("generate")
+        comparison = f" (original {original:.1f}s)" if original is not None else ""
+        out.echo(f"⏱️  Generated in {timings['generate']:.1f}s{comparison}")
+        if identical:
+            out.echo(f"✅ Output identical to run #{run_id}: {output_path}")
+        else:
+            out.echo(f"⚠️  Output differs from run #{run_id}: compare {output_path} with {record.output}")
+        out.echo(f"🧾 Recorded replay as run #{replay_id}")
+    
+    except Exception as e:
+        logger.error(f"Replay failed: {e}")
+        out.echo(f"❌ Replay failed: {e}", err=True)
+        sys.exit(1)
+
+
+def _emit_run(out: EventEmitter, run) -> None:
+    out.emit(
+        "run",
+        id=run.id,
+        cluster=run.cluster,
+        kind=run.kind,
+        status=run.status.value,
+        started_at=run.started_at,
+        finished_at=run.finished_at,
+        duration=run.duration,
+        snapshot_id=run.snapshot_id,
+        error=run.error
+    )
+
+
+@cli.command()
+@click.option('--cache-dir', type=click.Path(exists=True, file_okay=False), required=True,
+              help='Directory holding packaged charts (<name>-<version>.tgz)')
+@click.option('--output', '-o', type=click.Path(), default='./cluster-snek-bundle.zip',
+              help='Output bundle path')
+@click.option('--chart', 'extra_charts', multiple=True,
+              help='Additional chart to include as name=version')
+@click.option('--sign-key', help='GPG key ID used to sign the bundle')
+@click.option('--gnupghome', type=click.Path(exists=True, file_okay=False),
+              help='GPG home directory holding the signing key')
+def bundle(cache_dir: str, output: str, extra_charts: tuple, sign_key: Optional[str],
+           gnupghome: Optional[str]):
+    """Build an airgapped-archive bundle from a local chart cache"""
+    from cluster_snek.deployment.bundle import BundleBuilder, default_chart_versions
+    out = get_emitter()
+    
+    charts = default_chart_versions()
+    for spec in extra_charts:
+        name, sep, version = spec.partition('=')
+        if not sep or not name or not version:
+            out.echo(f"❌ Invalid chart spec '{spec}', expected name=version", err=True)
+            sys.exit(1)
+        charts[name] = version
+    
+    try:
+        builder = BundleBuilder(Path(cache_dir), charts)
+        manifest = builder.build(
+            Path(output),
+            sign_key=sign_key,
+            gnupghome=Path(gnupghome) if gnupghome else None
+        )
+        
+        blobs = len({entry.digest for entry in manifest.charts})
+        out.emit(
+            "bundle",
+            path=str(Path(output).absolute()),
+            charts=len(manifest.charts),
+            blobs=blobs,
+            signed=bool(sign_key)
+        )
+        out.echo(f"✅ Bundle created: {Path(output).absolute()}")
+        out.echo(f"📦 Charts: {len(manifest.charts)} ({blobs} unique blobs)")
+        out.echo(f"🔒 Checksums: {output}.sha256")
+        if sign_key:
+            out.echo(f"✍️  Signature: {output}.sig")
+        
+    except ValueError as e:
+        out.echo(f"❌ Bundle creation failed: {e}", err=True)
         sys.exit(1)
 
 
@@ -274,85 +948,207 @@ def deploy(ctx, config: Optional[str], deployment_dir: Optional[str], wait: bool
               default='table', help='Output format')
 def examples():
     """Show example configurations"""
+    import json
+    import yaml
+    from vectorweight.config.schema import EXAMPLE_CONFIGURATIONS
+    out = get_emitter()
+    
+    if out.jsonl:
+        for name, config in EXAMPLE_CONFIGURATIONS.items():
+            out.emit("example", name=name, configuration=config)
     
-    if click.get_current_context().params['format'] == 'table':
-        click.echo("📋 Available Configuration Examples:\n")
+    elif click.get_current_context().params['format'] == 'table':
+        out.echo("📋 Available Configuration Examples:\n")
         
         for name, config in EXAMPLE_CONFIGURATIONS.items():
-            click.echo(f"🔧 {name}")
-            click.echo(f"   Project: {config.get('project_name', 'N/A')}")
-            click.echo(f"   Environment: {config.get('environment', 'N/A')}")
-            click.echo(f"   Deployment Mode: {config.get('deployment_mode', 'N/A')}")
-            click.echo(f"   Clusters: {len(config.get('clusters', []))}")
-            click.echo()
+            out.echo(f"🔧 {name}")
+            out.echo(f"   Project: {config.get('project_name', 'N/A')}")
+            out.echo(f"   Environment: {config.get('environment', 'N/A')}")
+            out.echo(f"   Deployment Mode: {config.get('deployment_mode', 'N/A')}")
+            out.echo(f"   Clusters: {len(config.get('clusters', []))}")
+            out.echo()
         
-        click.echo("💡 Use 'vectorweight init --template <name>' to create configuration")
+        out.echo("💡 Use 'vectorweight init --template <name>' to create configuration")
         
     elif click.get_current_context().params['format'] == 'json':
-        click.echo(json.dumps(EXAMPLE_CONFIGURATIONS, indent=2, default=str))
+        out.echo(json.dumps(EXAMPLE_CONFIGURATIONS, indent=2, default=str))
         
     elif click.get_current_context().params['format'] == 'yaml':
-        click.echo(yaml.dump(EXAMPLE_CONFIGURATIONS, default_flow_style=False))
+        out.echo(yaml.dump(EXAMPLE_CONFIGURATIONS, default_flow_style=False))
 
 
 @cli.command()
 @click.option('--namespace', default='argocd', help='Argo CD namespace')
-def status(namespace: str):
+@click.option('--context', 'kube_context', shell_complete=completer(CONTEXTS),
+              help='Kubeconfig context to query')
+@click.option('--fleet', is_flag=True,
+              help='Query every cluster in the configuration concurrently')
+@click.option('--config', '-c', type=click.Path(exists=True),
+              help='Configuration file listing the fleet')
+@click.option('--concurrency', type=click.IntRange(min=1), default=8, show_default=True,
+              help='Maximum number of clusters queried at once (--fleet)')
+@click.option('--timeout', type=click.FloatRange(min=0, min_open=True), default=10, show_default=True,
+              help='Seconds before a cluster is reported unreachable (--fleet)')
+@click.option('--no-cache', is_flag=True, help='Ignore recently cached cluster results (--fleet)')
+@click.pass_context
+def status(ctx, namespace: str, kube_context: Optional[str], fleet: bool, config: Optional[str],
+           concurrency: int, timeout: float, no_cache: bool):
     """Check VectorWeight deployment status"""
+    if fleet:
+        _fleet_status(ctx, namespace, config, concurrency, timeout, no_cache)
+        return
+    
+    from cluster_snek.connectors.argocd import ArgoCDConnector
+    from cluster_snek.connectors.kubernetes_client import get_api_client
+    out = get_emitter()
     
     try:
-        import subprocess
+        out.echo("📊 VectorWeight Deployment Status\n")
         
-        click.echo("📊 VectorWeight Deployment Status\n")
-        
-        # Check if kubectl is available
-        try:
-            subprocess.run(['kubectl', 'version', '--client'], 
-                         capture_output=True, check=True)
-        except (subprocess.CalledProcessError, FileNotFoundError):
-            click.echo("❌ kubectl not found. Please install kubectl to check status.")
-            sys.exit(1)
+        argocd = ArgoCDConnector(get_api_client(kube_context), namespace=namespace)
         
         # Check Argo CD deployment
-        click.echo("🎯 Argo CD Status:")
-        result = subprocess.run([
-            'kubectl', 'get', 'pods', '-n', namespace, 
-            '-l', 'app.kubernetes.io/name=argocd-server'
-        ], capture_output=True, text=True)
-        
-        if result.returncode == 0 and result.stdout.strip():
-            click.echo("✅ Argo CD is running")
+        out.echo("🎯 Argo CD Status:")
+        running = argocd.server_running()
+        out.emit("argocd", context=kube_context, namespace=namespace, running=running)
+        if running:
+            out.echo("✅ Argo CD is running")
         else:
-            click.echo("❌ Argo CD not found")
+            out.echo("❌ Argo CD not found")
         
         # Check applications
-        click.echo("\n📦 Applications:")
-        result = subprocess.run([
-            'kubectl', 'get', 'applications', '-n', namespace
-        ], capture_output=True, text=True)
-        
-        if result.returncode == 0:
-            lines = result.stdout.strip().split('\n')
-            if len(lines) > 1:
-                for line in lines[1:]:  # Skip header
-                    parts = line.split()
-                    if len(parts) >= 3:
-                        name, health, sync = parts[0], parts[1], parts[2]
-                        status_icon = "✅" if health == "Healthy" and sync == "Synced" else "⚠️"
-                        click.echo(f"   {status_icon} {name}: {health}/{sync}")
-            else:
-                click.echo("   No applications found")
+        out.echo("\n📦 Applications:")
+        applications = argocd.list_applications()
+        if applications:
+            for app in applications:
+                _emit_application(out, kube_context, app)
+                status_icon = "✅" if app.healthy else "⚠️"
+                out.echo(f"   {status_icon} {app.name}: {app.health}/{app.sync}")
         else:
-            click.echo("   Unable to check applications")
+            out.echo("   No applications found")
             
     except Exception as e:
-        click.echo(f"❌ Status check failed: {e}", err=True)
+        out.echo(f"❌ Status check failed: {e}", err=True)
 
 
-def _interactive_configuration_wizard() -> VectorWaveConfiguration:
-    """Interactive configuration wizard"""
+def _fleet_status(ctx, namespace: str, config: Optional[str], concurrency: int,
+                  timeout: float, no_cache: bool) -> None:
+    """Aggregated Argo CD health of every configured cluster"""
+    from cluster_snek.connectors.fleet import fleet_status, fleet_targets
+    out = get_emitter()
+    
+    config_file = config or ctx.obj.get('config_file')
+    if not config_file:
+        out.echo("❌ No configuration file specified", err=True)
+        out.echo("💡 Use --config or set config file with 'vectorweight -c <file>'")
+        sys.exit(1)
+    
+    try:
+        targets = fleet_targets(_load_configuration(config_file).clusters)
+        if not targets:
+            out.echo("❌ No clusters configured", err=True)
+            sys.exit(1)
+        
+        out.echo(f"🌐 Fleet Status ({len(targets)} clusters)\n")
+        matrix = fleet_status(
+            targets, namespace=namespace, concurrency=concurrency, timeout=timeout,
+            use_cache=not no_cache, on_result=lambda health: _emit_cluster_health(out, health)
+        )
+    except ValueError as e:
+        out.echo(f"❌ Status check failed: {e}", err=True)
+        sys.exit(1)
+    
+    for health in matrix.clusters:
+        name = health.cluster if health.context == health.cluster else f"{health.cluster} ({health.context})"
+        if not health.reachable:
+            out.echo(f"   ❌ {name}: unreachable: {health.error}")
+        elif not health.argocd_running:
+            out.echo(f"   ❌ {name}: Argo CD not running")
+        else:
+            icon = "✅" if health.healthy else "⚠️"
+            cached = ", cached" if health.cached else ""
+            out.echo(f"   {icon} {name}: {health.healthy_count}/{len(health.applications)} "
+                     f"applications healthy [{health.elapsed:.1f}s{cached}]")
+    
+    # Only applications that are not healthy everywhere are worth a row
+    reachable = [h for h in matrix.clusters if h.reachable]
+    rows = []
+    for application in matrix.applications:
+        problems = []
+        for health in reachable:
+            cell = matrix.cell(health.cluster, application)
+            if cell is None:
+                problems.append(f"{health.cluster}: missing")
+            elif not cell.healthy:
+                problems.append(f"{health.cluster}: {cell.health}/{cell.sync}")
+        if problems:
+            rows.append((application, problems))
+    if rows:
+        out.echo("\n📦 Applications not healthy everywhere:")
+        for application, problems in rows:
+            out.echo(f"   ⚠️ {application}: {', '.join(problems)}")
+    
+    out.emit("fleet_summary", namespace=namespace, clusters=len(matrix.clusters),
+             healthy=sum(1 for h in matrix.clusters if h.healthy),
+             unreachable=sum(1 for h in matrix.clusters if not h.reachable),
+             applications=matrix.applications)
+    out.echo(f"\n📊 {matrix.summary()}")
+
+
+def _emit_cluster_health(out: EventEmitter, health) -> None:
+    out.emit(
+        "cluster_status",
+        cluster=health.cluster,
+        context=health.context,
+        reachable=health.reachable,
+        argocd_running=health.argocd_running,
+        healthy=health.healthy,
+        error=health.error,
+        elapsed=round(health.elapsed, 3),
+        cached=health.cached,
+        applications=[
+            {"name": app.name, "health": app.health, "sync": app.sync, "healthy": app.healthy}
+            for app in health.applications
+        ]
+    )
+
+
+def _emit_application(out: EventEmitter, kube_context: Optional[str], app) -> None:
+    out.emit(
+        "application",
+        context=kube_context,
+        name=app.name,
+        health=app.health,
+        sync=app.sync,
+        healthy=app.healthy
+    )
+
+
+def _interactive_configuration_wizard(existing: Optional[list] = None) -> "VectorWaveConfiguration":
+    """Interactive configuration wizard
+
+    Every cluster answer is checked against a fleet index of the existing
+    configurations and the clusters entered so far, and rejected answers
+    are asked again straight away.
+
+    Args:
+        existing: Loaded configurations the new clusters must not conflict with
+    """
+    from vectorweight.config.loader import ConfigurationLoader
+    from cluster_snek.config.fleet_index import FleetIndex
+    
+    existing = existing or []
+    index = FleetIndex.from_configuration(existing[0]) if existing else FleetIndex()
+    for configuration in existing[1:]:
+        index.add_configuration(configuration)
     
     click.echo("🧙 VectorWeight Configuration Wizard\n")
+    if index.clusters:
+        click.echo(f"📋 Checking answers against {len(index.clusters)} existing cluster(s)\n")
+    if index.legacy_clusters:
+        click.echo(f"⚠️  Cluster(s) {', '.join(index.legacy_clusters)} still announce the whole MetalLB pool {index.pool}; "
+                   "give them their own metallb_range before allocating from it, "
+                   "or enter a range outside the pool\n")
     
     # Project basics
     project_name = click.prompt("Project name", default="vectorweight-homelab")
@@ -370,12 +1166,21 @@ def _interactive_configuration_wizard() -> VectorWaveConfiguration:
     clusters = []
     
     while True:
-        cluster_name = click.prompt("Cluster name (or 'done' to finish)")
-        if cluster_name.lower() == 'done':
+        cluster_name = click.prompt("Cluster name (or 'done' to finish)",
+                                    value_proc=_validated(index.check_name, "done"))
+        if cluster_name == 'done':
             break
             
         domain = click.prompt(f"Domain for {cluster_name}", 
-                            default=f"{cluster_name}.vectorweight.com")
+                            default=f"{cluster_name}.vectorweight.com",
+                            value_proc=_validated(index.check_domain))
+        
+        free_range = index.next_free_range()
+        if free_range is None and not index.legacy_clusters:
+            click.echo(f"⚠️  No free range of {index.range_size} addresses left in {index.pool}")
+        metallb_range = click.prompt(f"MetalLB address range for {cluster_name}",
+                                     default=str(free_range) if free_range else None,
+                                     value_proc=_validated(lambda value: str(index.check_range(value))))
         
         size = click.prompt("Cluster size",
                           type=click.Choice(['minimal', 'small', 'medium', 'large']),
@@ -389,6 +1194,7 @@ def _interactive_configuration_wizard() -> VectorWaveConfiguration:
         
         cerbos_enabled = click.confirm("Enable Cerbos authorization?", default=False)
         
+        index.add(cluster_name, domain, metallb_range)
         cluster_config = {
             "name": cluster_name,
             "domain": domain,
@@ -396,7 +1202,8 @@ def _interactive_configuration_wizard() -> VectorWaveConfiguration:
             "gpu_enabled": gpu_enabled,
             "vector_store": vector_store,
             "cerbos_enabled": cerbos_enabled,
-            "specialized_workloads": []
+            "specialized_workloads": [],
+            "metallb_range": metallb_range
         }
         
         clusters.append(cluster_config)
@@ -426,41 +1233,134 @@ def _interactive_configuration_wizard() -> VectorWaveConfiguration:
     return loader.load_from_dict(config_data)
 
 
-def _monitor_deployment_progress():
-    """Monitor Argo CD deployment progress"""
-    import subprocess
+def _validated(check, *accepted: str):
+    """``click.prompt`` value_proc re-asking with the error when ``check`` raises ValueError"""
+    def convert(value: str):
+        if value.strip().lower() in accepted:
+            return value.strip().lower()
+        try:
+            return check(value)
+        except ValueError as e:
+            raise click.BadParameter(str(e))
+    return convert
+
+
+def _monitor_deployment_progress(kube_context: Optional[str] = None, timeout: float = 300,
+                                 dashboard=None):
+    """Monitor Argo CD deployment progress
+
+    Args:
+        kube_context: Kubeconfig context of the cluster
+        timeout: Seconds to wait for all applications to become healthy
+        dashboard: Live ``DeploymentDashboard`` to feed with every change
+    """
     import time
+    from cluster_snek.connectors.argocd import ArgoCDConnector
+    from cluster_snek.connectors.kubernetes_client import get_api_client
+    out = get_emitter()
+    
+    last_reported = [None]
+    previous = {}
+    
+    def report(statuses):
+        if dashboard is not None:
+            dashboard.on_applications(kube_context or "default", statuses)
+        for app in statuses:
+            if previous.get(app.name) != app:
+                previous[app.name] = app
+                _emit_application(out, kube_context, app)
+        healthy_count = sum(1 for s in statuses if s.healthy)
+        counts = (healthy_count, len(statuses))
+        if counts != last_reported[0]:
+            last_reported[0] = counts
+            out.echo(f"📊 Applications: {healthy_count}/{len(statuses)} healthy")
     
     try:
-        for _ in range(30):  # Monitor for 5 minutes
-            result = subprocess.run([
-                'kubectl', 'get', 'applications', '-n', 'argocd', '--no-headers'
-            ], capture_output=True, text=True)
-            
-            if result.returncode == 0:
-                lines = result.stdout.strip().split('\n')
-                healthy_count = 0
-                total_count = len([l for l in lines if l.strip()])
-                
-                for line in lines:
-                    if line.strip():
-                        parts = line.split()
-                        if len(parts) >= 3 and parts[1] == "Healthy" and parts[2] == "Synced":
-                            healthy_count += 1
-                
-                click.echo(f"📊 Applications: {healthy_count}/{total_count} healthy")
-                
-                if healthy_count == total_count and total_count > 0:
-                    click.echo("✅ All applications are healthy!")
-                    break
-            
-            time.sleep(10)
+        argocd = ArgoCDConnector(get_api_client(kube_context))
+        deadline = time.monotonic() + timeout
+        # Applications stay Unknown until the freshly bootstrapped server runs
+        healthy = argocd.wait_for_server(timeout=timeout) and argocd.wait_until_healthy(
+            timeout=max(0.0, deadline - time.monotonic()), on_change=report
+        )
+        out.emit("monitor_complete", context=kube_context, healthy=healthy)
+        if healthy:
+            out.echo("✅ All applications are healthy!")
+        else:
+            out.echo(f"⏰ Applications not healthy after {timeout:.0f}s")
     
     except KeyboardInterrupt:
-        click.echo("\n⏹️  Monitoring stopped by user")
+        out.echo("\n⏹️  Monitoring stopped by user")
     except Exception as e:
-        click.echo(f"❌ Monitoring failed: {e}")
+        out.emit("monitor_complete", context=kube_context, healthy=False, error=str(e))
+        if dashboard is not None:
+            dashboard.add_error(f"Monitoring failed: {e}")
+        out.echo(f"❌ Monitoring failed: {e}")
+
+
+@cli.command()
+@click.argument('shell', type=click.Choice(['bash', 'zsh', 'fish']))
+@click.pass_context
+def completion(ctx, shell: str):
+    """Print the shell completion script
+
+    Add it to your shell's startup file, for example:
+    eval "$(cluster-snek completion bash)"
+    """
+    from click.shell_completion import get_completion_class
+    
+    prog_name = ctx.find_root().info_name or "cluster-snek"
+    complete_var = f"_{prog_name.replace('-', '_').replace('.', '_')}_COMPLETE".upper()
+    completion_class = get_completion_class(shell)
+    click.echo(completion_class(ctx.find_root().command, {}, prog_name, complete_var).source())
+
+
+@cli.command()
+@click.option('--socket', 'socket_path', type=click.Path(dir_okay=False),
+              help='Unix socket to listen on (default: $XDG_RUNTIME_DIR/cluster-snek/daemon.sock)')
+@click.option('--stop', is_flag=True, help='Stop the running daemon')
+def serve(socket_path: Optional[str], stop: bool):
+    """Keep a warm CLI process serving generate/validate/status requests"""
+    from cluster_snek.cli.daemon import DaemonServer, DaemonUnavailable, request
+    out = get_emitter()
+    
+    path = Path(socket_path) if socket_path else None
+    if stop:
+        try:
+            request({"op": "shutdown"}, path)
+            out.echo("⏹️  Daemon stopped")
+        except DaemonUnavailable as e:
+            out.echo(f"❌ {e}", err=True)
+            sys.exit(1)
+        return
+    
+    server = DaemonServer(path)
+    out.emit("serving", socket=str(server.socket_path), pid=os.getpid())
+    out.echo(f"🐍 Serving on {server.socket_path} (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        out.echo("\n⏹️  Daemon stopped")
+    except ValueError as e:
+        out.echo(f"❌ {e}", err=True)
+        sys.exit(1)
+
+
+def main(argv: Optional[list] = None):
+    """Run the CLI, handing the command to a running daemon when possible"""
+    argv = sys.argv[1:] if argv is None else argv
+    from cluster_snek.cli.daemon import DaemonUnavailable, forward, should_forward
+    
+    if should_forward(cli, argv):
+        try:
+            response = forward(argv)
+        except DaemonUnavailable as e:
+            logger.debug(f"Running locally: {e}")
+        else:
+            sys.stdout.write(response.stdout)
+            sys.stderr.write(response.stderr)
+            sys.exit(response.exit_code)
+    cli(args=argv)
 
 
 if __name__ == '__main__':
-    cli()
+    main()
@@ -0,0 +1,100 @@
+"""Shell completion candidates.
+
+Completing a cluster or snapshot id must not load configuration files,
+Kubernetes clients or the generators. Instead, commands that already have
+that information at hand (loading a configuration, deploying, listing
+snapshots) record the names in a small JSON index, and completion only
+reads that file. It is a cache: missing or corrupt files simply offer no
+candidates, and entries may outlive the configuration they came from.
+
+Only the standard library and click are imported here, since this module
+loads on every completion request.
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional
+
+INDEX_VERSION = 1
+MAX_ENTRIES = 500
+
+CLUSTERS = "clusters"
+CONTEXTS = "contexts"
+COMPONENTS = "components"
+SNAPSHOTS = "snapshots"
+
+
+def default_index_path() -> Path:
+    """Location of the shared completion index."""
+    cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(cache_home) / "cluster-snek" / "completion.json"
+
+
+def read_index(path: Optional[Path] = None) -> Dict[str, List[str]]:
+    """Candidates by section; empty when there is no usable index."""
+    path = Path(path) if path else default_index_path()
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get("version") != INDEX_VERSION:
+        return {}
+    sections = data.get("sections")
+    return sections if isinstance(sections, dict) else {}
+
+
+def update_index(path: Optional[Path] = None, **sections: Iterable[str]) -> None:
+    """Add names to index sections.
+
+    New names go first and existing ones are kept after them, so recently
+    seen clusters and snapshots are offered first. Each section is capped
+    at ``MAX_ENTRIES``. Failures to write are ignored; the index is only an
+    optimization.
+
+    Args:
+        path: Index file; the shared per-user index when omitted
+        **sections: Names per section, e.g. ``clusters=["lab", "edge"]``
+    """
+    path = Path(path) if path else default_index_path()
+    index = read_index(path)
+    for section, names in sections.items():
+        merged = list(dict.fromkeys([str(n) for n in names] + index.get(section, [])))
+        index[section] = merged[:MAX_ENTRIES]
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"version": INDEX_VERSION, "sections": index}, f)
+        os.replace(tmp, path)
+    except OSError:
+        pass
+
+
+def index_configuration(configuration, path: Optional[Path] = None) -> None:
+    """Record the clusters, contexts and workloads of a loaded configuration."""
+    clusters = list(getattr(configuration, "clusters", None) or [])
+    update_index(
+        path,
+        **{
+            CLUSTERS: [c.name for c in clusters],
+            CONTEXTS: [getattr(c, "context", None) or c.name for c in clusters],
+            COMPONENTS: [w for c in clusters for w in (getattr(c, "specialized_workloads", None) or [])],
+        }
+    )
+
+
+def candidates(section: str, incomplete: str = "", path: Optional[Path] = None) -> List[str]:
+    """Indexed names of a section starting with ``incomplete``."""
+    return [name for name in read_index(path).get(section, []) if name.startswith(incomplete)]
+
+
+def completer(*sections: str) -> Callable:
+    """``shell_complete`` callback offering the names of index sections."""
+    def complete(ctx, param, incomplete: str) -> List[str]:
+        names: List[str] = []
+        for section in sections:
+            names.extend(candidates(section, incomplete))
+        return list(dict.fromkeys(names))
+    return complete
@@ -0,0 +1,307 @@
+"""Long-lived CLI daemon.
+
+``cluster-snek serve`` keeps one process running with the CLI's modules
+imported, parsed configurations cached and Kubernetes clients pooled, and
+runs ``generate``, ``validate`` and ``status`` for clients connecting over a
+Unix socket. Commands run one at a time, in the client's working directory,
+and their output and exit code are sent back for the client to reproduce.
+Output is sent once the command finishes, so invocations that stream JSON
+events run locally instead. Pooled Kubernetes clients are dropped whenever a
+client's kubeconfig differs from the one they were created from.
+
+The protocol is one JSON object per line in each direction: a request
+``{"op": "run", "argv": [...], "cwd": "...", "env": {...}}`` (or ``ping`` /
+``shutdown``) and a response ``{"exit_code": 0, "stdout": "...",
+"stderr": "..."}``.
+"""
+
+import json
+import logging
+import os
+import socket
+import socketserver
+import sys
+import threading
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+FORWARDED_COMMANDS = ("generate", "validate", "status")
+# Options that keep a command running, which would hold the daemon forever
+LOCAL_ONLY_OPTIONS = ("--watch",)
+# Output formats that must reach the client as they are produced
+STREAMING_OUTPUT_FORMATS = ("jsonl",)
+DISABLE_ENV = "CLUSTER_SNEK_NO_DAEMON"
+SOCKET_ENV = "CLUSTER_SNEK_SOCKET"
+DEFAULT_CONNECT_TIMEOUT = 0.5
+
+
+def default_socket_path() -> Path:
+    """Socket the daemon listens on unless told otherwise."""
+    if os.environ.get(SOCKET_ENV):
+        return Path(os.environ[SOCKET_ENV])
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        return Path(runtime_dir) / "cluster-snek" / "daemon.sock"
+    cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(cache_home) / "cluster-snek" / "daemon.sock"
+
+
+class DaemonUnavailable(ValueError):
+    """No daemon is listening on the socket."""
+
+
+@dataclass
+class DaemonResponse:
+    """Result of a command run by the daemon."""
+    exit_code: int
+    stdout: str = ""
+    stderr: str = ""
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+
+    def handle(self) -> None:
+        line = self.rfile.readline()
+        try:
+            request = json.loads(line)
+            response = self.server.daemon.handle(request)
+        except (json.JSONDecodeError, ValueError) as e:
+            response = DaemonResponse(exit_code=2, stderr=f"Invalid daemon request: {e}\n")
+        self.wfile.write(json.dumps(asdict(response)).encode() + b"\n")
+
+
+class _UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class DaemonServer:
+    """Runs CLI commands for clients over a Unix socket."""
+
+    def __init__(self, socket_path: Optional[Path] = None, command: Any = None):
+        """Create the server; nothing listens until ``serve_forever``.
+
+        Args:
+            socket_path: Socket to listen on; ``default_socket_path()`` when omitted
+            command: Click command to run requests against; the CLI by default
+        """
+        self.socket_path = Path(socket_path) if socket_path else default_socket_path()
+        if command is None:
+            from cluster_snek.cli.commands.cli import cli as command
+        self.command = command
+        self._run_lock = threading.Lock()
+        self._server: Optional[_UnixServer] = None
+        self._kubeconfig: Optional[Tuple] = None
+
+    def handle(self, request: Dict[str, Any]) -> DaemonResponse:
+        """Answer a single decoded request.
+
+        Raises:
+            ValueError: If the request is malformed
+        """
+        op = request.get("op", "run")
+        if op == "ping":
+            return DaemonResponse(exit_code=0, stdout=f"{os.getpid()}\n")
+        if op == "shutdown":
+            threading.Thread(target=self.shutdown, daemon=True).start()
+            return DaemonResponse(exit_code=0)
+        if op != "run":
+            raise ValueError(f"Unknown op: {op}")
+        argv = request.get("argv")
+        if not isinstance(argv, list) or not all(isinstance(a, str) for a in argv):
+            raise ValueError("argv must be a list of strings")
+        return self.run(argv, cwd=request.get("cwd"), env=request.get("env"))
+
+    def run(self, argv: Sequence[str], cwd: Optional[str] = None,
+            env: Optional[Dict[str, str]] = None) -> DaemonResponse:
+        """Run one command with captured output.
+
+        Commands run one at a time: they share the process's working
+        directory, environment and standard streams. Pooled Kubernetes
+        clients are discarded first if the kubeconfig this command would
+        read is not the one they were built from.
+        """
+        from click.testing import CliRunner
+
+        if env is not None:
+            # Unset what the client does not have, so commands see its environment
+            env = {**{key: None for key in os.environ if key not in env}, **env}
+        with self._run_lock:
+            self._check_kubeconfig(env)
+            previous_cwd = os.getcwd()
+            try:
+                if cwd:
+                    os.chdir(cwd)
+                result = CliRunner().invoke(
+                    self.command, list(argv), env=env, prog_name="cluster-snek"
+                )
+            finally:
+                os.chdir(previous_cwd)
+        stderr = result.stderr
+        if result.exception is not None and not isinstance(result.exception, SystemExit):
+            logger.error(f"Command {list(argv)} failed: {result.exception!r}")
+            stderr += f"Error: {result.exception}\n"
+        return DaemonResponse(result.exit_code, result.stdout, stderr)
+
+    def _check_kubeconfig(self, env: Optional[Dict[str, Optional[str]]]) -> None:
+        """Drop pooled API clients built from a different kubeconfig"""
+        identity = _kubeconfig_identity(env)
+        if identity != self._kubeconfig:
+            clients = sys.modules.get("cluster_snek.connectors.kubernetes_client")
+            if clients is not None and self._kubeconfig is not None:
+                logger.info("Kubeconfig changed; dropping pooled Kubernetes clients")
+                clients.get_api_client.cache_clear()
+            self._kubeconfig = identity
+
+    def serve_forever(self) -> None:
+        """Listen on the socket until shut down.
+
+        Raises:
+            ValueError: If another daemon is already listening
+        """
+        if self.socket_path.exists():
+            if ping(self.socket_path):
+                raise ValueError(f"A daemon is already listening on {self.socket_path}")
+            self.socket_path.unlink()
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True, mode=0o700)
+        previous_umask = os.umask(0o177)
+        try:
+            self._server = _UnixServer(str(self.socket_path), _RequestHandler)
+        finally:
+            os.umask(previous_umask)
+        self._server.daemon = self
+        logger.info(f"Listening on {self.socket_path}")
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+            try:
+                self.socket_path.unlink()
+            except FileNotFoundError:
+                pass
+
+    def shutdown(self) -> None:
+        """Stop ``serve_forever`` from another thread."""
+        if self._server is not None:
+            self._server.shutdown()
+
+
+def _kubeconfig_identity(env: Optional[Dict[str, Optional[str]]] = None) -> Tuple:
+    """Kubeconfig files a command would read, with their size and mtime.
+
+    Switching ``KUBECONFIG`` or editing the file, e.g. with ``kubectl config
+    use-context``, changes the identity.
+    """
+    def get(key: str) -> Optional[str]:
+        return env[key] if env is not None and key in env else os.environ.get(key)
+
+    paths = get("KUBECONFIG") or str(Path(get("HOME") or Path.home()) / ".kube" / "config")
+    identity = []
+    for path in paths.split(os.pathsep):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            identity.append((path, None))
+        else:
+            identity.append((path, stat.st_mtime_ns, stat.st_size))
+    return tuple(identity)
+
+
+def request(payload: Dict[str, Any], socket_path: Optional[Path] = None,
+            timeout: Optional[float] = None) -> DaemonResponse:
+    """Send one request to the daemon and wait for its response.
+
+    Args:
+        payload: Request object
+        socket_path: Daemon socket; ``default_socket_path()`` when omitted
+        timeout: Seconds to wait for the response; None waits for the command
+
+    Raises:
+        DaemonUnavailable: If no daemon accepts the connection
+    """
+    socket_path = Path(socket_path) if socket_path else default_socket_path()
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.settimeout(DEFAULT_CONNECT_TIMEOUT)
+        try:
+            sock.connect(str(socket_path))
+        except (FileNotFoundError, ConnectionRefusedError, socket.timeout) as e:
+            raise DaemonUnavailable(f"No daemon on {socket_path}: {e}")
+        sock.settimeout(timeout)
+        sock.sendall(json.dumps(payload).encode() + b"\n")
+        with sock.makefile("rb") as f:
+            line = f.readline()
+    finally:
+        sock.close()
+    if not line:
+        raise DaemonUnavailable(f"Daemon on {socket_path} closed the connection")
+    return DaemonResponse(**json.loads(line))
+
+
+def ping(socket_path: Optional[Path] = None) -> bool:
+    """Whether a daemon answers on the socket."""
+    try:
+        return request({"op": "ping"}, socket_path, timeout=DEFAULT_CONNECT_TIMEOUT).exit_code == 0
+    except (DaemonUnavailable, OSError):
+        return False
+
+
+def forward(argv: Sequence[str], socket_path: Optional[Path] = None) -> DaemonResponse:
+    """Run a CLI command in the daemon, as if run from this process.
+
+    Raises:
+        DaemonUnavailable: If no daemon is running
+    """
+    return request(
+        {"op": "run", "argv": list(argv), "cwd": os.getcwd(), "env": dict(os.environ)},
+        socket_path
+    )
+
+
+def requested_command(group: Any, argv: Sequence[str]) -> Optional[str]:
+    """Name of the subcommand in ``argv``, skipping the group's own options."""
+    takes_value = {
+        opt
+        for param in group.params
+        if not getattr(param, "is_flag", False) and not getattr(param, "count", False)
+        for opt in param.opts
+    }
+    args = list(argv)
+    i = 0
+    while i < len(args):
+        arg = args[i]
+        if arg == "--":
+            return args[i + 1] if i + 1 < len(args) else None
+        if not arg.startswith("-"):
+            return arg
+        if arg in takes_value:
+            i += 1
+        i += 1
+    return None
+
+
+def should_forward(group: Any, argv: Sequence[str]) -> bool:
+    """Whether a CLI invocation may be handed to a running daemon."""
+    if os.environ.get(DISABLE_ENV, "").lower() in ("1", "true", "yes", "on"):
+        return False
+    if any(arg in LOCAL_ONLY_OPTIONS for arg in argv):
+        return False
+    if _option_value(argv, "--output-format") in STREAMING_OUTPUT_FORMATS:
+        return False
+    return requested_command(group, argv) in FORWARDED_COMMANDS and default_socket_path().exists()
+
+
+def _option_value(argv: Sequence[str], option: str) -> Optional[str]:
+    """Last value given for a long option, as ``--opt value`` or ``--opt=value``."""
+    value = None
+    args = list(argv)
+    for i, arg in enumerate(args):
+        if arg == "--":
+            break
+        if arg == option and i + 1 < len(args):
+            value = args[i + 1]
+        elif arg.startswith(option + "="):
+            value = arg[len(option) + 1:]
+    return value
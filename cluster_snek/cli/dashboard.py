@@ -0,0 +1,211 @@
+"""Live terminal dashboard for deployments.
+
+``DeploymentDashboard`` shows apply progress and throughput, the health and
+sync state of every Argo CD Application per cluster, and the most recent
+errors. It is fed from the apply engine's ``on_result`` callback and from
+Application watch events, both of which may arrive from other threads and
+in bursts of hundreds.
+
+Updates only mark the dashboard dirty; a single render thread redraws it
+at most ``max_fps`` times per second, and only when something changed, so
+cost does not grow with the event rate. With many applications the table
+lists unhealthy ones first and folds the rest into a count, keeping each
+frame within the terminal height.
+"""
+
+import threading
+import time
+from collections import Counter, deque
+from typing import Deque, Dict, Iterable, List, Optional, Tuple
+
+from rich.console import Console, Group, RenderableType
+from rich.live import Live
+from rich.panel import Panel
+from rich.table import Table
+from rich.text import Text
+
+from cluster_snek.connectors.argocd import ApplicationStatus
+from cluster_snek.deployment.apply import ApplyResult, ApplyStatus
+
+DEFAULT_MAX_FPS = 4.0
+DEFAULT_ERROR_LINES = 8
+THROUGHPUT_WINDOW = 5.0
+
+_HEALTH_STYLES = {
+    "Healthy": "green",
+    "Progressing": "yellow",
+    "Degraded": "red",
+    "Missing": "red",
+    "Suspended": "blue",
+}
+_SYNC_STYLES = {"Synced": "green", "OutOfSync": "yellow"}
+
+
+class DeploymentDashboard:
+    """Throttled live view of apply and Application state."""
+
+    def __init__(
+        self,
+        title: str = "Deployment",
+        console: Optional[Console] = None,
+        max_fps: float = DEFAULT_MAX_FPS,
+        error_lines: int = DEFAULT_ERROR_LINES
+    ):
+        """Create the dashboard; nothing is drawn until ``start``.
+
+        Args:
+            title: Heading shown above the panels
+            console: Console to draw on; the terminal by default
+            max_fps: Upper bound on redraws per second
+            error_lines: Number of recent errors kept on screen
+        """
+        self.title = title
+        self.console = console or Console()
+        self.max_fps = max_fps
+        self.renders = 0
+        self._lock = threading.Lock()
+        self._dirty = threading.Event()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._live: Optional[Live] = None
+        self._started = time.monotonic()
+        self._results: Counter = Counter()
+        self._total = 0
+        self._recent: Deque[float] = deque()
+        self._applications: Dict[Tuple[str, str], ApplicationStatus] = {}
+        self._errors: Deque[str] = deque(maxlen=error_lines)
+
+    def __enter__(self) -> "DeploymentDashboard":
+        self.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def expect(self, total: int) -> None:
+        """Set the number of resources the apply will report."""
+        with self._lock:
+            self._total = total
+        self._dirty.set()
+
+    def on_result(self, result: ApplyResult) -> None:
+        """Apply engine callback."""
+        now = time.monotonic()
+        with self._lock:
+            self._results[result.status] += 1
+            if result.status == ApplyStatus.APPLIED:
+                self._recent.append(now)
+            if result.error:
+                self._errors.append(f"{result.key}: {result.error}")
+        self._dirty.set()
+
+    def on_applications(self, cluster: str, statuses: Iterable[ApplicationStatus]) -> None:
+        """Application watch callback; replaces the cluster's applications."""
+        statuses = list(statuses)
+        with self._lock:
+            for key in [k for k in self._applications if k[0] == cluster]:
+                del self._applications[key]
+            for app in statuses:
+                self._applications[(cluster, app.name)] = app
+        self._dirty.set()
+
+    def add_error(self, message: str) -> None:
+        """Show an error in the error stream."""
+        with self._lock:
+            self._errors.append(message)
+        self._dirty.set()
+
+    def start(self) -> None:
+        """Begin drawing in the terminal."""
+        self._live = Live(self.render(), console=self.console, auto_refresh=False)
+        self._live.start()
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._render_loop, name="dashboard", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Draw the final state and stop."""
+        self._stopping.set()
+        self._dirty.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._live is not None:
+            self._live.update(self.render(), refresh=True)
+            self._live.stop()
+            self._live = None
+
+    def _render_loop(self) -> None:
+        interval = 1.0 / self.max_fps
+        while not self._stopping.is_set():
+            self._dirty.wait()
+            if self._stopping.is_set():
+                return
+            self._dirty.clear()
+            self._live.update(self.render(), refresh=True)
+            # Events arriving during the pause are folded into the next frame
+            self._stopping.wait(interval)
+
+    def throughput(self) -> float:
+        """Resources applied per second over the last few seconds."""
+        now = time.monotonic()
+        with self._lock:
+            while self._recent and now - self._recent[0] > THROUGHPUT_WINDOW:
+                self._recent.popleft()
+            window = min(THROUGHPUT_WINDOW, max(now - self._started, 1e-6))
+            return len(self._recent) / window
+
+    def render(self) -> RenderableType:
+        """Build one frame."""
+        self.renders += 1
+        throughput = self.throughput()
+        with self._lock:
+            results = dict(self._results)
+            total = self._total
+            applications = sorted(
+                self._applications.items(),
+                key=lambda item: (item[1].healthy, item[0])
+            )
+            errors = list(self._errors)
+
+        done = sum(results.values())
+        applied = results.get(ApplyStatus.APPLIED, 0)
+        summary = Text.assemble(
+            (f"{done}/{total or '?'} resources  ", "bold"),
+            (f"{applied} applied  ", "green"),
+            (f"{results.get(ApplyStatus.UNCHANGED, 0)} unchanged  ", "dim"),
+            (f"{results.get(ApplyStatus.FAILED, 0)} failed  ", "red"),
+            (f"{results.get(ApplyStatus.SKIPPED, 0)} skipped  ", "yellow"),
+            (f"{throughput:.1f}/s  ", "cyan"),
+            (f"{time.monotonic() - self._started:.0f}s elapsed", "dim"),
+        )
+
+        healthy = sum(1 for _, app in applications if app.healthy)
+        table = Table(expand=True, show_edge=False, pad_edge=False)
+        table.add_column("Cluster", no_wrap=True)
+        table.add_column("Application", no_wrap=True)
+        table.add_column("Health", no_wrap=True)
+        table.add_column("Sync", no_wrap=True)
+        rows = self._visible_rows(len(errors))
+        for (cluster, name), app in applications[:rows]:
+            table.add_row(
+                cluster, name,
+                Text(app.health, style=_HEALTH_STYLES.get(app.health, "")),
+                Text(app.sync, style=_SYNC_STYLES.get(app.sync, ""))
+            )
+        hidden = len(applications) - min(rows, len(applications))
+        if hidden:
+            table.add_row("", Text(f"… {hidden} more", style="dim"), "", "")
+
+        parts: List[RenderableType] = [
+            summary,
+            Panel(table, title=f"Applications {healthy}/{len(applications)} healthy"),
+        ]
+        if errors:
+            parts.append(Panel(Text("\n".join(errors), style="red"), title="Errors"))
+        return Panel(Group(*parts), title=self.title)
+
+    def _visible_rows(self, error_count: int) -> int:
+        # Borders, summary, table header and the error panel
+        chrome = 8 + (error_count + 2 if error_count else 0)
+        return max(3, self.console.size.height - chrome)
@@ -0,0 +1,84 @@
+"""Human and machine-readable command output.
+
+Commands write through an ``EventEmitter`` instead of calling ``click.echo``
+directly. In text mode it prints the usual messages and ignores events. In
+jsonl mode the messages are dropped and every event is written to stdout as
+one JSON object per line the moment it happens, so other tools can process
+results while a command is still running. Error messages become ``error``
+events, so nothing needs to be scraped from stderr either.
+
+Every event carries ``event`` (its type) and ``ts`` (UTC, ISO 8601) fields
+followed by event specific fields.
+"""
+
+import json
+import threading
+from datetime import datetime, timezone
+from enum import Enum
+from typing import Any, Optional
+
+import click
+
+
+class OutputFormat(Enum):
+    """How commands report their results"""
+    TEXT = "text"
+    JSONL = "jsonl"
+
+
+class EventEmitter:
+    """Writes command output as text or as a stream of JSON events."""
+
+    def __init__(self, output_format: OutputFormat = OutputFormat.TEXT):
+        """Create an emitter.
+
+        Args:
+            output_format: Text for people, jsonl for tools
+        """
+        self.output_format = output_format
+        self._lock = threading.Lock()
+
+    @property
+    def jsonl(self) -> bool:
+        return self.output_format == OutputFormat.JSONL
+
+    def echo(self, message: str = "", err: bool = False) -> None:
+        """Print a human readable message; in jsonl mode errors become events."""
+        if not self.jsonl:
+            click.echo(message, err=err)
+        elif err:
+            self.emit("error", message=message.lstrip("❌🔒⚠️ "))
+
+    def emit(self, event: str, **fields: Any) -> None:
+        """Write one event; does nothing in text mode.
+
+        Args:
+            event: Event type, e.g. ``resource`` or ``application``
+            **fields: JSON-serializable details; other values are stringified
+        """
+        if not self.jsonl:
+            return
+        record = {
+            "event": event,
+            "ts": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
+            **fields
+        }
+        line = json.dumps(record, default=_serialize)
+        with self._lock:
+            click.echo(line)
+
+
+def get_emitter(ctx: Optional[click.Context] = None) -> EventEmitter:
+    """Emitter configured for the running command, text when there is none."""
+    ctx = ctx or click.get_current_context(silent=True)
+    if ctx is not None:
+        ctx = ctx.find_root()
+        if isinstance(ctx.obj, dict) and isinstance(ctx.obj.get('output'), EventEmitter):
+            return ctx.obj['output']
+    return EventEmitter()
+
+
+def _serialize(value: Any) -> Any:
+    if isinstance(value, Enum):
+        return value.value
+    return str(value)
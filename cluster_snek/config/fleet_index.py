@@ -0,0 +1,246 @@
+"""In-memory index of a fleet's names, domains and address allocations.
+
+The configuration wizard checks every answer against this index as soon as
+it is entered, so a duplicate cluster name, a domain already served by
+another cluster or an overlapping MetalLB range is rejected on the spot
+instead of surfacing after a full generation run. It also proposes the next
+free MetalLB range from the shared address pool.
+
+Allocations are kept sorted by start address, so overlap checks and gap
+searches are a bisect and a single pass rather than comparisons between
+every pair of clusters. Clusters from older configurations announce the
+whole shared pool. They may share it with each other, but while any of them
+does, no part of the pool is free for a new range: each such cluster has to
+be migrated to its own ``metallb_range`` first.
+"""
+
+import bisect
+import ipaddress
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from cluster_snek.config.schema import VectorWaveConfig
+
+DEFAULT_RANGE_SIZE = 10
+
+_CLUSTER_NAME = re.compile(r"^[a-z0-9]([a-z0-9-]{0,61}[a-z0-9])?$")
+_DOMAIN_LABEL = re.compile(r"^[a-z0-9]([a-z0-9-]{0,61}[a-z0-9])?$")
+_RESERVED_NAMES = ("done",)
+
+
+@dataclass(frozen=True)
+class AddressRange:
+    """Inclusive IPv4 range owned by one cluster"""
+    start: ipaddress.IPv4Address
+    end: ipaddress.IPv4Address
+    owner: str = ""
+
+    @classmethod
+    def parse(cls, text: str, owner: str = "") -> "AddressRange":
+        """Parse ``start-end`` or a CIDR block.
+
+        Raises:
+            ValueError: If the text is not a valid, ordered IPv4 range
+        """
+        text = text.strip()
+        try:
+            if "/" in text:
+                network = ipaddress.IPv4Network(text, strict=True)
+                return cls(network[0], network[-1], owner)
+            start_text, sep, end_text = text.partition("-")
+            if not sep:
+                raise ValueError
+            start = ipaddress.IPv4Address(start_text.strip())
+            end = ipaddress.IPv4Address(end_text.strip())
+        except ValueError:
+            raise ValueError(f"'{text}' is not an address range like 192.168.1.200-192.168.1.209")
+        if end < start:
+            raise ValueError(f"Range {text} ends before it starts")
+        return cls(start, end, owner)
+
+    @property
+    def size(self) -> int:
+        return int(self.end) - int(self.start) + 1
+
+    def overlaps(self, other: "AddressRange") -> bool:
+        return self.start <= other.end and other.start <= self.end
+
+    def __str__(self) -> str:
+        return f"{self.start}-{self.end}"
+
+
+class FleetIndex:
+    """Names, domains and MetalLB ranges already taken in a fleet"""
+
+    def __init__(
+        self,
+        pool_start: str = VectorWaveConfig.ip_pool_start,
+        pool_end: str = VectorWaveConfig.ip_pool_end,
+        range_size: int = DEFAULT_RANGE_SIZE
+    ):
+        """Create an empty index.
+
+        Args:
+            pool_start: First address of the shared MetalLB pool
+            pool_end: Last address of the shared MetalLB pool
+            range_size: Number of addresses suggested per cluster
+        """
+        self.pool = AddressRange.parse(f"{pool_start}-{pool_end}")
+        self.range_size = range_size
+        self.clusters: Dict[str, str] = {}  # name -> domain
+        self.domains: Dict[str, str] = {}  # domain -> cluster name
+        self._ranges: List[AddressRange] = []
+        self._starts: List[int] = []
+        self._shared: List[AddressRange] = []  # Whole-pool ranges of clusters without their own
+
+    @classmethod
+    def from_configuration(cls, configuration, range_size: int = DEFAULT_RANGE_SIZE) -> "FleetIndex":
+        """Index an existing configuration, using its MetalLB pool.
+
+        Raises:
+            ValueError: If the configuration already contains conflicts
+        """
+        index = cls(
+            getattr(configuration, "ip_pool_start", VectorWaveConfig.ip_pool_start),
+            getattr(configuration, "ip_pool_end", VectorWaveConfig.ip_pool_end),
+            range_size
+        )
+        index.add_configuration(configuration)
+        return index
+
+    def add_configuration(self, configuration) -> None:
+        """Index the clusters of a configuration.
+
+        Clusters without their own ``metallb_range`` announce the whole
+        shared pool; they are recorded as sharing it, which blocks the pool
+        for new ranges until they are migrated.
+
+        Raises:
+            ValueError: If its clusters conflict with those already indexed
+        """
+        clusters = getattr(configuration, "clusters", None) or []
+        # Own ranges first, so an older cluster listed before them does not
+        # make them fail; the overlap is reported through legacy_clusters
+        for cluster in sorted(clusters, key=lambda c: not getattr(c, "metallb_range", None)):
+            metallb_range = getattr(cluster, "metallb_range", None)
+            self.add(cluster.name, cluster.domain, metallb_range or str(self.pool), shared=not metallb_range)
+
+    def check_name(self, name: str) -> str:
+        """Validate a new cluster name.
+
+        Raises:
+            ValueError: If the name is not a DNS label or is already used
+        """
+        name = name.strip()
+        if not _CLUSTER_NAME.match(name):
+            raise ValueError(
+                f"'{name}' is not a valid cluster name: use lowercase letters, digits and '-', "
+                "starting and ending with a letter or digit (max 63 characters)"
+            )
+        if name in _RESERVED_NAMES:
+            raise ValueError(f"'{name}' is reserved")
+        if name in self.clusters:
+            raise ValueError(f"Cluster '{name}' already exists")
+        return name
+
+    def check_domain(self, domain: str) -> str:
+        """Validate a new cluster domain.
+
+        Raises:
+            ValueError: If the domain is malformed or served by another cluster
+        """
+        domain = domain.strip().lower().rstrip(".")
+        labels = domain.split(".")
+        if len(labels) < 2 or len(domain) > 253 or not all(_DOMAIN_LABEL.match(label) for label in labels):
+            raise ValueError(f"'{domain}' is not a valid domain name")
+        owner = self.domains.get(domain)
+        if owner is not None:
+            raise ValueError(f"Domain {domain} is already used by cluster '{owner}'")
+        return domain
+
+    def check_range(self, text: str) -> AddressRange:
+        """Validate a MetalLB range for a new cluster.
+
+        Raises:
+            ValueError: If the range is malformed or overlaps an allocation
+        """
+        candidate = AddressRange.parse(text)
+        conflict = self._overlapping(candidate)
+        if conflict is not None:
+            raise ValueError(f"Range {candidate} overlaps {conflict} used by cluster '{conflict.owner}'")
+        legacy = [allocated for allocated in self._shared if allocated.overlaps(candidate)]
+        if legacy:
+            raise ValueError(
+                f"Range {candidate} overlaps the pool {legacy[0]} still announced by "
+                f"{_cluster_list(a.owner for a in legacy)}; give them their own metallb_range first"
+            )
+        return candidate
+
+    def next_free_range(self, size: Optional[int] = None) -> Optional[AddressRange]:
+        """First gap in the shared pool with room for ``size`` addresses.
+
+        Returns:
+            The suggested range, or None when the pool is exhausted
+        """
+        size = size or self.range_size
+        cursor = int(self.pool.start)
+        for allocated in self.allocations():
+            if int(allocated.start) - cursor >= size:
+                break
+            cursor = max(cursor, int(allocated.end) + 1)
+        if int(self.pool.end) - cursor + 1 < size:
+            return None
+        return AddressRange(ipaddress.IPv4Address(cursor), ipaddress.IPv4Address(cursor + size - 1))
+
+    def add(self, name: str, domain: str, metallb_range: Optional[str] = None, shared: bool = False) -> None:
+        """Record a cluster after its answers were accepted.
+
+        Args:
+            name: Cluster name
+            domain: Cluster domain
+            metallb_range: Addresses the cluster's MetalLB will announce
+            shared: The range is the shared pool (older configurations);
+                such ranges do not conflict with each other but block every
+                other range that overlaps them
+
+        Raises:
+            ValueError: If the cluster conflicts with the index
+        """
+        self.check_name(name)
+        domain = self.check_domain(domain)
+        allocation = None
+        if metallb_range:
+            allocation = AddressRange.parse(metallb_range, owner=name)
+            if not shared:
+                self.check_range(metallb_range)
+        self.clusters[name] = domain
+        self.domains[domain] = name
+        if allocation is not None and shared:
+            self._shared.append(allocation)
+        elif allocation is not None:
+            position = bisect.bisect_left(self._starts, int(allocation.start))
+            self._starts.insert(position, int(allocation.start))
+            self._ranges.insert(position, allocation)
+
+    def allocations(self) -> List[AddressRange]:
+        """Recorded ranges sorted by start address, shared ones included"""
+        return sorted(self._ranges + self._shared, key=lambda r: (int(r.start), r.owner))
+
+    @property
+    def legacy_clusters(self) -> List[str]:
+        """Clusters still announcing the whole shared pool"""
+        return sorted(allocated.owner for allocated in self._shared)
+
+    def _overlapping(self, candidate: AddressRange) -> Optional[AddressRange]:
+        # Only ranges starting at or before the candidate's end can overlap
+        position = bisect.bisect_right(self._starts, int(candidate.end))
+        for allocated in reversed(self._ranges[:position]):
+            if allocated.overlaps(candidate):
+                return allocated
+        return None
+
+
+def _cluster_list(names) -> str:
+    names = sorted(set(names))
+    return ("cluster " if len(names) == 1 else "clusters ") + ", ".join(f"'{n}'" for n in names)
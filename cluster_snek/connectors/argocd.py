@@ -0,0 +1,125 @@
+"""Argo CD connector.
+
+Reads Argo CD Application health straight from the Kubernetes API through
+the shared client layer, so status checks and deployment monitoring need no
+``kubectl`` or ``argocd`` binaries. Waiting for the server pod or for
+Applications to become healthy is driven by watches rather than polling.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+from cluster_snek.connectors.kubernetes_client import (
+    Informer, custom_object_informer, get_api_client, pod_informer
+)
+
+APPLICATION_GROUP = "argoproj.io"
+APPLICATION_VERSION = "v1alpha1"
+APPLICATION_PLURAL = "applications"
+ARGOCD_SERVER_SELECTOR = "app.kubernetes.io/name=argocd-server"
+
+
+@dataclass
+class ApplicationStatus:
+    """Health and sync state of an Argo CD Application."""
+    name: str
+    health: str
+    sync: str
+
+    @property
+    def healthy(self) -> bool:
+        """True once the application is both Healthy and Synced."""
+        return self.health == "Healthy" and self.sync == "Synced"
+
+    @classmethod
+    def from_object(cls, obj: Dict[str, Any]) -> "ApplicationStatus":
+        """Build from an Application object as returned by the API."""
+        status = obj.get("status", {})
+        return cls(
+            name=obj["metadata"]["name"],
+            health=status.get("health", {}).get("status", "Unknown"),
+            sync=status.get("sync", {}).get("status", "Unknown")
+        )
+
+
+class ArgoCDConnector:
+    """Queries and watches Argo CD Applications in one namespace."""
+
+    def __init__(self, api_client: Optional[Any] = None, namespace: str = "argocd"):
+        """Initialise the connector.
+
+        Args:
+            api_client: Kubernetes ApiClient; the shared client for the
+                current context when omitted
+            namespace: Namespace Argo CD is installed in
+        """
+        self.api_client = api_client or get_api_client()
+        self.namespace = namespace
+
+    def applications_informer(self) -> Informer:
+        """Informer over the namespace's Applications (not yet started)."""
+        return custom_object_informer(
+            self.api_client, APPLICATION_GROUP, APPLICATION_VERSION,
+            APPLICATION_PLURAL, self.namespace
+        )
+
+    def list_applications(self) -> List[ApplicationStatus]:
+        """Current status of every Application, sorted by name."""
+        from kubernetes import client
+
+        result = client.CustomObjectsApi(self.api_client).list_namespaced_custom_object(
+            APPLICATION_GROUP, APPLICATION_VERSION, self.namespace, APPLICATION_PLURAL
+        )
+        return sorted(
+            (ApplicationStatus.from_object(obj) for obj in result.get("items", [])),
+            key=lambda status: status.name
+        )
+
+    def server_running(self) -> bool:
+        """True if an argocd-server pod is Running."""
+        from kubernetes import client
+
+        pods = client.CoreV1Api(self.api_client).list_namespaced_pod(
+            self.namespace, label_selector=ARGOCD_SERVER_SELECTOR
+        )
+        return any(pod.status.phase == "Running" for pod in pods.items)
+
+    def wait_for_server(self, timeout: Optional[float] = None) -> bool:
+        """Wait until an argocd-server pod is Running.
+
+        Args:
+            timeout: Seconds to wait; forever when omitted
+
+        Returns:
+            bool: True if the server was running before the timeout
+        """
+        def running(pods: List[Dict[str, Any]]) -> bool:
+            return any(pod.get("status", {}).get("phase") == "Running" for pod in pods)
+
+        with pod_informer(self.api_client, self.namespace, ARGOCD_SERVER_SELECTOR) as informer:
+            return informer.wait_for(running, timeout)
+
+    def wait_until_healthy(
+        self,
+        timeout: Optional[float] = None,
+        on_change: Optional[Callable[[List[ApplicationStatus]], None]] = None
+    ) -> bool:
+        """Wait until every Application is Healthy and Synced.
+
+        Reacts to each watch event rather than polling.
+
+        Args:
+            timeout: Seconds to wait; forever when omitted
+            on_change: Called with the current statuses after every change
+
+        Returns:
+            bool: True if all applications became healthy before the timeout
+        """
+        def all_healthy(items: List[Dict[str, Any]]) -> bool:
+            statuses = [ApplicationStatus.from_object(obj) for obj in items]
+            if on_change:
+                on_change(statuses)
+            return bool(statuses) and all(s.healthy for s in statuses)
+
+        with self.applications_informer() as informer:
+            return informer.wait_for(all_healthy, timeout)
@@ -0,0 +1,214 @@
+"""Fleet-wide status across many kubeconfig contexts.
+
+Each cluster is checked in a worker thread, since the Kubernetes client is
+blocking, and the checks are driven from asyncio. A semaphore bounds how
+many run at once and ``asyncio.wait_for`` gives each cluster its own
+timeout, so one unreachable API server costs ``timeout`` seconds instead of
+holding up the whole fleet. Results are kept for a short TTL so repeated
+queries within a warm process (such as the ``serve`` daemon) answer from
+memory.
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from cluster_snek.connectors.argocd import ApplicationStatus
+
+DEFAULT_CONCURRENCY = 8
+DEFAULT_TIMEOUT = 10.0
+DEFAULT_CACHE_TTL = 30.0
+
+
+@dataclass(frozen=True)
+class FleetTarget:
+    """A cluster to check and the kubeconfig context to reach it through"""
+    cluster: str
+    context: str
+
+
+@dataclass
+class ClusterHealth:
+    """Argo CD status of one cluster"""
+    cluster: str
+    context: str
+    argocd_running: bool = False
+    applications: List[ApplicationStatus] = field(default_factory=list)
+    error: Optional[str] = None
+    elapsed: float = 0.0
+    cached: bool = False
+
+    @property
+    def reachable(self) -> bool:
+        return self.error is None
+
+    @property
+    def healthy_count(self) -> int:
+        return sum(1 for app in self.applications if app.healthy)
+
+    @property
+    def healthy(self) -> bool:
+        """True when Argo CD runs and every application is Healthy and Synced."""
+        return self.reachable and self.argocd_running and self.healthy_count == len(self.applications)
+
+
+@dataclass
+class HealthMatrix:
+    """Application health per cluster for a whole fleet"""
+    clusters: List[ClusterHealth]
+
+    @property
+    def applications(self) -> List[str]:
+        """Every application name seen on any cluster, sorted"""
+        return sorted({app.name for health in self.clusters for app in health.applications})
+
+    def cell(self, cluster: str, application: str) -> Optional[ApplicationStatus]:
+        """Status of an application on a cluster; None if it is not deployed there."""
+        for health in self.clusters:
+            if health.cluster == cluster:
+                return next((a for a in health.applications if a.name == application), None)
+        return None
+
+    @property
+    def healthy(self) -> bool:
+        return all(health.healthy for health in self.clusters)
+
+    def summary(self) -> str:
+        healthy = sum(1 for health in self.clusters if health.healthy)
+        unreachable = sum(1 for health in self.clusters if not health.reachable)
+        return f"{healthy}/{len(self.clusters)} clusters healthy, {unreachable} unreachable"
+
+
+ClusterCheck = Callable[[FleetTarget, str], ClusterHealth]
+
+
+class FleetStatusCache:
+    """Short-lived cache of cluster results keyed by context and namespace"""
+
+    def __init__(self, ttl: float = DEFAULT_CACHE_TTL):
+        self.ttl = ttl
+        self._entries: Dict[Tuple[str, str], Tuple[float, ClusterHealth]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, context: str, namespace: str) -> Optional[ClusterHealth]:
+        with self._lock:
+            entry = self._entries.get((context, namespace))
+        if entry is None or time.monotonic() - entry[0] > self.ttl:
+            return None
+        return entry[1]
+
+    def put(self, context: str, namespace: str, health: ClusterHealth) -> None:
+        with self._lock:
+            self._entries[(context, namespace)] = (time.monotonic(), health)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+# Shared by every fleet query in this process
+_cache = FleetStatusCache()
+
+
+def fleet_targets(clusters: Iterable) -> List[FleetTarget]:
+    """Targets for configured clusters; the context defaults to the cluster name."""
+    return [
+        FleetTarget(cluster.name, getattr(cluster, "context", None) or cluster.name)
+        for cluster in clusters
+    ]
+
+
+def check_cluster(target: FleetTarget, namespace: str) -> ClusterHealth:
+    """Query Argo CD on one cluster (blocking)."""
+    from cluster_snek.connectors.argocd import ArgoCDConnector
+    from cluster_snek.connectors.kubernetes_client import get_api_client
+
+    argocd = ArgoCDConnector(get_api_client(target.context), namespace=namespace)
+    return ClusterHealth(
+        cluster=target.cluster,
+        context=target.context,
+        argocd_running=argocd.server_running(),
+        applications=argocd.list_applications()
+    )
+
+
+async def gather_fleet_status(
+    targets: List[FleetTarget],
+    namespace: str = "argocd",
+    concurrency: int = DEFAULT_CONCURRENCY,
+    timeout: float = DEFAULT_TIMEOUT,
+    cache: Optional[FleetStatusCache] = None,
+    check: Optional[ClusterCheck] = None,
+    on_result: Optional[Callable[[ClusterHealth], None]] = None
+) -> HealthMatrix:
+    """Check every cluster concurrently.
+
+    Args:
+        targets: Clusters to check
+        namespace: Namespace Argo CD is installed in
+        concurrency: Maximum number of clusters queried at once
+        timeout: Seconds before a cluster is reported unreachable
+        cache: Recent results to reuse; results are stored back into it
+        check: Blocking function checking one cluster; ``check_cluster``
+            by default
+        on_result: Called with each cluster's result as soon as it is known
+
+    Returns:
+        HealthMatrix: Results in the order of ``targets``
+    """
+    check = check or check_cluster
+    semaphore = asyncio.Semaphore(concurrency)
+    loop = asyncio.get_running_loop()
+    # A thread per target: a check that timed out keeps its thread until
+    # the client gives up, and must not delay the clusters queued behind it
+    executor = ThreadPoolExecutor(max_workers=max(1, len(targets)), thread_name_prefix="fleet")
+
+    async def run(target: FleetTarget) -> ClusterHealth:
+        cached = cache.get(target.context, namespace) if cache else None
+        if cached is not None:
+            health = replace(cached, cluster=target.cluster, cached=True)
+        else:
+            async with semaphore:
+                started = time.monotonic()
+                try:
+                    health = await asyncio.wait_for(
+                        loop.run_in_executor(executor, check, target, namespace), timeout
+                    )
+                except asyncio.TimeoutError:
+                    health = ClusterHealth(target.cluster, target.context,
+                                           error=f"timed out after {timeout:g}s")
+                except Exception as e:
+                    health = ClusterHealth(target.cluster, target.context, error=str(e))
+                health.elapsed = time.monotonic() - started
+            # Failures are not cached so the next query retries them
+            if cache is not None and health.reachable:
+                cache.put(target.context, namespace, health)
+        if on_result:
+            on_result(health)
+        return health
+
+    try:
+        results = await asyncio.gather(*(run(target) for target in targets))
+    finally:
+        # Abandon checks that timed out rather than waiting for them
+        executor.shutdown(wait=False, cancel_futures=True)
+    return HealthMatrix(list(results))
+
+
+def fleet_status(
+    targets: List[FleetTarget],
+    namespace: str = "argocd",
+    concurrency: int = DEFAULT_CONCURRENCY,
+    timeout: float = DEFAULT_TIMEOUT,
+    use_cache: bool = True,
+    check: Optional[ClusterCheck] = None,
+    on_result: Optional[Callable[[ClusterHealth], None]] = None
+) -> HealthMatrix:
+    """Synchronous entry point for ``gather_fleet_status`` using the shared cache."""
+    return asyncio.run(gather_fleet_status(
+        targets, namespace=namespace, concurrency=concurrency, timeout=timeout,
+        cache=_cache if use_cache else None, check=check, on_result=on_result
+    ))
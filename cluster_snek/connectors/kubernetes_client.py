@@ -0,0 +1,244 @@
+"""Shared Kubernetes client layer.
+
+One pooled ``ApiClient`` is kept per kubeconfig context so every caller in a
+process reuses the same HTTP connections. ``Informer`` keeps a local copy of
+a resource collection current with a single list followed by a watch, so
+callers read from memory and wait on change notifications instead of polling
+the API server or spawning ``kubectl``.
+"""
+
+import json
+import logging
+import threading
+import time
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POOL_SIZE = 16
+WATCH_TIMEOUT_SECONDS = 300
+
+EventHandler = Callable[[str, Dict[str, Any]], None]
+
+
+@lru_cache(maxsize=None)
+def get_api_client(context: Optional[str] = None, pool_size: int = DEFAULT_POOL_SIZE) -> Any:
+    """Shared ``kubernetes.client.ApiClient`` for a kubeconfig context.
+
+    Args:
+        context: Kubeconfig context; the current context when omitted
+        pool_size: Maximum number of pooled connections to the API server
+
+    Returns:
+        ApiClient: Client shared by every caller using the same context
+    """
+    from kubernetes import client, config
+
+    configuration = client.Configuration()
+    config.load_kube_config(context=context, client_configuration=configuration)
+    configuration.connection_pool_maxsize = pool_size
+    return client.ApiClient(configuration)
+
+
+def object_key(obj: Dict[str, Any]) -> str:
+    """``namespace/name`` for namespaced objects, ``name`` otherwise."""
+    metadata = obj.get("metadata", {})
+    namespace = metadata.get("namespace")
+    return f"{namespace}/{metadata['name']}" if namespace else metadata["name"]
+
+
+class Informer:
+    """List+watch cache of one resource collection.
+
+    A background thread lists the collection, then watches for changes from
+    the listed resource version, relisting whenever the watch expires.
+    Objects are kept as plain dicts exactly as the API server returns them.
+    """
+
+    def __init__(self, list_func: Callable[..., Any], **list_kwargs: Any):
+        """Create an informer; call ``start`` to begin syncing.
+
+        Args:
+            list_func: Generated client list method, e.g.
+                ``CoreV1Api.list_namespaced_pod``
+            **list_kwargs: Arguments for ``list_func`` such as ``namespace``
+                or ``label_selector``
+        """
+        self._list_func = list_func
+        self._list_kwargs = list_kwargs
+        self._items: Dict[str, Dict[str, Any]] = {}
+        self._handlers: List[EventHandler] = []
+        self._condition = threading.Condition()
+        self._changes = 0  # Bumped on every change, so waiters notice ones they missed
+        self._synced = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._watch: Optional[Any] = None
+
+    def __enter__(self) -> "Informer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def start(self) -> "Informer":
+        """Start syncing in a background thread."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="informer", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop watching; the cached items remain readable."""
+        self._stopped.set()
+        if self._watch is not None:
+            self._watch.stop()
+        with self._condition:
+            self._condition.notify_all()
+
+    def add_handler(self, handler: EventHandler) -> None:
+        """Call ``handler(event_type, obj)`` for every ADDED/MODIFIED/DELETED event."""
+        self._handlers.append(handler)
+
+    def items(self) -> List[Dict[str, Any]]:
+        """Snapshot of the cached objects."""
+        with self._condition:
+            return list(self._items.values())
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Cached object by ``namespace/name`` (or ``name``)."""
+        with self._condition:
+            return self._items.get(key)
+
+    def wait_for_sync(self, timeout: Optional[float] = None) -> bool:
+        """Block until the initial list has completed."""
+        return self._synced.wait(timeout)
+
+    def wait_for(
+        self,
+        predicate: Callable[[List[Dict[str, Any]]], bool],
+        timeout: Optional[float] = None
+    ) -> bool:
+        """Block until ``predicate(items)`` holds, re-checking on every change.
+
+        Args:
+            predicate: Called with a snapshot of the cached objects
+            timeout: Seconds to wait; forever when omitted
+
+        Returns:
+            bool: True if the predicate held, False on timeout or stop
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        if not self.wait_for_sync(timeout):
+            return False
+        with self._condition:
+            items, seen = list(self._items.values()), self._changes
+        # The predicate runs outside the lock, so a slow one (e.g. one that
+        # reports progress) never holds up event delivery
+        while not predicate(items):
+            with self._condition:
+                while self._changes == seen:
+                    if self._stopped.is_set():
+                        return False
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        return False
+                    self._condition.wait(remaining)
+                items, seen = list(self._items.values()), self._changes
+        return True
+
+    def _run(self) -> None:
+        from kubernetes.client.exceptions import ApiException
+
+        backoff = 1.0
+        while not self._stopped.is_set():
+            try:
+                resource_version = self._relist()
+                self._watch_from(resource_version)
+                backoff = 1.0
+            except ApiException as e:
+                if e.status == 410:
+                    # Resource version expired; relist
+                    continue
+                logger.warning("Informer list/watch failed: %s", e)
+                self._stopped.wait(backoff)
+                backoff = min(backoff * 2, 30.0)
+            except Exception as e:
+                logger.warning("Informer list/watch failed: %s", e)
+                self._stopped.wait(backoff)
+                backoff = min(backoff * 2, 30.0)
+
+    def _relist(self) -> str:
+        """Replace the cache with a fresh list; returns its resource version"""
+        response = self._list_func(_preload_content=False, **self._list_kwargs)
+        data = json.loads(response.data)
+        items = {object_key(obj): obj for obj in data.get("items", [])}
+        with self._condition:
+            self._items = items
+            self._changes += 1
+            self._condition.notify_all()
+        self._synced.set()
+        return data.get("metadata", {}).get("resourceVersion", "")
+
+    def _watch_from(self, resource_version: str) -> None:
+        from kubernetes import watch
+
+        self._watch = watch.Watch()
+        stream = self._watch.stream(
+            self._list_func,
+            resource_version=resource_version,
+            timeout_seconds=WATCH_TIMEOUT_SECONDS,
+            allow_watch_bookmarks=True,
+            **self._list_kwargs
+        )
+        for event in stream:
+            if self._stopped.is_set():
+                break
+            event_type, obj = event["type"], event["raw_object"]
+            if event_type == "BOOKMARK":
+                continue
+            key = object_key(obj)
+            with self._condition:
+                if event_type == "DELETED":
+                    self._items.pop(key, None)
+                else:
+                    self._items[key] = obj
+                self._changes += 1
+                self._condition.notify_all()
+            for handler in self._handlers:
+                handler(event_type, obj)
+
+
+def pod_informer(
+    api_client: Any,
+    namespace: Optional[str] = None,
+    label_selector: Optional[str] = None
+) -> Informer:
+    """Informer over pods in one namespace, or all namespaces."""
+    from kubernetes import client
+
+    core = client.CoreV1Api(api_client)
+    kwargs: Dict[str, Any] = {}
+    if label_selector:
+        kwargs["label_selector"] = label_selector
+    if namespace:
+        return Informer(core.list_namespaced_pod, namespace=namespace, **kwargs)
+    return Informer(core.list_pod_for_all_namespaces, **kwargs)
+
+
+def custom_object_informer(
+    api_client: Any,
+    group: str,
+    version: str,
+    plural: str,
+    namespace: str
+) -> Informer:
+    """Informer over custom resources in a namespace."""
+    from kubernetes import client
+
+    custom = client.CustomObjectsApi(api_client)
+    return Informer(
+        custom.list_namespaced_custom_object,
+        group=group, version=version, namespace=namespace, plural=plural
+    )
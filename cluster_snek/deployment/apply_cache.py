@@ -0,0 +1,113 @@
+"""Record of manifests last applied to a cluster.
+
+Server-side apply of an unchanged object is a no-op for the cluster but still
+costs an API round trip. This cache stores a hash of every manifest applied
+successfully so the apply engine can skip objects whose manifest has not
+changed since. Skipping trusts that nothing else modified the object, so a
+full reconcile, which applies everything regardless, is forced once the last
+one is older than the reconcile interval.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+CACHE_VERSION = 1
+DEFAULT_RECONCILE_INTERVAL = 24 * 60 * 60
+
+
+def default_cache_path(scope: str = "default") -> Path:
+    """Location of the applied-manifest cache for a cluster or context."""
+    cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    safe_scope = "".join(c if c.isalnum() or c in "-_." else "_" for c in scope)
+    return Path(cache_home) / "cluster-snek" / "applied" / f"{safe_scope}.json"
+
+
+def manifest_hash(body: Dict) -> str:
+    """Digest of a manifest that ignores key order and formatting."""
+    canonical = json.dumps(body, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+class AppliedResourceCache:
+    """Manifest hashes of the resources last applied, keyed by resource."""
+
+    def __init__(
+        self,
+        cache_path: Optional[Path] = None,
+        reconcile_interval: float = DEFAULT_RECONCILE_INTERVAL
+    ):
+        """Load the cache.
+
+        Args:
+            cache_path: JSON file to persist hashes in
+            reconcile_interval: Seconds after which a full reconcile is due
+        """
+        self.cache_path = Path(cache_path) if cache_path else default_cache_path()
+        self.reconcile_interval = reconcile_interval
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._hashes: Dict[str, str] = {}
+        self._last_full_reconcile = 0.0
+        self._load()
+
+    def is_unchanged(self, key: str, body: Dict) -> bool:
+        """Check whether this exact manifest was the last one applied."""
+        with self._lock:
+            return self._hashes.get(key) == manifest_hash(body)
+
+    def record(self, key: str, body: Dict) -> None:
+        """Remember a successfully applied manifest."""
+        digest = manifest_hash(body)
+        with self._lock:
+            if self._hashes.get(key) != digest:
+                self._hashes[key] = digest
+                self._dirty = True
+
+    def forget(self, key: str) -> None:
+        """Drop a resource so its next apply always reaches the API server."""
+        with self._lock:
+            if self._hashes.pop(key, None) is not None:
+                self._dirty = True
+
+    def needs_full_reconcile(self) -> bool:
+        """True once the last full reconcile is older than the interval."""
+        return time.time() - self._last_full_reconcile >= self.reconcile_interval
+
+    def mark_full_reconcile(self) -> None:
+        """Record that every resource was just applied."""
+        with self._lock:
+            self._last_full_reconcile = time.time()
+            self._dirty = True
+
+    def save(self) -> None:
+        """Persist the cache if anything changed."""
+        with self._lock:
+            if not self._dirty:
+                return
+            payload = {
+                "version": CACHE_VERSION,
+                "last_full_reconcile": self._last_full_reconcile,
+                "resources": self._hashes
+            }
+            self._dirty = False
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.cache_path.with_name(f".{self.cache_path.name}.{os.getpid()}.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(payload, f)
+        os.replace(tmp, self.cache_path)
+
+    def _load(self) -> None:
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return
+        if data.get("version") != CACHE_VERSION:
+            return
+        self._hashes = data.get("resources", {})
+        self._last_full_reconcile = float(data.get("last_full_reconcile", 0.0))
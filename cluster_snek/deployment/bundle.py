@@ -0,0 +1,267 @@
+"""Bundle builder and reader for airgapped-archive deployments.
+
+A bundle is a zip archive holding the packaged Helm charts a deployment needs.
+Zip compresses every member independently and keeps a central directory, so
+a consumer can seek straight to one chart instead of decompressing the whole
+archive. Chart blobs are stored once per SHA-256 digest under
+``blobs/sha256/`` and ``manifest.json`` maps chart names and versions to
+those digests.
+"""
+
+import hashlib
+import json
+import os
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import gnupg
+
+from cluster_snek.generators.infrastructure import InfrastructureGenerator
+
+BUNDLE_FORMAT = "cluster-snek-bundle/v1"
+MANIFEST_NAME = "manifest.json"
+BLOB_PREFIX = "blobs/sha256/"
+
+
+@dataclass
+class BundleEntry:
+    """A chart stored in a bundle."""
+    name: str
+    version: str
+    digest: str
+    size: int
+
+    @property
+    def filename(self) -> str:
+        """Packaged chart filename as produced by ``helm package``."""
+        return f"{self.name}-{self.version}.tgz"
+
+
+@dataclass
+class BundleManifest:
+    """Contents listing written into every bundle."""
+    charts: List[BundleEntry] = field(default_factory=list)
+    created: str = ""
+    format: str = BUNDLE_FORMAT
+
+    def to_json(self) -> str:
+        """Serialize the manifest."""
+        return json.dumps(asdict(self), indent=2, sort_keys=True)
+
+    @classmethod
+    def from_json(cls, data: str) -> "BundleManifest":
+        """Parse a serialized manifest.
+
+        Raises:
+            ValueError: If the data is not a bundle manifest
+        """
+        raw = json.loads(data)
+        if raw.get("format") != BUNDLE_FORMAT:
+            raise ValueError(f"Unsupported bundle format: {raw.get('format')}")
+        return cls(
+            charts=[BundleEntry(**entry) for entry in raw.get("charts", [])],
+            created=raw.get("created", ""),
+            format=raw["format"]
+        )
+
+
+def default_chart_versions() -> Dict[str, str]:
+    """Chart versions the infrastructure generator deploys."""
+    return {
+        name: config["version"]
+        for name, config in InfrastructureGenerator._CHART_CONFIG.items()
+    }
+
+
+class BundleBuilder:
+    """Packs charts from a local cache into a signed, deduplicated bundle."""
+
+    def __init__(self, cache_dir: Path, charts: Optional[Dict[str, str]] = None):
+        """Initialise the builder.
+
+        Args:
+            cache_dir: Directory holding ``<name>-<version>.tgz`` chart packages
+            charts: Chart name to version; defaults to the generator's charts
+        """
+        self.cache_dir = Path(cache_dir)
+        self.charts = charts if charts is not None else default_chart_versions()
+
+    def collect(self) -> Dict[str, Path]:
+        """Locate every requested chart in the cache.
+
+        Returns:
+            Dict[str, Path]: Chart filename to cached package path
+
+        Raises:
+            ValueError: If any requested chart is missing from the cache
+        """
+        found: Dict[str, Path] = {}
+        missing: List[str] = []
+        for name, version in sorted(self.charts.items()):
+            filename = f"{name}-{version}.tgz"
+            path = self.cache_dir / filename
+            if path.is_file():
+                found[filename] = path
+            else:
+                missing.append(filename)
+        if missing:
+            raise ValueError(f"Charts missing from cache {self.cache_dir}: {', '.join(missing)}")
+        return found
+
+    def build(
+        self,
+        output_path: Path,
+        sign_key: Optional[str] = None,
+        gnupghome: Optional[Path] = None
+    ) -> BundleManifest:
+        """Write the bundle, its checksum file and optional signature.
+
+        Produces ``<bundle>``, ``<bundle>.sha256`` (sha256sum format) and, when
+        ``sign_key`` is given, a binary detached ``<bundle>.sig``.
+
+        Args:
+            output_path: Bundle file to create
+            sign_key: GPG key ID to sign the bundle with
+            gnupghome: GPG home directory holding the signing key
+
+        Returns:
+            BundleManifest: Manifest written into the bundle
+
+        Raises:
+            ValueError: If charts are missing or signing fails
+        """
+        output_path = Path(output_path)
+        packages = self.collect()
+
+        with ThreadPoolExecutor() as executor:
+            digests = dict(zip(packages, executor.map(_sha256_file, packages.values())))
+
+        manifest = BundleManifest(
+            created=datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+        )
+        name_versions = {f"{n}-{v}.tgz": (n, v) for n, v in self.charts.items()}
+        for filename, path in packages.items():
+            name, version = name_versions[filename]
+            manifest.charts.append(
+                BundleEntry(name=name, version=version, digest=digests[filename], size=path.stat().st_size)
+            )
+
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = output_path.with_name(f".{output_path.name}.tmp")
+        written = set()
+        with zipfile.ZipFile(tmp_path, "w") as bundle:
+            bundle.writestr(MANIFEST_NAME, manifest.to_json(), compress_type=zipfile.ZIP_DEFLATED)
+            for filename, path in packages.items():
+                digest = digests[filename]
+                if digest in written:
+                    continue
+                # Chart packages are already gzip-compressed; store them as-is
+                bundle.write(path, f"{BLOB_PREFIX}{digest}", compress_type=zipfile.ZIP_STORED)
+                written.add(digest)
+        os.replace(tmp_path, output_path)
+
+        checksum_path = output_path.with_name(f"{output_path.name}.sha256")
+        checksum_path.write_text(f"{_sha256_file(output_path)}  {output_path.name}\n")
+
+        if sign_key:
+            self._sign(output_path, sign_key, gnupghome)
+
+        return manifest
+
+    @staticmethod
+    def _sign(bundle_path: Path, sign_key: str, gnupghome: Optional[Path]) -> Path:
+        """Create a binary detached signature next to the bundle"""
+        gpg = gnupg.GPG(gnupghome=str(gnupghome)) if gnupghome else gnupg.GPG()
+        signature_path = bundle_path.with_name(f"{bundle_path.name}.sig")
+        with open(bundle_path, "rb") as f:
+            result = gpg.sign_file(
+                f, keyid=sign_key, detach=True, binary=True, output=str(signature_path)
+            )
+        if not result or not signature_path.exists():
+            status = getattr(result, "status", None) or "Unknown error (no status provided by GPG)."
+            raise ValueError(f"Bundle signing failed: {status}")
+        return signature_path
+
+
+class BundleReader:
+    """Random-access reader for bundles produced by ``BundleBuilder``."""
+
+    def __init__(self, bundle_path: Path):
+        """Open a bundle and load its manifest.
+
+        Raises:
+            ValueError: If the file is not a bundle
+        """
+        self.bundle_path = Path(bundle_path)
+        self._zip = zipfile.ZipFile(self.bundle_path)
+        try:
+            self.manifest = BundleManifest.from_json(self._zip.read(MANIFEST_NAME).decode())
+        except KeyError:
+            self._zip.close()
+            raise ValueError(f"Not a cluster-snek bundle: {self.bundle_path}")
+
+    def __enter__(self) -> "BundleReader":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the underlying archive."""
+        self._zip.close()
+
+    def find(self, name: str, version: Optional[str] = None) -> BundleEntry:
+        """Look up a chart entry.
+
+        Raises:
+            KeyError: If the chart is not in the bundle
+        """
+        for entry in self.manifest.charts:
+            if entry.name == name and (version is None or entry.version == version):
+                return entry
+        raise KeyError(f"{name}{'-' + version if version else ''} not in bundle")
+
+    def extract_chart(self, name: str, dest_dir: Path, version: Optional[str] = None) -> Path:
+        """Extract a single chart package, verifying its digest.
+
+        Only the chart's own member is read from the archive.
+
+        Raises:
+            KeyError: If the chart is not in the bundle
+            ValueError: If the extracted chart does not match its digest
+        """
+        entry = self.find(name, version)
+        dest_dir = Path(dest_dir)
+        dest_dir.mkdir(parents=True, exist_ok=True)
+        target = dest_dir / entry.filename
+        sha256 = hashlib.sha256()
+        with self._zip.open(f"{BLOB_PREFIX}{entry.digest}") as src, open(target, "wb") as dst:
+            for chunk in iter(lambda: src.read(1024 * 1024), b""):
+                sha256.update(chunk)
+                dst.write(chunk)
+        if sha256.hexdigest() != entry.digest:
+            target.unlink()
+            raise ValueError(f"Checksum mismatch for {entry.filename}")
+        return target
+
+    def extract_all(self, dest_dir: Path) -> List[Path]:
+        """Extract every chart package into a directory."""
+        return [self.extract_chart(e.name, dest_dir, e.version) for e in self.manifest.charts]
+
+
+def is_bundle(archive_path: Path) -> bool:
+    """Check whether an archive is a cluster-snek bundle."""
+    if not zipfile.is_zipfile(archive_path):
+        return False
+    with zipfile.ZipFile(archive_path) as zf:
+        return MANIFEST_NAME in zf.namelist()
+
+
+def _sha256_file(path: Path) -> str:
+    """SHA-256 digest of a file"""
+    with open(path, "rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
@@ -3,18 +3,35 @@
 This module handles different deployment scenarios with appropriate validation and security measures.
 """
 
-from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from enum import Enum, auto
 from pathlib import Path
-from typing import Dict, Optional, List
+from typing import Callable, Dict, Optional, List, Tuple
 import hashlib
 import hmac
 import json
+import logging
+import mmap
 import os
-import gnupg
+import re
+import shutil
+import subprocess
+import tarfile
+import zipfile
 import yaml
 from abc import ABC, abstractmethod
 
+from cluster_snek.deployment.apply import ApplyEngine, Applier, KubernetesApplier, load_manifests
+from cluster_snek.deployment.snapshots import SnapshotStore
+from cluster_snek.deployment.state import StateStore, StateStoreResourceCache
+from cluster_snek.deployment.verification_cache import FileFingerprint, VerificationCache, key_digest
+from cluster_snek.security_framework.crypto.signing import get_signature_service
+from cluster_snek.utils.delta_sync import DeltaSync
+from cluster_snek.utils.locking import FileLock
+
+logger = logging.getLogger(__name__)
+
 
 class DeploymentMode(Enum):
     """Supported deployment modes."""
@@ -34,6 +51,9 @@ class SourceConfig:
     checksums: Optional[Dict[str, str]] = None
     signature_path: Optional[Path] = None
     public_key_path: Optional[Path] = None
+    verification_cache_path: Optional[Path] = None
+    strict_verification: bool = False
+    full_reconcile: bool = False
 
 
 class DeploymentValidator:
@@ -104,16 +124,185 @@ class DeploymentValidator:
         return True
 
 
+SUPPORTED_HASH_ALGORITHMS = ("sha256", "sha512", "blake2b")
+
+# Reads below this size go through a buffered loop; larger files are mmapped
+_MMAP_THRESHOLD = 4 * 1024 * 1024
+_HASH_CHUNK = 8 * 1024 * 1024
+
+_BSD_TAGS = {"SHA256": "sha256", "SHA512": "sha512", "BLAKE2B": "blake2b", "BLAKE2B-512": "blake2b"}
+_BSD_LINE = re.compile(r"^(?P<tag>[A-Za-z0-9-]+) \((?P<path>.+)\) = (?P<digest>[0-9a-fA-F]+)$")
+_GNU_LINE = re.compile(r"^\\?(?P<digest>[0-9a-fA-F]+) [ *](?P<path>.+)$")
+
+
+@dataclass
+class ChecksumEntry:
+    """A single expected digest from a checksum manifest."""
+    path: str
+    digest: str
+    algorithm: str
+
+
+@dataclass
+class ChecksumReport:
+    """Outcome of verifying every entry in a checksum manifest."""
+    verified: List[str] = field(default_factory=list)
+    mismatched: Dict[str, Tuple[str, str]] = field(default_factory=dict)
+    missing: List[str] = field(default_factory=list)
+    failed: Dict[str, str] = field(default_factory=dict)  # Entries that could not be checked, with why
+
+    @property
+    def ok(self) -> bool:
+        """True if every listed file exists and matches."""
+        return not self.mismatched and not self.missing and not self.failed
+
+    def errors(self) -> List[str]:
+        """One message per failed entry."""
+        messages = [f"Missing file: {path}" for path in sorted(self.missing)]
+        messages.extend(
+            f"Checksum mismatch for {path}: expected {expected}, got {actual}"
+            for path, (expected, actual) in sorted(self.mismatched.items())
+        )
+        messages.extend(f"Could not verify {path}: {reason}" for path, reason in sorted(self.failed.items()))
+        return messages
+
+
+def hash_file(path: Path, algorithm: str = "sha256") -> str:
+    """Compute the hex digest of a file.
+
+    Large files are mmapped and hashed in big slices; hashlib releases the GIL
+    while hashing, so several files can be hashed in parallel threads.
+
+    Args:
+        path: File to hash
+        algorithm: One of SUPPORTED_HASH_ALGORITHMS
+
+    Returns:
+        str: Hex digest
+
+    Raises:
+        ValueError: If the algorithm is not supported
+    """
+    if algorithm not in SUPPORTED_HASH_ALGORITHMS:
+        raise ValueError(f"Unsupported hash algorithm: {algorithm}")
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size < _MMAP_THRESHOLD:
+            return hashlib.file_digest(f, algorithm).hexdigest()
+        digest = hashlib.new(algorithm)
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            view = memoryview(mapped)
+            try:
+                for offset in range(0, size, _HASH_CHUNK):
+                    digest.update(view[offset:offset + _HASH_CHUNK])
+            finally:
+                view.release()
+        return digest.hexdigest()
+
+
+def cached_hash_file(
+    path: Path,
+    algorithm: str = "sha256",
+    cache: Optional[VerificationCache] = None
+) -> str:
+    """Hash a file, reusing a cached digest when the file is unchanged.
+
+    Args:
+        path: File to hash
+        algorithm: One of SUPPORTED_HASH_ALGORITHMS
+        cache: Verification cache to consult and update
+
+    Returns:
+        str: Hex digest
+    """
+    if cache is None:
+        return hash_file(path, algorithm)
+    cached = cache.get_digest(path, algorithm)
+    if cached is not None:
+        return cached
+    # Fingerprint before hashing so a concurrent write invalidates the entry
+    fingerprint = FileFingerprint.of(path)
+    digest = hash_file(path, algorithm)
+    cache.put_digest(path, algorithm, digest, fingerprint)
+    return digest
+
+
+def parse_checksum_manifest(manifest_path: Path, algorithm: Optional[str] = None) -> List[ChecksumEntry]:
+    """Parse a sha256sum/SHA512SUMS/b2sum style checksum manifest.
+
+    Both the GNU format (``<digest>  <path>``) and the BSD tagged format
+    (``SHA256 (<path>) = <digest>``) are accepted. Without an explicit
+    algorithm it is taken from the BSD tag, then the manifest file name
+    (``SHA512SUMS``, ``B2SUMS``, ``*.sha256`` ...), then the digest length.
+
+    Args:
+        manifest_path: Path to the manifest
+        algorithm: Force a hash algorithm for every entry
+
+    Returns:
+        List[ChecksumEntry]: Entries in manifest order
+
+    Raises:
+        ValueError: If a line is malformed or the algorithm cannot be determined
+    """
+    if algorithm and algorithm not in SUPPORTED_HASH_ALGORITHMS:
+        raise ValueError(f"Unsupported hash algorithm: {algorithm}")
+    default = algorithm or _algorithm_from_filename(manifest_path.name)
+
+    entries = []
+    with open(manifest_path, "r", encoding="utf-8") as f:
+        for lineno, line in enumerate(f, 1):
+            line = line.rstrip("\n")
+            if not line.strip() or line.lstrip().startswith("#"):
+                continue
+            bsd = _BSD_LINE.match(line)
+            gnu = None if bsd else _GNU_LINE.match(line)
+            if bsd:
+                tag = bsd["tag"].upper()
+                if tag not in _BSD_TAGS:
+                    raise ValueError(f"{manifest_path}:{lineno}: unsupported algorithm {bsd['tag']}")
+                entry_algorithm = algorithm or _BSD_TAGS[tag]
+                path, digest = bsd["path"], bsd["digest"]
+            elif gnu:
+                path, digest = gnu["path"], gnu["digest"]
+                entry_algorithm = default or {64: "sha256", 128: "sha512"}.get(len(digest))
+                if entry_algorithm is None:
+                    raise ValueError(f"{manifest_path}:{lineno}: cannot infer algorithm from digest length")
+            else:
+                raise ValueError(f"{manifest_path}:{lineno}: malformed checksum line")
+            entries.append(ChecksumEntry(path=path, digest=digest.lower(), algorithm=entry_algorithm))
+    return entries
+
+
+def _algorithm_from_filename(name: str) -> Optional[str]:
+    """Guess the hash algorithm from a manifest file name"""
+    lowered = name.lower()
+    if lowered.startswith("b2sum") or lowered.endswith((".b2", ".blake2b")):
+        return "blake2b"
+    if lowered.startswith("sha512") or lowered.endswith(".sha512"):
+        return "sha512"
+    if lowered.startswith("sha256") or lowered.endswith(".sha256"):
+        return "sha256"
+    return None
+
+
 class ArchiveVerifier:
     """Handles verification of deployment archives."""
     
     @staticmethod
-    def verify_checksums(archive_path: Path, checksums: Dict[str, str]) -> bool:
+    def verify_checksums(
+        archive_path: Path,
+        checksums: Dict[str, str],
+        algorithm: str = "sha256",
+        cache: Optional[VerificationCache] = None
+    ) -> bool:
         """Verify archive checksums.
         
         Args:
             archive_path: Path to archive file
             checksums: Dictionary of filename to expected checksum
+            algorithm: Hash algorithm the checksums were made with
+            cache: Skip hashing when the archive is unchanged since last time
             
         Returns:
             bool: True if checksums match
@@ -129,29 +318,103 @@ class ArchiveVerifier:
             raise ValueError(f"No checksum found for {filename}")
             
         expected = checksums[filename]
-        
-        sha256 = hashlib.sha256()
-        with open(archive_path, 'rb') as f:
-            for chunk in iter(lambda: f.read(4096), b''):
-                sha256.update(chunk)
                 
-        if sha256.hexdigest() != expected:
+        if cached_hash_file(archive_path, algorithm, cache) != expected.lower():
             raise ValueError(f"Checksum mismatch for {filename}")
             
         return True
 
+    @staticmethod
+    def verify_manifest(
+        manifest_path: Path,
+        base_dir: Optional[Path] = None,
+        algorithm: Optional[str] = None,
+        max_workers: Optional[int] = None,
+        raise_on_error: bool = True,
+        cache: Optional[VerificationCache] = None
+    ) -> ChecksumReport:
+        """Verify every file listed in a checksum manifest in parallel.
+        
+        All entries are checked; failures, including files that cannot be
+        read and entries pointing outside ``base_dir``, are collected rather
+        than stopping at the first one.
+        
+        Args:
+            manifest_path: sha256sum/SHA512SUMS/b2sum style manifest
+            base_dir: Directory entries are relative to (defaults to the
+                manifest's directory)
+            algorithm: Force a hash algorithm instead of detecting it
+            max_workers: Hashing thread pool size
+            raise_on_error: Raise instead of returning a failed report
+            cache: Skip hashing files unchanged since they were last hashed
+            
+        Returns:
+            ChecksumReport: Verified, mismatched, missing and unverifiable files
+            
+        Raises:
+            ValueError: If the manifest is invalid, or any file is missing or
+                mismatched and raise_on_error is set
+        """
+        if not manifest_path.exists():
+            raise ValueError(f"Checksum manifest not found: {manifest_path}")
+        base_dir = base_dir or manifest_path.parent
+        entries = parse_checksum_manifest(manifest_path, algorithm)
+        report = ChecksumReport()
+
+        root = base_dir.resolve()
+        present = []
+        for entry in entries:
+            path = (base_dir / entry.path).resolve()
+            if os.path.isabs(entry.path) or not path.is_relative_to(root):
+                report.failed[entry.path] = f"path is outside {base_dir}"
+            elif path.is_file():
+                present.append((entry, path, path.stat().st_size))
+            else:
+                report.missing.append(entry.path)
+        # Largest files first so one huge file does not start last
+        present.sort(key=lambda item: item[2], reverse=True)
+
+        def check(item) -> Tuple[Optional[str], Optional[OSError]]:
+            try:
+                return cached_hash_file(item[1], item[0].algorithm, cache), None
+            except OSError as e:
+                return None, e
+
+        workers = max_workers or min(32, (os.cpu_count() or 1) + 4)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for (entry, _, _), (actual, error) in zip(present, executor.map(check, present)):
+                if isinstance(error, FileNotFoundError):
+                    report.missing.append(entry.path)
+                elif error is not None:
+                    report.failed[entry.path] = error.strerror or str(error)
+                elif actual == entry.digest:
+                    report.verified.append(entry.path)
+                else:
+                    report.mismatched[entry.path] = (entry.digest, actual)
+
+        if raise_on_error and not report.ok:
+            errors = report.errors()
+            raise ValueError(
+                f"Checksum verification failed for {len(errors)} of {len(entries)} file(s):\n"
+                + "\n".join(errors)
+            )
+        return report
+
     @staticmethod
     def verify_signature(
         archive_path: Path,
         signature_path: Path,
-        public_key_path: Path
+        public_key_path: Path,
+        cache: Optional[VerificationCache] = None
     ) -> bool:
         """Verify archive signature.
         
         Args:
             archive_path: Path to archive file
             signature_path: Path to signature file  
-            public_key_path: Path to public key file
+            public_key_path: Path to public key file (GPG or minisign)
+            cache: Skip verification when this archive, signature and key
+                verified before
             
         Returns:
             bool: True if signature is valid
@@ -161,56 +424,298 @@ class ArchiveVerifier:
         """
         if not all(p.exists() for p in (archive_path, signature_path, public_key_path)):
             raise ValueError("Archive, signature or public key file not found")
-            
-        gpg = gnupg.GPG()
-
-        # The expected signature format is a detached signature file (.sig or .asc) that matches the archive.
-        # Only detached signatures are supported; clear-signed or embedded signatures will not verify correctly.
-        with open(public_key_path, "rb") as f:
-            key_data = f.read()
-            gpg.import_keys(key_data)
-
-        # Check if the signature file is a detached signature by inspecting its contents
-        with open(signature_path, "rb") as sig_file:
-            sig_data = sig_file.read()
-            if b"BEGIN PGP SIGNED MESSAGE" in sig_data:
-                raise ValueError(
-                    "The provided signature appears to be a clear-signed message. "
-                    "Please provide a detached signature file (created with 'gpg --detach-sign')."
-                )
-            if b"BEGIN PGP MESSAGE" in sig_data:
-                raise ValueError(
-                    "The provided signature appears to be an embedded/opaque signature. "
-                    "Please provide a detached signature file (created with 'gpg --detach-sign')."
-                )
 
-        with open(signature_path, "rb") as sig:
-            verify = gpg.verify_file(sig, archive_path)
-        if not verify:
-            status_msg = verify.status or "Unknown error (no status provided by GPG)."
-            raise ValueError(f"Signature verification failed: {status_msg}")
+        if cache is not None:
+            if cache.is_signature_verified(archive_path, signature_path, public_key_path):
+                return True
+            # Taken before verifying, so files replaced meanwhile are not cached as verified
+            fingerprints = (
+                FileFingerprint.of(archive_path),
+                FileFingerprint.of(signature_path),
+                key_digest(public_key_path)
+            )
+            
+        # One long-lived service: the keyring persists and keys are imported once
+        get_signature_service().verify(archive_path, signature_path, public_key_path)
 
+        if cache is not None:
+            cache.record_signature(archive_path, signature_path, public_key_path, *fingerprints)
         return True
 
 
+LOCK_FILE_NAME = ".lock"
+
+
+class DeploymentStage(Enum):
+    """Pipeline stages, in execution order."""
+    FETCH = "fetch"
+    VERIFY = "verify"
+    RENDER = "render"
+    APPLY = "apply"
+
+
+class DeploymentCheckpoint:
+    """Records completed pipeline stages so an interrupted deploy can resume.
+    
+    Progress is kept in the state store under a scope naming the work
+    directory and is tied to a fingerprint of the source configuration; if
+    the configuration changes, recorded progress is discarded.
+    """
+
+    def __init__(self, store: StateStore, scope: str, fingerprint: str):
+        self.store = store
+        self.scope = scope
+        self.fingerprint = fingerprint
+        self.completed: List[str] = store.checkpoint(scope, fingerprint)
+
+    def is_complete(self, stage: DeploymentStage) -> bool:
+        """Check whether a stage finished in this or a previous run."""
+        return stage.value in self.completed
+
+    def mark_complete(self, stage: DeploymentStage) -> None:
+        """Record a finished stage."""
+        if stage.value not in self.completed:
+            self.completed.append(stage.value)
+        self._save()
+
+    def invalidate(self, stage: DeploymentStage) -> None:
+        """Forget a stage and every stage after it, so they run again."""
+        stages = [s.value for s in DeploymentStage]
+        later = set(stages[stages.index(stage.value):])
+        completed = [value for value in self.completed if value not in later]
+        if completed != self.completed:
+            self.completed = completed
+            self._save()
+
+    def clear(self) -> None:
+        """Forget all progress once the pipeline has finished."""
+        self.completed = []
+        self.store.clear_checkpoint(self.scope)
+
+    def _save(self) -> None:
+        self.store.save_checkpoint(self.scope, self.fingerprint, self.completed)
+
+
+def _run(command: List[str], cwd: Optional[Path] = None) -> str:
+    """Run an external tool, raising ValueError with its stderr on failure."""
+    try:
+        result = subprocess.run(command, cwd=cwd, capture_output=True, text=True)
+    except FileNotFoundError:
+        raise ValueError(f"Required tool not found: {command[0]}")
+    if result.returncode != 0:
+        raise ValueError(f"{' '.join(command[:2])} failed: {result.stderr.strip()}")
+    return result.stdout
+
+
 class DeploymentBase(ABC):
-    """Base class for deployment implementations."""
+    """Base class for deployment implementations.
+    
+    A deployment runs the stages fetch → verify → render → apply inside a
+    work directory. Each completed stage is checkpointed in the state
+    store, keyed by the work directory, so re-running a failed deploy
+    resumes at the stage that failed instead of starting over. A failed
+    verification also discards the fetch, so the sources are fetched again.
+    """
     
-    def __init__(self, config: SourceConfig):
+    def __init__(
+        self,
+        config: SourceConfig,
+        work_dir: Optional[Path] = None,
+        progress: Optional[Callable[[DeploymentStage, str], None]] = None,
+        applier: Optional[Applier] = None,
+        lock_timeout: Optional[float] = None,
+        context: Optional[str] = None,
+        state: Optional[StateStore] = None
+    ):
         self.config = config
         DeploymentValidator.validate_source_config(config, self.mode)
+        self.work_dir = Path(work_dir) if work_dir else Path.cwd() / ".cluster-snek" / self.mode.name.lower()
+        self.sources_dir = self.work_dir / "sources"
+        self.rendered_dir = self.work_dir / "rendered"
+        self.snapshot_store = SnapshotStore()
+        self.progress = progress
+        self.applier = applier
+        self.lock_timeout = lock_timeout
+        self.context = context
+        self.state = state
         
     @property
     @abstractmethod
     def mode(self) -> DeploymentMode:
         """Get deployment mode."""
         pass
+
+    def deploy(self) -> bool:
+        """Execute deployment, resuming after the last completed stage.
         
+        Returns:
+            bool: True once every stage has completed
+            
+        Raises:
+            ValueError: If a stage fails; completed stages stay checkpointed
+            LockUnavailable: If another run holds the work directory
+        """
+        self.work_dir.mkdir(parents=True, exist_ok=True)
+        with FileLock(self.work_dir / LOCK_FILE_NAME, timeout=self.lock_timeout):
+            checkpoint = DeploymentCheckpoint(
+                self._state_store(), self.checkpoint_scope, self._fingerprint()
+            )
+            
+            for stage in DeploymentStage:
+                if checkpoint.is_complete(stage):
+                    self._report(stage, "skipped (completed in a previous run)")
+                    continue
+                self._report(stage, "started")
+                try:
+                    getattr(self, stage.value)()
+                except Exception:
+                    if stage == DeploymentStage.VERIFY:
+                        # Never resume from sources that failed verification
+                        checkpoint.invalidate(DeploymentStage.FETCH)
+                    raise
+                checkpoint.mark_complete(stage)
+                self._report(stage, "completed")
+            
+            checkpoint.clear()
+        return True
+
     @abstractmethod
-    def deploy(self) -> bool:
-        """Execute deployment."""
+    def fetch(self) -> None:
+        """Bring deployment sources into ``sources_dir``."""
         pass
 
+    def verify(self) -> None:
+        """Verify fetched sources against the configured checksums.
+        
+        Checksum keys are paths relative to ``sources_dir``.
+        """
+        if not self.config.checksums:
+            return
+        cache = self._verification_cache()
+        try:
+            for relative, expected in self.config.checksums.items():
+                path = self.sources_dir / relative
+                if not path.is_file():
+                    raise ValueError(f"Checksummed file missing from sources: {relative}")
+                if cached_hash_file(path, "sha256", cache) != expected.lower():
+                    raise ValueError(f"Checksum mismatch for {relative}")
+        finally:
+            cache.save()
+
+    def render(self) -> None:
+        """Render Helm charts and collect plain manifests into ``rendered_dir``."""
+        if self.rendered_dir.exists():
+            shutil.rmtree(self.rendered_dir)
+        self.rendered_dir.mkdir(parents=True)
+        
+        chart_dirs = sorted(p.parent for p in self.sources_dir.rglob("Chart.yaml"))
+        top_level_charts = [
+            c for c in chart_dirs if not any(parent in chart_dirs for parent in c.parents)
+        ]
+        for chart_dir in top_level_charts:
+            self._render_chart(chart_dir)
+        
+        for manifest in sorted(self.sources_dir.rglob("*.y*ml")):
+            if manifest.suffix not in (".yaml", ".yml"):
+                continue
+            if any(chart in manifest.parents for chart in top_level_charts):
+                continue
+            target = self.rendered_dir / manifest.relative_to(self.sources_dir)
+            target.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copy2(manifest, target)
+
+    def apply(self) -> None:
+        """Apply rendered manifests in dependency order with server-side apply.
+        
+        Resources unchanged since the last apply to the same kubeconfig
+        context, from this pipeline or ``deploy``, are skipped unless a full
+        reconcile is requested or due. The applied manifests are then
+        recorded as a snapshot of the context, which ``rollback --to`` can
+        return to.
+        """
+        resources = load_manifests([self.rendered_dir])
+        if not resources:
+            return
+        scope = self._cluster_scope()
+        engine = ApplyEngine(
+            self.applier or KubernetesApplier(context=self.context),
+            cache=StateStoreResourceCache(self._state_store(), scope),
+            full_reconcile=self.config.full_reconcile
+        )
+        report = engine.apply(resources)
+        self._report(DeploymentStage.APPLY, report.summary().splitlines()[0])
+        if not report.ok:
+            raise ValueError(report.summary())
+        snapshot = self.snapshot_store.record(
+            resources, scope=scope,
+            metadata={"mode": self.mode.name.lower(), "version": self.config.version}
+        )
+        self._report(DeploymentStage.APPLY, f"recorded snapshot {snapshot.id}")
+
+    def _render_chart(self, chart_dir: Path) -> None:
+        """Render one chart with ``helm template``"""
+        with open(chart_dir / "Chart.yaml") as f:
+            chart = yaml.safe_load(f) or {}
+        name = chart.get("name", chart_dir.name)
+        if chart.get("dependencies") and not (chart_dir / "charts").exists():
+            _run(["helm", "dependency", "build", str(chart_dir)])
+        output = _run(["helm", "template", name, str(chart_dir), "--namespace", name])
+        target = self.rendered_dir / f"{chart_dir.relative_to(self.sources_dir)}.yaml"
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_text(output)
+
+    def _verification_cache(self) -> VerificationCache:
+        return VerificationCache(
+            self.config.verification_cache_path,
+            strict=self.config.strict_verification
+        )
+
+    def _state_store(self) -> StateStore:
+        if self.state is None:
+            self.state = StateStore()
+        return self.state
+
+    def _cluster_scope(self) -> str:
+        """Kubeconfig context the resources are applied to
+
+        Raises:
+            ConfigException: If there is a kubeconfig but it is unusable,
+                e.g. has no current context
+        """
+        if self.context:
+            return self.context
+        kubeconfig = os.environ.get("KUBECONFIG") or str(Path.home() / ".kube" / "config")
+        if not any(Path(path).expanduser().is_file() for path in kubeconfig.split(os.pathsep) if path):
+            # No kubeconfig at all, e.g. a custom applier talking to something else
+            return "default"
+        from kubernetes import config as kube_config
+        return kube_config.list_kube_config_contexts(config_file=kubeconfig)[1]["name"]
+
+    @property
+    def checkpoint_scope(self) -> str:
+        """Key of this work directory's checkpoint in the state store"""
+        return f"deploy:{self.work_dir.resolve()}"
+
+    def _fingerprint(self) -> str:
+        """Identity of the configuration a checkpoint belongs to"""
+        fields = {
+            k: str(v) for k, v in sorted(vars(self.config).items())
+            if k != "full_reconcile"
+        }
+        fields["mode"] = self.mode.name
+        return hashlib.sha256(json.dumps(fields, sort_keys=True).encode()).hexdigest()
+
+    def _report(self, stage: DeploymentStage, message: str) -> None:
+        logger.info("%s: %s", stage.value, message)
+        if self.progress:
+            self.progress(stage, message)
+
+    def _reset_sources(self) -> None:
+        """Remove partial sources left by an interrupted fetch"""
+        if self.sources_dir.exists():
+            shutil.rmtree(self.sources_dir)
+        self.sources_dir.parent.mkdir(parents=True, exist_ok=True)
+
 
 class InternetDeployment(DeploymentBase):
     """Internet-connected deployment implementation."""
@@ -218,10 +723,14 @@ class InternetDeployment(DeploymentBase):
     @property
     def mode(self) -> DeploymentMode:
         return DeploymentMode.INTERNET
-        
-    def deploy(self) -> bool:
-        # Implementation for internet deployment
-        return True
+
+    def fetch(self) -> None:
+        """Shallow-clone the source repository."""
+        self._reset_sources()
+        command = ["git", "clone", "--depth", "1"]
+        if self.config.version:
+            command += ["--branch", self.config.version]
+        _run(command + [self.config.url, str(self.sources_dir)])
 
 
 class AirgappedVCDeployment(DeploymentBase):
@@ -230,10 +739,14 @@ class AirgappedVCDeployment(DeploymentBase):
     @property
     def mode(self) -> DeploymentMode:
         return DeploymentMode.AIRGAPPED_VC
-        
-    def deploy(self) -> bool:
-        # Implementation for airgapped VC deployment  
-        return True
+
+    def fetch(self) -> None:
+        """Clone from the local repository mirror."""
+        self._reset_sources()
+        command = ["git", "clone", "--no-hardlinks"]
+        if self.config.version:
+            command += ["--branch", self.config.version]
+        _run(command + [str(self.config.local_path), str(self.sources_dir)])
 
 
 class AirgappedLocalDeployment(DeploymentBase):
@@ -242,49 +755,97 @@ class AirgappedLocalDeployment(DeploymentBase):
     @property
     def mode(self) -> DeploymentMode:
         return DeploymentMode.AIRGAPPED_LOCAL
-        
-    def deploy(self) -> bool:
-        # Implementation for airgapped local deployment
-        return True
+
+    def fetch(self) -> None:
+        """Delta-sync the local source directory."""
+        DeltaSync(self.config.local_path, self.sources_dir).sync()
 
 
 class AirgappedArchiveDeployment(DeploymentBase):
-    """Airgapped archive deployment implementation."""
+    """Airgapped archive deployment implementation.
+    
+    The archive is verified before anything is extracted from it, so
+    extraction happens in the render stage.
+    """
     
     @property
     def mode(self) -> DeploymentMode:
         return DeploymentMode.AIRGAPPED_ARCHIVE
-        
-    def deploy(self) -> bool:
+
+    def fetch(self) -> None:
+        """The archive is already local; only check that it is present."""
+        if not self.config.archive_path.exists():
+            raise ValueError(f"Archive not found: {self.config.archive_path}")
+
+    def verify(self) -> None:
+        """Verify archive checksum and, if configured, its signature."""
         verifier = ArchiveVerifier()
+        cache = self._verification_cache()
         
-        # Verify archive integrity
-        verifier.verify_checksums(
-            self.config.archive_path,
-            self.config.checksums
-        )
-        
-        # Verify signature if provided
-        if self.config.signature_path and self.config.public_key_path:
-            verifier.verify_signature(
+        try:
+            # Verify archive integrity
+            verifier.verify_checksums(
                 self.config.archive_path,
-                self.config.signature_path,
-                self.config.public_key_path
+                self.config.checksums,
+                cache=cache
             )
             
-        # Implementation for airgapped archive deployment
-        return True
+            # Verify signature if provided
+            if self.config.signature_path and self.config.public_key_path:
+                verifier.verify_signature(
+                    self.config.archive_path,
+                    self.config.signature_path,
+                    self.config.public_key_path,
+                    cache=cache
+                )
+        finally:
+            cache.save()
+
+    def render(self) -> None:
+        """Extract the verified archive, then render its contents."""
+        self._reset_sources()
+        self.sources_dir.mkdir()
+        from cluster_snek.deployment.bundle import BundleReader, is_bundle
+        
+        archive = self.config.archive_path
+        if is_bundle(archive):
+            with BundleReader(archive) as bundle:
+                bundle.extract_all(self.sources_dir / "charts")
+        elif zipfile.is_zipfile(archive):
+            with zipfile.ZipFile(archive) as zf:
+                zf.extractall(self.sources_dir)
+        elif tarfile.is_tarfile(archive):
+            with tarfile.open(archive) as tar:
+                tar.extractall(self.sources_dir, filter="data")
+        else:
+            raise ValueError(f"Unsupported archive format: {archive.name}")
+        super().render()
 
 
 def create_deployment(
     mode: DeploymentMode,
-    config: SourceConfig
+    config: SourceConfig,
+    work_dir: Optional[Path] = None,
+    progress: Optional[Callable[[DeploymentStage, str], None]] = None,
+    applier: Optional[Applier] = None,
+    lock_timeout: Optional[float] = None,
+    context: Optional[str] = None,
+    state: Optional[StateStore] = None
 ) -> DeploymentBase:
     """Factory function to create appropriate deployment instance.
     
     Args:
         mode: Deployment mode to use
         config: Source configuration
+        work_dir: Directory for sources, rendered manifests and checkpoints
+        progress: Called with each stage and a status message
+        applier: Applies rendered resources; defaults to server-side apply
+            against the current kubeconfig context
+        lock_timeout: Seconds to wait for a concurrent run using the same
+            work directory; None waits forever, 0 fails immediately
+        context: Kubeconfig context to apply to instead of the current one;
+            also scopes the cache of resources already applied
+        state: Store for stage checkpoints; the shared one when omitted
         
     Returns:
         DeploymentBase: Configured deployment instance
@@ -302,4 +863,7 @@ def create_deployment(
     if mode not in deployments:
         raise ValueError(f"Invalid deployment mode: {mode}")
         
-    return deployments[mode](config)
+    return deployments[mode](
+        config, work_dir=work_dir, progress=progress, applier=applier, lock_timeout=lock_timeout,
+        context=context, state=state
+    )
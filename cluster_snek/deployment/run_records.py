@@ -0,0 +1,274 @@
+"""Reproducible generate run records.
+
+Each generate run writes a compact record of what produced its output:
+digests of the configuration, the ``.env`` file and every local source, the
+tool and Python versions, per-phase timings and a digest of the generated
+tree. The inputs themselves are copied into a content-addressed store next
+to the records, each distinct file once however many runs used it, so a
+recorded run can be regenerated later without the network and its output
+compared with the original.
+
+Directories are stored as a manifest of relative path to file digest and
+permission bits; the manifest's own digest identifies the tree. Restoring a
+tree recreates the permissions and refuses paths that would land outside the
+destination. Digests of large, unchanged
+inputs come from the verification cache rather than being recomputed on
+every run.
+"""
+
+import hashlib
+import json
+import os
+import platform
+import shutil
+import stat
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path, PurePosixPath
+from typing import Dict, List, Optional
+
+from cluster_snek.deployment.verification_cache import FileFingerprint, VerificationCache
+
+RECORD_VERSION = 2
+HASH_ALGORITHM = "sha256"
+
+# Input kinds
+FILE = "file"
+TREE = "tree"
+REMOTE = "remote"
+
+
+def default_store_path() -> Path:
+    """Location of the shared run record store."""
+    data_home = os.environ.get("XDG_DATA_HOME") or Path.home() / ".local" / "share"
+    return Path(data_home) / "cluster-snek" / "runs"
+
+
+def tool_version() -> str:
+    """Installed cluster-snek version, or ``unknown`` when running from a checkout."""
+    from importlib.metadata import PackageNotFoundError, version
+
+    try:
+        return version("cluster-snek")
+    except PackageNotFoundError:
+        return "unknown"
+
+
+@dataclass
+class InputDigest:
+    """One input of a run and where it came from"""
+    name: str
+    path: str
+    kind: str
+    digest: Optional[str] = None  # None for remote inputs, which are not stored
+
+
+@dataclass
+class GenerationRecord:
+    """Everything needed to reproduce one generate run"""
+    run_id: int
+    created: str
+    tool_version: str
+    python_version: str
+    config: InputDigest
+    output: str
+    inputs: List[InputDigest] = field(default_factory=list)
+    clusters: List[str] = field(default_factory=list)
+    timings: Dict[str, float] = field(default_factory=dict)
+    output_digest: Optional[str] = None
+    replay_of: Optional[int] = None
+
+    def input(self, name: str) -> Optional[InputDigest]:
+        return next((item for item in self.inputs if item.name == name), None)
+
+    @property
+    def remote_inputs(self) -> List[InputDigest]:
+        return [item for item in self.inputs if item.kind == REMOTE]
+
+
+class RunRecordStore:
+    """Run records and the content-addressed inputs they reference"""
+
+    def __init__(self, root: Optional[Path] = None, cache: Optional[VerificationCache] = None):
+        """Open (or create on first write) a store.
+
+        Args:
+            root: Store directory; the shared per-user store when omitted
+            cache: Digest cache for large inputs; the shared one when omitted
+        """
+        self.root = Path(root) if root else default_store_path()
+        self.objects_dir = self.root / "objects"
+        self.records_dir = self.root / "records"
+        self.cache = cache or VerificationCache()
+
+    def capture(self, name: str, path: Optional[Path], url: Optional[str] = None) -> InputDigest:
+        """Store a file or directory input and return its digest.
+
+        Args:
+            name: Name of the input within the run, e.g. ``config``
+            path: Local file or directory, if there is one
+            url: Where the input is fetched from when there is no local copy
+
+        Returns:
+            InputDigest: A remote input when there is no local copy
+        """
+        if path is None:
+            return InputDigest(name, url or "", REMOTE)
+        path = Path(path)
+        if path.is_file():
+            return InputDigest(name, str(path.absolute()), FILE, self._put_file(path))
+        if path.is_dir():
+            return InputDigest(name, str(path.absolute()), TREE, self._put_tree(path))
+        return InputDigest(name, url or str(path), REMOTE)
+
+    def save(self, record: GenerationRecord) -> Path:
+        """Write a record; the digest cache is saved along with it."""
+        self.records_dir.mkdir(parents=True, exist_ok=True)
+        path = self.records_dir / f"{record.run_id}.json"
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"version": RECORD_VERSION, **asdict(record)}, f, indent=2)
+        os.replace(tmp, path)
+        self.cache.save()
+        return path
+
+    def load(self, run_id: int) -> GenerationRecord:
+        """Look up the record of a run.
+
+        Raises:
+            ValueError: If no record exists for the run
+        """
+        path = self.records_dir / f"{run_id}.json"
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            raise ValueError(f"No run record for run {run_id}")
+        if data.pop("version", None) != RECORD_VERSION:
+            raise ValueError(f"Run record {run_id} was written by an incompatible version")
+        data["config"] = InputDigest(**data["config"])
+        data["inputs"] = [InputDigest(**item) for item in data["inputs"]]
+        return GenerationRecord(**data)
+
+    def unchanged(self, item: InputDigest) -> bool:
+        """True if the input is still at its original path with the recorded digest."""
+        path = Path(item.path)
+        if item.kind == FILE and path.is_file():
+            return self._digest_file(path) == item.digest
+        if item.kind == TREE and path.is_dir():
+            return _manifest_digest(self._manifest(path)) == item.digest
+        return False
+
+    def restore(self, item: InputDigest, destination: Path) -> Path:
+        """Recreate a stored input at ``destination``.
+
+        Raises:
+            ValueError: If the input is remote or missing from the store, or
+                its manifest names a path outside ``destination``
+        """
+        destination = Path(destination)
+        if item.kind == FILE:
+            self._copy_object(item.digest, destination)
+        elif item.kind == TREE:
+            if not self.has(item.digest):
+                raise ValueError(f"Stored input missing: {item.name} ({item.digest})")
+            manifest = json.loads(self._object_path(item.digest).read_bytes())
+            for relative in manifest:
+                parts = PurePosixPath(relative).parts
+                if not parts or PurePosixPath(relative).is_absolute() or ".." in parts:
+                    raise ValueError(f"Stored input {item.name} has an unsafe path: {relative}")
+            destination.mkdir(parents=True, exist_ok=True)
+            for relative, entry in manifest.items():
+                target = destination / relative
+                self._copy_object(entry["digest"], target)
+                os.chmod(target, entry["mode"])
+        else:
+            raise ValueError(f"Input {item.name} was fetched from {item.path} and is not stored")
+        return destination
+
+    def has(self, digest: Optional[str]) -> bool:
+        return digest is not None and self._object_path(digest).exists()
+
+    def tree_digest(self, path: Path) -> str:
+        """Digest of a directory tree without storing its files, e.g. for outputs.
+
+        Freshly generated files would never hit the digest cache, so they
+        are hashed directly instead of filling it.
+        """
+        return _manifest_digest(self._manifest(Path(path), cached=False))
+
+    def _put_file(self, path: Path) -> str:
+        digest = self._digest_file(path)
+        target = self._object_path(digest)
+        if not target.exists():
+            target.parent.mkdir(parents=True, exist_ok=True)
+            tmp = target.with_name(f".{digest}.{os.getpid()}.tmp")
+            shutil.copyfile(path, tmp)
+            os.replace(tmp, target)
+        return digest
+
+    def _put_tree(self, path: Path) -> str:
+        manifest = self._manifest(path)
+        for relative in manifest:
+            self._put_file(path / relative)
+        data = _manifest_bytes(manifest)
+        digest = hashlib.new(HASH_ALGORITHM, data).hexdigest()
+        target = self._object_path(digest)
+        if not target.exists():
+            target.parent.mkdir(parents=True, exist_ok=True)
+            tmp = target.with_name(f".{digest}.{os.getpid()}.tmp")
+            tmp.write_bytes(data)
+            os.replace(tmp, target)
+        return digest
+
+    def _manifest(self, path: Path, cached: bool = True) -> Dict[str, Dict]:
+        files = sorted(p for p in path.rglob("*") if p.is_file() and not p.is_symlink())
+        return {
+            p.relative_to(path).as_posix(): {
+                "digest": self._digest_file(p, cached),
+                "mode": stat.S_IMODE(p.stat().st_mode) & 0o777
+            }
+            for p in files
+        }
+
+    def _digest_file(self, path: Path, cached: bool = True) -> str:
+        if cached:
+            digest = self.cache.get_digest(path, HASH_ALGORITHM)
+            if digest is not None:
+                return digest
+        fingerprint = FileFingerprint.of(path)
+        with open(path, "rb") as f:
+            digest = hashlib.file_digest(f, HASH_ALGORITHM).hexdigest()
+        if cached:
+            self.cache.put_digest(path, HASH_ALGORITHM, digest, fingerprint)
+        return digest
+
+    def _copy_object(self, digest: Optional[str], destination: Path) -> None:
+        if not self.has(digest):
+            raise ValueError(f"Stored input missing: {digest}")
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(self._object_path(digest), destination)
+
+    def _object_path(self, digest: str) -> Path:
+        return self.objects_dir / digest[:2] / digest
+
+
+def new_record(run_id: int, config: InputDigest, output: Path, **fields) -> GenerationRecord:
+    """Record for a run that is happening now, stamped with this tool's version."""
+    return GenerationRecord(
+        run_id=run_id,
+        created=datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
+        tool_version=tool_version(),
+        python_version=platform.python_version(),
+        config=config,
+        output=str(Path(output).absolute()),
+        **fields
+    )
+
+
+def _manifest_bytes(manifest: Dict[str, Dict]) -> bytes:
+    return json.dumps(manifest, sort_keys=True, separators=(",", ":")).encode()
+
+
+def _manifest_digest(manifest: Dict[str, Dict]) -> str:
+    return hashlib.new(HASH_ALGORITHM, _manifest_bytes(manifest)).hexdigest()
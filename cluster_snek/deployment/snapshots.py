@@ -0,0 +1,225 @@
+"""Deployment snapshots and rollback.
+
+After each deploy the applied manifests are recorded as a snapshot. Every
+resource manifest is stored once under ``objects/`` keyed by its hash, and a
+snapshot is only a small index mapping resource keys to those hashes, so
+successive snapshots of a large fleet share almost all of their storage and
+each costs little more than the resources that changed.
+
+Rolling back compares the target snapshot with what is actually applied,
+i.e. the per-resource hashes in the state store, and reapplies only the
+resources whose manifests differ. Snapshots are only recorded for
+successful deploys, so after a failed or partial deploy the latest snapshot
+no longer describes the cluster.
+"""
+
+import json
+import os
+import zlib
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from cluster_snek.deployment.apply import ApplyEngine, ApplyReport, Resource
+from cluster_snek.deployment.apply_cache import manifest_hash
+
+SNAPSHOT_VERSION = 1
+
+
+def default_store_path() -> Path:
+    """Location of the shared snapshot store."""
+    data_home = os.environ.get("XDG_DATA_HOME") or Path.home() / ".local" / "share"
+    return Path(data_home) / "cluster-snek" / "snapshots"
+
+
+@dataclass
+class Snapshot:
+    """Index of the manifests applied by one deploy."""
+    id: str
+    scope: str
+    created: str
+    resources: Dict[str, str] = field(default_factory=dict)
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class RollbackPlan:
+    """Differences between the current state and a rollback target."""
+    target: Snapshot
+    current: Optional[Snapshot]
+    changed: List[str] = field(default_factory=list)
+    unchanged: List[str] = field(default_factory=list)
+    orphaned: List[str] = field(default_factory=list)
+
+
+class SnapshotStore:
+    """Content-addressed store of deployment snapshots."""
+
+    def __init__(self, root: Optional[Path] = None):
+        """Open (or create on first write) a store.
+
+        Args:
+            root: Store directory; the shared per-user store when omitted
+        """
+        self.root = Path(root) if root else default_store_path()
+        self.objects_dir = self.root / "objects"
+        self.snapshots_dir = self.root / "snapshots"
+
+    def record(
+        self,
+        resources: List[Resource],
+        scope: str = "default",
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> Snapshot:
+        """Store the manifests of a deploy as a new snapshot.
+
+        Args:
+            resources: Resources that were applied
+            scope: Cluster or context the resources were applied to
+            metadata: Extra details to keep with the snapshot
+
+        Returns:
+            Snapshot: The recorded snapshot
+        """
+        index: Dict[str, str] = {}
+        for resource in resources:
+            digest = manifest_hash(resource.body)
+            self._write_object(digest, resource.body)
+            index[resource.key] = digest
+
+        now = datetime.now(timezone.utc)
+        content_id = manifest_hash({"scope": scope, "resources": index, "created": now.isoformat()})
+        snapshot = Snapshot(
+            id=f"{now.strftime('%Y%m%dT%H%M%S')}-{content_id[:8]}",
+            scope=scope,
+            created=now.isoformat().replace("+00:00", "Z"),
+            resources=dict(sorted(index.items())),
+            metadata=metadata or {}
+        )
+        self.snapshots_dir.mkdir(parents=True, exist_ok=True)
+        path = self.snapshots_dir / f"{snapshot.id}.json"
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"version": SNAPSHOT_VERSION, **asdict(snapshot)}, f, indent=2)
+        os.replace(tmp, path)
+        return snapshot
+
+    def list(self, scope: Optional[str] = None) -> List[Snapshot]:
+        """Snapshots, oldest first, optionally limited to one scope."""
+        if not self.snapshots_dir.is_dir():
+            return []
+        snapshots = [self._read_snapshot(p) for p in self.snapshots_dir.glob("*.json")]
+        snapshots.sort(key=lambda s: (s.created, s.id))
+        return [s for s in snapshots if scope is None or s.scope == scope]
+
+    def latest(self, scope: str) -> Optional[Snapshot]:
+        """Most recent snapshot for a scope."""
+        snapshots = self.list(scope)
+        return snapshots[-1] if snapshots else None
+
+    def get(self, snapshot_id: str) -> Snapshot:
+        """Look up a snapshot by id or unique id prefix.
+
+        Raises:
+            ValueError: If no snapshot, or more than one, matches
+        """
+        path = self.snapshots_dir / f"{snapshot_id}.json"
+        if path.is_file():
+            return self._read_snapshot(path)
+        matches = []
+        if self.snapshots_dir.is_dir():
+            matches = sorted(self.snapshots_dir.glob(f"{snapshot_id}*.json"))
+        if len(matches) != 1:
+            reason = "No snapshot" if not matches else "Ambiguous snapshot id"
+            raise ValueError(f"{reason}: {snapshot_id}")
+        return self._read_snapshot(matches[0])
+
+    def resources(self, snapshot: Snapshot, keys: Optional[List[str]] = None) -> List[Resource]:
+        """Load the manifests of a snapshot, or only the given keys."""
+        keys = keys if keys is not None else list(snapshot.resources)
+        return [Resource(body=self._read_object(snapshot.resources[key])) for key in keys]
+
+    def plan_rollback(self, snapshot_id: str, applied: Optional[Dict[str, str]] = None) -> RollbackPlan:
+        """Compare a target snapshot with the current state of its scope.
+
+        Args:
+            snapshot_id: Snapshot id or unique prefix to return to
+            applied: Hashes of the manifests last applied to the scope, by
+                resource key (``StateStore.resource_hashes``); the latest
+                snapshot is used when omitted
+        """
+        target = self.get(snapshot_id)
+        current = self.latest(target.scope)
+        if applied is not None:
+            current_index = applied
+        else:
+            current_index = current.resources if current else {}
+        plan = RollbackPlan(target=target, current=current)
+        for key, digest in target.resources.items():
+            if current_index.get(key) == digest:
+                plan.unchanged.append(key)
+            else:
+                plan.changed.append(key)
+        plan.orphaned = sorted(set(current_index) - set(target.resources))
+        return plan
+
+    def rollback(
+        self,
+        snapshot_id: str,
+        engine: ApplyEngine,
+        applied: Optional[Dict[str, str]] = None
+    ) -> ApplyReport:
+        """Reapply the resources that differ from a target snapshot.
+
+        Resources created after the target are reported in the plan but not
+        deleted. Unchanged resources count as applied, so a changed resource
+        may still declare a dependency on one of them. On success a new snapshot identical to the target is
+        recorded, so the rollback itself becomes the latest state.
+
+        Args:
+            snapshot_id: Snapshot id or unique prefix to return to
+            engine: Engine used to apply the differing resources
+            applied: Hashes of the manifests last applied to the scope; see
+                ``plan_rollback``
+
+        Returns:
+            ApplyReport: Result of applying the differing resources
+        """
+        plan = self.plan_rollback(snapshot_id, applied)
+        report = engine.apply(self.resources(plan.target, plan.changed), satisfied=plan.unchanged)
+        if report.ok:
+            self.record(
+                self.resources(plan.target),
+                scope=plan.target.scope,
+                metadata={"rollback_of": plan.target.id}
+            )
+        return report
+
+    def _object_path(self, digest: str) -> Path:
+        return self.objects_dir / digest[:2] / digest
+
+    def _write_object(self, digest: str, body: Dict[str, Any]) -> None:
+        """Store a manifest unless an identical one is already present"""
+        path = self._object_path(digest)
+        if path.exists():
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = json.dumps(body, sort_keys=True, separators=(",", ":"), default=str).encode()
+        tmp = path.with_name(f".{digest}.{os.getpid()}.tmp")
+        tmp.write_bytes(zlib.compress(data))
+        os.replace(tmp, path)
+
+    def _read_object(self, digest: str) -> Dict[str, Any]:
+        try:
+            data = zlib.decompress(self._object_path(digest).read_bytes())
+        except FileNotFoundError:
+            raise ValueError(f"Snapshot object missing from store: {digest}")
+        return json.loads(data)
+
+    @staticmethod
+    def _read_snapshot(path: Path) -> Snapshot:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        data.pop("version", None)
+        return Snapshot(**data)
@@ -0,0 +1,533 @@
+"""SQLite-backed deployment state.
+
+Run history, per-run component results, the hashes of applied resources
+and the checkpoints of interrupted pipelines live in one SQLite database in
+WAL mode. Concurrent runs append rows instead
+of rewriting a shared JSON document, readers never block writers, and
+history queries such as "last successful deploy per cluster" are answered
+from indexes rather than by loading the whole state.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import astuple, dataclass
+from enum import Enum
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+from cluster_snek.deployment.apply import ApplyReport, ApplyStatus, Resource
+from cluster_snek.deployment.apply_cache import DEFAULT_RECONCILE_INTERVAL, manifest_hash
+from cluster_snek.utils.locking import DEFAULT_LEASE_SECONDS, Lease, LockUnavailable
+
+SCHEMA_VERSION = 2
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS clusters (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    context TEXT,
+    last_full_reconcile REAL NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    cluster_id INTEGER NOT NULL REFERENCES clusters(id),
+    kind TEXT NOT NULL,
+    status TEXT NOT NULL,
+    started_at REAL NOT NULL,
+    finished_at REAL,
+    config_hash TEXT,
+    snapshot_id TEXT,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS runs_by_cluster
+    ON runs (cluster_id, kind, status, finished_at);
+CREATE INDEX IF NOT EXISTS runs_by_start ON runs (started_at);
+CREATE TABLE IF NOT EXISTS components (
+    id INTEGER PRIMARY KEY,
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    status TEXT NOT NULL,
+    version TEXT,
+    duration REAL
+);
+CREATE INDEX IF NOT EXISTS components_by_run ON components (run_id);
+CREATE INDEX IF NOT EXISTS components_by_name ON components (name, status);
+CREATE TABLE IF NOT EXISTS resource_hashes (
+    cluster_id INTEGER NOT NULL REFERENCES clusters(id),
+    resource_key TEXT NOT NULL,
+    hash TEXT NOT NULL,
+    applied_at REAL NOT NULL,
+    PRIMARY KEY (cluster_id, resource_key)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS leases (
+    name TEXT PRIMARY KEY,
+    owner TEXT NOT NULL,
+    pid INTEGER NOT NULL,
+    host TEXT NOT NULL,
+    acquired_at REAL NOT NULL,
+    expires_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS checkpoints (
+    scope TEXT PRIMARY KEY,
+    fingerprint TEXT NOT NULL,
+    completed TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+"""
+
+
+def default_state_path() -> Path:
+    """Location of the shared state database."""
+    data_home = os.environ.get("XDG_DATA_HOME") or Path.home() / ".local" / "share"
+    return Path(data_home) / "cluster-snek" / "state.db"
+
+
+class RunStatus(Enum):
+    """Lifecycle of a recorded run"""
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+@dataclass
+class RunRecord:
+    """One generate, deploy or rollback run"""
+    id: int
+    cluster: str
+    kind: str
+    status: RunStatus
+    started_at: float
+    finished_at: Optional[float] = None
+    config_hash: Optional[str] = None
+    snapshot_id: Optional[str] = None
+    error: Optional[str] = None
+
+    @property
+    def duration(self) -> Optional[float]:
+        return None if self.finished_at is None else self.finished_at - self.started_at
+
+
+_RUN_COLUMNS = (
+    "r.id, c.name, r.kind, r.status, r.started_at, r.finished_at,"
+    " r.config_hash, r.snapshot_id, r.error"
+)
+
+
+class StateStore:
+    """Deployment history and applied-resource state for every cluster."""
+
+    def __init__(self, path: Optional[Path] = None, busy_timeout: float = 30.0):
+        """Open the database, creating it and its schema if needed.
+
+        Args:
+            path: Database file; the shared per-user database when omitted
+            busy_timeout: Seconds a writer waits for another writer's lock
+        """
+        self.path = Path(path) if path else default_state_path()
+        self.busy_timeout = busy_timeout
+        self._local = threading.local()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connection() as conn:
+            conn.executescript(_SCHEMA)
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def _connection(self) -> sqlite3.Connection:
+        """Per-thread connection, as sqlite3 connections are not shareable"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=self.busy_timeout)
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("PRAGMA synchronous = NORMAL")
+            conn.execute("PRAGMA foreign_keys = ON")
+            self._local.conn = conn
+        return conn
+
+    def close(self) -> None:
+        """Close this thread's connection."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def ensure_cluster(self, name: str, context: Optional[str] = None) -> int:
+        """Id of a cluster, registering it on first use."""
+        with self._connection() as conn:
+            conn.execute(
+                "INSERT INTO clusters (name, context) VALUES (?, ?)"
+                " ON CONFLICT (name) DO UPDATE SET context = COALESCE(excluded.context, context)",
+                (name, context)
+            )
+            return conn.execute("SELECT id FROM clusters WHERE name = ?", (name,)).fetchone()[0]
+
+    def start_run(self, cluster: str, kind: str, config_hash: Optional[str] = None) -> int:
+        """Record the start of a run.
+
+        Returns:
+            int: Id of the new run
+        """
+        cluster_id = self.ensure_cluster(cluster)
+        with self._connection() as conn:
+            cursor = conn.execute(
+                "INSERT INTO runs (cluster_id, kind, status, started_at, config_hash)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (cluster_id, kind, RunStatus.RUNNING.value, time.time(), config_hash)
+            )
+            return cursor.lastrowid
+
+    def finish_run(
+        self,
+        run_id: int,
+        status: RunStatus,
+        error: Optional[str] = None,
+        snapshot_id: Optional[str] = None
+    ) -> None:
+        """Record how a run ended."""
+        with self._connection() as conn:
+            conn.execute(
+                "UPDATE runs SET status = ?, finished_at = ?, error = ?,"
+                " snapshot_id = COALESCE(?, snapshot_id) WHERE id = ?",
+                (status.value, time.time(), error, snapshot_id, run_id)
+            )
+
+    def record_component(
+        self,
+        run_id: int,
+        name: str,
+        status: str,
+        version: Optional[str] = None,
+        duration: Optional[float] = None
+    ) -> None:
+        """Record the outcome of one component within a run."""
+        with self._connection() as conn:
+            conn.execute(
+                "INSERT INTO components (run_id, name, status, version, duration)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (run_id, name, status, version, duration)
+            )
+
+    def record_apply_components(
+        self,
+        run_id: int,
+        resources: List[Resource],
+        report: ApplyReport
+    ) -> None:
+        """Record apply results grouped into components.
+
+        A resource belongs to the component named by its
+        ``app.kubernetes.io/part-of`` or ``app.kubernetes.io/name`` label,
+        falling back to its namespace.
+
+        Args:
+            run_id: Run the apply belonged to
+            resources: Resources passed to the apply engine
+            report: Result returned by the apply engine
+        """
+        groups: Dict[str, List[str]] = {}
+        for resource in resources:
+            labels = resource.body.get("metadata", {}).get("labels") or {}
+            name = (
+                labels.get("app.kubernetes.io/part-of")
+                or labels.get("app.kubernetes.io/name")
+                or resource.namespace
+                or "cluster"
+            )
+            groups.setdefault(name, []).append(resource.key)
+        with self._connection() as conn:
+            for name, keys in sorted(groups.items()):
+                results = [report.results[key] for key in keys if key in report.results]
+                failed = any(r.status in (ApplyStatus.FAILED, ApplyStatus.SKIPPED) for r in results)
+                conn.execute(
+                    "INSERT INTO components (run_id, name, status, duration) VALUES (?, ?, ?, ?)",
+                    (run_id, name, "failed" if failed else "succeeded",
+                     sum(r.duration for r in results))
+                )
+
+    def get_run(self, run_id: int) -> Optional[RunRecord]:
+        """Look up a run by id."""
+        row = self._connection().execute(
+            f"SELECT {_RUN_COLUMNS} FROM runs r JOIN clusters c ON c.id = r.cluster_id"
+            " WHERE r.id = ?",
+            (run_id,)
+        ).fetchone()
+        return _run_record(row) if row else None
+
+    def runs(self, cluster: Optional[str] = None, limit: int = 50) -> List[RunRecord]:
+        """Most recent runs, newest first, optionally for one cluster."""
+        query = f"SELECT {_RUN_COLUMNS} FROM runs r JOIN clusters c ON c.id = r.cluster_id"
+        params: tuple = ()
+        if cluster is not None:
+            query += " WHERE c.name = ?"
+            params = (cluster,)
+        query += " ORDER BY r.started_at DESC, r.id DESC LIMIT ?"
+        rows = self._connection().execute(query, params + (limit,)).fetchall()
+        return [_run_record(row) for row in rows]
+
+    def last_successful_runs(self, kind: str = "deploy") -> Dict[str, RunRecord]:
+        """Latest successful run of a kind for every cluster that has one.
+
+        Each lookup is a single seek on the ``runs_by_cluster`` index.
+        """
+        rows = self._connection().execute(
+            f"SELECT {_RUN_COLUMNS} FROM clusters c JOIN runs r ON r.id = ("
+            "  SELECT id FROM runs WHERE cluster_id = c.id AND kind = ? AND status = ?"
+            "  ORDER BY finished_at DESC LIMIT 1"
+            ") ORDER BY c.name",
+            (kind, RunStatus.SUCCEEDED.value)
+        ).fetchall()
+        return {row[1]: _run_record(row) for row in rows}
+
+    def components(self, run_id: int) -> List[Dict]:
+        """Component results recorded for a run."""
+        rows = self._connection().execute(
+            "SELECT name, status, version, duration FROM components WHERE run_id = ? ORDER BY id",
+            (run_id,)
+        ).fetchall()
+        return [dict(zip(("name", "status", "version", "duration"), row)) for row in rows]
+
+    def component_results(self, name: str, limit: int = 50) -> List[Dict]:
+        """Most recent results of one component across runs, newest first."""
+        rows = self._connection().execute(
+            "SELECT co.run_id, c.name, co.status, co.version, co.duration, r.started_at"
+            " FROM components co JOIN runs r ON r.id = co.run_id"
+            " JOIN clusters c ON c.id = r.cluster_id"
+            " WHERE co.name = ? ORDER BY r.started_at DESC, co.id DESC LIMIT ?",
+            (name, limit)
+        ).fetchall()
+        keys = ("run_id", "cluster", "status", "version", "duration", "started_at")
+        return [dict(zip(keys, row)) for row in rows]
+
+    def resource_hashes(self, cluster: str) -> Dict[str, str]:
+        """Hashes of the manifests last applied to a cluster."""
+        rows = self._connection().execute(
+            "SELECT resource_key, hash FROM resource_hashes h JOIN clusters c ON c.id = h.cluster_id"
+            " WHERE c.name = ?",
+            (cluster,)
+        ).fetchall()
+        return dict(rows)
+
+    def update_resource_hashes(
+        self,
+        cluster: str,
+        updated: Dict[str, str],
+        removed: Optional[List[str]] = None,
+        full_reconcile_at: Optional[float] = None
+    ) -> None:
+        """Apply a batch of hash changes for a cluster in one transaction."""
+        cluster_id = self.ensure_cluster(cluster)
+        now = time.time()
+        with self._connection() as conn:
+            conn.executemany(
+                "INSERT INTO resource_hashes (cluster_id, resource_key, hash, applied_at)"
+                " VALUES (?, ?, ?, ?) ON CONFLICT (cluster_id, resource_key)"
+                " DO UPDATE SET hash = excluded.hash, applied_at = excluded.applied_at",
+                [(cluster_id, key, digest, now) for key, digest in updated.items()]
+            )
+            conn.executemany(
+                "DELETE FROM resource_hashes WHERE cluster_id = ? AND resource_key = ?",
+                [(cluster_id, key) for key in removed or []]
+            )
+            if full_reconcile_at is not None:
+                conn.execute(
+                    "UPDATE clusters SET last_full_reconcile = ? WHERE id = ?",
+                    (full_reconcile_at, cluster_id)
+                )
+
+    def try_acquire_lease(self, name: str, lease: Lease) -> Optional[Lease]:
+        """Claim a named lease unless someone else holds an unexpired one.
+
+        Returns:
+            Optional[Lease]: None if acquired, otherwise the current holder
+        """
+        conn = self._connection()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute(
+                "INSERT INTO leases (owner, pid, host, acquired_at, expires_at, name)"
+                " VALUES (?, ?, ?, ?, ?, ?) ON CONFLICT (name) DO UPDATE SET"
+                " owner = excluded.owner, pid = excluded.pid, host = excluded.host,"
+                " acquired_at = excluded.acquired_at, expires_at = excluded.expires_at"
+                " WHERE leases.expires_at <= ?",
+                astuple(lease) + (name, time.time())
+            )
+            row = conn.execute(
+                "SELECT owner, pid, host, acquired_at, expires_at FROM leases WHERE name = ?",
+                (name,)
+            ).fetchone()
+        holder = Lease(*row)
+        return None if holder == lease else holder
+
+    def renew_lease(self, name: str, lease: Lease, duration: float) -> None:
+        """Push back the expiry of a lease this process holds."""
+        lease.expires_at = time.time() + duration
+        with self._connection() as conn:
+            conn.execute(
+                "UPDATE leases SET expires_at = ? WHERE name = ? AND pid = ? AND host = ?"
+                " AND acquired_at = ?",
+                (lease.expires_at, name, lease.pid, lease.host, lease.acquired_at)
+            )
+
+    def release_lease(self, name: str, lease: Lease) -> None:
+        """Give up a lease this process holds."""
+        with self._connection() as conn:
+            conn.execute(
+                "DELETE FROM leases WHERE name = ? AND pid = ? AND host = ? AND acquired_at = ?",
+                (name, lease.pid, lease.host, lease.acquired_at)
+            )
+
+    @contextmanager
+    def cluster_lease(
+        self,
+        cluster: str,
+        timeout: Optional[float] = None,
+        duration: float = DEFAULT_LEASE_SECONDS,
+        poll_interval: float = 0.5
+    ) -> Iterator[Lease]:
+        """Own a cluster for the duration of a run.
+
+        Unlike a file lock this works across hosts sharing the database. A
+        holder that dies without releasing loses the lease once it expires;
+        a live holder renews it in the background.
+
+        Args:
+            cluster: Cluster (or context) name to lease
+            timeout: Seconds to wait; None waits forever, 0 fails immediately
+            duration: Lease length; renewed every third of it while held
+            poll_interval: Seconds between attempts while waiting
+
+        Raises:
+            LockUnavailable: If the cluster is still leased after the timeout
+        """
+        name = f"cluster:{cluster}"
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            lease = Lease.new(duration=duration)
+            holder = self.try_acquire_lease(name, lease)
+            if holder is None:
+                break
+            if deadline is not None and time.monotonic() >= deadline:
+                raise LockUnavailable(cluster, holder)
+            time.sleep(poll_interval)
+
+        stop = threading.Event()
+
+        def heartbeat() -> None:
+            store = StateStore(self.path, self.busy_timeout)
+            try:
+                while not stop.wait(duration / 3):
+                    store.renew_lease(name, lease, duration)
+            finally:
+                store.close()
+
+        renewer = threading.Thread(target=heartbeat, name=f"lease-{cluster}", daemon=True)
+        renewer.start()
+        try:
+            yield lease
+        finally:
+            stop.set()
+            renewer.join()
+            self.release_lease(name, lease)
+
+    def last_full_reconcile(self, cluster: str) -> float:
+        """Time of a cluster's last full reconcile, 0 if never."""
+        row = self._connection().execute(
+            "SELECT last_full_reconcile FROM clusters WHERE name = ?", (cluster,)
+        ).fetchone()
+        return row[0] if row else 0.0
+
+    def checkpoint(self, scope: str, fingerprint: str) -> List[str]:
+        """Stages completed under a scope, empty if recorded for another fingerprint."""
+        row = self._connection().execute(
+            "SELECT fingerprint, completed FROM checkpoints WHERE scope = ?", (scope,)
+        ).fetchone()
+        if row is None or row[0] != fingerprint:
+            return []
+        return [stage for stage in row[1].split(",") if stage]
+
+    def save_checkpoint(self, scope: str, fingerprint: str, completed: List[str]) -> None:
+        """Replace the completed stages recorded under a scope."""
+        with self._connection() as conn:
+            conn.execute(
+                "INSERT INTO checkpoints (scope, fingerprint, completed, updated_at)"
+                " VALUES (?, ?, ?, ?) ON CONFLICT (scope) DO UPDATE SET"
+                " fingerprint = excluded.fingerprint, completed = excluded.completed,"
+                " updated_at = excluded.updated_at",
+                (scope, fingerprint, ",".join(completed), time.time())
+            )
+
+    def clear_checkpoint(self, scope: str) -> None:
+        """Forget the checkpoint of a finished pipeline."""
+        with self._connection() as conn:
+            conn.execute("DELETE FROM checkpoints WHERE scope = ?", (scope,))
+
+
+def _run_record(row: tuple) -> RunRecord:
+    return RunRecord(
+        id=row[0], cluster=row[1], kind=row[2], status=RunStatus(row[3]),
+        started_at=row[4], finished_at=row[5], config_hash=row[6],
+        snapshot_id=row[7], error=row[8]
+    )
+
+
+class StateStoreResourceCache:
+    """Applied-manifest cache for one cluster backed by the state store.
+
+    Drop-in replacement for ``AppliedResourceCache``: hashes are read once
+    when created and changes are written back in a single transaction on
+    ``save``.
+    """
+
+    def __init__(
+        self,
+        store: StateStore,
+        cluster: str,
+        reconcile_interval: float = DEFAULT_RECONCILE_INTERVAL
+    ):
+        self.store = store
+        self.cluster = cluster
+        self.reconcile_interval = reconcile_interval
+        self._lock = threading.Lock()
+        self._hashes = store.resource_hashes(cluster)
+        self._last_full_reconcile = store.last_full_reconcile(cluster)
+        self._updated: Dict[str, str] = {}
+        self._removed: List[str] = []
+        self._reconciled_at: Optional[float] = None
+
+    def is_unchanged(self, key: str, body: Dict) -> bool:
+        """Check whether this exact manifest was the last one applied."""
+        with self._lock:
+            return self._hashes.get(key) == manifest_hash(body)
+
+    def record(self, key: str, body: Dict) -> None:
+        """Remember a successfully applied manifest."""
+        digest = manifest_hash(body)
+        with self._lock:
+            if self._hashes.get(key) != digest:
+                self._hashes[key] = digest
+                self._updated[key] = digest
+
+    def forget(self, key: str) -> None:
+        """Drop a resource so its next apply always reaches the API server."""
+        with self._lock:
+            if self._hashes.pop(key, None) is not None:
+                self._updated.pop(key, None)
+                self._removed.append(key)
+
+    def needs_full_reconcile(self) -> bool:
+        """True once the last full reconcile is older than the interval."""
+        return time.time() - self._last_full_reconcile >= self.reconcile_interval
+
+    def mark_full_reconcile(self) -> None:
+        """Record that every resource was just applied."""
+        with self._lock:
+            self._last_full_reconcile = self._reconciled_at = time.time()
+
+    def save(self) -> None:
+        """Write pending changes to the state store."""
+        with self._lock:
+            updated, removed, reconciled_at = self._updated, self._removed, self._reconciled_at
+            self._updated, self._removed, self._reconciled_at = {}, [], None
+        if updated or removed or reconciled_at is not None:
+            self.store.update_resource_hashes(self.cluster, updated, removed, reconciled_at)
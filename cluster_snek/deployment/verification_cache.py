@@ -0,0 +1,195 @@
+"""Persistent cache of archive verification results.
+
+Hashing a multi-gigabyte bundle and running GPG on it again for every deploy
+is wasted work when the file has not changed. This cache remembers the digest
+computed for a file, and successful signature checks, keyed by the file's
+identity on disk (device, inode, size, mtime and ctime). Any write to the file
+changes at least one of these, so a stale entry is never used.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, Optional
+
+CACHE_VERSION = 1
+
+
+def default_cache_path() -> Path:
+    """Location of the shared verification cache."""
+    cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(cache_home) / "cluster-snek" / "verification.json"
+
+
+@dataclass(frozen=True)
+class FileFingerprint:
+    """Identity of a file's current contents as seen by the filesystem."""
+    device: int
+    inode: int
+    size: int
+    mtime_ns: int
+    ctime_ns: int
+
+    @classmethod
+    def of(cls, path: Path) -> "FileFingerprint":
+        """Fingerprint a file.
+
+        Raises:
+            FileNotFoundError: If the file does not exist
+        """
+        st = os.stat(path)
+        return cls(st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns, st.st_ctime_ns)
+
+
+class VerificationCache:
+    """Digest and signature results keyed by file fingerprint.
+
+    In strict mode lookups always miss, forcing a full rehash and signature
+    check, while fresh results are still recorded.
+    """
+
+    def __init__(self, cache_path: Optional[Path] = None, strict: bool = False):
+        """Load the cache.
+
+        Args:
+            cache_path: JSON file to persist results in
+            strict: Ignore cached results and always re-verify
+        """
+        self.cache_path = Path(cache_path) if cache_path else default_cache_path()
+        self.strict = strict
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._digests: Dict[str, Dict[str, Dict]] = {}
+        self._signatures: Dict[str, Dict] = {}
+        self._load()
+
+    def get_digest(self, path: Path, algorithm: str) -> Optional[str]:
+        """Return the cached digest if the file is unchanged since it was hashed."""
+        if self.strict:
+            return None
+        key = self._path_key(path)
+        with self._lock:
+            entry = self._digests.get(key, {}).get(algorithm)
+        if entry is None or not self._matches(path, entry["file"]):
+            return None
+        return entry["digest"]
+
+    def put_digest(self, path: Path, algorithm: str, digest: str,
+                   fingerprint: Optional[FileFingerprint] = None) -> None:
+        """Record a freshly computed digest.
+
+        Args:
+            path: File that was hashed
+            algorithm: Hash algorithm used
+            digest: Hex digest computed
+            fingerprint: Fingerprint taken before hashing; pass it so a file
+                modified while being hashed is not cached as unchanged
+        """
+        fingerprint = fingerprint or FileFingerprint.of(path)
+        with self._lock:
+            self._digests.setdefault(self._path_key(path), {})[algorithm] = {
+                "file": asdict(fingerprint),
+                "digest": digest
+            }
+            self._dirty = True
+
+    def is_signature_verified(self, path: Path, signature_path: Path, public_key_path: Path) -> bool:
+        """Check whether this exact file, signature and key verified before."""
+        if self.strict:
+            return False
+        key = self._signature_key(path, signature_path, public_key_path)
+        with self._lock:
+            entry = self._signatures.get(key)
+        return (
+            entry is not None
+            and self._matches(path, entry["file"])
+            and self._matches(signature_path, entry["signature"])
+            and entry["public_key"] == key_digest(public_key_path)
+        )
+
+    def record_signature(
+        self,
+        path: Path,
+        signature_path: Path,
+        public_key_path: Path,
+        fingerprint: Optional[FileFingerprint] = None,
+        signature_fingerprint: Optional[FileFingerprint] = None,
+        public_key: Optional[str] = None
+    ) -> None:
+        """Remember a successful signature verification.
+
+        Args:
+            path: File whose signature was verified
+            signature_path: Detached signature
+            public_key_path: Key the signature was verified with
+            fingerprint: Fingerprint of ``path`` taken before verifying
+            signature_fingerprint: Fingerprint of ``signature_path`` taken
+                before verifying
+            public_key: ``key_digest`` of the key taken before verifying
+
+        Pass all three so files replaced during verification are not
+        cached as verified.
+        """
+        key = self._signature_key(path, signature_path, public_key_path)
+        fingerprint = fingerprint or FileFingerprint.of(path)
+        signature_fingerprint = signature_fingerprint or FileFingerprint.of(signature_path)
+        with self._lock:
+            self._signatures[key] = {
+                "file": asdict(fingerprint),
+                "signature": asdict(signature_fingerprint),
+                "public_key": public_key or key_digest(public_key_path)
+            }
+            self._dirty = True
+
+    def save(self) -> None:
+        """Persist the cache if anything changed."""
+        with self._lock:
+            if not self._dirty:
+                return
+            payload = {
+                "version": CACHE_VERSION,
+                "digests": self._digests,
+                "signatures": self._signatures
+            }
+            self._dirty = False
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.cache_path.with_name(f".{self.cache_path.name}.{os.getpid()}.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(payload, f)
+        os.replace(tmp, self.cache_path)
+
+    def _load(self) -> None:
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return
+        if data.get("version") != CACHE_VERSION:
+            return
+        self._digests = data.get("digests", {})
+        self._signatures = data.get("signatures", {})
+
+    @staticmethod
+    def _matches(path: Path, recorded: Dict) -> bool:
+        try:
+            return asdict(FileFingerprint.of(path)) == recorded
+        except FileNotFoundError:
+            return False
+
+    @staticmethod
+    def _path_key(path: Path) -> str:
+        return str(Path(path).resolve())
+
+    def _signature_key(self, path: Path, signature_path: Path, public_key_path: Path) -> str:
+        return "|".join(self._path_key(p) for p in (path, signature_path, public_key_path))
+
+
+def key_digest(public_key_path: Path) -> Optional[str]:
+    """Digest of a public key file, so a replaced key invalidates results"""
+    try:
+        return hashlib.sha256(Path(public_key_path).read_bytes()).hexdigest()
+    except FileNotFoundError:
+        return None
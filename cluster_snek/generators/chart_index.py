@@ -0,0 +1,226 @@
+"""Offline Helm chart repository indexer.
+
+Builds a Helm ``index.yaml`` for a directory of packaged charts (``*.tgz``)
+without a network connection or the ``helm`` binary. Each tarball is scanned
+in streaming mode and only its ``Chart.yaml`` is decoded, so charts are never
+fully extracted. Results are cached per tarball (size and mtime) so
+re-indexing after adding a chart only scans the new file. A tarball that is
+not a readable chart is logged and left out of the index rather than
+failing the whole build.
+
+The generator copies the ``charts/*.tgz`` of every source layout (plain
+directories, archives, bundles, git) into ``<sources>/charts`` through the
+source view, so that one directory is all that needs indexing.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import tarfile
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import yaml
+
+INDEX_FILE = "index.yaml"
+CACHE_FILE = ".index-cache.json"
+
+_Dumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+_Loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class IndexStats:
+    """Counters describing an index build."""
+    scanned: int = 0
+    reused: int = 0
+    removed: int = 0
+    charts: int = 0
+    skipped: int = 0
+    written: bool = False
+
+
+class ChartIndexer:
+    """Builds and incrementally updates ``index.yaml`` for a chart directory."""
+
+    def __init__(
+        self,
+        charts_dir: Path,
+        base_url: Optional[str] = None,
+        max_workers: Optional[int] = None
+    ):
+        """Initialise the indexer.
+
+        Args:
+            charts_dir: Directory containing packaged chart tarballs
+            base_url: URL prefix for chart downloads; relative URLs are used
+                when omitted, which Helm resolves against the repository URL
+            max_workers: Thread pool size for scanning tarballs
+        """
+        self.charts_dir = Path(charts_dir)
+        self.base_url = base_url.rstrip("/") if base_url else None
+        self.max_workers = max_workers or min(32, (os.cpu_count() or 1) + 4)
+        self.index_path = self.charts_dir / INDEX_FILE
+        self.cache_path = self.charts_dir / CACHE_FILE
+
+    def build(self, force: bool = False) -> IndexStats:
+        """Scan new or changed tarballs and rewrite the index if needed.
+
+        Args:
+            force: Ignore the cache and rescan every tarball
+
+        Returns:
+            IndexStats: What was scanned, reused, removed and skipped as
+                unreadable
+
+        Raises:
+            ValueError: If the charts directory does not exist
+        """
+        if not self.charts_dir.is_dir():
+            raise ValueError(f"Charts directory not found: {self.charts_dir}")
+
+        stats = IndexStats()
+        cache = {} if force else self._load_cache()
+        current: Dict[str, Dict[str, Any]] = {}
+        to_scan: List[Tuple[str, os.stat_result]] = []
+
+        with os.scandir(self.charts_dir) as entries:
+            for entry in entries:
+                if not entry.is_file() or not entry.name.endswith(".tgz"):
+                    continue
+                st = entry.stat()
+                cached = cache.get(entry.name)
+                if cached and cached["size"] == st.st_size and cached["mtime_ns"] == st.st_mtime_ns:
+                    current[entry.name] = cached
+                    stats.reused += 1
+                else:
+                    to_scan.append((entry.name, st))
+
+        if to_scan:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                scanned = executor.map(lambda item: self._scan(*item), to_scan)
+                for (name, st), result in zip(to_scan, scanned):
+                    current[name] = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, **result}
+            stats.scanned = len(to_scan)
+
+        stats.removed = len(cache.keys() - current.keys())
+        for name, item in sorted(current.items()):
+            if item["entry"] is None:
+                logger.warning("Skipping %s: %s", name, item["error"])
+                stats.skipped += 1
+        stats.charts = len(current) - stats.skipped
+
+        if force or stats.scanned or stats.removed or not self.index_path.exists():
+            self._write_index(current)
+            self._save_cache(current)
+            stats.written = True
+        return stats
+
+    def _scan(self, filename: str, st: os.stat_result) -> Dict[str, Any]:
+        """Read Chart.yaml metadata and digest from one chart tarball"""
+        path = self.charts_dir / filename
+        try:
+            metadata = read_chart_metadata(path)
+        except (ValueError, OSError) as e:
+            # Cached like a good chart, so an unchanged bad tarball is not rescanned
+            return {"entry": None, "error": str(e)}
+        with open(path, "rb") as f:
+            digest = hashlib.file_digest(f, "sha256").hexdigest()
+
+        entry = dict(metadata)
+        entry["created"] = datetime.fromtimestamp(
+            st.st_mtime_ns / 1e9, tz=timezone.utc
+        ).isoformat().replace("+00:00", "Z")
+        entry["digest"] = digest
+        entry["urls"] = [f"{self.base_url}/{filename}" if self.base_url else filename]
+        return {"entry": entry}
+
+    def _write_index(self, files: Dict[str, Dict[str, Any]]) -> None:
+        """Write index.yaml grouped by chart name, newest version first"""
+        entries: Dict[str, List[Dict[str, Any]]] = {}
+        for item in files.values():
+            chart_entry = item["entry"]
+            if chart_entry is None:
+                continue
+            entries.setdefault(chart_entry["name"], []).append(chart_entry)
+        for versions in entries.values():
+            versions.sort(key=lambda e: version_key(str(e.get("version", ""))), reverse=True)
+
+        index = {
+            "apiVersion": "v1",
+            "entries": dict(sorted(entries.items())),
+            "generated": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+        }
+        tmp = self.index_path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            yaml.dump(index, f, Dumper=_Dumper, default_flow_style=False, sort_keys=False)
+        os.replace(tmp, self.index_path)
+
+    def _load_cache(self) -> Dict[str, Dict[str, Any]]:
+        """Load per-tarball scan results from the previous build"""
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                cache = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+        if cache.get("base_url") != self.base_url:
+            return {}
+        return cache.get("files", {})
+
+    def _save_cache(self, files: Dict[str, Dict[str, Any]]) -> None:
+        """Persist per-tarball scan results for the next build"""
+        tmp = self.cache_path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"base_url": self.base_url, "files": files}, f, default=str)
+        os.replace(tmp, self.cache_path)
+
+
+def read_chart_metadata(chart_path: Path) -> Dict[str, Any]:
+    """Read ``Chart.yaml`` from a packaged chart without extracting it.
+
+    The tarball is read as a stream and scanning stops at the top-level
+    ``<chart>/Chart.yaml``, which ``helm package`` writes first.
+
+    Args:
+        chart_path: Path to the chart tarball
+
+    Returns:
+        Dict[str, Any]: Parsed Chart.yaml contents
+
+    Raises:
+        ValueError: If the tarball has no readable top-level Chart.yaml
+    """
+    try:
+        with tarfile.open(chart_path, "r|*") as tar:
+            for member in tar:
+                name = member.name[2:] if member.name.startswith("./") else member.name
+                parts = name.split("/")
+                if member.isfile() and len(parts) == 2 and parts[1] == "Chart.yaml":
+                    handle = tar.extractfile(member)
+                    metadata = yaml.load(handle.read(), Loader=_Loader) if handle else None
+                    if not isinstance(metadata, dict) or "name" not in metadata:
+                        raise ValueError(f"Invalid Chart.yaml in {chart_path.name}")
+                    return metadata
+    except tarfile.TarError as e:
+        raise ValueError(f"Unreadable chart archive {chart_path.name}: {e}")
+    raise ValueError(f"No Chart.yaml found in {chart_path.name}")
+
+
+def version_key(version: str) -> Tuple:
+    """Sort key ordering semantic versions, releases after pre-releases."""
+    core, _, prerelease = version.lstrip("v").partition("-")
+    core = core.split("+", 1)[0]
+    numbers = tuple(int(n) if n.isdigit() else 0 for n in core.split("."))
+    numbers = (numbers + (0, 0, 0))[:3]
+    pre = tuple(
+        (0, int(p), "") if p.isdigit() else (1, 0, p)
+        for p in re.split(r"[.]", prerelease) if p
+    )
+    return numbers, not pre, pre
@@ -23,6 +23,7 @@ from enhanced_config_schema import (
     VectorWaveConfig, DeploymentMode, ClusterSize, VectorStoreType,
     SourceConfig, ClusterConfig
 )
+from cluster_snek.generators.chart_index import ChartIndexer
 
 
 class CerbosIntegration:
@@ -87,8 +88,25 @@ class EnhancedHelmManager:
         }
     
     def _get_local_repositories(self) -> Dict:
-        """Local/airgapped repositories"""
+        """Local/airgapped repositories
+        
+        Only the packaged charts are read from the source view into the local
+        chart repository, so archives and bundles are never fully extracted.
+        """
         sources_path = self.source_manager.local_path
+        charts_path = sources_path / "charts"
+        view = self.source_manager.open_view()
+        packages = [p for p in view.glob("charts/*.tgz") if p.count("/") == 1]
+        if packages:
+            charts_path.mkdir(parents=True, exist_ok=True)
+            for name, data in view.read_files(packages):
+                target = sources_path / name
+                # Rewriting unchanged charts would defeat the index cache
+                if not (target.is_file() and target.stat().st_size == len(data) and target.read_bytes() == data):
+                    target.write_bytes(data)
+        if charts_path.is_dir():
+            # Incremental: only tarballs added or changed since the last run are scanned
+            ChartIndexer(charts_path).build()
         return {
             "local-charts": {"url": f"file://{sources_path}/charts"},
             "internal-registry": {"url": "registry.vectorweight.internal"}
@@ -76,12 +76,13 @@ class InfrastructureGenerator:
                 })
         
         elif name == "metallb":
+            addresses = cluster_config.metallb_range or f"{self.ip_pool_start}-{self.ip_pool_end}"
             values = {
                 "configInline": {
                     "address-pools": [{
                         "name": "default",
                         "protocol": "layer2",
-                        "addresses": [f"{self.ip_pool_start}-{self.ip_pool_end}"]
+                        "addresses": [addresses]
                     }]
                 }
             }
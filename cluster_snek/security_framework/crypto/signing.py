@@ -0,0 +1,420 @@
+"""Detached signature verification for deployment artifacts.
+
+Two backends are provided behind one ``SignatureService``:
+
+* ``GpgSignatureBackend`` keeps a single ``gnupg.GPG`` instance bound to a
+  persistent keyring. Public keys are imported once (tracked across runs by
+  key file digest) and each verification costs a single ``gpg`` process.
+* ``MinisignBackend`` verifies minisign/signify-style Ed25519 signatures in
+  pure Python, without spawning any process.
+
+The Ed25519 implementation follows the reference code in RFC 8032. It is not
+constant time, which is fine for verification of public data; this module
+therefore only verifies and never handles secret keys. Signatures are made
+with the ``minisign`` or ``gpg`` tools.
+"""
+
+import base64
+import functools
+import hashlib
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+# =============================================================================
+# Ed25519 (RFC 8032)
+# =============================================================================
+
+_P = 2 ** 255 - 19
+_Q = 2 ** 252 + 27742317777372353535851937790883648493
+_D = -121665 * pow(121666, _P - 2, _P) % _P
+_SQRT_M1 = pow(2, (_P - 1) // 4, _P)
+
+_Point = Tuple[int, int, int, int]
+
+
+def _inv(x: int) -> int:
+    return pow(x, _P - 2, _P)
+
+
+def _sha512_mod_q(data: bytes) -> int:
+    return int.from_bytes(hashlib.sha512(data).digest(), "little") % _Q
+
+
+def _point_add(p: _Point, q: _Point) -> _Point:
+    a = (p[1] - p[0]) * (q[1] - q[0]) % _P
+    b = (p[1] + p[0]) * (q[1] + q[0]) % _P
+    c = 2 * p[3] * q[3] * _D % _P
+    d = 2 * p[2] * q[2] % _P
+    e, f, g, h = b - a, d - c, d + c, b + a
+    return (e * f % _P, g * h % _P, f * g % _P, e * h % _P)
+
+
+def _point_mul(scalar: int, point: _Point) -> _Point:
+    result: _Point = (0, 1, 1, 0)
+    while scalar > 0:
+        if scalar & 1:
+            result = _point_add(result, point)
+        point = _point_add(point, point)
+        scalar >>= 1
+    return result
+
+
+def _point_equal(p: _Point, q: _Point) -> bool:
+    return (p[0] * q[2] - q[0] * p[2]) % _P == 0 and (p[1] * q[2] - q[1] * p[2]) % _P == 0
+
+
+def _recover_x(y: int, sign: int) -> Optional[int]:
+    if y >= _P:
+        return None
+    x2 = (y * y - 1) * _inv(_D * y * y + 1)
+    if x2 == 0:
+        return None if sign else 0
+    x = pow(x2, (_P + 3) // 8, _P)
+    if (x * x - x2) % _P != 0:
+        x = x * _SQRT_M1 % _P
+    if (x * x - x2) % _P != 0:
+        return None
+    if (x & 1) != sign:
+        x = _P - x
+    return x
+
+
+_G_Y = 4 * _inv(5) % _P
+_G_X = _recover_x(_G_Y, 0)
+_G: _Point = (_G_X, _G_Y, 1, _G_X * _G_Y % _P)
+
+
+def _compress(point: _Point) -> bytes:
+    z_inv = _inv(point[2])
+    x = point[0] * z_inv % _P
+    y = point[1] * z_inv % _P
+    return int.to_bytes(y | ((x & 1) << 255), 32, "little")
+
+
+def _decompress(data: bytes) -> Optional[_Point]:
+    if len(data) != 32:
+        return None
+    y = int.from_bytes(data, "little")
+    sign = y >> 255
+    y &= (1 << 255) - 1
+    x = _recover_x(y, sign)
+    if x is None:
+        return None
+    return (x, y, 1, x * y % _P)
+
+
+def ed25519_verify(public: bytes, message: bytes, signature: bytes) -> bool:
+    """Check an Ed25519 signature."""
+    if len(public) != 32 or len(signature) != 64:
+        return False
+    a = _decompress(public)
+    r = _decompress(signature[:32])
+    if a is None or r is None:
+        return False
+    s = int.from_bytes(signature[32:], "little")
+    if s >= _Q:
+        return False
+    h = _sha512_mod_q(signature[:32] + public + message)
+    return _point_equal(_point_mul(s, _G), _point_add(r, _point_mul(h, a)))
+
+
+# =============================================================================
+# Minisign
+# =============================================================================
+
+_MINISIGN_PUBLIC_ALG = b"Ed"
+_MINISIGN_LEGACY_ALG = b"Ed"
+_MINISIGN_PREHASHED_ALG = b"ED"
+
+
+@dataclass(frozen=True)
+class MinisignPublicKey:
+    """A minisign public key."""
+    key_id: bytes
+    key: bytes
+
+    @classmethod
+    def parse(cls, text: str) -> "MinisignPublicKey":
+        """Parse the contents of a ``.pub`` file or a bare base64 key.
+
+        Raises:
+            ValueError: If the key is malformed
+        """
+        lines = [line.strip() for line in text.strip().splitlines() if line.strip()]
+        if lines and lines[0].startswith("untrusted comment:"):
+            lines = lines[1:]
+        try:
+            raw = base64.b64decode(lines[0], validate=True)
+        except (IndexError, ValueError):
+            raise ValueError("Malformed minisign public key")
+        if len(raw) != 42 or raw[:2] != _MINISIGN_PUBLIC_ALG:
+            raise ValueError("Malformed minisign public key")
+        return cls(key_id=raw[2:10], key=raw[10:])
+
+    def to_text(self, comment: str = "minisign public key") -> str:
+        """Serialize as a ``.pub`` file."""
+        encoded = base64.b64encode(_MINISIGN_PUBLIC_ALG + self.key_id + self.key).decode()
+        return f"untrusted comment: {comment}\n{encoded}\n"
+
+
+@dataclass(frozen=True)
+class MinisignSignature:
+    """A parsed minisign detached signature."""
+    algorithm: bytes
+    key_id: bytes
+    signature: bytes
+    trusted_comment: str
+    global_signature: bytes
+
+    @classmethod
+    def parse(cls, text: str) -> "MinisignSignature":
+        """Parse the contents of a ``.minisig`` file.
+
+        Raises:
+            ValueError: If the signature is malformed
+        """
+        lines = text.splitlines()
+        try:
+            raw = base64.b64decode(lines[1].strip(), validate=True)
+            trusted = lines[2]
+            global_signature = base64.b64decode(lines[3].strip(), validate=True)
+        except (IndexError, ValueError):
+            raise ValueError("Malformed minisign signature")
+        if (
+            not lines[0].startswith("untrusted comment:")
+            or not trusted.startswith("trusted comment: ")
+            or len(raw) != 74
+            or raw[:2] not in (_MINISIGN_LEGACY_ALG, _MINISIGN_PREHASHED_ALG)
+            or len(global_signature) != 64
+        ):
+            raise ValueError("Malformed minisign signature")
+        return cls(
+            algorithm=raw[:2],
+            key_id=raw[2:10],
+            signature=raw[10:],
+            trusted_comment=trusted[len("trusted comment: "):],
+            global_signature=global_signature
+        )
+
+
+def _blake2b_file(path: Path) -> bytes:
+    with open(path, "rb") as f:
+        return hashlib.file_digest(f, "blake2b").digest()
+
+
+def is_minisign_key(public_key_path: Path) -> bool:
+    """Check whether a key file holds a minisign public key."""
+    try:
+        MinisignPublicKey.parse(Path(public_key_path).read_text(encoding="utf-8"))
+    except (UnicodeDecodeError, ValueError):
+        return False
+    return True
+
+
+# =============================================================================
+# Backends
+# =============================================================================
+
+
+class MinisignBackend:
+    """Pure-Python minisign verification; spawns no processes."""
+
+    def __init__(self):
+        self._keys: Dict[Path, MinisignPublicKey] = {}
+        self._lock = threading.Lock()
+
+    def verify(self, data_path: Path, signature_path: Path, public_key_path: Path) -> None:
+        """Verify a minisign signature.
+
+        Raises:
+            ValueError: If the signature does not verify
+        """
+        key = self._load_key(public_key_path)
+        sig = MinisignSignature.parse(Path(signature_path).read_text(encoding="utf-8"))
+        if sig.key_id != key.key_id:
+            raise ValueError(
+                f"Signature verification failed: signed by key {sig.key_id[::-1].hex().upper()}, "
+                f"expected {key.key_id[::-1].hex().upper()}"
+            )
+        if sig.algorithm == _MINISIGN_PREHASHED_ALG:
+            message = _blake2b_file(data_path)
+        else:
+            message = Path(data_path).read_bytes()
+        if not ed25519_verify(key.key, message, sig.signature):
+            raise ValueError("Signature verification failed: bad signature")
+        if not ed25519_verify(key.key, sig.signature + sig.trusted_comment.encode(), sig.global_signature):
+            raise ValueError("Signature verification failed: bad trusted comment signature")
+
+    def _load_key(self, public_key_path: Path) -> MinisignPublicKey:
+        path = Path(public_key_path).resolve()
+        with self._lock:
+            if path not in self._keys:
+                self._keys[path] = MinisignPublicKey.parse(path.read_text(encoding="utf-8"))
+            return self._keys[path]
+
+
+def default_keyring_path() -> Path:
+    """Location of the persistent keyring used for artifact verification."""
+    data_home = os.environ.get("XDG_DATA_HOME") or Path.home() / ".local" / "share"
+    return Path(data_home) / "cluster-snek" / "gnupg"
+
+
+class GpgSignatureBackend:
+    """GPG verification against one persistent keyring.
+
+    The ``gnupg.GPG`` instance is created once, and each public key file is
+    imported once; the fingerprints it yielded are remembered in the keyring
+    directory so later runs skip the import as well.
+    """
+
+    _IMPORTED_FILE = "cluster-snek-imported.json"
+
+    def __init__(self, gnupghome: Optional[Path] = None):
+        self.gnupghome = Path(gnupghome) if gnupghome else default_keyring_path()
+        self._gpg = None
+        self._lock = threading.Lock()
+        self._imported: Optional[Dict[str, List[str]]] = None
+
+    def verify(self, data_path: Path, signature_path: Path, public_key_path: Path) -> None:
+        """Verify a detached GPG signature made by the given key.
+
+        Raises:
+            ValueError: If the signature is not detached or does not verify
+        """
+        fingerprints = self._ensure_key(public_key_path)
+
+        with open(signature_path, "rb") as sig_file:
+            head = sig_file.read(64)
+            if b"BEGIN PGP SIGNED MESSAGE" in head:
+                raise ValueError(
+                    "The provided signature appears to be a clear-signed message. "
+                    "Please provide a detached signature file (created with 'gpg --detach-sign')."
+                )
+            if b"BEGIN PGP MESSAGE" in head:
+                raise ValueError(
+                    "The provided signature appears to be an embedded/opaque signature. "
+                    "Please provide a detached signature file (created with 'gpg --detach-sign')."
+                )
+            sig_file.seek(0)
+            verified = self._get_gpg().verify_file(sig_file, str(data_path))
+
+        if not verified:
+            status_msg = verified.status or "Unknown error (no status provided by GPG)."
+            raise ValueError(f"Signature verification failed: {status_msg}")
+        signer = verified.pubkey_fingerprint or verified.fingerprint
+        if signer not in fingerprints:
+            raise ValueError(
+                f"Signature verification failed: signed by {signer}, "
+                f"which is not in {Path(public_key_path).name}"
+            )
+
+    def _get_gpg(self):
+        with self._lock:
+            if self._gpg is None:
+                import gnupg
+
+                self.gnupghome.mkdir(parents=True, exist_ok=True, mode=0o700)
+                self._gpg = gnupg.GPG(gnupghome=str(self.gnupghome))
+            return self._gpg
+
+    def _ensure_key(self, public_key_path: Path) -> Set[str]:
+        """Import a key file unless it was imported before; return its fingerprints"""
+        key_data = Path(public_key_path).read_bytes()
+        key_digest = hashlib.sha256(key_data).hexdigest()
+        gpg = self._get_gpg()
+        with self._lock:
+            imported = self._load_imported()
+            if key_digest not in imported:
+                result = gpg.import_keys(key_data)
+                if not result.fingerprints:
+                    raise ValueError(f"No public keys found in {public_key_path}")
+                imported[key_digest] = list(result.fingerprints)
+                self._save_imported()
+            return set(imported[key_digest])
+
+    def _load_imported(self) -> Dict[str, List[str]]:
+        if self._imported is None:
+            try:
+                with open(self.gnupghome / self._IMPORTED_FILE, "r", encoding="utf-8") as f:
+                    self._imported = json.load(f)
+            except (FileNotFoundError, json.JSONDecodeError):
+                self._imported = {}
+        return self._imported
+
+    def _save_imported(self) -> None:
+        path = self.gnupghome / self._IMPORTED_FILE
+        tmp = path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self._imported, f)
+        os.replace(tmp, path)
+
+
+# =============================================================================
+# Service
+# =============================================================================
+
+
+class SignatureService:
+    """Verifies detached signatures, picking the backend from the key format."""
+
+    def __init__(self, gnupghome: Optional[Path] = None, max_workers: int = 8):
+        self.gpg = GpgSignatureBackend(gnupghome)
+        self.minisign = MinisignBackend()
+        self.max_workers = max_workers
+
+    def verify(self, data_path: Path, signature_path: Path, public_key_path: Path) -> bool:
+        """Verify one detached signature.
+
+        Returns:
+            bool: True if the signature is valid
+
+        Raises:
+            ValueError: If verification fails
+        """
+        if is_minisign_key(public_key_path):
+            self.minisign.verify(data_path, signature_path, public_key_path)
+        else:
+            self.gpg.verify(data_path, signature_path, public_key_path)
+        return True
+
+    def verify_many(
+        self,
+        items: Iterable[Tuple[Path, Path]],
+        public_key_path: Path
+    ) -> Dict[Path, Optional[str]]:
+        """Verify many (data, signature) pairs signed by one key.
+
+        The key is loaded once for the whole batch and GPG verifications run
+        concurrently.
+
+        Returns:
+            Dict[Path, Optional[str]]: Data path to None if valid, otherwise
+            the failure message
+        """
+        items = list(items)
+        minisign = is_minisign_key(public_key_path)
+        backend = self.minisign if minisign else self.gpg
+
+        def check(item: Tuple[Path, Path]) -> Optional[str]:
+            try:
+                backend.verify(item[0], item[1], public_key_path)
+            except (OSError, ValueError) as e:
+                return str(e)
+            return None
+
+        if minisign or len(items) < 2:
+            # Pure-Python verification is CPU bound; threads would only add overhead
+            return {data: check((data, sig)) for data, sig in items}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            return dict(zip((data for data, _ in items), executor.map(check, items)))
+
+
+@functools.lru_cache(maxsize=None)
+def get_signature_service(gnupghome: Optional[Path] = None) -> SignatureService:
+    """Process-wide signature service for a keyring."""
+    return SignatureService(gnupghome)
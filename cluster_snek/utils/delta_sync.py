@@ -0,0 +1,270 @@
+"""Delta synchronisation of directory trees.
+
+Copies only the files that changed since the previous sync, using a manifest
+of size/mtime (and optionally content digests) stored in the destination.
+Changed files are cloned with reflinks where the filesystem supports them and
+fall back to in-kernel copies (``copy_file_range``/``sendfile``) otherwise.
+"""
+
+import errno
+import hashlib
+import json
+import os
+import shutil
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Tuple
+
+MANIFEST_NAME = ".cluster-snek-sync.json"
+
+# ioctl request number for FICLONE on Linux (_IOW(0x94, 9, int))
+_FICLONE = 0x40049409
+
+_COPY_CHUNK = 64 * 1024 * 1024
+
+
+@dataclass
+class SyncStats:
+    """Counters describing what a sync did."""
+    copied: int = 0
+    skipped: int = 0
+    removed: int = 0
+    bytes_copied: int = 0
+
+
+class DeltaSync:
+    """rsync-like one-way sync from ``source`` into ``destination``.
+
+    Only files recorded in the destination manifest are ever removed, so
+    files written into the destination by other tools are left alone.
+    """
+
+    def __init__(
+        self,
+        source: Path,
+        destination: Path,
+        checksum: bool = False,
+        hardlink: bool = False
+    ):
+        """Initialise the sync.
+
+        Args:
+            source: Directory to copy from
+            destination: Directory to copy into
+            checksum: Compare content digests when size matches but mtime
+                differs, so touched-but-identical files are not recopied
+            hardlink: Hard link files instead of copying them. Only safe when
+                nothing modifies the destination tree in place.
+        """
+        self.source = Path(source)
+        self.destination = Path(destination)
+        self.checksum = checksum
+        self.hardlink = hardlink
+        self.manifest_path = self.destination / MANIFEST_NAME
+
+    def sync(self) -> SyncStats:
+        """Bring the destination up to date with the source.
+
+        Returns:
+            SyncStats: Counters for copied, skipped and removed files
+
+        Raises:
+            ValueError: If the source directory does not exist
+        """
+        if not self.source.is_dir():
+            raise ValueError(f"Source directory not found: {self.source}")
+
+        self.destination.mkdir(parents=True, exist_ok=True)
+        previous = self._load_manifest()
+        current: Dict[str, Dict] = {}
+        stats = SyncStats()
+
+        for rel, src_stat in self._walk(self.source):
+            src = self.source / rel
+            dst = self.destination / rel
+            entry = previous.get(rel)
+            record = {"size": src_stat.st_size, "mtime_ns": src_stat.st_mtime_ns}
+
+            if entry and self._unchanged(entry, src_stat, dst):
+                current[rel] = entry
+                stats.skipped += 1
+                continue
+
+            if self.checksum:
+                record["digest"] = _file_digest(src)
+                if (
+                    entry
+                    and entry.get("digest") == record["digest"]
+                    and entry["size"] == src_stat.st_size
+                    and _size_of(dst) == src_stat.st_size
+                ):
+                    # Content unchanged, only metadata moved; refresh mtime
+                    os.utime(dst, ns=(src_stat.st_atime_ns, src_stat.st_mtime_ns))
+                    current[rel] = record
+                    stats.skipped += 1
+                    continue
+
+            dst.parent.mkdir(parents=True, exist_ok=True)
+            self._transfer(src, dst, src_stat)
+            current[rel] = record
+            stats.copied += 1
+            stats.bytes_copied += src_stat.st_size
+
+        for rel in previous.keys() - current.keys():
+            stale = self.destination / rel
+            try:
+                stale.unlink()
+                stats.removed += 1
+            except FileNotFoundError:
+                pass
+            self._prune_empty_dirs(stale.parent)
+
+        self._save_manifest(current)
+        return stats
+
+    def _unchanged(self, entry: Dict, src_stat: os.stat_result, dst: Path) -> bool:
+        """Check the manifest entry and destination against the source stat"""
+        return (
+            entry.get("size") == src_stat.st_size
+            and entry.get("mtime_ns") == src_stat.st_mtime_ns
+            and _size_of(dst) == src_stat.st_size
+        )
+
+    def _transfer(self, src: Path, dst: Path, src_stat: os.stat_result) -> None:
+        """Replace ``dst`` with the contents of ``src`` atomically"""
+        tmp = dst.with_name(f".{dst.name}.sync-tmp")
+        if tmp.exists():
+            tmp.unlink()
+        try:
+            if self.hardlink:
+                try:
+                    os.link(src, tmp)
+                    os.replace(tmp, dst)
+                    return
+                except OSError as e:
+                    if e.errno not in (errno.EXDEV, errno.EPERM, errno.EMLINK, errno.ENOTSUP):
+                        raise
+            copy_file(src, tmp)
+            os.chmod(tmp, src_stat.st_mode & 0o7777)
+            os.utime(tmp, ns=(src_stat.st_atime_ns, src_stat.st_mtime_ns))
+            os.replace(tmp, dst)
+        finally:
+            if tmp.exists():
+                tmp.unlink()
+
+    def _walk(self, root: Path) -> Iterator[Tuple[str, os.stat_result]]:
+        """Yield (relative path, stat) for every regular file under root"""
+        stack = [root]
+        while stack:
+            directory = stack.pop()
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_dir():
+                        stack.append(Path(entry.path))
+                    elif entry.is_file():
+                        rel = Path(entry.path).relative_to(root).as_posix()
+                        if rel != MANIFEST_NAME:
+                            yield rel, entry.stat()
+
+    def _prune_empty_dirs(self, directory: Path) -> None:
+        """Remove now-empty directories up to the destination root"""
+        while directory != self.destination and self.destination in directory.parents:
+            try:
+                directory.rmdir()
+            except OSError:
+                return
+            directory = directory.parent
+
+    def _load_manifest(self) -> Dict[str, Dict]:
+        """Load the manifest from the previous sync, if any"""
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+        if data.get("source") != str(self.source.resolve()):
+            # A different source was synced here; trust nothing
+            return {}
+        return data.get("files", {})
+
+    def _save_manifest(self, files: Dict[str, Dict]) -> None:
+        """Atomically write the manifest for the next sync"""
+        tmp = self.manifest_path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"source": str(self.source.resolve()), "files": files}, f)
+        os.replace(tmp, self.manifest_path)
+
+
+def copy_file(src: Path, dst: Path) -> None:
+    """Copy a file using the cheapest mechanism the platform offers.
+
+    Tries a reflink clone first (copy-on-write filesystems such as btrfs and
+    XFS), then ``os.copy_file_range`` and ``os.sendfile``, which keep the data
+    in the kernel, and finally ``shutil.copyfile``.
+
+    Args:
+        src: File to copy
+        dst: Destination path, created or truncated
+    """
+    with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+        if _try_reflink(fsrc.fileno(), fdst.fileno()):
+            return
+        size = os.fstat(fsrc.fileno()).st_size
+        if _try_kernel_copy(fsrc.fileno(), fdst.fileno(), size):
+            return
+    shutil.copyfile(src, dst)
+
+
+def _try_reflink(src_fd: int, dst_fd: int) -> bool:
+    """Clone the source extents into the destination (Linux FICLONE)"""
+    try:
+        import fcntl
+        fcntl.ioctl(dst_fd, _FICLONE, src_fd)
+        return True
+    except (ImportError, OSError):
+        return False
+
+
+def _try_kernel_copy(src_fd: int, dst_fd: int, size: int) -> bool:
+    """Copy via copy_file_range or sendfile without userspace buffers"""
+    for name in ("copy_file_range", "sendfile"):
+        func = getattr(os, name, None)
+        if func is None:
+            continue
+        offset = 0
+        try:
+            while offset < size:
+                if name == "copy_file_range":
+                    sent = func(src_fd, dst_fd, min(_COPY_CHUNK, size - offset))
+                else:
+                    sent = func(dst_fd, src_fd, offset, min(_COPY_CHUNK, size - offset))
+                if sent == 0:
+                    break
+                offset += sent
+        except OSError:
+            if offset:
+                # Partially copied; rewind both files and let the caller fall back
+                os.lseek(src_fd, 0, os.SEEK_SET)
+                os.lseek(dst_fd, 0, os.SEEK_SET)
+                os.ftruncate(dst_fd, 0)
+            continue
+        if offset == size:
+            return True
+        os.lseek(src_fd, 0, os.SEEK_SET)
+        os.lseek(dst_fd, 0, os.SEEK_SET)
+        os.ftruncate(dst_fd, 0)
+    return False
+
+
+def _file_digest(path: Path) -> str:
+    """SHA-256 digest of a file"""
+    with open(path, "rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+
+def _size_of(path: Path) -> Optional[int]:
+    """Size of path, or None if it does not exist"""
+    try:
+        return path.stat().st_size
+    except FileNotFoundError:
+        return None
@@ -0,0 +1,223 @@
+"""Advisory locks for coordinating concurrent runs.
+
+``FileLock`` takes an exclusive ``flock`` on a lock file. The kernel drops it
+when the holding process exits, so a crashed run never leaves a stale lock
+behind. While held, the file records the holder's lease (owner, pid, host and
+expiry) so a run that cannot get the lock can say who has it.
+
+Locks are taken per cluster: runs touching disjoint clusters proceed in
+parallel, while runs that overlap wait, or fail fast with a zero timeout.
+Files shared by every cluster in an output directory (the orchestration
+repository, ``deploy.sh``, generator state) have a lock of their own, held
+only while a run writes them.
+"""
+
+import fcntl
+import getpass
+import json
+import os
+import socket
+import time
+from contextlib import ExitStack, contextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional
+
+LOCK_DIR_NAME = ".locks"
+# Cluster lock files sit directly in LOCK_DIR_NAME, so one in a subdirectory
+# cannot clash with any cluster name
+SHARED_LOCK_DIR = "shared"
+SHARED_LOCK_NAME = "outputs.lock"
+DEFAULT_LEASE_SECONDS = 3600.0
+
+
+@dataclass
+class Lease:
+    """Who holds a lock and until when they claim it."""
+    owner: str
+    pid: int
+    host: str
+    acquired_at: float
+    expires_at: float
+
+    def describe(self) -> str:
+        """Human readable holder description."""
+        held = time.time() - self.acquired_at
+        return f"{self.owner} (pid {self.pid} on {self.host}, held {held:.0f}s)"
+
+    @classmethod
+    def new(cls, owner: Optional[str] = None, duration: float = DEFAULT_LEASE_SECONDS) -> "Lease":
+        """Lease for the current process."""
+        now = time.time()
+        return cls(
+            owner=owner or _default_owner(),
+            pid=os.getpid(),
+            host=socket.gethostname(),
+            acquired_at=now,
+            expires_at=now + duration
+        )
+
+
+class LockUnavailable(ValueError):
+    """A lock could not be acquired within the timeout."""
+
+    def __init__(self, name: str, holder: Optional[Lease] = None):
+        self.name = name
+        self.holder = holder
+        detail = f" held by {holder.describe()}" if holder else ""
+        super().__init__(f"{name} is locked{detail}")
+
+
+class FileLock:
+    """Exclusive advisory lock on a file, with lease metadata."""
+
+    def __init__(
+        self,
+        path: Path,
+        timeout: Optional[float] = None,
+        poll_interval: float = 0.1,
+        owner: Optional[str] = None,
+        lease_seconds: float = DEFAULT_LEASE_SECONDS
+    ):
+        """Create the lock; nothing is locked until ``acquire``.
+
+        Args:
+            path: Lock file, created if missing
+            timeout: Seconds to wait; None waits forever, 0 fails immediately
+            poll_interval: Seconds between attempts while waiting
+            owner: Name recorded in the lease; defaults to ``user@host``
+            lease_seconds: How long the recorded lease claims the lock for
+        """
+        self.path = Path(path)
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self.owner = owner
+        self.lease_seconds = lease_seconds
+        self.lease: Optional[Lease] = None
+        self._fd: Optional[int] = None
+
+    def __enter__(self) -> "FileLock":
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.release()
+
+    @property
+    def locked(self) -> bool:
+        return self._fd is not None
+
+    def acquire(self) -> Lease:
+        """Take the lock, waiting up to the timeout.
+
+        Raises:
+            LockUnavailable: If another process holds the lock past the timeout
+        """
+        if self._fd is not None:
+            raise ValueError(f"{self.path} is already held by this lock")
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        deadline = None if self.timeout is None else time.monotonic() + self.timeout
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            while True:
+                try:
+                    fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    break
+                except BlockingIOError:
+                    if deadline is not None and time.monotonic() >= deadline:
+                        raise LockUnavailable(str(self.path), read_lease(self.path))
+                    time.sleep(self.poll_interval)
+        except BaseException:
+            os.close(fd)
+            raise
+        self._fd = fd
+        self.lease = Lease.new(self.owner, self.lease_seconds)
+        self._write_lease()
+        return self.lease
+
+    def release(self) -> None:
+        """Clear the lease and drop the lock."""
+        if self._fd is None:
+            return
+        try:
+            os.ftruncate(self._fd, 0)
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+        finally:
+            os.close(self._fd)
+            self._fd = None
+            self.lease = None
+
+    def _write_lease(self) -> None:
+        data = json.dumps(asdict(self.lease)).encode()
+        os.ftruncate(self._fd, 0)
+        os.pwrite(self._fd, data, 0)
+
+
+def read_lease(path: Path) -> Optional[Lease]:
+    """Lease recorded in a lock file, if any."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = f.read()
+        return Lease(**json.loads(data)) if data else None
+    except (FileNotFoundError, json.JSONDecodeError, TypeError):
+        return None
+
+
+def cluster_lock_path(root: Path, cluster: str) -> Path:
+    """Lock file guarding one cluster's files under ``root``."""
+    safe = "".join(c if c.isalnum() or c in "-_." else "_" for c in cluster)
+    return Path(root) / LOCK_DIR_NAME / f"{safe}.lock"
+
+
+def shared_lock_path(root: Path) -> Path:
+    """Lock file guarding the files under ``root`` that all clusters share."""
+    return Path(root) / LOCK_DIR_NAME / SHARED_LOCK_DIR / SHARED_LOCK_NAME
+
+
+@contextmanager
+def lock_clusters(
+    root: Path,
+    clusters: Iterable[str],
+    timeout: Optional[float] = None,
+    owner: Optional[str] = None
+) -> Iterator[List[FileLock]]:
+    """Hold the locks of several clusters at once.
+
+    Locks are always taken in sorted order, so two runs over overlapping
+    cluster sets cannot deadlock. The timeout applies to the whole set.
+    Files shared by all clusters are locked separately with
+    ``shared_lock_path``, for as short a time as possible.
+
+    Args:
+        root: Directory holding the clusters' files
+        clusters: Names of the clusters to lock
+        timeout: Seconds to wait; None waits forever, 0 fails immediately
+        owner: Name recorded in the leases
+
+    Raises:
+        LockUnavailable: If any cluster stays locked past the timeout
+        ValueError: If two of the clusters map to the same lock file
+    """
+    deadline = None if timeout is None else time.monotonic() + timeout
+    paths = {}
+    for cluster in sorted(set(clusters)):
+        path = cluster_lock_path(root, cluster)
+        if path in paths:
+            raise ValueError(f"Clusters '{paths[path]}' and '{cluster}' share the lock file {path.name}")
+        paths[path] = cluster
+    with ExitStack() as stack:
+        locks = []
+        for path in paths:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            lock = FileLock(path, timeout=remaining, owner=owner)
+            stack.enter_context(lock)
+            locks.append(lock)
+        yield locks
+
+
+def _default_owner() -> str:
+    try:
+        user = getpass.getuser()
+    except (KeyError, OSError):
+        user = str(os.getuid())
+    return f"{user}@{socket.gethostname()}"
@@ -1,9 +1,18 @@
-import shutil
 import tarfile
+import time
 import zipfile
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from enum import Enum
 from pathlib import Path
+from typing import Dict, List, Optional
 import git
 from cluster_snek.config.schema import SourceConfig, DeploymentMode
+from cluster_snek.deployment.bundle import BundleReader, is_bundle
+from cluster_snek.utils.delta_sync import DeltaSync
+from cluster_snek.utils.source_view import (
+    DirectorySourceView, GitSourceView, LazySourceView, open_archive_view
+)
 
 class SourceManager:
     """Manages different source types for airgapped deployments"""
@@ -29,6 +38,45 @@ class SourceManager:
         else:
             raise ValueError(f"Unsupported deployment mode: {self.config.type}")
     
+    def open_view(self, cache_bytes: int = 64 * 1024 * 1024) -> LazySourceView:
+        """Expose the source through a lazy read-only view.
+
+        Local directories, mounted shares and local archives are read in
+        place; git sources are cloned bare so blobs are only read when opened.
+        Sources that can only be downloaded fall back to an eager fetch.
+        """
+        cache_dir = self.temp_dir / "view-cache"
+        return LazySourceView(self._open_base_view(), cache_dir, cache_bytes=cache_bytes)
+
+    def _open_base_view(self):
+        """Pick the view implementation for the configured mode"""
+        if self.config.type == DeploymentMode.AIRGAPPED_LOCAL and self.config.path:
+            return DirectorySourceView(self.config.path)
+        if self.config.type == DeploymentMode.AIRGAPPED_ARCHIVE and self.config.path:
+            return open_archive_view(self.config.path)
+        if self.config.type == DeploymentMode.AIRGAPPED_VC:
+            if self.config.path and self.config.path.exists():
+                return GitSourceView(self.config.path)
+            if self.config.url:
+                bare_path = self.local_path / "repositories.git"
+                if not bare_path.exists():
+                    git.Repo.clone_from(
+                        self.config.url,
+                        bare_path,
+                        bare=True,
+                        env={
+                            "GIT_USERNAME": self.config.username or "",
+                            "GIT_PASSWORD": self.config.token or self.config.password or ""
+                        }
+                    )
+                return GitSourceView(bare_path)
+        if self.config.type == DeploymentMode.AIRGAPPED_NETWORK and self.config.url:
+            url = self.config.url
+            mount_point = Path(url[len("file://"):] if url.startswith("file://") else url)
+            if mount_point.is_dir():
+                return DirectorySourceView(mount_point)
+        return DirectorySourceView(self.fetch_sources())
+
     def _fetch_internet_sources(self) -> Path:
         """Use standard internet-based sources"""
         return self.local_path
@@ -48,10 +96,19 @@ class SourceManager:
         return repo_path
     
     def _copy_local_sources(self) -> Path:
-        """Copy from local directory"""
+        """Copy from local directory, transferring only files changed since the last run"""
         if self.config.path and self.config.path.exists():
-            shutil.copytree(self.config.path, self.local_path / "local", dirs_exist_ok=True)
+            self._sync_directory(self.config.path, self.local_path / "local")
         return self.local_path / "local"
+
+    def _sync_directory(self, source: Path, destination: Path) -> None:
+        """Delta-sync a directory tree into the working area"""
+        DeltaSync(
+            source,
+            destination,
+            checksum=self.config.sync_checksums,
+            hardlink=self.config.sync_hardlinks
+        ).sync()
     
     def _fetch_network_sources(self) -> Path:
         """Fetch from network location"""
@@ -68,6 +125,13 @@ class SourceManager:
                 self._mount_network_path(self.config.url, network_path)
         
         return network_path
+
+    def _mount_network_path(self, url: str, network_path: Path) -> None:
+        """Sync from an already-mounted network share (NFS/SMB/SSHFS)"""
+        mount_point = Path(url[len("file://"):] if url.startswith("file://") else url)
+        if not mount_point.is_dir():
+            raise ValueError(f"Network path is not mounted or not a directory: {url}")
+        self._sync_directory(mount_point, network_path)
     
     def _extract_archive_sources(self) -> Path:
         """Extract from archive files"""
@@ -88,8 +152,178 @@ class SourceManager:
         if archive_file.suffix in ['.tar', '.tar.gz', '.tgz']:
             with tarfile.open(archive_file) as tar:
                 tar.extractall(extract_to)
+        elif archive_file.suffix == '.zip' and is_bundle(archive_file):
+            # Bundles hold deduplicated chart blobs; lay them out as a chart repository
+            with BundleReader(archive_file) as bundle:
+                bundle.extract_all(extract_to / "charts")
         elif archive_file.suffix == '.zip':
             with zipfile.ZipFile(archive_file) as zip_file:
                 zip_file.extractall(extract_to)
         else:
             raise ValueError(f"Unsupported archive format: {archive_file.suffix}")
+
+
+class FetchStatus(Enum):
+    """Outcome of fetching a single named source"""
+    OK = "ok"
+    FAILED = "failed"
+    TIMEOUT = "timeout"
+
+
+@dataclass
+class SourceFetchResult:
+    """Result of fetching one named source"""
+    name: str
+    status: FetchStatus
+    path: Optional[Path] = None
+    error: Optional[str] = None
+    duration: float = 0.0
+
+
+@dataclass
+class SourceFetchReport:
+    """Combined status report for a multi-source fetch"""
+    results: Dict[str, SourceFetchResult] = field(default_factory=dict)
+    elapsed: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        """True if every source was fetched successfully"""
+        return all(r.status == FetchStatus.OK for r in self.results.values())
+
+    @property
+    def failed(self) -> List[SourceFetchResult]:
+        """Sources that failed or timed out"""
+        return [r for r in self.results.values() if r.status != FetchStatus.OK]
+
+    def paths(self) -> Dict[str, Path]:
+        """Local paths of the successfully fetched sources, by name"""
+        return {
+            name: r.path for name, r in self.results.items()
+            if r.status == FetchStatus.OK and r.path is not None
+        }
+
+    def summary(self) -> str:
+        """Human readable one-line-per-source summary"""
+        lines = [f"Fetched {len(self.results)} source(s) in {self.elapsed:.2f}s"]
+        for name in sorted(self.results):
+            r = self.results[name]
+            line = f"  {name}: {r.status.value} ({r.duration:.2f}s)"
+            if r.error:
+                line += f" - {r.error}"
+            lines.append(line)
+        return "\n".join(lines)
+
+
+class MultiSourceManager:
+    """Fetches several named sources concurrently with bounded parallelism.
+
+    Each source is fetched by its own ``SourceManager`` into
+    ``temp_dir / <name>`` so independent sources never share a directory.
+    Fetches are I/O bound (git clones, copies, downloads), so a thread pool
+    is used and total wall time approaches the slowest source rather than
+    the sum of all of them.
+
+    A source whose fetch runs longer than its timeout is reported as
+    ``FetchStatus.TIMEOUT`` and abandoned; the worker thread cannot be
+    killed, so it finishes in the background but its result is discarded.
+    """
+
+    def __init__(self, sources: Dict[str, SourceConfig], temp_dir: Path,
+                 max_workers: int = 4, default_timeout: Optional[float] = None):
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        self.sources = sources
+        self.temp_dir = temp_dir
+        self.max_workers = max_workers
+        self.default_timeout = default_timeout
+
+    def fetch_sources(self) -> SourceFetchReport:
+        """Fetch all configured sources and return a combined report"""
+        started = time.monotonic()
+        report = SourceFetchReport()
+        start_times: Dict[str, float] = {}
+
+        executor = ThreadPoolExecutor(
+            max_workers=min(self.max_workers, max(len(self.sources), 1)),
+            thread_name_prefix="source-fetch"
+        )
+        try:
+            futures: Dict[Future, str] = {
+                executor.submit(self._fetch_one, name, config, start_times): name
+                for name, config in self.sources.items()
+            }
+            pending = set(futures)
+            while pending:
+                done, pending = wait(
+                    pending,
+                    timeout=self._next_wakeup(pending, futures, start_times),
+                    return_when=FIRST_COMPLETED
+                )
+                for future in done:
+                    result = future.result()
+                    report.results[result.name] = result
+
+                now = time.monotonic()
+                for future in list(pending):
+                    name = futures[future]
+                    timeout = self._timeout_for(name)
+                    begun = start_times.get(name)
+                    if timeout is not None and begun is not None and now - begun >= timeout:
+                        future.cancel()
+                        pending.discard(future)
+                        report.results[name] = SourceFetchResult(
+                            name=name,
+                            status=FetchStatus.TIMEOUT,
+                            error=f"Timed out after {timeout:g}s",
+                            duration=now - begun
+                        )
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        report.elapsed = time.monotonic() - started
+        return report
+
+    def _fetch_one(self, name: str, config: SourceConfig,
+                   start_times: Dict[str, float]) -> SourceFetchResult:
+        """Fetch a single source, converting errors into a failed result"""
+        begun = time.monotonic()
+        start_times[name] = begun
+        try:
+            source_dir = self.temp_dir / name
+            source_dir.mkdir(parents=True, exist_ok=True)
+            path = SourceManager(config, source_dir).fetch_sources()
+        except Exception as e:
+            return SourceFetchResult(
+                name=name,
+                status=FetchStatus.FAILED,
+                error=str(e),
+                duration=time.monotonic() - begun
+            )
+        return SourceFetchResult(
+            name=name,
+            status=FetchStatus.OK,
+            path=path,
+            duration=time.monotonic() - begun
+        )
+
+    def _timeout_for(self, name: str) -> Optional[float]:
+        """Per-source timeout, falling back to the manager default"""
+        timeout = self.sources[name].timeout
+        return timeout if timeout is not None else self.default_timeout
+
+    def _next_wakeup(self, pending: set, futures: Dict[Future, str],
+                     start_times: Dict[str, float]) -> Optional[float]:
+        """Seconds until the earliest running source would time out"""
+        now = time.monotonic()
+        wakeup: Optional[float] = None
+        for future in pending:
+            name = futures[future]
+            timeout = self._timeout_for(name)
+            if timeout is None:
+                continue
+            begun = start_times.get(name)
+            # Queued sources have no start time yet; poll until they begin
+            remaining = 0.05 if begun is None else max(begun + timeout - now, 0.0)
+            wakeup = remaining if wakeup is None else min(wakeup, remaining)
+        return wakeup
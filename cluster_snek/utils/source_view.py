@@ -0,0 +1,426 @@
+"""Lazy, read-only views over source trees.
+
+Local directories, tar/zip archives, cluster-snek bundles and git repositories
+are exposed through a single ``SourceView`` API addressed by POSIX-style
+relative paths. Nothing is copied or extracted up front: ``LazySourceView``
+materializes a file into its cache directory only when a caller needs a real
+path, and keeps recently read files in a small in-memory LRU.
+
+Compressed tar archives cannot be read at random; see ``TarSourceView``.
+"""
+
+import fnmatch
+import hashlib
+import io
+import os
+import posixpath
+import tarfile
+import threading
+import zipfile
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+
+def normalize_path(path: str) -> str:
+    """Normalize a virtual path to the canonical relative form.
+
+    Args:
+        path: Path such as ``./charts/cilium/Chart.yaml``
+
+    Returns:
+        str: Path without leading ``./`` or ``/``
+
+    Raises:
+        ValueError: If the path escapes the view root
+    """
+    normalized = posixpath.normpath(path.replace("\\", "/")).lstrip("/")
+    if normalized == ".." or normalized.startswith("../"):
+        raise ValueError(f"Path escapes source root: {path}")
+    return "" if normalized == "." else normalized
+
+
+class SourceView(ABC):
+    """Read-only view over a tree of files."""
+
+    @abstractmethod
+    def list_files(self) -> List[str]:
+        """Return every file path in the view."""
+
+    @abstractmethod
+    def read_bytes(self, path: str) -> bytes:
+        """Return the contents of a file.
+
+        Raises:
+            FileNotFoundError: If the path is not a file in the view
+        """
+
+    def exists(self, path: str) -> bool:
+        """Check whether a file exists in the view."""
+        return normalize_path(path) in set(self.list_files())
+
+    def read_text(self, path: str, encoding: str = "utf-8") -> str:
+        """Return the decoded contents of a file."""
+        return self.read_bytes(path).decode(encoding)
+
+    def read_files(self, paths: Iterable[str]) -> Iterator[Tuple[str, bytes]]:
+        """Read several files, yielding ``(normalized path, contents)``.
+
+        Views that read sequentially yield the files in storage order, so
+        the order may differ from ``paths``.
+
+        Raises:
+            FileNotFoundError: If a path is not a file in the view
+        """
+        for path in paths:
+            yield normalize_path(path), self.read_bytes(path)
+
+    def open(self, path: str) -> BinaryIO:
+        """Open a file for binary reading."""
+        return io.BytesIO(self.read_bytes(path))
+
+    def glob(self, pattern: str) -> List[str]:
+        """Return file paths matching a shell-style pattern."""
+        return [p for p in self.list_files() if fnmatch.fnmatchcase(p, pattern)]
+
+    def local_path(self, path: str) -> Optional[Path]:
+        """Return an on-disk path for the file if one already exists."""
+        return None
+
+
+class DirectorySourceView(SourceView):
+    """View over a directory on a local or mounted filesystem."""
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+
+    def list_files(self) -> List[str]:
+        files = []
+        for dirpath, _, filenames in os.walk(self.root):
+            rel_dir = Path(dirpath).relative_to(self.root).as_posix()
+            for filename in filenames:
+                files.append(filename if rel_dir == "." else f"{rel_dir}/{filename}")
+        return sorted(files)
+
+    def exists(self, path: str) -> bool:
+        return (self.root / normalize_path(path)).is_file()
+
+    def read_bytes(self, path: str) -> bytes:
+        target = self.root / normalize_path(path)
+        if not target.is_file():
+            raise FileNotFoundError(path)
+        return target.read_bytes()
+
+    def local_path(self, path: str) -> Optional[Path]:
+        target = self.root / normalize_path(path)
+        return target if target.is_file() else None
+
+
+class TarSourceView(SourceView):
+    """View over a tar archive (optionally compressed).
+
+    Member headers are indexed in one streaming pass. In an uncompressed
+    archive each member is then read by seeking straight to its data. A
+    compressed stream cannot be seeked, so each ``read_bytes`` decompresses
+    from the start up to its member: read several files with
+    ``read_files``, which fetches them all in a single pass in archive order.
+    """
+
+    def __init__(self, archive_path: Path):
+        self.archive_path = Path(archive_path)
+        self._lock = threading.Lock()
+        self.compressed = _is_compressed_tar(self.archive_path)
+        # Path -> (data offset, size), in archive order; later duplicates win
+        self._members: Dict[str, Tuple[int, int]] = {}
+        with tarfile.open(self.archive_path, "r|*") as tar:
+            for member in tar:
+                if member.isfile():
+                    self._members[normalize_path(member.name)] = (member.offset_data, member.size)
+        self._file: Optional[BinaryIO] = None if self.compressed else open(self.archive_path, "rb")
+
+    def list_files(self) -> List[str]:
+        return sorted(self._members)
+
+    def exists(self, path: str) -> bool:
+        return normalize_path(path) in self._members
+
+    def read_bytes(self, path: str) -> bytes:
+        for _, data in self.read_files([path]):
+            return data
+        raise FileNotFoundError(path)
+
+    def read_files(self, paths: Iterable[str]) -> Iterator[Tuple[str, bytes]]:
+        wanted = {normalize_path(p) for p in paths}
+        missing = wanted - self._members.keys()
+        if missing:
+            raise FileNotFoundError(sorted(missing)[0])
+        if self._file is not None:
+            for key in sorted(wanted, key=lambda k: self._members[k][0]):
+                offset, size = self._members[key]
+                with self._lock:
+                    self._file.seek(offset)
+                    data = self._file.read(size)
+                yield key, data
+            return
+        with tarfile.open(self.archive_path, "r|*") as tar:
+            for member in tar:
+                key = normalize_path(member.name)
+                # Only the last copy of a duplicated path counts
+                if key in wanted and member.isfile() and member.offset_data == self._members[key][0]:
+                    handle = tar.extractfile(member)
+                    yield key, handle.read() if handle else b""
+                    wanted.discard(key)
+                    if not wanted:
+                        return
+
+    def close(self) -> None:
+        """Close the underlying archive."""
+        if self._file is not None:
+            self._file.close()
+
+
+class ZipSourceView(SourceView):
+    """View over a zip archive with random member access."""
+
+    def __init__(self, archive_path: Path):
+        self.archive_path = Path(archive_path)
+        self._lock = threading.Lock()
+        self._zip = zipfile.ZipFile(self.archive_path)
+        self._members: Dict[str, str] = {
+            normalize_path(info.filename): info.filename
+            for info in self._zip.infolist() if not info.is_dir()
+        }
+
+    def list_files(self) -> List[str]:
+        return sorted(self._members)
+
+    def exists(self, path: str) -> bool:
+        return normalize_path(path) in self._members
+
+    def read_bytes(self, path: str) -> bytes:
+        name = self._members.get(normalize_path(path))
+        if name is None:
+            raise FileNotFoundError(path)
+        with self._lock:
+            return self._zip.read(name)
+
+    def close(self) -> None:
+        """Close the underlying archive."""
+        self._zip.close()
+
+
+class BundleSourceView(ZipSourceView):
+    """View over a cluster-snek bundle laid out as a chart repository.
+
+    Charts stored as ``blobs/sha256/<digest>`` are exposed as
+    ``charts/<name>-<version>.tgz``, the layout extracted bundles use, and
+    each read is checked against its digest.
+    """
+
+    def __init__(self, archive_path: Path):
+        from cluster_snek.deployment.bundle import BLOB_PREFIX, BundleReader
+
+        super().__init__(archive_path)
+        with BundleReader(self.archive_path) as bundle:
+            entries = bundle.manifest.charts
+        self._digests = {f"charts/{entry.filename}": entry.digest for entry in entries}
+        self._members = {path: f"{BLOB_PREFIX}{digest}" for path, digest in self._digests.items()}
+
+    def read_bytes(self, path: str) -> bytes:
+        data = super().read_bytes(path)
+        if hashlib.sha256(data).hexdigest() != self._digests[normalize_path(path)]:
+            raise ValueError(f"Checksum mismatch for {path} in {self.archive_path.name}")
+        return data
+
+
+class GitSourceView(SourceView):
+    """View over a git revision, reading blobs straight from the object store."""
+
+    def __init__(self, repo_path: Path, revision: str = "HEAD"):
+        import git
+
+        self.repo = git.Repo(repo_path)
+        self.revision = revision
+        self._tree = self.repo.commit(revision).tree
+        self._lock = threading.Lock()
+
+    def list_files(self) -> List[str]:
+        return sorted(item.path for item in self._tree.traverse() if item.type == "blob")
+
+    def exists(self, path: str) -> bool:
+        return self._blob(path) is not None
+
+    def read_bytes(self, path: str) -> bytes:
+        blob = self._blob(path)
+        if blob is None:
+            raise FileNotFoundError(path)
+        with self._lock:
+            return blob.data_stream.read()
+
+    def _blob(self, path: str):
+        try:
+            item = self._tree / normalize_path(path)
+        except KeyError:
+            return None
+        return item if item.type == "blob" else None
+
+
+class OverlayView(SourceView):
+    """Stack of views; the first layer containing a path wins."""
+
+    def __init__(self, layers: Sequence[SourceView]):
+        self.layers = list(layers)
+
+    def list_files(self) -> List[str]:
+        files = set()
+        for layer in self.layers:
+            files.update(layer.list_files())
+        return sorted(files)
+
+    def exists(self, path: str) -> bool:
+        return any(layer.exists(path) for layer in self.layers)
+
+    def read_bytes(self, path: str) -> bytes:
+        return self._layer_for(path).read_bytes(path)
+
+    def local_path(self, path: str) -> Optional[Path]:
+        return self._layer_for(path).local_path(path)
+
+    def _layer_for(self, path: str) -> SourceView:
+        for layer in self.layers:
+            if layer.exists(path):
+                return layer
+        raise FileNotFoundError(path)
+
+
+class LazySourceView(SourceView):
+    """Caching front for a view that materializes files only on demand.
+
+    Reads are served from an LRU of recently used files bounded by
+    ``cache_bytes``. ``materialize`` writes a file into ``cache_dir`` the first
+    time a caller needs a real filesystem path (e.g. to hand to ``helm``).
+    """
+
+    def __init__(self, view: SourceView, cache_dir: Path, cache_bytes: int = 64 * 1024 * 1024):
+        self.view = view
+        self.cache_dir = Path(cache_dir)
+        self.cache_bytes = cache_bytes
+        self._lru: "OrderedDict[str, bytes]" = OrderedDict()
+        self._lru_size = 0
+        self._lock = threading.Lock()
+        self._files: Optional[List[str]] = None
+
+    def list_files(self) -> List[str]:
+        if self._files is None:
+            self._files = self.view.list_files()
+        return self._files
+
+    def exists(self, path: str) -> bool:
+        return self.view.exists(path)
+
+    def read_bytes(self, path: str) -> bytes:
+        key = normalize_path(path)
+        with self._lock:
+            if key in self._lru:
+                self._lru.move_to_end(key)
+                return self._lru[key]
+        data = self.view.read_bytes(key)
+        self._remember(key, data)
+        return data
+
+    def read_files(self, paths: Iterable[str]) -> Iterator[Tuple[str, bytes]]:
+        return self.view.read_files(paths)
+
+    def local_path(self, path: str) -> Optional[Path]:
+        return self.view.local_path(path)
+
+    def materialize(self, path: str) -> Path:
+        """Return a real path for a file, writing it to the cache if needed.
+
+        Raises:
+            FileNotFoundError: If the path is not a file in the view
+        """
+        key = normalize_path(path)
+        existing = self.view.local_path(key)
+        if existing is not None:
+            return existing
+        return self._cache_file(key)
+
+    def materialize_tree(self, prefix: str) -> Path:
+        """Materialize every file under a directory prefix and return its path.
+
+        If all files already live under one on-disk root (a directory source)
+        that directory is returned as is; otherwise the files are written to
+        the cache directory.
+
+        Raises:
+            FileNotFoundError: If no file lives under the prefix
+        """
+        key = normalize_path(prefix).rstrip("/")
+        members = [p for p in self.list_files() if p.startswith(f"{key}/")]
+        if not members:
+            raise FileNotFoundError(prefix)
+
+        roots = set()
+        for member in members:
+            local = self.view.local_path(member)
+            roots.add(Path(str(local)[: -len(member) - 1]) if local else None)
+        if len(roots) == 1 and None not in roots:
+            return roots.pop() / key
+
+        # One read_files call, so a compressed archive is decompressed once
+        missing = [m for m in members if not (self.cache_dir / m).is_file()]
+        for member, data in self.view.read_files(missing):
+            self._write_cache(member, data)
+        return self.cache_dir / key
+
+    def _cache_file(self, key: str) -> Path:
+        target = self.cache_dir / key
+        if not target.is_file():
+            self._write_cache(key, self.read_bytes(key))
+        return target
+
+    def _write_cache(self, key: str, data: bytes) -> None:
+        target = self.cache_dir / key
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp = target.with_name(f".{target.name}.{threading.get_ident()}.tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, target)
+
+    def _remember(self, key: str, data: bytes) -> None:
+        if len(data) > self.cache_bytes:
+            return
+        with self._lock:
+            if key in self._lru:
+                return
+            self._lru[key] = data
+            self._lru_size += len(data)
+            while self._lru_size > self.cache_bytes:
+                _, evicted = self._lru.popitem(last=False)
+                self._lru_size -= len(evicted)
+
+
+def open_archive_view(archive_path: Path) -> SourceView:
+    """Open the appropriate view for an archive file.
+
+    Raises:
+        ValueError: If the archive format is not supported
+    """
+    from cluster_snek.deployment.bundle import is_bundle
+
+    name = Path(archive_path).name
+    if name.endswith(".zip"):
+        return BundleSourceView(archive_path) if is_bundle(archive_path) else ZipSourceView(archive_path)
+    if name.endswith((".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tar.xz")):
+        return TarSourceView(archive_path)
+    raise ValueError(f"Unsupported archive format: {name}")
+
+
+def _is_compressed_tar(archive_path: Path) -> bool:
+    """Whether a tar archive is wrapped in gzip, bzip2 or xz"""
+    try:
+        with tarfile.open(archive_path, "r:"):
+            return False
+    except tarfile.ReadError:
+        return True
@@ -0,0 +1,326 @@
+"""Watch configuration inputs and work out which clusters they affect.
+
+``FileWatcher`` reports batches of changed paths under a set of files and
+directories. On Linux it uses inotify through ctypes, so an idle watch costs
+nothing; elsewhere, or when inotify is unavailable, it falls back to polling
+modification times. Events are debounced: a batch is only returned once the
+inputs have been quiet for a moment, so an editor's save-and-rename or a
+``git checkout`` yields one regeneration rather than dozens.
+
+``cluster_digests`` and ``changed_clusters`` decide which clusters need to be
+regenerated for a batch of changes.
+"""
+
+import ctypes
+import ctypes.util
+import hashlib
+import json
+import os
+import select
+import struct
+import sys
+import time
+from dataclasses import asdict, is_dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+DEFAULT_DEBOUNCE = 0.3
+DEFAULT_POLL_INTERVAL = 1.0
+
+# Editor swap and backup files that never affect generation
+IGNORED_SUFFIXES = (".swp", ".swx", ".swo", "~", ".tmp")
+IGNORED_PREFIXES = (".#",)
+
+_IN_ATTRIB = 0x00000004
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_DELETE_SELF = 0x00000400
+_IN_MOVE_SELF = 0x00000800
+_IN_Q_OVERFLOW = 0x00004000
+_IN_ISDIR = 0x40000000
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+_WATCH_MASK = (_IN_ATTRIB | _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO
+               | _IN_CREATE | _IN_DELETE | _IN_DELETE_SELF | _IN_MOVE_SELF)
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+def _ignored(path: Path) -> bool:
+    name = path.name
+    return name.endswith(IGNORED_SUFFIXES) or name.startswith(IGNORED_PREFIXES)
+
+
+class _Targets:
+    """Watched files and directories, and which paths belong to them"""
+
+    def __init__(self, paths: Iterable[Path]):
+        self.files: Set[Path] = set()
+        self.dirs: Set[Path] = set()
+        for path in paths:
+            path = Path(path).absolute()
+            (self.dirs if path.is_dir() else self.files).add(path)
+
+    def watched_dirs(self) -> Set[Path]:
+        """Directories to watch: file parents and directory trees"""
+        dirs = {f.parent for f in self.files if f.parent.is_dir()}
+        for root in self.dirs:
+            for current, subdirs, _ in os.walk(root):
+                subdirs[:] = [d for d in subdirs if not d.startswith(".")]
+                dirs.add(Path(current))
+        return dirs
+
+    def relevant(self, path: Path) -> bool:
+        if _ignored(path):
+            return False
+        return path in self.files or any(root == path or root in path.parents for root in self.dirs)
+
+    def all_paths(self) -> Set[Path]:
+        return self.files | self.dirs
+
+
+class _InotifyBackend:
+    """Change notifications from the Linux kernel"""
+
+    def __init__(self, targets: _Targets):
+        libc_name = ctypes.util.find_library("c")
+        if not sys.platform.startswith("linux") or not libc_name:
+            raise OSError("inotify is only available on Linux")
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        self._targets = targets
+        fd = self._libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._fd = fd
+        self._watches: Dict[int, Path] = {}
+        try:
+            for directory in targets.watched_dirs():
+                self._add_watch(directory)
+        except OSError:
+            self.close()
+            raise
+
+    def _add_watch(self, directory: Path) -> None:
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), _WATCH_MASK)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f"Cannot watch {directory}")
+        self._watches[wd] = directory
+
+    def read(self, timeout: Optional[float]) -> Set[Path]:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            ready, _, _ = select.select([self._fd], [], [], remaining)
+            if not ready:
+                return set()
+            # Events for unrelated files in a watched directory do not count
+            changed = self._read_events()
+            if changed:
+                return changed
+
+    def _read_events(self) -> Set[Path]:
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return set()
+        changed: Set[Path] = set()
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b"\0")
+            offset += length
+            if mask & _IN_Q_OVERFLOW:
+                return self._targets.all_paths()
+            directory = self._watches.get(wd)
+            if directory is None:
+                continue
+            path = directory / os.fsdecode(name) if name else directory
+            if mask & _IN_ISDIR and mask & (_IN_CREATE | _IN_MOVED_TO) and self._targets.relevant(path):
+                # New subdirectory of a watched tree: watch it, and report files
+                # created in it before the watch was in place
+                for current, _, files in os.walk(path):
+                    try:
+                        self._add_watch(Path(current))
+                    except OSError:
+                        continue  # removed again before it could be watched
+                    changed.update(Path(current) / f for f in files if not _ignored(Path(f)))
+            if self._targets.relevant(path):
+                changed.add(path)
+        return changed
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+class _PollingBackend:
+    """Change detection by comparing modification times"""
+
+    def __init__(self, targets: _Targets, poll_interval: float = DEFAULT_POLL_INTERVAL):
+        self._targets = targets
+        self._poll_interval = poll_interval
+        self._state = self._scan()
+
+    def _scan(self) -> Dict[Path, Tuple[int, int]]:
+        state = {}
+        paths: List[Path] = list(self._targets.files)
+        for root in self._targets.dirs:
+            for current, subdirs, files in os.walk(root):
+                subdirs[:] = [d for d in subdirs if not d.startswith(".")]
+                paths.extend(Path(current) / f for f in files)
+        for path in paths:
+            if _ignored(path):
+                continue
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                continue
+            state[path] = (st.st_mtime_ns, st.st_size)
+        return state
+
+    def read(self, timeout: Optional[float]) -> Set[Path]:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            current = self._scan()
+            changed = {
+                path for path in current.keys() | self._state.keys()
+                if current.get(path) != self._state.get(path)
+            }
+            self._state = current
+            if changed:
+                return changed
+            if deadline is not None and time.monotonic() >= deadline:
+                return set()
+            wait = self._poll_interval
+            if deadline is not None:
+                wait = min(wait, max(0.0, deadline - time.monotonic()))
+            time.sleep(wait)
+
+    def close(self) -> None:
+        pass
+
+
+class FileWatcher:
+    """Debounced change notifications for files and directory trees."""
+
+    def __init__(
+        self,
+        paths: Iterable[Path],
+        debounce: float = DEFAULT_DEBOUNCE,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+        use_inotify: bool = True
+    ):
+        """Start watching.
+
+        Args:
+            paths: Files and directories to watch; directories recursively
+            debounce: Seconds without further changes before a batch is reported
+            poll_interval: Seconds between scans when polling
+            use_inotify: Try inotify before falling back to polling
+        """
+        self.debounce = debounce
+        targets = _Targets(paths)
+        self._backend = None
+        if use_inotify:
+            try:
+                self._backend = _InotifyBackend(targets)
+            except (OSError, AttributeError):
+                self._backend = None
+        if self._backend is None:
+            self._backend = _PollingBackend(targets, poll_interval)
+
+    @property
+    def backend(self) -> str:
+        return "inotify" if isinstance(self._backend, _InotifyBackend) else "polling"
+
+    def __enter__(self) -> "FileWatcher":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def wait(self, timeout: Optional[float] = None) -> Set[Path]:
+        """Block until inputs change and settle.
+
+        Args:
+            timeout: Seconds to wait for the first change; None waits forever
+
+        Returns:
+            Set[Path]: Changed paths, empty if the timeout expired first
+        """
+        changed = self._backend.read(timeout)
+        if not changed:
+            return set()
+        while True:
+            more = self._backend.read(self.debounce)
+            if not more:
+                return changed
+            changed |= more
+
+    def close(self) -> None:
+        self._backend.close()
+
+
+def _digest(value: Any) -> str:
+    if is_dataclass(value) and not isinstance(value, type):
+        value = asdict(value)
+    elif hasattr(value, "__dict__") and not isinstance(value, dict):
+        value = vars(value)
+    canonical = json.dumps(value, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def cluster_digests(configuration: Any) -> Dict[str, str]:
+    """Digest of each cluster's own settings, plus ``""`` for everything else.
+
+    Args:
+        configuration: Loaded configuration with a ``clusters`` list
+
+    Returns:
+        Dict[str, str]: Cluster name to digest; the ``""`` key covers the
+        settings shared by all clusters
+    """
+    digests = {cluster.name: _digest(cluster) for cluster in configuration.clusters}
+    shared = {key: value for key, value in vars(configuration).items() if key != "clusters"}
+    digests[""] = _digest(shared)
+    return digests
+
+
+def changed_clusters(
+    before: Dict[str, str],
+    after: Dict[str, str],
+    changed_paths: Iterable[Path] = (),
+    config_paths: Iterable[Path] = ()
+) -> Set[str]:
+    """Clusters whose inputs changed between two sets of digests.
+
+    A change to the shared settings, or to the set of clusters, affects
+    every cluster. A changed file
+    other than the configuration files affects only the clusters named by a
+    component of its path (``values/lab/cilium.yaml`` affects ``lab``), or
+    every cluster when it names none.
+
+    Args:
+        before: ``cluster_digests`` of the previous configuration
+        after: ``cluster_digests`` of the new configuration
+        changed_paths: Files reported by the watcher
+        config_paths: Configuration files, whose effect the digests capture
+    """
+    clusters = {name for name in after if name}
+    if before.get("") != after.get("") or before.keys() != after.keys():
+        return clusters
+    changed = {name for name in clusters if before.get(name) != after[name]}
+    config_paths = {Path(p).absolute() for p in config_paths}
+    for path in changed_paths:
+        path = Path(path).absolute()
+        if path in config_paths:
+            continue
+        named = clusters.intersection(path.parts)
+        if not named:
+            return clusters
+        changed |= named
+    return changed
@@ -0,0 +1,182 @@
+"""Offline benchmark harness.
+
+Benchmarks are skipped unless ``CLUSTER_SNEK_BENCHMARK=1`` is set. Each one
+times a callable over several rounds and compares the fastest round with the
+baseline stored in ``baselines.json``; running slower than the baseline by
+more than the threshold fails the test. The threshold comes from the
+baselines file and can be overridden with ``CLUSTER_SNEK_BENCHMARK_THRESHOLD``
+(0.3 allows 30% slower).
+
+To refresh the baselines on the reference runner:
+
+    CLUSTER_SNEK_BENCHMARK=1 CLUSTER_SNEK_BENCHMARK_UPDATE=1 pytest tests/benchmarks
+
+Baselines of benchmarks that no longer exist in a collected module are
+listed in the summary as stale, and dropped when refreshing.
+"""
+
+import json
+import os
+import statistics
+import time
+from pathlib import Path
+
+import pytest # type: ignore
+
+BASELINES_PATH = Path(__file__).with_name("baselines.json")
+DEFAULT_THRESHOLD = 0.3
+DEFAULT_ROUNDS = 5
+# Absolute slack so timer noise cannot fail sub-millisecond benchmarks
+MIN_SLACK = 0.001
+
+_results = {}
+_collected = set()
+
+
+def _enabled(name):
+    return os.environ.get(name, "").lower() in ("1", "true", "yes", "on")
+
+
+def _load_baselines():
+    try:
+        with open(BASELINES_PATH, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {"threshold": DEFAULT_THRESHOLD, "benchmarks": {}}
+
+
+class Benchmark:
+    """Times a callable and checks it against its stored baseline"""
+
+    def __init__(self, name, baseline, threshold):
+        self.name = name
+        self.baseline = baseline
+        self.threshold = threshold
+        self.times = []
+        self.extra = {}
+
+    def __call__(self, func, *args, **kwargs):
+        """Run ``func`` once to warm up, then time DEFAULT_ROUNDS calls."""
+        func(*args, **kwargs)
+        return self.pedantic(func, args=args, kwargs=kwargs, rounds=DEFAULT_ROUNDS)
+
+    def pedantic(self, func, args=(), kwargs=None, setup=None, rounds=1):
+        """Time ``rounds`` calls, calling ``setup`` untimed before each.
+
+        ``setup`` may return an ``(args, kwargs)`` pair to call ``func`` with.
+        """
+        result = None
+        for _ in range(rounds):
+            call_args, call_kwargs = args, kwargs or {}
+            if setup is not None:
+                prepared = setup()
+                if prepared is not None:
+                    call_args, call_kwargs = prepared
+            started = time.perf_counter()
+            result = func(*call_args, **call_kwargs)
+            self.times.append(time.perf_counter() - started)
+        self._check()
+        return result
+
+    @property
+    def stats(self):
+        return {
+            "min": min(self.times),
+            "median": statistics.median(self.times),
+            "rounds": len(self.times),
+            **self.extra,
+        }
+
+    def _check(self):
+        _results[self.name] = self
+        if self.baseline is None or _enabled("CLUSTER_SNEK_BENCHMARK_UPDATE"):
+            return
+        limit = max(self.baseline["min"] * (1 + self.threshold), self.baseline["min"] + MIN_SLACK)
+        fastest = min(self.times)
+        assert fastest <= limit, (
+            f"{self.name} regressed: {fastest * 1000:.2f}ms against a baseline of "
+            f"{self.baseline['min'] * 1000:.2f}ms (limit {limit * 1000:.2f}ms)"
+        )
+
+
+@pytest.fixture(scope="session")
+def baselines():
+    data = _load_baselines()
+    yield data
+    if _enabled("CLUSTER_SNEK_BENCHMARK_UPDATE") and _results:
+        data.setdefault("benchmarks", {}).update(
+            {name: {"min": round(min(result.times), 6)} for name, result in _results.items()}
+        )
+        for name in _stale(data["benchmarks"]):
+            del data["benchmarks"][name]
+        data["benchmarks"] = dict(sorted(data["benchmarks"].items()))
+        with open(BASELINES_PATH, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+            f.write("\n")
+
+
+@pytest.fixture
+def benchmark(request, baselines):
+    if not _enabled("CLUSTER_SNEK_BENCHMARK"):
+        pytest.skip("benchmarks run only with CLUSTER_SNEK_BENCHMARK=1")
+    name = f"{request.node.module.__name__}::{request.node.name}"
+    threshold = float(os.environ.get(
+        "CLUSTER_SNEK_BENCHMARK_THRESHOLD", baselines.get("threshold", DEFAULT_THRESHOLD)
+    ))
+    return Benchmark(name, baselines.get("benchmarks", {}).get(name), threshold)
+
+
+def synthetic_structure(nodes, fanout=10):
+    """Balanced project structure with ``nodes`` directories and files in total"""
+    entries = [{} for _ in range(nodes + 1)]
+    for i in range(nodes, 0, -1):
+        parent = entries[(i - 1) // fanout]
+        if i * fanout + 1 <= nodes:
+            parent[f"pkg_{i}"] = entries[i]
+        elif i % 2:
+            parent[f"module_{i}.py"] = f"Module {i}"
+        else:
+            parent[f"notes_{i}.md"] = f"# Notes {i}\n"
+    return entries[0]
+
+
+@pytest.fixture
+def make_structure():
+    return synthetic_structure
+
+
+def _stale(baselines):
+    """Baselines of collected modules that have no matching benchmark"""
+    modules = {name.split("::")[0] for name in _collected}
+    return sorted(
+        name for name in baselines
+        if name.split("::")[0] in modules and name not in _collected
+    )
+
+
+def pytest_itemcollected(item):
+    # Called before deselection, so -k runs do not make baselines look stale
+    if "benchmark" in getattr(item, "fixturenames", ()):
+        _collected.add(f"{item.module.__name__}::{item.name}")
+
+
+def pytest_terminal_summary(terminalreporter):
+    if not _results:
+        return
+    baselines = _load_baselines().get("benchmarks", {})
+    stale = _stale(baselines)
+    if stale:
+        terminalreporter.section("stale benchmark baselines")
+        for name in stale:
+            terminalreporter.write_line(name)
+    terminalreporter.section("benchmarks")
+    for name, result in sorted(_results.items()):
+        stats = result.stats
+        baseline = baselines.get(name)
+        versus = f"{stats['min'] / baseline['min']:.2f}x baseline" if baseline else "no baseline"
+        extra = "".join(f"  {key}={value}" for key, value in stats.items()
+                        if key not in ("min", "median", "rounds"))
+        terminalreporter.write_line(
+            f"{name:<70} min {stats['min'] * 1000:9.2f}ms  "
+            f"median {stats['median'] * 1000:9.2f}ms  {versus}{extra}"
+        )
@@ -0,0 +1,54 @@
+import hashlib
+import os
+
+import pytest # type: ignore
+
+import cluster_snek.deployment.modes as modes
+import cluster_snek.deployment.verification_cache as verification_cache
+
+ARCHIVE_SIZE = 256 * 1024 * 1024
+MANIFEST_FILES = 2_000
+
+
+@pytest.fixture(scope="module")
+def archive(tmp_path_factory):
+    path = tmp_path_factory.mktemp("archive") / "bundle.tar.gz"
+    block = os.urandom(1024 * 1024)
+    with open(path, "wb") as f:
+        for _ in range(ARCHIVE_SIZE // len(block)):
+            f.write(block)
+    with open(path, "rb") as f:
+        digest = hashlib.file_digest(f, "sha256").hexdigest()
+    return path, {path.name: digest}
+
+
+@pytest.mark.parametrize("algorithm", ["sha256", "sha512", "blake2b"])
+def test_hash_file_throughput(benchmark, archive, algorithm):
+    path, _ = archive
+    benchmark(modes.hash_file, path, algorithm)
+    benchmark.extra["MB/s"] = round(ARCHIVE_SIZE / 1e6 / min(benchmark.times))
+
+
+def test_verify_checksums_uncached(benchmark, archive):
+    path, checksums = archive
+    assert benchmark(modes.ArchiveVerifier.verify_checksums, path, checksums)
+    benchmark.extra["MB/s"] = round(ARCHIVE_SIZE / 1e6 / min(benchmark.times))
+
+
+def test_verify_checksums_cached(benchmark, archive, tmp_path):
+    path, checksums = archive
+    cache = verification_cache.VerificationCache(tmp_path / "verification.json")
+    modes.ArchiveVerifier.verify_checksums(path, checksums, cache=cache)
+    assert benchmark(modes.ArchiveVerifier.verify_checksums, path, checksums, cache=cache)
+
+
+def test_verify_manifest(benchmark, tmp_path):
+    lines = []
+    for i in range(MANIFEST_FILES):
+        data = f"chart {i}\n".encode() * 512
+        (tmp_path / f"chart-{i}.tgz").write_bytes(data)
+        lines.append(f"{hashlib.sha256(data).hexdigest()}  chart-{i}.tgz")
+    manifest = tmp_path / "SHA256SUMS"
+    manifest.write_text("\n".join(lines) + "\n")
+    report = benchmark(modes.ArchiveVerifier.verify_manifest, manifest)
+    assert report.ok
@@ -0,0 +1,25 @@
+import pytest # type: ignore
+
+import cluster_snek.generators.infrastructure as infrastructure
+import cluster_snek.config.schema as schema
+import cluster_snek.iac.generate_secrets as generate_secrets
+
+
+@pytest.mark.parametrize("size", list(schema.ClusterSize), ids=lambda size: size.value)
+def test_infrastructure_generate_per_cluster(benchmark, tmp_path, size):
+    generator = infrastructure.InfrastructureGenerator(
+        use_vms=False, ip_pool_start="10.0.0.100", ip_pool_end="10.0.0.150"
+    )
+    cluster = schema.ClusterConfig(name=f"bench-{size.value}", domain="bench.lab", size=size)
+    benchmark(generator.generate, cluster, tmp_path / cluster.name)
+    assert (tmp_path / cluster.name / "infrastructure" / "cilium" / "values.yaml").exists()
+
+
+def test_generate_all_secrets(benchmark):
+    secrets = benchmark(generate_secrets.generate_all_secrets, "bench")
+    assert all(secret["metadata"]["namespace"] == "bench" for secret in secrets)
+
+
+def test_generate_secrets_to_files(benchmark, tmp_path, capsys):
+    benchmark(generate_secrets.main, str(tmp_path))
+    assert len(list(tmp_path.glob("*.yaml"))) == 3
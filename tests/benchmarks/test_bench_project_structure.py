@@ -0,0 +1,30 @@
+import pytest # type: ignore
+
+from cluster_snek import generate_project_structure
+
+
+@pytest.mark.parametrize("nodes", [1_000, 10_000, 100_000])
+def test_generate_project_structure(benchmark, tmp_path, make_structure, nodes):
+    structure = make_structure(nodes)
+    runs = iter(range(3))
+
+    def fresh_target():
+        target = tmp_path / f"run{next(runs)}"
+        target.mkdir()
+        return (target, structure), {}
+
+    benchmark.pedantic(
+        generate_project_structure,
+        setup=fresh_target,
+        rounds=3 if nodes < 100_000 else 1
+    )
+
+
+@pytest.mark.parametrize("nodes", [1_000, 10_000, 100_000])
+def test_regenerate_unchanged_project_structure(benchmark, tmp_path, make_structure, nodes):
+    structure = make_structure(nodes)
+    generate_project_structure(tmp_path, structure)
+    benchmark.pedantic(
+        generate_project_structure, args=(tmp_path, structure),
+        rounds=3 if nodes < 100_000 else 1
+    )
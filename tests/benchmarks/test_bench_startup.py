@@ -0,0 +1,43 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest # type: ignore
+import yaml # type: ignore
+
+from cluster_snek import load_project_structure, load_user_settings
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+
+def test_cli_cold_start(benchmark):
+    pytest.importorskip("click")
+    command = [sys.executable, "-m", "cluster_snek.cli.commands.cli", "--help"]
+    benchmark(subprocess.run, command, cwd=REPO_ROOT, capture_output=True, check=True)
+
+
+def test_load_user_settings(benchmark, tmp_path, monkeypatch):
+    monkeypatch.delenv("PROJECT_NAME", raising=False)
+    config = tmp_path / "settings.yaml"
+    config.write_text(yaml.dump({
+        "project_name": "bench",
+        "deployment_mode": "airgapped-vc",
+        "enable_webhooks": "true",
+    }))
+    env = tmp_path / ".env"
+    env.write_text("\n".join(f"VAR_{i}=value{i}" for i in range(200)) + "\nPROJECT_NAME=bench\n")
+    settings = benchmark(load_user_settings, config_path=config, env_path=env)
+    assert settings.project_name == "bench"
+
+
+@pytest.mark.parametrize("suffix", [".yaml", ".json"])
+def test_load_project_structure(benchmark, tmp_path, make_structure, suffix):
+    structure = make_structure(10_000)
+    path = tmp_path / f"project_structure{suffix}"
+    with open(path, "w", encoding="utf-8") as f:
+        if suffix == ".json":
+            json.dump(structure, f)
+        else:
+            yaml.safe_dump(structure, f)
+    assert benchmark(load_project_structure, path) == structure
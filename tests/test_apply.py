@@ -0,0 +1,284 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest # type: ignore
+
+import cluster_snek.deployment.apply as apply
+
+ApplyEngine = apply.ApplyEngine
+ApplyStatus = apply.ApplyStatus
+DependencyGraph = apply.DependencyGraph
+Resource = apply.Resource
+
+
+def _resource(kind, name, namespace=None, api_version="v1", **extra):
+    metadata = {"name": name}
+    if namespace:
+        metadata["namespace"] = namespace
+    body = {"apiVersion": api_version, "kind": kind, "metadata": metadata}
+    body.update(extra)
+    return Resource(body)
+
+
+def _crd(group, kind):
+    return _resource(
+        "CustomResourceDefinition", f"{kind.lower()}s.{group}",
+        api_version="apiextensions.k8s.io/v1",
+        spec={"group": group, "names": {"kind": kind, "plural": f"{kind.lower()}s"},
+              "scope": "Namespaced", "versions": [{"name": "v1alpha1"}]}
+    )
+
+
+def _stack():
+    return [
+        _resource("Application", "apps", "argocd", api_version="argoproj.io/v1alpha1"),
+        _resource("Deployment", "argocd-server", "argocd", api_version="apps/v1"),
+        _resource("ServiceAccount", "argocd-server", "argocd"),
+        _resource("ClusterRole", "argocd-server", api_version="rbac.authorization.k8s.io/v1"),
+        _resource("Namespace", "argocd"),
+        _crd("argoproj.io", "Application"),
+    ]
+
+
+class RecordingApplier:
+    def __init__(self, delay=0.0, fail=()):
+        self.delay = delay
+        self.fail = set(fail)
+        self.order = []
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def apply(self, resource):
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(self.delay)
+        with self._lock:
+            self.active -= 1
+            self.order.append(resource.key)
+        if resource.key in self.fail:
+            raise RuntimeError("rejected")
+
+
+def test_load_manifests_splits_documents_and_lists(tmp_path):
+    (tmp_path / "nested").mkdir()
+    (tmp_path / "a.yaml").write_text(
+        "apiVersion: v1\nkind: Namespace\nmetadata:\n  name: one\n---\n"
+        "apiVersion: v1\nkind: Namespace\nmetadata:\n  name: two\n"
+    )
+    (tmp_path / "nested" / "b.yml").write_text(
+        "apiVersion: v1\nkind: List\nitems:\n"
+        "- apiVersion: v1\n  kind: ConfigMap\n  metadata:\n    name: cm\n    namespace: one\n"
+    )
+    (tmp_path / "notes.txt").write_text("ignored")
+
+    keys = [r.key for r in apply.load_manifests([tmp_path])]
+    assert keys == ["Namespace/one", "Namespace/two", "ConfigMap/one/cm"]
+
+
+def test_graph_orders_crds_namespaces_operators_apps():
+    graph = DependencyGraph(_stack())
+    deps = graph.dependencies
+    assert deps["Application/argocd/apps"] == {
+        "CustomResourceDefinition/applications.argoproj.io",
+        "Namespace/argocd",
+        "Deployment/argocd/argocd-server",
+    }
+    assert deps["Deployment/argocd/argocd-server"] == {
+        "Namespace/argocd",
+        "ServiceAccount/argocd/argocd-server",
+        "ClusterRole/argocd-server",
+    }
+    assert deps["Namespace/argocd"] == set()
+
+
+def test_declared_dependencies_and_cycles():
+    first = _resource("ConfigMap", "first")
+    first.body["metadata"]["annotations"] = {apply.DEPENDS_ON_ANNOTATION: "ConfigMap/second"}
+    second = _resource("ConfigMap", "second")
+    assert DependencyGraph([first, second]).dependencies["ConfigMap/first"] == {"ConfigMap/second"}
+
+    second.body["metadata"]["annotations"] = {apply.DEPENDS_ON_ANNOTATION: "ConfigMap/first"}
+    with pytest.raises(ValueError, match="cycle"):
+        DependencyGraph([first, second])
+    with pytest.raises(ValueError, match="Duplicate"):
+        DependencyGraph([second, _resource("ConfigMap", "second")])
+
+
+def test_engine_respects_dependencies():
+    applier = RecordingApplier()
+    report = ApplyEngine(applier, max_workers=4).apply(_stack())
+
+    assert report.ok
+    position = {key: i for i, key in enumerate(applier.order)}
+    assert position["Namespace/argocd"] < position["ServiceAccount/argocd/argocd-server"]
+    assert position["ServiceAccount/argocd/argocd-server"] < position["Deployment/argocd/argocd-server"]
+    assert position["Deployment/argocd/argocd-server"] < position["Application/argocd/apps"]
+    assert position["CustomResourceDefinition/applications.argoproj.io"] < position["Application/argocd/apps"]
+
+
+def test_engine_applies_independent_resources_concurrently():
+    resources = [_resource("Namespace", f"ns-{i}") for i in range(12)]
+    applier = RecordingApplier(delay=0.1)
+
+    started = time.monotonic()
+    report = ApplyEngine(applier, max_workers=4).apply(resources)
+
+    assert report.ok
+    assert applier.peak == 4
+    assert time.monotonic() - started < 0.8
+
+
+def test_failure_skips_only_dependents():
+    applier = RecordingApplier(fail={"ServiceAccount/argocd/argocd-server"})
+    resources = _stack() + [_resource("Namespace", "unrelated")]
+
+    streamed = []
+    report = ApplyEngine(applier, on_result=streamed.append).apply(resources)
+
+    assert not report.ok
+    assert {r.key: r for r in streamed} == report.results
+    assert [r.key for r in report.failed] == ["ServiceAccount/argocd/argocd-server"]
+    assert {r.key for r in report.skipped} == {
+        "Deployment/argocd/argocd-server", "Application/argocd/apps"
+    }
+    assert report.results["Namespace/unrelated"].status == ApplyStatus.APPLIED
+    assert "1 failed, 2 skipped" in report.summary()
+
+
+class FakeApiServer(BaseHTTPRequestHandler):
+    """Just enough of the Kubernetes API for discovery and server-side apply"""
+
+    core = [
+        {"name": "namespaces", "singularName": "namespace", "namespaced": False,
+         "kind": "Namespace", "verbs": ["get", "patch"]},
+    ]
+    groups = {
+        "apiextensions.k8s.io/v1": [
+            {"name": "customresourcedefinitions", "singularName": "customresourcedefinition",
+             "namespaced": False, "kind": "CustomResourceDefinition", "verbs": ["get", "patch"]},
+        ],
+    }
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, payload, status=200):
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        state = self.server.state
+        if self.path == "/version":
+            return self._send({"major": "1", "minor": "30", "gitVersion": "v1.30.0"})
+        if self.path == "/api":
+            return self._send({"kind": "APIVersions", "versions": ["v1"]})
+        if self.path == "/api/v1":
+            return self._send({"kind": "APIResourceList", "groupVersion": "v1", "resources": self.core})
+        if self.path == "/apis":
+            groups = []
+            for group_version in state["groups"]:
+                group, version = group_version.split("/")
+                entry = {"groupVersion": group_version, "version": version}
+                groups.append({"name": group, "versions": [entry], "preferredVersion": entry})
+            return self._send({"kind": "APIGroupList", "apiVersion": "v1", "groups": groups})
+        group_version = self.path[len("/apis/"):]
+        if group_version in state["groups"]:
+            return self._send({"kind": "APIResourceList", "groupVersion": group_version,
+                               "resources": state["groups"][group_version]})
+        self._send({"kind": "Status", "code": 404}, status=404)
+
+    def do_PATCH(self):
+        state = self.server.state
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        state["patches"].append((self.path, self.headers["Content-Type"], body))
+        if body["kind"] == "CustomResourceDefinition":
+            spec = body["spec"]
+            state["groups"][f"{spec['group']}/{spec['versions'][0]['name']}"] = [
+                {"name": spec["names"]["plural"], "singularName": spec["names"]["kind"].lower(),
+                 "namespaced": True, "kind": spec["names"]["kind"], "verbs": ["get", "patch"]}
+            ]
+        self._send(body)
+
+
+@pytest.fixture
+def api_server():
+    kubernetes = pytest.importorskip("kubernetes")
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeApiServer)
+    server.state = {"groups": dict(FakeApiServer.groups), "patches": []}
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    configuration = kubernetes.client.Configuration()
+    configuration.host = f"http://127.0.0.1:{server.server_port}"
+    yield kubernetes.client.ApiClient(configuration), server.state
+    server.shutdown()
+
+
+def test_kubernetes_applier_server_side_applies_through_fake_api(api_server):
+    api_client, state = api_server
+    applier = apply.KubernetesApplier(api_client, retry_delay=0.01)
+    resources = [
+        _resource("Namespace", "argocd"),
+        _crd("argoproj.io", "Application"),
+        _resource("Application", "apps", "argocd", api_version="argoproj.io/v1alpha1"),
+    ]
+
+    report = ApplyEngine(applier).apply(resources)
+
+    assert report.ok, report.summary()
+    paths = [path for path, _, _ in state["patches"]]
+    assert paths[-1].startswith("/apis/argoproj.io/v1alpha1/namespaces/argocd/applications/apps?")
+    for path, content_type, _ in state["patches"]:
+        assert "fieldManager=cluster-snek" in path and "force=true" in path
+        assert content_type == "application/apply-patch+yaml"
+
+
+def test_unchanged_resources_are_not_reapplied(tmp_path):
+    cache_path = tmp_path / "applied.json"
+    resources = _stack()
+    first = RecordingApplier()
+    ApplyEngine(first, cache=apply.AppliedResourceCache(cache_path)).apply(resources)
+    assert len(first.order) == len(resources)
+
+    resources[-2].body["metadata"]["labels"] = {"team": "platform"}
+    second = RecordingApplier()
+    report = ApplyEngine(second, cache=apply.AppliedResourceCache(cache_path)).apply(resources)
+
+    assert report.ok
+    assert second.order == ["Namespace/argocd"]
+    assert len(report.unchanged) == len(resources) - 1
+
+
+def test_full_reconcile_reapplies_everything(tmp_path):
+    cache_path = tmp_path / "applied.json"
+    ApplyEngine(RecordingApplier(), cache=apply.AppliedResourceCache(cache_path)).apply(_stack())
+
+    forced = RecordingApplier()
+    ApplyEngine(
+        forced, cache=apply.AppliedResourceCache(cache_path), full_reconcile=True
+    ).apply(_stack())
+    assert len(forced.order) == len(_stack())
+
+    due = RecordingApplier()
+    ApplyEngine(
+        due, cache=apply.AppliedResourceCache(cache_path, reconcile_interval=0)
+    ).apply(_stack())
+    assert len(due.order) == len(_stack())
+
+
+def test_failed_resource_is_retried_next_run(tmp_path):
+    cache_path = tmp_path / "applied.json"
+    ApplyEngine(RecordingApplier(), cache=apply.AppliedResourceCache(cache_path)).apply(_stack())
+    failing = RecordingApplier(fail={"Namespace/argocd"})
+    ApplyEngine(failing, cache=apply.AppliedResourceCache(cache_path), full_reconcile=True).apply(_stack())
+
+    retry = RecordingApplier()
+    ApplyEngine(retry, cache=apply.AppliedResourceCache(cache_path)).apply(_stack())
+    assert retry.order == ["Namespace/argocd"]
@@ -0,0 +1,79 @@
+import io
+import tarfile
+import zipfile
+
+import pytest # type: ignore
+import yaml # type: ignore
+
+import cluster_snek.deployment.bundle as bundle
+
+BundleBuilder = bundle.BundleBuilder
+BundleReader = bundle.BundleReader
+
+
+def _package_chart(cache_dir, name, version, payload=None):
+    path = cache_dir / f"{name}-{version}.tgz"
+    data = yaml.dump({"apiVersion": "v2", "name": payload or name, "version": version}).encode()
+    with tarfile.open(path, "w:gz") as tar:
+        info = tarfile.TarInfo(f"{payload or name}/Chart.yaml")
+        info.size = len(data)
+        info.mtime = 0
+        tar.addfile(info, io.BytesIO(data))
+    return path
+
+
+@pytest.fixture
+def cache_dir(tmp_path):
+    cache = tmp_path / "cache"
+    cache.mkdir()
+    _package_chart(cache, "cilium", "1.17.4")
+    _package_chart(cache, "metallb", "6.4.18")
+    # Same package content published under a second name
+    (cache / "metallb-mirror-6.4.18.tgz").write_bytes((cache / "metallb-6.4.18.tgz").read_bytes())
+    return cache
+
+
+def test_default_charts_come_from_generator():
+    assert bundle.default_chart_versions() == {"cilium": "1.17.4", "metallb": "6.4.18"}
+
+
+def test_build_deduplicates_blobs(tmp_path, cache_dir):
+    charts = {"cilium": "1.17.4", "metallb": "6.4.18", "metallb-mirror": "6.4.18"}
+    output = tmp_path / "out" / "bundle.zip"
+
+    manifest = BundleBuilder(cache_dir, charts).build(output)
+
+    assert len(manifest.charts) == 3
+    with zipfile.ZipFile(output) as zf:
+        blobs = [n for n in zf.namelist() if n.startswith(bundle.BLOB_PREFIX)]
+    assert len(blobs) == 2
+    digest, name = (tmp_path / "out" / "bundle.zip.sha256").read_text().split()
+    assert name == "bundle.zip" and len(digest) == 64
+
+
+def test_reader_extracts_single_chart(tmp_path, cache_dir):
+    output = tmp_path / "bundle.zip"
+    BundleBuilder(cache_dir).build(output)
+
+    assert bundle.is_bundle(output)
+    with BundleReader(output) as reader:
+        path = reader.extract_chart("metallb", tmp_path / "charts")
+        assert path.name == "metallb-6.4.18.tgz"
+        assert path.read_bytes() == (cache_dir / "metallb-6.4.18.tgz").read_bytes()
+        assert not (tmp_path / "charts" / "cilium-1.17.4.tgz").exists()
+        with pytest.raises(KeyError):
+            reader.find("istio")
+
+
+def test_missing_charts_are_reported(tmp_path, cache_dir):
+    with pytest.raises(ValueError, match="istio-1.26.1.tgz"):
+        BundleBuilder(cache_dir, {"cilium": "1.17.4", "istio": "1.26.1"}).build(tmp_path / "b.zip")
+
+
+def test_reader_rejects_plain_zip(tmp_path):
+    path = tmp_path / "plain.zip"
+    with zipfile.ZipFile(path, "w") as zf:
+        zf.writestr("README.md", "hi")
+    assert not bundle.is_bundle(path)
+    with pytest.raises(ValueError):
+        BundleReader(path)
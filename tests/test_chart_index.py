@@ -0,0 +1,98 @@
+import io
+import tarfile
+
+import pytest # type: ignore
+import yaml # type: ignore
+
+import cluster_snek.generators.chart_index as chart_index
+
+ChartIndexer = chart_index.ChartIndexer
+read_chart_metadata = chart_index.read_chart_metadata
+version_key = chart_index.version_key
+
+
+def _package_chart(charts_dir, name, version):
+    path = charts_dir / f"{name}-{version}.tgz"
+    members = {
+        f"{name}/Chart.yaml": yaml.dump({"apiVersion": "v2", "name": name, "version": version}),
+        f"{name}/values.yaml": "replicas: 1\n",
+        f"{name}/charts/dep/Chart.yaml": yaml.dump({"name": "dep", "version": "0.0.1"}),
+    }
+    with tarfile.open(path, "w:gz") as tar:
+        for member, content in members.items():
+            data = content.encode()
+            info = tarfile.TarInfo(member)
+            info.size = len(data)
+            tar.addfile(info, io.BytesIO(data))
+    return path
+
+
+def test_build_index(tmp_path):
+    _package_chart(tmp_path, "cilium", "1.17.4")
+    _package_chart(tmp_path, "cilium", "1.16.0")
+    _package_chart(tmp_path, "metallb", "6.4.18")
+
+    stats = ChartIndexer(tmp_path).build()
+
+    assert (stats.scanned, stats.charts, stats.written) == (3, 3, True)
+    index = yaml.safe_load((tmp_path / "index.yaml").read_text())
+    assert index["apiVersion"] == "v1"
+    assert [e["version"] for e in index["entries"]["cilium"]] == ["1.17.4", "1.16.0"]
+    metallb = index["entries"]["metallb"][0]
+    assert metallb["urls"] == ["metallb-6.4.18.tgz"]
+    assert len(metallb["digest"]) == 64
+
+
+def test_incremental_rebuild(tmp_path):
+    _package_chart(tmp_path, "cilium", "1.17.4")
+    _package_chart(tmp_path, "metallb", "6.4.18")
+    indexer = ChartIndexer(tmp_path, base_url="http://charts.internal/")
+    indexer.build()
+
+    stats = indexer.build()
+    assert (stats.scanned, stats.reused, stats.written) == (0, 2, False)
+
+    _package_chart(tmp_path, "argo-cd", "8.1.1")
+    (tmp_path / "metallb-6.4.18.tgz").unlink()
+    stats = indexer.build()
+    assert (stats.scanned, stats.reused, stats.removed) == (1, 1, 1)
+
+    index = yaml.safe_load((tmp_path / "index.yaml").read_text())
+    assert sorted(index["entries"]) == ["argo-cd", "cilium"]
+    assert index["entries"]["argo-cd"][0]["urls"] == ["http://charts.internal/argo-cd-8.1.1.tgz"]
+
+
+def test_read_chart_metadata_rejects_non_charts(tmp_path):
+    path = tmp_path / "broken.tgz"
+    with tarfile.open(path, "w:gz") as tar:
+        info = tarfile.TarInfo("broken/README.md")
+        tar.addfile(info, io.BytesIO(b""))
+    with pytest.raises(ValueError):
+        read_chart_metadata(path)
+
+
+def test_unreadable_charts_are_skipped(tmp_path, caplog):
+    _package_chart(tmp_path, "cilium", "1.17.4")
+    (tmp_path / "truncated-1.0.0.tgz").write_bytes(b"\x1f\x8b\x08 not really gzip")
+    indexer = ChartIndexer(tmp_path)
+
+    stats = indexer.build()
+    assert (stats.scanned, stats.charts, stats.skipped, stats.written) == (2, 1, 1, True)
+    assert "Skipping truncated-1.0.0.tgz" in caplog.text
+    index = yaml.safe_load((tmp_path / "index.yaml").read_text())
+    assert list(index["entries"]) == ["cilium"]
+
+    # The bad tarball is remembered, not rescanned, until it changes
+    stats = indexer.build()
+    assert (stats.scanned, stats.skipped, stats.written) == (0, 1, False)
+    (tmp_path / "truncated-1.0.0.tgz").unlink()
+    _package_chart(tmp_path, "truncated", "1.0.0")
+    stats = indexer.build()
+    assert (stats.scanned, stats.charts, stats.skipped) == (1, 2, 0)
+
+
+def test_version_ordering():
+    versions = ["1.2.0", "1.10.0", "1.10.0-rc.1", "v1.9.3", "1.2.0-alpha"]
+    assert sorted(versions, key=version_key, reverse=True) == [
+        "1.10.0", "1.10.0-rc.1", "v1.9.3", "1.2.0", "1.2.0-alpha"
+    ]
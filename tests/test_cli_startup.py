@@ -0,0 +1,82 @@
+import json
+import os
+import subprocess
+import sys
+import tomllib
+from pathlib import Path
+
+import pytest # type: ignore
+
+pytest.importorskip("click")
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# Cumulative import time of the CLI module, in seconds. Importing click
+# alone accounts for most of it; a command dependency creeping back to
+# module level costs several times this.
+IMPORT_BUDGET = float(os.environ.get("CLUSTER_SNEK_IMPORT_BUDGET", "0.25"))
+
+HEAVY_MODULES = ("yaml", "kubernetes", "git", "gnupg", "rich", "requests", "vectorweight")
+
+RENDER_ALL_HELP = """
+import json, sys
+import click
+from cluster_snek.cli.commands.cli import cli
+with click.Context(cli, info_name="cluster-snek") as ctx:
+    cli.get_help(ctx)
+    for name, command in cli.commands.items():
+        command.get_help(click.Context(command, info_name=name, parent=ctx))
+print(json.dumps(sorted(sys.modules)))
+"""
+
+
+def _python(*args):
+    return subprocess.run(
+        [sys.executable, *args], cwd=REPO_ROOT, capture_output=True, text=True, check=True
+    )
+
+
+def _heavy(modules):
+    return sorted(
+        m for m in modules
+        if m.split(".")[0] in HEAVY_MODULES or m.startswith("cluster_snek.deployment")
+    )
+
+
+def test_help_loads_no_command_dependencies():
+    modules = json.loads(_python("-c", RENDER_ALL_HELP).stdout)
+    assert _heavy(modules) == []
+
+
+def test_group_help_runs():
+    result = _python("-m", "cluster_snek.cli.commands.cli", "--help")
+    for command in ("generate", "validate", "deploy", "status"):
+        assert command in result.stdout
+
+
+RUN_ENTRY_POINT = """
+import sys
+from importlib.metadata import EntryPoint
+EntryPoint("cluster-snek", sys.argv.pop(1), "console_scripts").load()()
+"""
+
+
+def test_installed_command_runs():
+    with open(REPO_ROOT / "pyproject.toml", "rb") as f:
+        target = tomllib.load(f)["project"]["scripts"]["cluster-snek"]
+    result = _python("-c", RUN_ENTRY_POINT, target, "--help")
+    for command in ("generate", "deploy", "serve"):
+        assert command in result.stdout
+
+
+def test_import_time_within_budget():
+    result = _python("-X", "importtime", "-c", "import cluster_snek.cli.commands.cli")
+    cumulative = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, total, name = line.split("|")
+        if total.strip().isdigit():
+            cumulative[name.strip()] = int(total) / 1e6
+    elapsed = cumulative["cluster_snek.cli.commands.cli"]
+    assert elapsed < IMPORT_BUDGET, f"CLI import took {elapsed:.3f}s (budget {IMPORT_BUDGET}s)"
@@ -0,0 +1,107 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest # type: ignore
+
+pytest.importorskip("click")
+import cluster_snek.cli.completion as completion
+
+from click.shell_completion import ShellComplete # type: ignore # noqa: E402
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+COMPLETE_IN_SUBPROCESS = """
+import json, sys
+from cluster_snek.cli.commands.cli import cli
+try:
+    cli(prog_name="cluster-snek")
+except SystemExit:
+    pass
+print(json.dumps(sorted(sys.modules)))
+"""
+
+
+@pytest.fixture
+def index_path(tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    return tmp_path / "cluster-snek" / "completion.json"
+
+
+def test_index_keeps_recent_names_first(index_path):
+    completion.update_index(snapshots=["20260101T000000-aaaa"], contexts=["lab"])
+    completion.update_index(snapshots=["20260102T000000-bbbb", "20260101T000000-aaaa"])
+
+    assert json.loads(index_path.read_text())["version"] == completion.INDEX_VERSION
+    assert completion.read_index() == {
+        "snapshots": ["20260102T000000-bbbb", "20260101T000000-aaaa"],
+        "contexts": ["lab"],
+    }
+    assert completion.candidates("snapshots", "20260101") == ["20260101T000000-aaaa"]
+
+
+def test_sections_are_capped(index_path, monkeypatch):
+    monkeypatch.setattr(completion, "MAX_ENTRIES", 3)
+    completion.update_index(snapshots=[str(i) for i in range(10)])
+    assert completion.read_index()["snapshots"] == ["0", "1", "2"]
+
+
+def test_unusable_index_offers_nothing(index_path):
+    index_path.parent.mkdir(parents=True)
+    index_path.write_text("{not json")
+    assert completion.candidates("clusters") == []
+    index_path.write_text(json.dumps({"version": 0, "sections": {"clusters": ["lab"]}}))
+    assert completion.candidates("clusters") == []
+
+
+def test_configuration_is_indexed(index_path):
+    configuration = SimpleNamespace(clusters=[
+        SimpleNamespace(name="lab", context=None, specialized_workloads=["ml-training"]),
+        SimpleNamespace(name="edge", context="edge-admin", specialized_workloads=[]),
+    ])
+    completion.index_configuration(configuration)
+
+    assert completion.read_index() == {
+        "clusters": ["lab", "edge"],
+        "contexts": ["lab", "edge-admin"],
+        "components": ["ml-training"],
+    }
+
+
+def test_cli_options_complete_from_index(index_path):
+    import cluster_snek.cli.commands.cli as cli_module
+    completion.update_index(contexts=["lab", "edge"], snapshots=["20260102T000000-bbbb"],
+                            components=["argocd", "metallb"])
+    complete = ShellComplete(cli_module.cli, {}, "cluster-snek", "_CLUSTER_SNEK_COMPLETE")
+
+    def values(args, incomplete):
+        return [item.value for item in complete.get_completions(args, incomplete)]
+
+    assert values(["deploy", "--context"], "") == ["lab", "edge"]
+    assert values(["status", "--context"], "e") == ["edge"]
+    assert values(["rollback", "--to"], "2026") == ["20260102T000000-bbbb"]
+    assert values(["history", "--component"], "m") == ["metallb"]
+    assert values(["init", "--template"], "air") == ["airgapped_enterprise"]
+
+
+def test_completion_loads_no_command_dependencies(index_path):
+    completion.update_index(snapshots=["20260102T000000-bbbb"])
+    env = {
+        **os.environ,
+        "_CLUSTER_SNEK_COMPLETE": "bash_complete",
+        "COMP_WORDS": "cluster-snek rollback --to 2026",
+        "COMP_CWORD": "3",
+    }
+    result = subprocess.run(
+        [sys.executable, "-c", COMPLETE_IN_SUBPROCESS],
+        cwd=REPO_ROOT, env=env, capture_output=True, text=True, check=True
+    )
+    lines = result.stdout.splitlines()
+
+    assert "plain,20260102T000000-bbbb" in lines
+    modules = json.loads(lines[-1])
+    assert [m for m in modules if m.split(".")[0] in ("yaml", "kubernetes", "vectorweight", "rich")] == []
+    assert not any(m.startswith("cluster_snek.deployment") for m in modules)
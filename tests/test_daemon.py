@@ -0,0 +1,159 @@
+import os
+import threading
+import time
+
+import pytest # type: ignore
+
+click = pytest.importorskip("click")
+import cluster_snek.cli.daemon as daemon
+
+
+@click.group()
+@click.option("--config-file", "-c")
+@click.option("--verbose", "-v", is_flag=True)
+@click.option("--output-format", default="text")
+def fake_cli(config_file, verbose, output_format):
+    pass
+
+
+@fake_cli.command()
+@click.argument("path", type=click.Path(exists=True))
+def validate(path):
+    """Counts how often it ran in this process"""
+    validate.runs = getattr(validate, "runs", 0) + 1
+    click.echo(f"valid {path} in {os.getcwd()} run {validate.runs}")
+    click.echo(f"mode {os.environ.get('BENCH_MODE')}", err=True)
+
+
+@fake_cli.command()
+def status():
+    time.sleep(0.2)
+    click.echo("slow")
+    raise SystemExit(3)
+
+
+@pytest.fixture
+def server(tmp_path):
+    server = daemon.DaemonServer(tmp_path / "daemon.sock", command=fake_cli)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    deadline = time.monotonic() + 5
+    while not daemon.ping(server.socket_path):
+        assert time.monotonic() < deadline, "daemon did not start"
+        time.sleep(0.01)
+    yield server
+    server.shutdown()
+    thread.join(5)
+
+
+def test_forward_runs_in_client_cwd_and_env(server, tmp_path, monkeypatch):
+    (tmp_path / "config.yaml").write_text("{}")
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("BENCH_MODE", "airgapped")
+
+    first = daemon.forward(["validate", "config.yaml"], server.socket_path)
+    second = daemon.forward(["validate", "config.yaml"], server.socket_path)
+
+    assert first.exit_code == 0
+    assert first.stdout == f"valid config.yaml in {tmp_path} run 1\n"
+    assert first.stderr == "mode airgapped\n"
+    # Same process, so state from the first run is still there
+    assert second.stdout.endswith("run 2\n")
+    assert os.getcwd() == str(tmp_path)
+
+
+def test_forward_reports_exit_code_and_serializes_runs(server):
+    responses = []
+    threads = [
+        threading.Thread(target=lambda: responses.append(daemon.forward(["status"], server.socket_path)))
+        for _ in range(3)
+    ]
+    started = time.monotonic()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+
+    assert [(r.exit_code, r.stdout) for r in responses] == [(3, "slow\n")] * 3
+    assert time.monotonic() - started >= 0.6
+
+
+def test_invalid_request_is_rejected(server):
+    response = daemon.request({"op": "run", "argv": "validate"}, server.socket_path)
+    assert response.exit_code == 2
+    assert "argv must be a list" in response.stderr
+
+
+def test_second_daemon_refuses_live_socket(server):
+    with pytest.raises(ValueError, match="already listening"):
+        daemon.DaemonServer(server.socket_path, command=fake_cli).serve_forever()
+
+
+def test_stale_socket_is_unavailable_and_replaced(tmp_path):
+    socket_path = tmp_path / "daemon.sock"
+    server = daemon.DaemonServer(socket_path, command=fake_cli)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    while not daemon.ping(socket_path):
+        time.sleep(0.01)
+    daemon.request({"op": "shutdown"}, socket_path)
+    thread.join(5)
+    assert not socket_path.exists()
+
+    socket_path.touch()
+    with pytest.raises(daemon.DaemonUnavailable):
+        daemon.forward(["validate", "x"], socket_path)
+    assert not daemon.ping(socket_path)
+
+
+def test_only_light_commands_are_forwarded(tmp_path, monkeypatch):
+    monkeypatch.setenv(daemon.SOCKET_ENV, str(tmp_path / "daemon.sock"))
+    (tmp_path / "daemon.sock").touch()
+
+    assert daemon.requested_command(fake_cli, ["-c", "validate", "-v", "status"]) == "status"
+    assert daemon.should_forward(fake_cli, ["-v", "validate", "x"])
+    assert not daemon.should_forward(fake_cli, ["deploy"])
+    assert not daemon.should_forward(fake_cli, ["generate", "--watch"])
+    monkeypatch.setenv(daemon.DISABLE_ENV, "1")
+    assert not daemon.should_forward(fake_cli, ["validate", "x"])
+
+
+def test_streaming_output_runs_locally(tmp_path, monkeypatch):
+    monkeypatch.setenv(daemon.SOCKET_ENV, str(tmp_path / "daemon.sock"))
+    (tmp_path / "daemon.sock").touch()
+
+    assert daemon.should_forward(fake_cli, ["--output-format", "text", "status"])
+    assert not daemon.should_forward(fake_cli, ["--output-format", "jsonl", "status"])
+    assert not daemon.should_forward(fake_cli, ["--output-format=jsonl", "validate", "x"])
+
+
+def test_kubeconfig_change_drops_pooled_clients(tmp_path, monkeypatch):
+    import functools
+    import cluster_snek.connectors.kubernetes_client as kubernetes_client
+
+    built = []
+
+    @functools.lru_cache(maxsize=None)
+    def get_api_client(context=None):
+        built.append(context)
+        return object()
+
+    monkeypatch.setattr(kubernetes_client, "get_api_client", get_api_client)
+    lab, edge = tmp_path / "lab.yaml", tmp_path / "edge.yaml"
+    lab.write_text("current-context: lab\n")
+    edge.write_text("current-context: edge\n")
+    server = daemon.DaemonServer(tmp_path / "daemon.sock", command=fake_cli)
+
+    def run(kubeconfig):
+        server.run(["validate", str(tmp_path)], env={**os.environ, "KUBECONFIG": str(kubeconfig)})
+        get_api_client()
+
+    run(lab)
+    run(lab)
+    assert len(built) == 1
+    run(edge)
+    assert len(built) == 2
+    edge.write_text("current-context: edge-admin\n")
+    os.utime(edge, ns=(time.time_ns() + 10**9, time.time_ns() + 10**9))
+    run(edge)
+    assert len(built) == 3
@@ -0,0 +1,102 @@
+import io
+import time
+
+import pytest # type: ignore
+
+pytest.importorskip("rich")
+import cluster_snek.cli.dashboard as dashboard_module
+import cluster_snek.connectors.argocd as argocd
+import cluster_snek.deployment.apply as apply
+
+from rich.console import Console # type: ignore # noqa: E402
+
+DeploymentDashboard = dashboard_module.DeploymentDashboard
+ApplicationStatus = argocd.ApplicationStatus
+ApplyResult = apply.ApplyResult
+ApplyStatus = apply.ApplyStatus
+
+
+def _console(height=40):
+    return Console(file=io.StringIO(), width=100, height=height, force_terminal=False)
+
+
+def _text(dashboard):
+    console = _console(dashboard.console.size.height)
+    console.print(dashboard.render())
+    return console.file.getvalue()
+
+
+def test_render_shows_progress_applications_and_errors():
+    dashboard = DeploymentDashboard(title="Deploying to lab", console=_console())
+    dashboard.expect(3)
+    dashboard.on_result(ApplyResult("v1/Namespace/argocd", ApplyStatus.APPLIED))
+    dashboard.on_result(ApplyResult("v1/ConfigMap/argocd/cm", ApplyStatus.UNCHANGED))
+    dashboard.on_result(ApplyResult("apps/v1/Deployment/argocd/server", ApplyStatus.FAILED, error="forbidden"))
+    dashboard.on_applications("lab", [
+        ApplicationStatus("apps", "Healthy", "Synced"),
+        ApplicationStatus("cilium", "Degraded", "OutOfSync"),
+    ])
+
+    text = _text(dashboard)
+
+    assert "Deploying to lab" in text
+    assert "3/3 resources" in text and "1 applied" in text and "1 failed" in text
+    assert "Applications 1/2 healthy" in text
+    assert text.index("cilium") < text.index("apps")
+    assert "apps/v1/Deployment/argocd/server: forbidden" in text
+
+
+def test_application_updates_replace_cluster_state():
+    dashboard = DeploymentDashboard(console=_console())
+    dashboard.on_applications("lab", [ApplicationStatus("apps", "Progressing", "OutOfSync")])
+    dashboard.on_applications("edge", [ApplicationStatus("apps", "Healthy", "Synced")])
+    dashboard.on_applications("lab", [ApplicationStatus("apps", "Healthy", "Synced")])
+
+    assert "Applications 2/2 healthy" in _text(dashboard)
+
+
+def test_large_fleets_are_folded_to_fit_the_terminal():
+    dashboard = DeploymentDashboard(console=_console(height=30))
+    dashboard.on_applications("lab", [
+        ApplicationStatus(f"app-{i:03}", "Healthy", "Synced") for i in range(500)
+    ] + [ApplicationStatus("broken", "Degraded", "Synced")])
+
+    text = _text(dashboard)
+
+    assert "broken" in text
+    assert "more" in text
+    assert len(text.splitlines()) <= 30
+
+
+def test_error_stream_keeps_recent_errors():
+    dashboard = DeploymentDashboard(console=_console(), error_lines=3)
+    for i in range(10):
+        dashboard.add_error(f"error {i}")
+
+    text = _text(dashboard)
+
+    assert "error 9" in text and "error 7" in text
+    assert "error 6" not in text
+
+
+def test_bursts_of_updates_are_throttled():
+    dashboard = DeploymentDashboard(console=_console(), max_fps=5)
+    with dashboard:
+        started = time.monotonic()
+        for i in range(2000):
+            dashboard.on_result(ApplyResult(f"v1/ConfigMap/default/cm-{i}", ApplyStatus.APPLIED))
+        time.sleep(0.5)
+        elapsed = time.monotonic() - started
+
+    # One frame on start and one on stop, the rest bounded by max_fps
+    assert dashboard.renders <= 2 + int(elapsed * 5) + 1
+    assert "2000/? resources" in _text(dashboard)
+
+
+def test_idle_dashboard_does_not_redraw():
+    dashboard = DeploymentDashboard(console=_console(), max_fps=20)
+    with dashboard:
+        time.sleep(0.1)
+        before = dashboard.renders
+        time.sleep(0.3)
+        assert dashboard.renders == before
@@ -0,0 +1,82 @@
+import os
+
+import pytest # type: ignore
+
+import cluster_snek.utils.delta_sync as delta_sync
+
+DeltaSync = delta_sync.DeltaSync
+copy_file = delta_sync.copy_file
+
+
+def _make_tree(root):
+    (root / "charts" / "cilium").mkdir(parents=True)
+    (root / "charts" / "cilium" / "Chart.yaml").write_text("name: cilium\n")
+    (root / "charts" / "metallb.tgz").write_bytes(os.urandom(4096))
+    (root / "README.md").write_text("mirror\n")
+
+
+def test_initial_sync_copies_everything(tmp_path):
+    src, dst = tmp_path / "src", tmp_path / "dst"
+    _make_tree(src)
+    stats = DeltaSync(src, dst).sync()
+    assert stats.copied == 3
+    assert (dst / "charts" / "cilium" / "Chart.yaml").read_text() == "name: cilium\n"
+    assert (dst / "charts" / "metallb.tgz").read_bytes() == (src / "charts" / "metallb.tgz").read_bytes()
+
+
+def test_resync_copies_only_changes(tmp_path):
+    src, dst = tmp_path / "src", tmp_path / "dst"
+    _make_tree(src)
+    DeltaSync(src, dst).sync()
+
+    stats = DeltaSync(src, dst).sync()
+    assert (stats.copied, stats.skipped, stats.removed) == (0, 3, 0)
+
+    (src / "README.md").write_text("mirror v2\n")
+    (src / "charts" / "metallb.tgz").unlink()
+    stats = DeltaSync(src, dst).sync()
+    assert (stats.copied, stats.skipped, stats.removed) == (1, 1, 1)
+    assert (dst / "README.md").read_text() == "mirror v2\n"
+    assert not (dst / "charts" / "metallb.tgz").exists()
+
+
+def test_foreign_files_are_kept(tmp_path):
+    src, dst = tmp_path / "src", tmp_path / "dst"
+    _make_tree(src)
+    DeltaSync(src, dst).sync()
+    (dst / "generated.yaml").write_text("kept")
+    DeltaSync(src, dst).sync()
+    assert (dst / "generated.yaml").read_text() == "kept"
+
+
+def test_checksum_mode_skips_touched_files(tmp_path):
+    src, dst = tmp_path / "src", tmp_path / "dst"
+    _make_tree(src)
+    DeltaSync(src, dst, checksum=True).sync()
+
+    readme = src / "README.md"
+    stat = readme.stat()
+    os.utime(readme, ns=(stat.st_atime_ns, stat.st_mtime_ns + 5_000_000_000))
+    stats = DeltaSync(src, dst, checksum=True).sync()
+    assert stats.copied == 0
+    assert (dst / "README.md").stat().st_mtime_ns == readme.stat().st_mtime_ns
+
+
+def test_hardlink_mode(tmp_path):
+    src, dst = tmp_path / "src", tmp_path / "dst"
+    _make_tree(src)
+    DeltaSync(src, dst, hardlink=True).sync()
+    assert (dst / "README.md").stat().st_ino == (src / "README.md").stat().st_ino
+
+
+def test_copy_file_preserves_content(tmp_path):
+    src = tmp_path / "big.bin"
+    data = os.urandom(3 * 1024 * 1024 + 17)
+    src.write_bytes(data)
+    copy_file(src, tmp_path / "copy.bin")
+    assert (tmp_path / "copy.bin").read_bytes() == data
+
+
+def test_missing_source(tmp_path):
+    with pytest.raises(ValueError):
+        DeltaSync(tmp_path / "missing", tmp_path / "dst").sync()
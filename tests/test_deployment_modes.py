@@ -0,0 +1,333 @@
+import hashlib
+
+import pytest # type: ignore
+
+import cluster_snek.deployment.modes as modes
+import cluster_snek.deployment.state as state_module
+
+ArchiveVerifier = modes.ArchiveVerifier
+hash_file = modes.hash_file
+parse_checksum_manifest = modes.parse_checksum_manifest
+
+
+@pytest.fixture(autouse=True)
+def state_home(tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_DATA_HOME", str(tmp_path / "data"))
+    monkeypatch.setenv("KUBECONFIG", str(tmp_path / "no-kubeconfig"))
+
+
+def _checkpoint(deployment):
+    return state_module.StateStore().checkpoint(deployment.checkpoint_scope, deployment._fingerprint())
+
+
+def _write_files(root, count=5):
+    files = {}
+    for i in range(count):
+        data = f"chart-{i}".encode() * (i + 1)
+        (root / f"chart-{i}.tgz").write_bytes(data)
+        files[f"chart-{i}.tgz"] = data
+    return files
+
+
+@pytest.mark.parametrize("algorithm", ["sha256", "sha512", "blake2b"])
+def test_hash_file_matches_hashlib(tmp_path, algorithm, monkeypatch):
+    path = tmp_path / "big.bin"
+    data = b"x" * (3 * 1024 * 1024 + 11)
+    path.write_bytes(data)
+    expected = hashlib.new(algorithm, data).hexdigest()
+    assert hash_file(path, algorithm) == expected
+    # Force the mmap path as well
+    monkeypatch.setattr(modes, "_MMAP_THRESHOLD", 1)
+    monkeypatch.setattr(modes, "_HASH_CHUNK", 1024 * 1024)
+    assert hash_file(path, algorithm) == expected
+
+
+def test_parse_gnu_and_bsd_formats(tmp_path):
+    sha256 = hashlib.sha256(b"a").hexdigest()
+    b2 = hashlib.blake2b(b"b").hexdigest()
+    manifest = tmp_path / "CHECKSUMS"
+    manifest.write_text(
+        "# generated\n"
+        f"{sha256}  charts/a.tgz\n"
+        f"{sha256} *b in.tgz\n"
+        f"BLAKE2b (c.tgz) = {b2}\n"
+    )
+    entries = parse_checksum_manifest(manifest)
+    assert [(e.path, e.algorithm) for e in entries] == [
+        ("charts/a.tgz", "sha256"), ("b in.tgz", "sha256"), ("c.tgz", "blake2b")
+    ]
+
+
+def test_parse_algorithm_from_filename(tmp_path):
+    manifest = tmp_path / "B2SUMS"
+    manifest.write_text(f"{hashlib.blake2b(b'a').hexdigest()}  a\n")
+    assert parse_checksum_manifest(manifest)[0].algorithm == "blake2b"
+
+
+def test_parse_rejects_malformed_lines(tmp_path):
+    manifest = tmp_path / "SHA256SUMS"
+    manifest.write_text("not a checksum line\n")
+    with pytest.raises(ValueError, match="SHA256SUMS:1"):
+        parse_checksum_manifest(manifest)
+
+
+def test_verify_manifest_success(tmp_path):
+    files = _write_files(tmp_path)
+    manifest = tmp_path / "SHA512SUMS"
+    manifest.write_text("".join(
+        f"{hashlib.sha512(data).hexdigest()}  {name}\n" for name, data in files.items()
+    ))
+    report = ArchiveVerifier.verify_manifest(manifest, max_workers=4)
+    assert report.ok
+    assert sorted(report.verified) == sorted(files)
+
+
+def test_verify_manifest_reports_every_failure(tmp_path):
+    files = _write_files(tmp_path)
+    manifest = tmp_path / "SHA256SUMS"
+    manifest.write_text("".join(
+        f"{hashlib.sha256(data).hexdigest()}  {name}\n" for name, data in files.items()
+    ) + f"{'0' * 64}  gone.tgz\n")
+    (tmp_path / "chart-1.tgz").write_bytes(b"tampered")
+    (tmp_path / "chart-3.tgz").write_bytes(b"tampered")
+
+    report = ArchiveVerifier.verify_manifest(manifest, raise_on_error=False)
+    assert not report.ok
+    assert sorted(report.mismatched) == ["chart-1.tgz", "chart-3.tgz"]
+    assert report.missing == ["gone.tgz"]
+    assert len(report.verified) == 3
+
+    with pytest.raises(ValueError) as excinfo:
+        ArchiveVerifier.verify_manifest(manifest)
+    message = str(excinfo.value)
+    assert "3 of 6" in message
+    assert "chart-1.tgz" in message and "chart-3.tgz" in message and "gone.tgz" in message
+
+
+def test_verify_manifest_records_unreadable_and_escaping_entries(tmp_path, monkeypatch):
+    (tmp_path / "bundle").mkdir()
+    files = _write_files(tmp_path / "bundle", count=2)
+    (tmp_path / "secret").write_bytes(b"outside")
+    digest = hashlib.sha256(b"outside").hexdigest()
+    manifest = tmp_path / "bundle" / "SHA256SUMS"
+    manifest.write_text("".join(
+        f"{hashlib.sha256(data).hexdigest()}  {name}\n" for name, data in files.items()
+    ) + f"{digest}  ../secret\n{digest}  {tmp_path / 'secret'}\n")
+
+    real_hash = modes.cached_hash_file
+
+    def flaky_hash(path, algorithm, cache=None):
+        if path.name == "chart-0.tgz":
+            raise PermissionError(13, "Permission denied")
+        return real_hash(path, algorithm, cache)
+
+    monkeypatch.setattr(modes, "cached_hash_file", flaky_hash)
+    report = ArchiveVerifier.verify_manifest(manifest, raise_on_error=False)
+
+    assert report.verified == ["chart-1.tgz"]
+    assert report.failed == {
+        "chart-0.tgz": "Permission denied",
+        "../secret": f"path is outside {tmp_path / 'bundle'}",
+        str(tmp_path / "secret"): f"path is outside {tmp_path / 'bundle'}",
+    }
+    assert not report.ok
+
+
+def test_verify_checksums_single_archive(tmp_path):
+    archive = tmp_path / "bundle.zip"
+    archive.write_bytes(b"bundle")
+    digest = hashlib.sha256(b"bundle").hexdigest()
+    assert ArchiveVerifier.verify_checksums(archive, {"bundle.zip": digest})
+    with pytest.raises(ValueError, match="mismatch"):
+        ArchiveVerifier.verify_checksums(archive, {"bundle.zip": "0" * 64})
+    with pytest.raises(ValueError, match="No checksum"):
+        ArchiveVerifier.verify_checksums(archive, {})
+
+
+CONFIG_MAP = "apiVersion: v1\nkind: ConfigMap\nmetadata:\n  name: demo\n  namespace: demo\n"
+
+
+class RecordingApplier:
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.applied = []
+
+    def apply(self, resource):
+        if self.fail:
+            raise ValueError("connection refused")
+        self.applied.append(resource.key)
+
+
+def _local_config(tmp_path):
+    source = tmp_path / "source"
+    (source / "chart" / "templates").mkdir(parents=True)
+    (source / "chart" / "Chart.yaml").write_text("name: demo\nversion: 0.1.0\n")
+    (source / "chart" / "templates" / "cm.yaml").write_text(CONFIG_MAP)
+    (source / "extra.yaml").write_text("apiVersion: v1\nkind: Namespace\nmetadata:\n  name: demo\n")
+    return modes.SourceConfig(
+        local_path=source,
+        verification_cache_path=tmp_path / "cache.json"
+    )
+
+
+def test_local_pipeline_renders_and_applies(tmp_path, monkeypatch):
+    commands = []
+
+    def run(command, cwd=None):
+        commands.append(command[:2])
+        return CONFIG_MAP
+
+    monkeypatch.setattr(modes, "_run", run)
+    stages = []
+    applier = RecordingApplier()
+    deployment = modes.create_deployment(
+        modes.DeploymentMode.AIRGAPPED_LOCAL,
+        _local_config(tmp_path),
+        work_dir=tmp_path / "work",
+        progress=lambda stage, message: stages.append((stage.value, message)),
+        applier=applier
+    )
+
+    assert deployment.deploy()
+    assert commands == [["helm", "template"]]
+    assert applier.applied == ["Namespace/demo", "ConfigMap/demo/demo"]
+    assert (deployment.rendered_dir / "chart.yaml").exists()
+    assert (deployment.rendered_dir / "extra.yaml").exists()
+    assert not (deployment.rendered_dir / "chart").exists()
+    assert [s for s, m in stages if m == "completed"] == ["fetch", "verify", "render", "apply"]
+    assert _checkpoint(deployment) == []
+    # Recorded where deploy and rollback --to keep the context's snapshots
+    snapshots = modes.SnapshotStore().list("default")
+    assert [(len(s.resources), s.metadata["mode"]) for s in snapshots] == [(2, "airgapped_local")]
+
+
+def test_failed_deploy_resumes_at_failed_stage(tmp_path, monkeypatch):
+    calls = []
+    monkeypatch.setattr(modes, "_run", lambda command, cwd=None: calls.append(command[:2]) or CONFIG_MAP)
+    config = _local_config(tmp_path)
+    deployment = modes.create_deployment(
+        modes.DeploymentMode.AIRGAPPED_LOCAL, config, work_dir=tmp_path / "work",
+        applier=RecordingApplier(fail=True)
+    )
+    with pytest.raises(ValueError, match="connection refused"):
+        deployment.deploy()
+    assert _checkpoint(deployment) == ["fetch", "verify", "render"]
+
+    calls.clear()
+    stages = []
+    applier = RecordingApplier()
+    resumed = modes.create_deployment(
+        modes.DeploymentMode.AIRGAPPED_LOCAL,
+        config,
+        work_dir=tmp_path / "work",
+        progress=lambda stage, message: stages.append((stage.value, message)),
+        applier=applier
+    )
+    assert resumed.deploy()
+    assert calls == []
+    assert len(applier.applied) == 2
+    assert [s for s, m in stages if m.startswith("skipped")] == ["fetch", "verify", "render"]
+
+
+def test_failed_verification_refetches_sources(tmp_path, monkeypatch):
+    monkeypatch.setattr(modes, "_run", lambda command, cwd=None: CONFIG_MAP)
+    config = _local_config(tmp_path)
+    fixed = b"apiVersion: v1\nkind: Namespace\nmetadata:\n  name: fixed\n"
+    config.checksums = {"extra.yaml": hashlib.sha256(fixed).hexdigest()}
+
+    def deployment():
+        return modes.create_deployment(
+            modes.DeploymentMode.AIRGAPPED_LOCAL, config, work_dir=tmp_path / "work",
+            applier=RecordingApplier()
+        )
+
+    with pytest.raises(ValueError, match="Checksum mismatch for extra.yaml"):
+        deployment().deploy()
+    assert _checkpoint(deployment()) == []
+
+    # The mirror is repaired; the bad copy in the work directory must not be reused
+    (tmp_path / "source" / "extra.yaml").write_bytes(fixed)
+    assert deployment().deploy()
+
+
+def test_applied_cache_is_kept_per_context(tmp_path, monkeypatch):
+    monkeypatch.setattr(modes, "_run", lambda command, cwd=None: CONFIG_MAP)
+    config = _local_config(tmp_path)
+
+    def deploy(context):
+        applier = RecordingApplier()
+        modes.create_deployment(
+            modes.DeploymentMode.AIRGAPPED_LOCAL, config, work_dir=tmp_path / "work",
+            applier=applier, context=context
+        ).deploy()
+        return applier.applied
+
+    assert len(deploy("lab")) == 2
+    assert deploy("lab") == []
+    # Same work directory, different cluster: nothing has been applied there yet
+    assert len(deploy("edge")) == 2
+    # The hashes are the ones the deploy command reads for the same context
+    store = state_module.StateStore()
+    assert len(store.resource_hashes("lab")) == len(store.resource_hashes("edge")) == 2
+
+
+def test_cluster_scope_requires_a_usable_kubeconfig(tmp_path, monkeypatch):
+    deployment = modes.create_deployment(
+        modes.DeploymentMode.AIRGAPPED_LOCAL, _local_config(tmp_path), work_dir=tmp_path / "work"
+    )
+    assert deployment._cluster_scope() == "default"
+
+    kubeconfig = tmp_path / "kubeconfig"
+    monkeypatch.setenv("KUBECONFIG", str(kubeconfig))
+    kubeconfig.write_text("apiVersion: v1\nkind: Config\ncontexts: []\n")
+    from kubernetes.config import ConfigException # type: ignore
+    with pytest.raises(ConfigException, match="current-context"):
+        deployment._cluster_scope()
+    kubeconfig.write_text(
+        "apiVersion: v1\nkind: Config\ncurrent-context: lab\n"
+        "contexts: [{name: lab, context: {cluster: lab, user: lab}}]\n"
+        "clusters: [{name: lab, cluster: {server: 'https://lab:6443'}}]\n"
+        "users: [{name: lab, user: {}}]\n"
+    )
+    assert deployment._cluster_scope() == "lab"
+
+
+def test_changed_config_discards_checkpoint(tmp_path):
+    store = state_module.StateStore(tmp_path / "state.db")
+    checkpoint = modes.DeploymentCheckpoint(store, "deploy:/work", "first")
+    checkpoint.mark_complete(modes.DeploymentStage.FETCH)
+
+    assert modes.DeploymentCheckpoint(store, "deploy:/work", "first").is_complete(
+        modes.DeploymentStage.FETCH
+    )
+    assert not modes.DeploymentCheckpoint(store, "deploy:/work", "second").is_complete(
+        modes.DeploymentStage.FETCH
+    )
+    assert not modes.DeploymentCheckpoint(store, "deploy:/other", "first").is_complete(
+        modes.DeploymentStage.FETCH
+    )
+
+
+def test_internet_fetch_clones_requested_version(tmp_path, monkeypatch):
+    commands = []
+    monkeypatch.setattr(modes, "_run", lambda command, cwd=None: commands.append(command) or "")
+    deployment = modes.create_deployment(
+        modes.DeploymentMode.INTERNET,
+        modes.SourceConfig(url="https://example.com/repo.git", version="v1.2.0"),
+        work_dir=tmp_path / "work"
+    )
+    deployment.fetch()
+    assert commands[0][:6] == ["git", "clone", "--depth", "1", "--branch", "v1.2.0"]
+    assert commands[0][-1] == str(deployment.sources_dir)
+
+
+def test_concurrent_deploy_of_same_work_dir_fails_fast(tmp_path):
+    import cluster_snek.utils.locking as locking
+    work = tmp_path / "work"
+    deployment = modes.create_deployment(
+        modes.DeploymentMode.AIRGAPPED_LOCAL, _local_config(tmp_path), work_dir=work,
+        applier=RecordingApplier(), lock_timeout=0
+    )
+    with locking.FileLock(work / modes.LOCK_FILE_NAME):
+        with pytest.raises(locking.LockUnavailable):
+            deployment.deploy()
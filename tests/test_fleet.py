@@ -0,0 +1,135 @@
+import json
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest # type: ignore
+
+import cluster_snek.connectors.fleet as fleet
+import cluster_snek.connectors.argocd as argocd
+
+ApplicationStatus = argocd.ApplicationStatus
+ClusterHealth = fleet.ClusterHealth
+FleetTarget = fleet.FleetTarget
+
+
+def _targets(count):
+    return [FleetTarget(f"cluster-{i}", f"ctx-{i}") for i in range(count)]
+
+
+def _healthy_check(delay=0.0):
+    def check(target, namespace):
+        time.sleep(delay)
+        return ClusterHealth(
+            target.cluster, target.context, argocd_running=True,
+            applications=[ApplicationStatus("apps", "Healthy", "Synced")]
+        )
+    return check
+
+
+def test_clusters_are_checked_concurrently_within_the_bound():
+    running, peak = [0], [0]
+    lock = threading.Lock()
+
+    def check(target, namespace):
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        time.sleep(0.1)
+        with lock:
+            running[0] -= 1
+        return ClusterHealth(target.cluster, target.context, argocd_running=True)
+
+    started = time.monotonic()
+    matrix = fleet.fleet_status(_targets(12), concurrency=4, use_cache=False, check=check)
+
+    assert peak[0] == 4
+    assert time.monotonic() - started < 0.8
+    assert [h.cluster for h in matrix.clusters] == [f"cluster-{i}" for i in range(12)]
+    assert matrix.healthy
+
+
+def test_slow_and_failing_clusters_are_reported_not_fatal():
+    def check(target, namespace):
+        if target.cluster == "cluster-1":
+            time.sleep(5)
+        if target.cluster == "cluster-2":
+            raise RuntimeError("Unauthorized")
+        return _healthy_check()(target, namespace)
+
+    started = time.monotonic()
+    matrix = fleet.fleet_status(_targets(3), timeout=0.2, use_cache=False, check=check)
+
+    assert time.monotonic() - started < 2
+    assert [h.error for h in matrix.clusters] == [None, "timed out after 0.2s", "Unauthorized"]
+    assert not matrix.healthy
+    assert matrix.summary() == "1/3 clusters healthy, 2 unreachable"
+
+
+def test_results_are_cached_for_the_ttl():
+    calls = []
+
+    def check(target, namespace):
+        calls.append(target.context)
+        if target.context == "ctx-1":
+            raise RuntimeError("connection refused")
+        return _healthy_check()(target, namespace)
+
+    cache = fleet.FleetStatusCache(ttl=60)
+
+    def query():
+        import asyncio
+        return asyncio.run(fleet.gather_fleet_status(_targets(2), cache=cache, check=check))
+
+    query()
+    second = query()
+
+    # Healthy result reused, failure retried
+    assert calls == ["ctx-0", "ctx-1", "ctx-1"]
+    assert [h.cached for h in second.clusters] == [True, False]
+
+    cache.ttl = 0
+    query()
+    assert calls.count("ctx-0") == 2
+
+
+def test_health_matrix_cells():
+    matrix = fleet.HealthMatrix([
+        ClusterHealth("lab", "lab", True, [ApplicationStatus("apps", "Healthy", "Synced"),
+                                           ApplicationStatus("cilium", "Degraded", "Synced")]),
+        ClusterHealth("edge", "edge", True, [ApplicationStatus("apps", "Healthy", "Synced")]),
+    ])
+
+    assert matrix.applications == ["apps", "cilium"]
+    assert matrix.cell("lab", "cilium").health == "Degraded"
+    assert matrix.cell("edge", "cilium") is None
+    assert [h.healthy for h in matrix.clusters] == [False, True]
+
+
+def test_targets_default_context_to_cluster_name():
+    clusters = [SimpleNamespace(name="lab", context=None), SimpleNamespace(name="edge", context="edge-admin")]
+    assert fleet.fleet_targets(clusters) == [FleetTarget("lab", "lab"), FleetTarget("edge", "edge-admin")]
+
+
+def test_status_fleet_streams_cluster_events(monkeypatch, tmp_path):
+    import cluster_snek.cli.commands.cli as cli_module
+    import cluster_snek.cli.output as output
+    from click.testing import CliRunner # type: ignore
+
+    config = tmp_path / "fleet.yaml"
+    config.write_text("clusters: []")
+    configuration = SimpleNamespace(clusters=[
+        SimpleNamespace(name="lab", context=None), SimpleNamespace(name="edge", context=None)
+    ])
+    monkeypatch.setattr(cli_module, "_load_configuration", lambda path: configuration)
+    monkeypatch.setattr(fleet, "check_cluster", _healthy_check())
+
+    result = CliRunner().invoke(
+        cli_module.cli.commands["status"], ["--fleet", "-c", str(config)],
+        obj={"output": output.EventEmitter(output.OutputFormat.JSONL)}
+    )
+
+    events = [json.loads(line) for line in result.stdout.splitlines()]
+    assert sorted(e["cluster"] for e in events if e["event"] == "cluster_status") == ["edge", "lab"]
+    assert events[-1]["event"] == "fleet_summary"
+    assert (events[-1]["clusters"], events[-1]["healthy"]) == (2, 2)
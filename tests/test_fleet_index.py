@@ -0,0 +1,124 @@
+import pytest # type: ignore
+
+import cluster_snek.config.fleet_index as fleet_index
+import cluster_snek.config.schema as schema
+
+FleetIndex = fleet_index.FleetIndex
+AddressRange = fleet_index.AddressRange
+
+
+def _configuration(*clusters, start="10.0.0.100", end="10.0.0.199"):
+    return schema.VectorWaveConfig(clusters=list(clusters), ip_pool_start=start, ip_pool_end=end)
+
+
+def test_duplicate_and_invalid_names_are_rejected():
+    index = FleetIndex.from_configuration(_configuration(
+        schema.ClusterConfig("lab", "lab.example.com", metallb_range="10.0.0.100-10.0.0.109")
+    ))
+
+    assert index.check_name("edge") == "edge"
+    with pytest.raises(ValueError, match="already exists"):
+        index.check_name("lab")
+    for name in ("Edge", "-edge", "edge_1", "x" * 64, "done"):
+        with pytest.raises(ValueError):
+            index.check_name(name)
+
+
+def test_domains_are_normalized_and_unique():
+    index = FleetIndex()
+    index.add("lab", "Lab.Example.com.")
+
+    assert index.domains == {"lab.example.com": "lab"}
+    with pytest.raises(ValueError, match="already used by cluster 'lab'"):
+        index.check_domain("lab.example.com")
+    for domain in ("localhost", "bad..example.com", "under_score.example.com"):
+        with pytest.raises(ValueError, match="not a valid domain"):
+            index.check_domain(domain)
+
+
+def test_ranges_parse_and_detect_overlaps():
+    assert str(AddressRange.parse("10.0.0.0/29")) == "10.0.0.0-10.0.0.7"
+    for text in ("10.0.0.9-10.0.0.1", "10.0.0.1", "10.0.0.1-banana"):
+        with pytest.raises(ValueError):
+            AddressRange.parse(text)
+
+    index = FleetIndex("10.0.0.100", "10.0.0.199")
+    index.add("lab", "lab.example.com", "10.0.0.110-10.0.0.119")
+    index.add("edge", "edge.example.com", "10.0.0.130-10.0.0.139")
+
+    assert str(index.check_range("10.0.0.120-10.0.0.129")) == "10.0.0.120-10.0.0.129"
+    with pytest.raises(ValueError, match="overlaps 10.0.0.130-10.0.0.139 used by cluster 'edge'"):
+        index.check_range("10.0.0.125-10.0.0.130")
+    with pytest.raises(ValueError, match="cluster 'lab'"):
+        index.add("dc", "dc.example.com", "10.0.0.119-10.0.0.119")
+    assert "dc" not in index.clusters
+
+
+def test_next_free_range_fills_gaps_first():
+    index = FleetIndex("10.0.0.100", "10.0.0.139", range_size=10)
+    assert str(index.next_free_range()) == "10.0.0.100-10.0.0.109"
+
+    index.add("a", "a.example.com", "10.0.0.105-10.0.0.109")
+    index.add("b", "b.example.com", "10.0.0.120-10.0.0.129")
+    assert str(index.next_free_range()) == "10.0.0.110-10.0.0.119"
+    assert str(index.next_free_range(size=5)) == "10.0.0.100-10.0.0.104"
+
+    index.add("c", "c.example.com", str(index.next_free_range()))
+    assert str(index.next_free_range()) == "10.0.0.130-10.0.0.139"
+    index.add("d", "d.example.com", "10.0.0.130-10.0.0.139")
+    assert index.next_free_range() is None
+
+
+def test_clusters_without_a_range_occupy_the_pool(tmp_path):
+    index = FleetIndex.from_configuration(_configuration(
+        schema.ClusterConfig("lab", "lab.example.com"),
+        schema.ClusterConfig("edge", "edge.example.com"),
+        schema.ClusterConfig("dc", "dc.example.com", metallb_range="10.0.0.100-10.0.0.109"),
+    ))
+
+    # Older clusters share the pool with each other, but still announce all of it
+    assert index.legacy_clusters == ["edge", "lab"]
+    assert index.next_free_range() is None
+    with pytest.raises(ValueError, match="still announced by clusters 'edge', 'lab'"):
+        index.check_range("10.0.0.150-10.0.0.159")
+    with pytest.raises(ValueError, match="used by cluster 'dc'"):
+        index.check_range("10.0.0.105-10.0.0.114")
+    assert str(index.check_range("10.0.1.0-10.0.1.9")) == "10.0.1.0-10.0.1.9"
+    assert [r.owner for r in index.allocations()] == ["dc", "edge", "lab"]
+
+    migrated = FleetIndex.from_configuration(_configuration(
+        schema.ClusterConfig("lab", "lab.example.com", metallb_range="10.0.0.110-10.0.0.119"),
+        schema.ClusterConfig("dc", "dc.example.com", metallb_range="10.0.0.100-10.0.0.109"),
+    ))
+    assert str(migrated.next_free_range()) == "10.0.0.120-10.0.0.129"
+
+
+def test_several_configurations_share_one_index():
+    index = FleetIndex.from_configuration(_configuration(
+        schema.ClusterConfig("lab", "lab.example.com", metallb_range="10.0.0.100-10.0.0.109")
+    ))
+    with pytest.raises(ValueError, match="already exists"):
+        index.add_configuration(_configuration(schema.ClusterConfig("lab", "other.example.com")))
+
+
+def test_wizard_prompts_reask_until_valid():
+    click = pytest.importorskip("click")
+    import cluster_snek.cli.commands.cli as cli_module
+    from click.testing import CliRunner # type: ignore
+
+    index = FleetIndex("10.0.0.100", "10.0.0.199")
+    index.add("lab", "lab.example.com", "10.0.0.100-10.0.0.109")
+
+    @click.command()
+    def ask():
+        name = click.prompt("Cluster name", value_proc=cli_module._validated(index.check_name, "done"))
+        metallb = click.prompt("MetalLB", default=str(index.next_free_range()),
+                               value_proc=cli_module._validated(lambda v: str(index.check_range(v))))
+        click.echo(f"-> {name} {metallb}")
+
+    result = CliRunner().invoke(ask, input="lab\nedge\n10.0.0.105-10.0.0.120\n\n")
+
+    assert "Cluster 'lab' already exists" in result.output
+    assert "overlaps 10.0.0.100-10.0.0.109" in result.output
+    assert result.output.endswith("-> edge 10.0.0.110-10.0.0.119\n")
+    assert CliRunner().invoke(ask, input="DONE\n\n").output.endswith("-> done 10.0.0.110-10.0.0.119\n")
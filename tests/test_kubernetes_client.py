@@ -0,0 +1,210 @@
+import json
+import queue
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest # type: ignore
+
+kubernetes = pytest.importorskip("kubernetes")
+import cluster_snek.connectors.kubernetes_client as kubernetes_client
+import cluster_snek.connectors.argocd as argocd
+
+APPLICATIONS = "/apis/argoproj.io/v1alpha1/namespaces/argocd/applications"
+PODS = "/api/v1/namespaces/argocd/pods"
+
+
+def _application(name, health, sync="Synced"):
+    return {
+        "apiVersion": "argoproj.io/v1alpha1",
+        "kind": "Application",
+        "metadata": {"name": name, "namespace": "argocd"},
+        "status": {"health": {"status": health}, "sync": {"status": sync}},
+    }
+
+
+def _pod(name, phase="Running"):
+    return {
+        "apiVersion": "v1",
+        "kind": "Pod",
+        "metadata": {"name": name, "namespace": "argocd",
+                     "labels": {"app.kubernetes.io/name": "argocd-server"}},
+        "status": {"phase": phase},
+    }
+
+
+class FakeApiServer(BaseHTTPRequestHandler):
+    """Serves list and chunked watch responses from in-memory collections"""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        state = self.server.state
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        state["requests"].append((url.path, query))
+        collection = state["collections"].get(url.path)
+        if collection is None:
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        if query.get("watch") == ["true"]:
+            return self._watch(url.path)
+        data = json.dumps({
+            "kind": "List",
+            "apiVersion": "v1",
+            "metadata": {"resourceVersion": str(state["version"])},
+            "items": list(collection.values()),
+        }).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _watch(self, path):
+        events = self.server.state["watches"].setdefault(path, queue.Queue())
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        while not self.server.stopping.is_set():
+            try:
+                event = events.get(timeout=0.05)
+            except queue.Empty:
+                continue
+            line = json.dumps(event).encode() + b"\n"
+            self.wfile.write(b"%x\r\n%s\r\n" % (len(line), line))
+            self.wfile.flush()
+        self.wfile.write(b"0\r\n\r\n")
+
+
+@pytest.fixture
+def api_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeApiServer)
+    server.daemon_threads = True
+    server.stopping = threading.Event()
+    server.state = {
+        "collections": {
+            APPLICATIONS: {"one": _application("one", "Progressing")},
+            PODS: {"argocd-server": _pod("argocd-server")},
+        },
+        "watches": {},
+        "requests": [],
+        "version": 1,
+    }
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    configuration = kubernetes.client.Configuration()
+    configuration.host = f"http://127.0.0.1:{server.server_port}"
+
+    def emit(path, event_type, obj):
+        server.state["version"] += 1
+        server.state["watches"].setdefault(path, queue.Queue()).put({"type": event_type, "object": obj})
+
+    yield kubernetes.client.ApiClient(configuration), server.state, emit
+    server.stopping.set()
+    server.shutdown()
+
+
+def test_get_api_client_is_shared_per_context(monkeypatch):
+    loaded = []
+    monkeypatch.setattr(
+        kubernetes.config, "load_kube_config",
+        lambda context=None, client_configuration=None: loaded.append(context)
+    )
+    kubernetes_client.get_api_client.cache_clear()
+    try:
+        first = kubernetes_client.get_api_client("lab")
+        assert kubernetes_client.get_api_client("lab") is first
+        assert kubernetes_client.get_api_client("prod") is not first
+        assert first.configuration.connection_pool_maxsize == kubernetes_client.DEFAULT_POOL_SIZE
+        assert loaded == ["lab", "prod"]
+    finally:
+        kubernetes_client.get_api_client.cache_clear()
+
+
+def test_informer_lists_then_applies_watch_events(api_server):
+    api_client, state, emit = api_server
+    seen = []
+    with kubernetes_client.pod_informer(api_client, "argocd") as informer:
+        informer.add_handler(lambda event_type, obj: seen.append((event_type, obj["metadata"]["name"])))
+        assert informer.wait_for_sync(5)
+        assert informer.get("argocd/argocd-server")["status"]["phase"] == "Running"
+
+        emit(PODS, "ADDED", _pod("repo-server", "Pending"))
+        assert informer.wait_for(lambda items: len(items) == 2, timeout=5)
+        emit(PODS, "DELETED", _pod("argocd-server"))
+        assert informer.wait_for(
+            lambda items: [i["metadata"]["name"] for i in items] == ["repo-server"], timeout=5
+        )
+
+    assert seen == [("ADDED", "repo-server"), ("DELETED", "argocd-server")]
+    lists = [q for path, q in state["requests"] if path == PODS and "watch" not in q]
+    assert len(lists) == 1
+
+
+def test_wait_for_times_out(api_server):
+    api_client, _, _ = api_server
+    with kubernetes_client.pod_informer(api_client, "argocd") as informer:
+        started = time.monotonic()
+        assert not informer.wait_for(lambda items: not items, timeout=0.3)
+        assert time.monotonic() - started < 2
+
+
+def test_argocd_status_and_event_driven_wait(api_server):
+    api_client, _, emit = api_server
+    connector = argocd.ArgoCDConnector(api_client)
+
+    assert connector.server_running()
+    assert [(a.name, a.health, a.healthy) for a in connector.list_applications()] == [
+        ("one", "Progressing", False)
+    ]
+
+    updates = []
+
+    def become_healthy():
+        time.sleep(0.2)
+        emit(APPLICATIONS, "MODIFIED", _application("one", "Healthy"))
+
+    threading.Thread(target=become_healthy, daemon=True).start()
+    started = time.monotonic()
+    assert connector.wait_until_healthy(
+        timeout=5, on_change=lambda statuses: updates.append([s.health for s in statuses])
+    )
+    assert time.monotonic() - started < 2
+    assert updates[0] == ["Progressing"]
+    assert updates[-1] == ["Healthy"]
+
+
+def test_slow_predicate_does_not_hold_up_events(api_server):
+    api_client, _, emit = api_server
+    with kubernetes_client.pod_informer(api_client, "argocd") as informer:
+        assert informer.wait_for_sync(5)
+        delivered = threading.Event()
+        informer.add_handler(lambda event_type, obj: delivered.set())
+        delivered_while_checking = []
+
+        def predicate(items):
+            if len(items) == 1:
+                emit(PODS, "ADDED", _pod("repo-server", "Pending"))
+                delivered_while_checking.append(delivered.wait(5))
+            return len(items) == 2
+
+        assert informer.wait_for(predicate, timeout=10)
+        assert delivered_while_checking == [True]
+
+
+def test_wait_for_server_watches_pods(api_server):
+    api_client, state, emit = api_server
+    state["collections"][PODS] = {"argocd-server": _pod("argocd-server", "Pending")}
+    connector = argocd.ArgoCDConnector(api_client)
+
+    threading.Timer(0.2, emit, (PODS, "MODIFIED", _pod("argocd-server"))).start()
+    assert connector.wait_for_server(timeout=5)
+    assert any(query.get("watch") == ["true"] for path, query in state["requests"] if path == PODS)
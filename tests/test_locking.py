@@ -0,0 +1,156 @@
+import subprocess
+import sys
+import threading
+import time
+
+import pytest # type: ignore
+
+import cluster_snek.utils.locking as locking
+import cluster_snek.deployment.state as state
+
+FileLock = locking.FileLock
+LockUnavailable = locking.LockUnavailable
+
+HOLD_LOCK = """
+import sys, time
+from cluster_snek.utils.locking import FileLock
+with FileLock(sys.argv[1], owner="ci-job-7"):
+    print("locked", flush=True)
+    time.sleep(float(sys.argv[2]))
+"""
+
+
+def _hold_in_subprocess(path, seconds):
+    process = subprocess.Popen(
+        [sys.executable, "-c", HOLD_LOCK, str(path), str(seconds)],
+        stdout=subprocess.PIPE, text=True
+    )
+    assert process.stdout.readline().strip() == "locked"
+    return process
+
+
+def test_fail_fast_reports_holder(tmp_path):
+    path = tmp_path / "lab.lock"
+    process = _hold_in_subprocess(path, 5)
+    try:
+        with pytest.raises(LockUnavailable) as excinfo:
+            FileLock(path, timeout=0).acquire()
+        assert excinfo.value.holder.owner == "ci-job-7"
+        assert excinfo.value.holder.pid == process.pid
+        assert "ci-job-7" in str(excinfo.value)
+    finally:
+        process.kill()
+        process.wait()
+
+
+def test_lock_released_when_holder_dies(tmp_path):
+    path = tmp_path / "lab.lock"
+    process = _hold_in_subprocess(path, 30)
+    process.kill()
+    process.wait()
+    with FileLock(path, timeout=1) as lock:
+        assert lock.locked
+        assert locking.read_lease(path).pid == lock.lease.pid
+    assert locking.read_lease(path) is None
+
+
+def test_waiting_run_proceeds_after_release(tmp_path):
+    path = tmp_path / "lab.lock"
+    process = _hold_in_subprocess(path, 0.3)
+    try:
+        started = time.monotonic()
+        with FileLock(path, timeout=5):
+            assert time.monotonic() - started >= 0.1
+    finally:
+        process.wait()
+
+
+def test_disjoint_clusters_run_in_parallel(tmp_path):
+    timeline = []
+
+    def run(clusters):
+        with locking.lock_clusters(tmp_path, clusters, timeout=5):
+            timeline.append(("start", clusters))
+            time.sleep(0.2)
+            timeline.append(("end", clusters))
+
+    threads = [
+        threading.Thread(target=run, args=(["lab", "edge"],)),
+        threading.Thread(target=run, args=(["prod"],)),
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert [event for event, _ in timeline[:2]] == ["start", "start"]
+
+
+def test_overlapping_clusters_conflict(tmp_path):
+    with locking.lock_clusters(tmp_path, ["lab", "prod"]):
+        with pytest.raises(LockUnavailable):
+            with locking.lock_clusters(tmp_path, ["prod", "staging"], timeout=0.2):
+                pass
+        with locking.lock_clusters(tmp_path, ["staging"], timeout=0):
+            pass
+
+
+def test_generate_runs_on_disjoint_clusters_overlap(tmp_path):
+    pytest.importorskip("click")
+    import cluster_snek.cli.commands.cli as cli_module
+
+    output = tmp_path / "out"
+    timeline = []
+
+    def generate(cluster):
+        # What _generate_clusters does around the (unavailable) generator
+        with locking.lock_clusters(output, [cluster], timeout=5):
+            timeline.append(("start", cluster))
+            staging = tmp_path / f"staging-{cluster}"
+            (staging / "clusters" / cluster).mkdir(parents=True)
+            (staging / "clusters" / cluster / "values.yaml").write_text(cluster)
+            (staging / "deploy.sh").write_text(cluster)
+            time.sleep(0.2)
+            cli_module._publish_generated(staging, output, timeout=5)
+            timeline.append(("end", cluster))
+
+    threads = [threading.Thread(target=generate, args=(name,)) for name in ("lab", "prod")]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert [event for event, _ in timeline[:2]] == ["start", "start"]
+    assert sorted(p.name for p in (output / "clusters").iterdir()) == ["lab", "prod"]
+    assert (output / "deploy.sh").read_text() == timeline[-1][1]
+
+
+def test_shared_lock_cannot_clash_with_a_cluster(tmp_path):
+    with FileLock(locking.shared_lock_path(tmp_path), timeout=0):
+        for name in ("shared", "_shared", "@shared", "outputs", "shared/outputs"):
+            with locking.lock_clusters(tmp_path, [name], timeout=0):
+                pass
+    with pytest.raises(ValueError, match="share the lock file"):
+        with locking.lock_clusters(tmp_path, ["lab@edge", "lab_edge"], timeout=0):
+            pass
+
+
+def test_state_store_leases(tmp_path):
+    store = state.StateStore(tmp_path / "state.db")
+    with store.cluster_lease("lab") as lease:
+        assert lease.pid > 0
+        with pytest.raises(LockUnavailable) as excinfo:
+            with state.StateStore(tmp_path / "state.db").cluster_lease("lab", timeout=0):
+                pass
+        assert excinfo.value.holder == lease
+        with store.cluster_lease("prod", timeout=0):
+            pass
+    with store.cluster_lease("lab", timeout=0):
+        pass
+
+
+def test_expired_lease_is_taken_over(tmp_path):
+    store = state.StateStore(tmp_path / "state.db")
+    stale = locking.Lease("crashed", 1, "elsewhere", time.time() - 100, time.time() - 1)
+    assert store.try_acquire_lease("cluster:lab", stale) is None
+    with store.cluster_lease("lab", timeout=0) as lease:
+        assert lease.owner != "crashed"
@@ -0,0 +1,74 @@
+import json
+
+import pytest # type: ignore
+
+click = pytest.importorskip("click")
+import cluster_snek.cli.output as output
+import cluster_snek.cli.commands.cli as cli_module
+import cluster_snek.connectors.argocd as argocd
+
+from click.testing import CliRunner # type: ignore # noqa: E402
+
+EventEmitter = output.EventEmitter
+OutputFormat = output.OutputFormat
+
+
+@click.command()
+def report():
+    out = output.get_emitter()
+    out.echo("🚀 working")
+    out.emit("cluster", name="lab", status="generated")
+    out.echo("❌ lab failed", err=True)
+
+
+def _events(text):
+    return [json.loads(line) for line in text.splitlines()]
+
+
+def test_text_mode_prints_messages_only():
+    result = CliRunner().invoke(report, obj={"output": EventEmitter(OutputFormat.TEXT)})
+    assert result.stdout == "🚀 working\n"
+    assert result.stderr == "❌ lab failed\n"
+
+
+def test_jsonl_mode_streams_events_only():
+    result = CliRunner().invoke(report, obj={"output": EventEmitter(OutputFormat.JSONL)})
+    events = _events(result.stdout)
+    assert [(e["event"], e.get("name"), e.get("message")) for e in events] == [
+        ("cluster", "lab", None),
+        ("error", None, "lab failed"),
+    ]
+    assert all(e["ts"].endswith("Z") for e in events)
+    assert result.stderr == ""
+
+
+def test_default_emitter_is_text():
+    assert not output.get_emitter().jsonl
+
+
+def test_status_emits_one_event_per_application(monkeypatch):
+    class FakeConnector:
+        def __init__(self, api_client, namespace="argocd"):
+            pass
+
+        def server_running(self):
+            return True
+
+        def list_applications(self):
+            return [
+                argocd.ApplicationStatus("apps", "Healthy", "Synced"),
+                argocd.ApplicationStatus("cilium", "Progressing", "OutOfSync"),
+            ]
+
+    monkeypatch.setattr(argocd, "ArgoCDConnector", FakeConnector)
+    monkeypatch.setattr("cluster_snek.connectors.kubernetes_client.get_api_client", lambda context: None)
+
+    result = CliRunner().invoke(
+        cli_module.cli.commands["status"], ["--context", "lab"],
+        obj={"output": EventEmitter(OutputFormat.JSONL)}
+    )
+
+    events = _events(result.stdout)
+    assert events[0]["event"] == "argocd" and events[0]["running"] is True
+    assert [(e["name"], e["healthy"]) for e in events[1:]] == [("apps", True), ("cilium", False)]
+    assert {e["context"] for e in events} == {"lab"}
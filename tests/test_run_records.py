@@ -0,0 +1,169 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest # type: ignore
+
+import cluster_snek.deployment.run_records as run_records
+import cluster_snek.deployment.verification_cache as verification_cache
+
+RunRecordStore = run_records.RunRecordStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    cache = verification_cache.VerificationCache(tmp_path / "verification.json")
+    return RunRecordStore(tmp_path / "runs", cache=cache)
+
+
+@pytest.fixture
+def inputs(tmp_path):
+    config = tmp_path / "fleet.yaml"
+    config.write_text("project_name: lab\n")
+    source = tmp_path / "charts"
+    (source / "cilium").mkdir(parents=True)
+    (source / "cilium" / "Chart.yaml").write_text("name: cilium\n")
+    (source / "values.yaml").write_text("replicas: 1\n")
+    (source / "render.sh").write_text("#!/bin/sh\n")
+    (source / "render.sh").chmod(0o755)
+    return config, source
+
+
+def test_capture_and_restore_roundtrip(store, inputs, tmp_path):
+    config, source = inputs
+    config_input = store.capture("config", config)
+    tree_input = store.capture("sources/charts", source)
+    remote = store.capture("sources/upstream", None, url="https://example.com/charts.git")
+
+    assert (config_input.kind, tree_input.kind, remote.kind) == ("file", "tree", "remote")
+    assert remote.digest is None and remote.path == "https://example.com/charts.git"
+
+    restored = store.restore(tree_input, tmp_path / "restored")
+    assert (restored / "cilium" / "Chart.yaml").read_text() == "name: cilium\n"
+    assert os.access(restored / "render.sh", os.X_OK)
+    assert store.tree_digest(restored) == tree_input.digest
+    assert store.restore(config_input, tmp_path / "c.yaml").read_text() == "project_name: lab\n"
+    with pytest.raises(ValueError, match="not stored"):
+        store.restore(remote, tmp_path / "upstream")
+
+
+def test_identical_files_are_stored_once(store, inputs, tmp_path):
+    config, source = inputs
+    (source / "copy.yaml").write_text("project_name: lab\n")
+    store.capture("config", config)
+    store.capture("sources/charts", source)
+    store.capture("config", config)
+
+    objects = [p for p in store.objects_dir.rglob("*") if p.is_file()]
+    # fleet.yaml == copy.yaml, Chart.yaml, values.yaml, render.sh and the tree manifest
+    assert len(objects) == 5
+
+
+def test_restore_rejects_paths_outside_destination(store, tmp_path):
+    for relative in ("../escaped.txt", "/tmp/escaped.txt", "charts/../../escaped.txt"):
+        data = json.dumps({relative: {"digest": "0" * 64, "mode": 0o644}}).encode()
+        digest = hashlib.sha256(data).hexdigest()
+        manifest = store._object_path(digest)
+        manifest.parent.mkdir(parents=True, exist_ok=True)
+        manifest.write_bytes(data)
+
+        item = run_records.InputDigest("sources/charts", str(tmp_path / "charts"), run_records.TREE, digest)
+        with pytest.raises(ValueError, match="unsafe path"):
+            store.restore(item, tmp_path / "restored")
+    assert not (tmp_path / "escaped.txt").exists()
+
+
+def test_unchanged_detects_mode_changes(store, inputs):
+    _, source = inputs
+    tree_input = store.capture("sources/charts", source)
+    (source / "render.sh").chmod(0o644)
+    assert not store.unchanged(tree_input)
+
+
+def test_unchanged_detects_edits(store, inputs):
+    config, source = inputs
+    config_input = store.capture("config", config)
+    tree_input = store.capture("sources/charts", source)
+    assert store.unchanged(config_input) and store.unchanged(tree_input)
+
+    (source / "values.yaml").write_text("replicas: 3\n")
+    config.unlink()
+    assert not store.unchanged(config_input)
+    assert not store.unchanged(tree_input)
+
+
+def test_records_roundtrip(store, inputs, tmp_path):
+    config, source = inputs
+    record = run_records.new_record(
+        7, store.capture("config", config), tmp_path / "out",
+        inputs=[store.capture("sources/charts", source)],
+        clusters=["lab"],
+        timings={"generate": 1.5}
+    )
+    store.save(record)
+
+    loaded = store.load(7)
+    assert loaded == record
+    assert loaded.input("sources/charts").kind == "tree"
+    assert loaded.created.endswith("Z") and loaded.python_version
+    with pytest.raises(ValueError, match="No run record for run 8"):
+        store.load(8)
+
+    path = store.records_dir / "7.json"
+    path.write_text(json.dumps({**json.loads(path.read_text()), "version": 0}))
+    with pytest.raises(ValueError, match="incompatible"):
+        store.load(7)
+
+
+def test_replay_restores_changed_inputs_and_compares_output(monkeypatch, tmp_path, inputs):
+    pytest.importorskip("click")
+    import cluster_snek.cli.commands.cli as cli_module
+    from click.testing import CliRunner # type: ignore
+
+    monkeypatch.setenv("XDG_DATA_HOME", str(tmp_path / "data"))
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    config, source = inputs
+    generated = []
+
+    def load(path):
+        return SimpleNamespace(
+            project_name="lab",
+            clusters=[SimpleNamespace(name="lab")],
+            source=SimpleNamespace(path=source, url=None),
+            sources={},
+            config_text=open(path).read()
+        )
+
+    def generate(ctx, configuration, output, force, clusters=None):
+        generated.append(configuration)
+        Path(output).mkdir(parents=True, exist_ok=True)
+        chart = Path(configuration.source.path) / "cilium" / "Chart.yaml"
+        (Path(output) / "cilium.yaml").write_text(configuration.config_text + chart.read_text())
+
+    monkeypatch.setattr(cli_module, "_load_configuration", load)
+    monkeypatch.setattr(cli_module, "_generate_clusters", generate)
+    monkeypatch.chdir(tmp_path)
+
+    cli_module._generate_recorded(None, str(config), load(config), str(tmp_path / "out"), False, {})
+    record = run_records.RunRecordStore().load(1)
+    assert [i.name for i in record.inputs] == ["source"]
+
+    # Edit the source after the run; replay must use the stored copy
+    (source / "cilium" / "Chart.yaml").write_text("name: cilium-next\n")
+    result = CliRunner().invoke(cli_module.cli.commands["replay"], ["1"], obj={})
+
+    assert result.exit_code == 0, result.output
+    assert "Restored source from the run store" in result.output
+    assert "Output identical to run #1" in result.output
+    assert generated[-1].source.path != source
+    assert (tmp_path / "out-replay-1" / "cilium.yaml").read_text() == "project_name: lab\nname: cilium\n"
+    assert run_records.RunRecordStore().load(2).replay_of == 1
+
+    # Generate runs are recorded per output directory, not as a deployed cluster
+    from cluster_snek.deployment.state import StateStore
+    assert sorted((run.kind, run.cluster) for run in StateStore().runs()) == [
+        ("generate", f"generate:{tmp_path / 'out'}"),
+        ("replay", f"generate:{tmp_path / 'out-replay-1'}"),
+    ]
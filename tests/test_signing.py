@@ -0,0 +1,177 @@
+import base64
+import hashlib
+import os
+import shutil
+
+import pytest # type: ignore
+
+import cluster_snek.security_framework.crypto.signing as signing
+
+MinisignPublicKey = signing.MinisignPublicKey
+SignatureService = signing.SignatureService
+
+# RFC 8032, section 7.1, test 1
+RFC_SECRET = bytes.fromhex("9d61b19deffd5a60ba844af492ec2cc44449c5697b326919703bac031cae7f60")
+RFC_PUBLIC = bytes.fromhex("d75a980182b10ab7d54bfed3c964073a0ee172f3daa62325af021a68f707511a")
+RFC_SIGNATURE = bytes.fromhex(
+    "e5564300c360ac729086e2cc806e828a84877f1eb8e5d974d873e06522490155"
+    "5fb8821590a33bacc61e39701cf9b46bd25bf5f0595bbe24655141438e7a100b"
+)
+KEY_ID = bytes.fromhex("0102030405060708")
+
+
+# Signing lives here rather than in the package: the Ed25519 code there is
+# not constant time and must never see a real secret key.
+def _expand_secret(secret):
+    digest = hashlib.sha512(secret).digest()
+    scalar = int.from_bytes(digest[:32], "little")
+    scalar &= (1 << 254) - 8
+    scalar |= 1 << 254
+    return scalar, digest[32:]
+
+
+def ed25519_public_key(secret):
+    scalar, _ = _expand_secret(secret)
+    return signing._compress(signing._point_mul(scalar, signing._G))
+
+
+def ed25519_sign(secret, message):
+    scalar, prefix = _expand_secret(secret)
+    public = ed25519_public_key(secret)
+    r = signing._sha512_mod_q(prefix + message)
+    r_bytes = signing._compress(signing._point_mul(r, signing._G))
+    h = signing._sha512_mod_q(r_bytes + public + message)
+    s = (r + h * scalar) % signing._Q
+    return r_bytes + int.to_bytes(s, 32, "little")
+
+
+def minisign_sign(data_path, secret, key_id, trusted_comment=""):
+    """Contents of a prehashed ``.minisig`` file for data_path"""
+    with open(data_path, "rb") as f:
+        prehashed = hashlib.file_digest(f, "blake2b").digest()
+    signature = ed25519_sign(secret, prehashed)
+    global_signature = ed25519_sign(secret, signature + trusted_comment.encode())
+    encoded = base64.b64encode(b"ED" + key_id + signature).decode()
+    return (
+        f"untrusted comment: signature from cluster-snek tests\n{encoded}\n"
+        f"trusted comment: {trusted_comment}\n"
+        f"{base64.b64encode(global_signature).decode()}\n"
+    )
+
+
+def test_ed25519_rfc8032_vector():
+    assert ed25519_public_key(RFC_SECRET) == RFC_PUBLIC
+    assert ed25519_sign(RFC_SECRET, b"") == RFC_SIGNATURE
+    assert signing.ed25519_verify(RFC_PUBLIC, b"", RFC_SIGNATURE)
+    assert not signing.ed25519_verify(RFC_PUBLIC, b"x", RFC_SIGNATURE)
+    tampered = RFC_SIGNATURE[:-1] + bytes([RFC_SIGNATURE[-1] ^ 1])
+    assert not signing.ed25519_verify(RFC_PUBLIC, b"", tampered)
+
+
+@pytest.fixture
+def minisign_files(tmp_path):
+    public = MinisignPublicKey(key_id=KEY_ID, key=ed25519_public_key(RFC_SECRET))
+    key_path = tmp_path / "bundle.pub"
+    key_path.write_text(public.to_text())
+    charts = []
+    for i in range(3):
+        data = tmp_path / f"chart-{i}.tgz"
+        data.write_bytes(os.urandom(1024))
+        sig = tmp_path / f"chart-{i}.tgz.minisig"
+        sig.write_text(minisign_sign(data, RFC_SECRET, KEY_ID, trusted_comment=f"chart {i}"))
+        charts.append((data, sig))
+    return key_path, charts
+
+
+def test_minisign_verify(minisign_files):
+    key_path, charts = minisign_files
+    service = SignatureService()
+    data, sig = charts[0]
+    assert signing.is_minisign_key(key_path)
+    assert service.verify(data, sig, key_path)
+
+    data.write_bytes(b"tampered")
+    with pytest.raises(ValueError, match="bad signature"):
+        service.verify(data, sig, key_path)
+
+
+def test_minisign_rejects_edited_trusted_comment(minisign_files):
+    key_path, charts = minisign_files
+    data, sig = charts[1]
+    sig.write_text(sig.read_text().replace("trusted comment: chart 1", "trusted comment: chart 9"))
+    with pytest.raises(ValueError, match="trusted comment"):
+        SignatureService().verify(data, sig, key_path)
+
+
+def test_minisign_batch_reports_each_result(minisign_files, monkeypatch):
+    key_path, charts = minisign_files
+    charts[2][0].write_bytes(b"tampered")
+    monkeypatch.setattr("subprocess.Popen", None)  # no process may be spawned
+
+    results = SignatureService().verify_many(charts, key_path)
+
+    assert results[charts[0][0]] is None
+    assert results[charts[1][0]] is None
+    assert "bad signature" in results[charts[2][0]]
+
+
+@pytest.fixture
+def gpg_key(tmp_path):
+    gnupg = pytest.importorskip("gnupg")
+    if shutil.which("gpg") is None:
+        pytest.skip("gpg not installed")
+    signer_home = tmp_path / "signer"
+    signer_home.mkdir(mode=0o700)
+    gpg = gnupg.GPG(gnupghome=str(signer_home))
+    key = gpg.gen_key(gpg.gen_key_input(
+        key_type="EDDSA", key_curve="ed25519", key_usage="sign",
+        name_email="release@example.com", no_protection=True
+    ))
+    if not key.fingerprint:
+        pytest.skip("gpg key generation unavailable")
+    key_path = tmp_path / "release.asc"
+    key_path.write_text(gpg.export_keys(key.fingerprint))
+
+    def sign(data_path):
+        sig_path = data_path.with_name(data_path.name + ".sig")
+        with open(data_path, "rb") as f:
+            gpg.sign_file(f, keyid=key.fingerprint, detach=True, binary=True, output=str(sig_path))
+        return sig_path
+
+    return key_path, sign
+
+
+def test_gpg_keys_imported_once(tmp_path, gpg_key, monkeypatch):
+    key_path, sign = gpg_key
+    data = tmp_path / "bundle.zip"
+    data.write_bytes(b"bundle")
+    sig = sign(data)
+
+    service = SignatureService(gnupghome=tmp_path / "keyring")
+    imports = []
+    real_import = service.gpg._get_gpg().import_keys
+    monkeypatch.setattr(service.gpg._gpg, "import_keys", lambda d: imports.append(1) or real_import(d))
+
+    assert service.verify(data, sig, key_path)
+    assert service.verify(data, sig, key_path)
+    assert len(imports) == 1
+
+    # A fresh service on the same keyring remembers the import
+    fresh = SignatureService(gnupghome=tmp_path / "keyring")
+    monkeypatch.setattr(fresh.gpg._get_gpg(), "import_keys", lambda d: imports.append(1) or real_import(d))
+    assert fresh.verify(data, sig, key_path)
+    assert len(imports) == 1
+
+    data.write_bytes(b"tampered")
+    with pytest.raises(ValueError, match="Signature verification failed"):
+        fresh.verify(data, sig, key_path)
+
+
+def test_gpg_rejects_clear_signed(tmp_path, gpg_key):
+    key_path, _ = gpg_key
+    data = tmp_path / "bundle.zip"
+    data.write_bytes(b"bundle")
+    sig = tmp_path / "bundle.zip.asc"
+    sig.write_text("-----BEGIN PGP SIGNED MESSAGE-----\n")
+    with pytest.raises(ValueError, match="clear-signed"):
+        SignatureService(gnupghome=tmp_path / "keyring").verify(data, sig, key_path)
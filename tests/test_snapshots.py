@@ -0,0 +1,130 @@
+import pytest # type: ignore
+
+import cluster_snek.deployment.snapshots as snapshots
+import cluster_snek.deployment.apply as apply
+import cluster_snek.deployment.state as state
+
+SnapshotStore = snapshots.SnapshotStore
+
+
+def _config_map(name, value):
+    return apply.Resource({
+        "apiVersion": "v1",
+        "kind": "ConfigMap",
+        "metadata": {"name": name, "namespace": "apps"},
+        "data": {"value": value},
+    })
+
+
+def _fleet(count, changed=()):
+    return [
+        _config_map(f"cm-{i}", "new" if i in changed else "old")
+        for i in range(count)
+    ]
+
+
+class RecordingApplier:
+    def __init__(self):
+        self.applied = []
+
+    def apply(self, resource):
+        self.applied.append(resource.key)
+
+
+def test_snapshots_share_unchanged_objects(tmp_path):
+    store = SnapshotStore(tmp_path)
+    for i in range(10):
+        store.record(_fleet(50, changed={i}), scope="lab")
+
+    objects = list((tmp_path / "objects").glob("*/*"))
+    assert len(store.list("lab")) == 10
+    # 50 originals plus one new version per snapshot
+    assert len(objects) == 50 + 10
+
+
+def test_get_by_prefix_and_scope_listing(tmp_path):
+    store = SnapshotStore(tmp_path)
+    lab = store.record(_fleet(2), scope="lab")
+    prod = store.record(_fleet(2), scope="prod")
+
+    assert store.get(lab.id).id == lab.id
+    assert store.get(lab.id[:len(lab.id) - 3]).id == lab.id
+    assert [s.id for s in store.list("prod")] == [prod.id]
+    assert store.latest("lab").id == lab.id
+    with pytest.raises(ValueError, match="No snapshot"):
+        store.get("nope")
+
+
+def test_rollback_reapplies_only_differences(tmp_path):
+    store = SnapshotStore(tmp_path)
+    good = store.record(_fleet(5), scope="lab")
+    extra = _config_map("added-later", "x")
+    store.record(_fleet(5, changed={1, 3}) + [extra], scope="lab")
+
+    plan = store.plan_rollback(good.id)
+    assert plan.changed == ["ConfigMap/apps/cm-1", "ConfigMap/apps/cm-3"]
+    assert plan.orphaned == ["ConfigMap/apps/added-later"]
+
+    applier = RecordingApplier()
+    report = store.rollback(good.id, apply.ApplyEngine(applier))
+
+    assert report.ok
+    assert sorted(applier.applied) == ["ConfigMap/apps/cm-1", "ConfigMap/apps/cm-3"]
+    latest = store.latest("lab")
+    assert latest.resources == good.resources
+    assert latest.metadata == {"rollback_of": good.id}
+    assert store.plan_rollback(good.id).changed == []
+
+
+def test_rollback_after_partial_deploy_uses_applied_hashes(tmp_path):
+    store = SnapshotStore(tmp_path / "snapshots")
+    states = state.StateStore(tmp_path / "state.db")
+    good = store.record(_fleet(4), scope="lab")
+    apply.ApplyEngine(RecordingApplier(), cache=state.StateStoreResourceCache(states, "lab")).apply(_fleet(4))
+
+    # A failed deploy got cm-2 through before stopping; no snapshot was recorded
+    class FailingApplier(RecordingApplier):
+        def apply(self, resource):
+            if resource.key.endswith("cm-3"):
+                raise RuntimeError("admission webhook denied the request")
+            super().apply(resource)
+
+    engine = apply.ApplyEngine(FailingApplier(), cache=state.StateStoreResourceCache(states, "lab"))
+    assert not engine.apply(_fleet(4, changed={2, 3})).ok
+    assert store.latest("lab").id == good.id
+    assert store.plan_rollback(good.id).changed == []
+
+    applied = states.resource_hashes("lab")
+    plan = store.plan_rollback(good.id, applied)
+    # cm-3 failed, so its applied state is unknown and it is reapplied too
+    assert plan.changed == ["ConfigMap/apps/cm-2", "ConfigMap/apps/cm-3"]
+
+    applier = RecordingApplier()
+    report = store.rollback(good.id, apply.ApplyEngine(applier), applied)
+    assert report.ok and sorted(applier.applied) == plan.changed
+
+
+def test_rollback_orders_changes_after_unchanged_dependencies(tmp_path):
+    store = SnapshotStore(tmp_path)
+    settings = _config_map("settings", "old")
+    app = _config_map("app", "old")
+    app.body["metadata"]["annotations"] = {apply.DEPENDS_ON_ANNOTATION: settings.key}
+    good = store.record([settings, app], scope="lab")
+    changed_app = _config_map("app", "new")
+    changed_app.body["metadata"]["annotations"] = {apply.DEPENDS_ON_ANNOTATION: settings.key}
+    store.record([settings, changed_app], scope="lab")
+
+    applier = RecordingApplier()
+    report = store.rollback(good.id, apply.ApplyEngine(applier))
+
+    # Only app differs; the settings it depends on are already in place
+    assert report.ok and applier.applied == ["ConfigMap/apps/app"]
+    with pytest.raises(ValueError, match="depends on unknown resource"):
+        apply.ApplyEngine(RecordingApplier()).apply(store.resources(good, ["ConfigMap/apps/app"]))
+
+
+def test_rolled_back_manifests_round_trip(tmp_path):
+    store = SnapshotStore(tmp_path)
+    snapshot = store.record(_fleet(3), scope="lab")
+    bodies = [r.body for r in store.resources(snapshot)]
+    assert bodies == [r.body for r in _fleet(3)]
@@ -0,0 +1,115 @@
+import time
+
+import pytest # type: ignore
+
+import cluster_snek.utils.source_manager as source_manager
+import cluster_snek.config.schema as schema
+
+FetchStatus = source_manager.FetchStatus
+MultiSourceManager = source_manager.MultiSourceManager
+SourceManager = source_manager.SourceManager
+DeploymentMode = schema.DeploymentMode
+SourceConfig = schema.SourceConfig
+
+
+def _local_source(path, timeout=None):
+    return SourceConfig(type=DeploymentMode.AIRGAPPED_LOCAL, path=path, timeout=timeout)
+
+
+def test_fetch_multiple_local_sources(tmp_path):
+    sources = {}
+    for name in ("charts", "images", "policies"):
+        src = tmp_path / "src" / name
+        src.mkdir(parents=True)
+        (src / f"{name}.txt").write_text(name)
+        sources[name] = _local_source(src)
+
+    report = MultiSourceManager(sources, tmp_path / "work").fetch_sources()
+
+    assert report.ok
+    paths = report.paths()
+    assert set(paths) == {"charts", "images", "policies"}
+    for name, path in paths.items():
+        assert (path / f"{name}.txt").read_text() == name
+
+
+def test_fetch_runs_concurrently(tmp_path, monkeypatch):
+    def slow_fetch(self):
+        time.sleep(0.3)
+        return self.local_path
+
+    monkeypatch.setattr(SourceManager, "fetch_sources", slow_fetch)
+    sources = {name: _local_source(tmp_path) for name in ("a", "b", "c")}
+
+    report = MultiSourceManager(sources, tmp_path / "work", max_workers=3).fetch_sources()
+
+    assert report.ok
+    assert report.elapsed < 0.8
+
+
+def test_fetch_reports_timeouts_and_failures(tmp_path, monkeypatch):
+    def fetch(self):
+        if self.temp_dir.name == "slow":
+            time.sleep(2)
+        if self.temp_dir.name == "broken":
+            raise ValueError("boom")
+        return self.local_path
+
+    monkeypatch.setattr(SourceManager, "fetch_sources", fetch)
+    sources = {
+        "slow": _local_source(tmp_path, timeout=0.2),
+        "broken": _local_source(tmp_path),
+        "fine": _local_source(tmp_path),
+    }
+
+    started = time.monotonic()
+    report = MultiSourceManager(sources, tmp_path / "work").fetch_sources()
+
+    assert time.monotonic() - started < 1.5
+    assert not report.ok
+    assert report.results["slow"].status == FetchStatus.TIMEOUT
+    assert report.results["broken"].status == FetchStatus.FAILED
+    assert report.results["broken"].error == "boom"
+    assert report.results["fine"].status == FetchStatus.OK
+    assert {r.name for r in report.failed} == {"slow", "broken"}
+    assert "slow: timeout" in report.summary()
+
+
+def test_invalid_max_workers(tmp_path):
+    with pytest.raises(ValueError):
+        MultiSourceManager({}, tmp_path, max_workers=0)
+
+
+def test_open_view_reads_local_source_in_place(tmp_path):
+    src = tmp_path / "mirror"
+    (src / "charts").mkdir(parents=True)
+    (src / "charts" / "index.yaml").write_text("apiVersion: v1\n")
+
+    work = tmp_path / "work"
+    work.mkdir()
+    view = SourceManager(_local_source(src), work).open_view()
+
+    assert view.read_text("charts/index.yaml") == "apiVersion: v1\n"
+    assert view.materialize("charts/index.yaml") == src / "charts" / "index.yaml"
+    assert not (tmp_path / "work" / "sources" / "local").exists()
+
+
+def test_generate_fetches_named_sources_before_generating(tmp_path):
+    from types import SimpleNamespace
+    import cluster_snek.cli.commands.cli as cli_module
+
+    src = tmp_path / "src" / "charts"
+    src.mkdir(parents=True)
+    (src / "Chart.yaml").write_text("name: cilium\n")
+    configuration = SimpleNamespace(sources={"charts": _local_source(src)})
+
+    fetched = cli_module._fetch_named_sources(configuration, tmp_path / "work")
+
+    local = fetched.sources["charts"]
+    assert local.type == DeploymentMode.AIRGAPPED_LOCAL
+    assert (local.path / "Chart.yaml").read_text() == "name: cilium\n"
+    assert configuration.sources["charts"].path == src
+
+    configuration.sources["broken"] = SourceConfig(type="ftp")
+    with pytest.raises(ValueError, match="broken: failed"):
+        cli_module._fetch_named_sources(configuration, tmp_path / "work")
@@ -0,0 +1,180 @@
+import hashlib
+import io
+import json
+import tarfile
+import zipfile
+
+import pytest # type: ignore
+
+import cluster_snek.utils.source_view as source_view
+
+DirectorySourceView = source_view.DirectorySourceView
+LazySourceView = source_view.LazySourceView
+OverlayView = source_view.OverlayView
+normalize_path = source_view.normalize_path
+open_archive_view = source_view.open_archive_view
+
+FILES = {
+    "charts/cilium/Chart.yaml": b"name: cilium\n",
+    "charts/cilium/values.yaml": b"replicas: 1\n",
+    "charts/metallb/Chart.yaml": b"name: metallb\n",
+}
+
+
+def _make_tar(path, mode="w:gz"):
+    with tarfile.open(path, mode) as tar:
+        for name, data in FILES.items():
+            info = tarfile.TarInfo(f"./{name}")
+            info.size = len(data)
+            tar.addfile(info, io.BytesIO(data))
+    return path
+
+
+def _make_zip(path):
+    with zipfile.ZipFile(path, "w") as zf:
+        for name, data in FILES.items():
+            zf.writestr(name, data)
+    return path
+
+
+def _make_dir(root):
+    for name, data in FILES.items():
+        (root / name).parent.mkdir(parents=True, exist_ok=True)
+        (root / name).write_bytes(data)
+    return root
+
+
+@pytest.mark.parametrize("factory", ["dir", "tar", "tgz", "zip"])
+def test_views_expose_same_tree(tmp_path, factory):
+    if factory == "dir":
+        view = DirectorySourceView(_make_dir(tmp_path / "src"))
+    elif factory == "tar":
+        view = open_archive_view(_make_tar(tmp_path / "bundle.tar", mode="w"))
+    elif factory == "tgz":
+        view = open_archive_view(_make_tar(tmp_path / "bundle.tar.gz"))
+    else:
+        view = open_archive_view(_make_zip(tmp_path / "bundle.zip"))
+
+    assert view.list_files() == sorted(FILES)
+    assert view.read_text("./charts/cilium/Chart.yaml") == "name: cilium\n"
+    assert view.exists("charts/metallb/Chart.yaml")
+    assert not view.exists("charts/istio/Chart.yaml")
+    assert view.glob("charts/*/Chart.yaml") == ["charts/cilium/Chart.yaml", "charts/metallb/Chart.yaml"]
+    with pytest.raises(FileNotFoundError):
+        view.read_bytes("missing.yaml")
+
+
+def test_git_view(tmp_path):
+    git = pytest.importorskip("git")
+    repo = git.Repo.init(tmp_path / "repo")
+    _make_dir(tmp_path / "repo")
+    repo.index.add(list(FILES))
+    repo.index.commit("charts")
+
+    view = source_view.GitSourceView(tmp_path / "repo")
+    assert view.list_files() == sorted(FILES)
+    assert view.read_bytes("charts/metallb/Chart.yaml") == b"name: metallb\n"
+    assert not view.exists("charts/cilium")
+
+
+def test_lazy_view_materializes_on_demand(tmp_path):
+    view = LazySourceView(open_archive_view(_make_tar(tmp_path / "b.tgz")), tmp_path / "cache")
+
+    assert not (tmp_path / "cache").exists()
+    path = view.materialize("charts/cilium/Chart.yaml")
+    assert path == tmp_path / "cache" / "charts" / "cilium" / "Chart.yaml"
+    assert path.read_bytes() == FILES["charts/cilium/Chart.yaml"]
+    assert not (tmp_path / "cache" / "charts" / "metallb").exists()
+
+    chart_dir = view.materialize_tree("charts/cilium")
+    assert sorted(p.name for p in chart_dir.iterdir()) == ["Chart.yaml", "values.yaml"]
+
+
+def test_compressed_tar_is_read_in_one_pass(tmp_path, monkeypatch):
+    archive = _make_tar(tmp_path / "b.tgz")
+    plain = open_archive_view(_make_tar(tmp_path / "b.tar", mode="w"))
+    view = open_archive_view(archive)
+    assert view.compressed and not plain.compressed
+
+    opened = []
+    real_open = tarfile.open
+    monkeypatch.setattr(source_view.tarfile, "open", lambda *a, **k: opened.append(a) or real_open(*a, **k))
+
+    # Seeks straight to member data, no tar parsing at all
+    assert plain.read_bytes("charts/metallb/Chart.yaml") == b"name: metallb\n"
+    assert opened == []
+
+    lazy = LazySourceView(view, tmp_path / "cache")
+    chart_dir = lazy.materialize_tree("charts")
+    assert len(opened) == 1
+    assert (chart_dir / "cilium" / "values.yaml").read_bytes() == b"replicas: 1\n"
+    assert [path for path, _ in view.read_files(reversed(sorted(FILES)))] == list(FILES)
+
+
+def test_bundle_view_exposes_charts_by_name(tmp_path):
+    chart = b"packaged cilium chart"
+    digest = hashlib.sha256(chart).hexdigest()
+    manifest = {
+        "format": "cluster-snek-bundle/v1",
+        "charts": [{"name": "cilium", "version": "1.15.0", "digest": digest, "size": len(chart)}],
+    }
+
+    def write_bundle(path, blob):
+        with zipfile.ZipFile(path, "w") as zf:
+            zf.writestr("manifest.json", json.dumps(manifest))
+            zf.writestr(f"blobs/sha256/{digest}", blob)
+        return path
+
+    view = open_archive_view(write_bundle(tmp_path / "bundle.zip", chart))
+    assert view.list_files() == ["charts/cilium-1.15.0.tgz"]
+    assert view.read_bytes("charts/cilium-1.15.0.tgz") == chart
+
+    tampered = open_archive_view(write_bundle(tmp_path / "tampered.zip", b"tampered"))
+    with pytest.raises(ValueError, match="Checksum mismatch"):
+        tampered.read_bytes("charts/cilium-1.15.0.tgz")
+
+
+def test_lazy_view_uses_directory_in_place(tmp_path):
+    root = _make_dir(tmp_path / "src")
+    view = LazySourceView(DirectorySourceView(root), tmp_path / "cache")
+    assert view.materialize("charts/cilium/values.yaml") == root / "charts" / "cilium" / "values.yaml"
+    assert view.materialize_tree("charts/metallb") == root / "charts" / "metallb"
+    assert not (tmp_path / "cache").exists()
+
+
+def test_lazy_view_lru_eviction(tmp_path):
+    reads = []
+
+    class CountingView(DirectorySourceView):
+        def read_bytes(self, path):
+            reads.append(path)
+            return super().read_bytes(path)
+
+    view = LazySourceView(CountingView(_make_dir(tmp_path / "src")), tmp_path / "cache", cache_bytes=30)
+    view.read_bytes("charts/cilium/Chart.yaml")
+    view.read_bytes("charts/cilium/Chart.yaml")
+    assert reads == ["charts/cilium/Chart.yaml"]
+
+    view.read_bytes("charts/cilium/values.yaml")
+    view.read_bytes("charts/metallb/Chart.yaml")
+    view.read_bytes("charts/cilium/Chart.yaml")
+    assert reads.count("charts/cilium/Chart.yaml") == 2
+
+
+def test_overlay_prefers_first_layer(tmp_path):
+    upper = tmp_path / "upper"
+    (upper / "charts" / "cilium").mkdir(parents=True)
+    (upper / "charts" / "cilium" / "Chart.yaml").write_text("name: patched\n")
+    view = OverlayView([
+        DirectorySourceView(upper),
+        open_archive_view(_make_zip(tmp_path / "b.zip")),
+    ])
+    assert view.read_text("charts/cilium/Chart.yaml") == "name: patched\n"
+    assert view.read_text("charts/metallb/Chart.yaml") == "name: metallb\n"
+    assert view.list_files() == sorted(FILES)
+
+
+def test_normalize_path_rejects_escape():
+    assert normalize_path("./a/b/../c") == "a/c"
+    with pytest.raises(ValueError):
+        normalize_path("../etc/passwd")
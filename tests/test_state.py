@@ -0,0 +1,122 @@
+import threading
+
+import pytest # type: ignore
+
+import cluster_snek.deployment.state as state
+import cluster_snek.deployment.apply as apply
+
+RunStatus = state.RunStatus
+StateStore = state.StateStore
+
+
+def _config_map(name, value="v", part_of=None):
+    metadata = {"name": name, "namespace": "apps"}
+    if part_of:
+        metadata["labels"] = {"app.kubernetes.io/part-of": part_of}
+    return apply.Resource({"apiVersion": "v1", "kind": "ConfigMap", "metadata": metadata,
+                           "data": {"value": value}})
+
+
+class RecordingApplier:
+    def __init__(self, fail=()):
+        self.fail = set(fail)
+        self.applied = []
+
+    def apply(self, resource):
+        if resource.key in self.fail:
+            raise RuntimeError("rejected")
+        self.applied.append(resource.key)
+
+
+def test_database_uses_wal_and_indexes(tmp_path):
+    store = StateStore(tmp_path / "state.db")
+    conn = store._connection()
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    plan = conn.execute(
+        "EXPLAIN QUERY PLAN SELECT id FROM runs WHERE cluster_id = 1 AND kind = 'deploy'"
+        " AND status = 'succeeded' ORDER BY finished_at DESC LIMIT 1"
+    ).fetchall()
+    assert any("runs_by_cluster" in row[-1] for row in plan)
+
+
+def test_last_successful_deploy_per_cluster(tmp_path):
+    store = StateStore(tmp_path / "state.db")
+    lab_ok = store.start_run("lab", "deploy")
+    store.finish_run(lab_ok, RunStatus.SUCCEEDED, snapshot_id="snap-1")
+    lab_failed = store.start_run("lab", "deploy")
+    store.finish_run(lab_failed, RunStatus.FAILED, error="boom")
+    prod_ok = store.start_run("prod", "deploy")
+    store.finish_run(prod_ok, RunStatus.SUCCEEDED)
+    store.start_run("edge", "deploy")
+
+    last = store.last_successful_runs()
+    assert {name: run.id for name, run in last.items()} == {"lab": lab_ok, "prod": prod_ok}
+    assert last["lab"].snapshot_id == "snap-1"
+    assert [r.status for r in store.runs("lab")] == [RunStatus.FAILED, RunStatus.SUCCEEDED]
+    assert store.get_run(lab_failed).error == "boom"
+
+
+def test_concurrent_runs_do_not_conflict(tmp_path):
+    path = tmp_path / "state.db"
+    StateStore(path)
+    errors = []
+
+    def worker(cluster):
+        try:
+            store = StateStore(path)
+            for _ in range(20):
+                run_id = store.start_run(cluster, "deploy")
+                store.record_component(run_id, "argocd", "succeeded")
+                store.finish_run(run_id, RunStatus.SUCCEEDED)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(f"cluster-{i}",)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert len(StateStore(path).runs(limit=1000)) == 80
+
+
+def test_resource_cache_backed_by_store(tmp_path):
+    store = StateStore(tmp_path / "state.db")
+    resources = [_config_map("one"), _config_map("two")]
+
+    first = RecordingApplier()
+    apply.ApplyEngine(first, cache=state.StateStoreResourceCache(store, "lab")).apply(resources)
+    assert len(first.applied) == 2
+    assert store.last_full_reconcile("lab") > 0
+
+    resources[1] = _config_map("two", "changed")
+    second = RecordingApplier()
+    report = apply.ApplyEngine(
+        second, cache=state.StateStoreResourceCache(StateStore(tmp_path / "state.db"), "lab")
+    ).apply(resources)
+    assert second.applied == ["ConfigMap/apps/two"]
+    assert len(report.unchanged) == 1
+
+    # Hashes are per cluster
+    other = RecordingApplier()
+    apply.ApplyEngine(other, cache=state.StateStoreResourceCache(store, "prod")).apply(resources)
+    assert len(other.applied) == 2
+
+
+def test_apply_components_recorded(tmp_path):
+    store = StateStore(tmp_path / "state.db")
+    resources = [_config_map("a", part_of="argocd"), _config_map("b", part_of="metallb"),
+                 _config_map("c")]
+    report = apply.ApplyEngine(RecordingApplier(fail={"ConfigMap/apps/b"})).apply(resources)
+    run_id = store.start_run("lab", "deploy")
+    store.record_apply_components(run_id, resources, report)
+
+    assert [(c["name"], c["status"]) for c in store.components(run_id)] == [
+        ("apps", "succeeded"), ("argocd", "succeeded"), ("metallb", "failed")
+    ]
+    later = store.start_run("edge", "deploy")
+    store.record_component(later, "metallb", "succeeded", version="0.14")
+    assert [(c["run_id"], c["cluster"], c["status"]) for c in store.component_results("metallb")] == [
+        (later, "edge", "succeeded"), (run_id, "lab", "failed")
+    ]
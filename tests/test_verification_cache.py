@@ -0,0 +1,136 @@
+import hashlib
+import io
+import os
+import zipfile
+
+import pytest # type: ignore
+
+import cluster_snek.deployment.modes as modes
+import cluster_snek.deployment.verification_cache as verification_cache
+
+VerificationCache = verification_cache.VerificationCache
+
+
+@pytest.fixture
+def hash_calls(monkeypatch):
+    calls = []
+    real_hash_file = modes.hash_file
+
+    def counting_hash_file(path, algorithm="sha256"):
+        calls.append(path)
+        return real_hash_file(path, algorithm)
+
+    monkeypatch.setattr(modes, "hash_file", counting_hash_file)
+    return calls
+
+
+class RecordingApplier:
+    def __init__(self):
+        self.applied = []
+
+    def apply(self, resource):
+        self.applied.append(resource.key)
+
+
+def _archive(tmp_path, data=b"bundle"):
+    archive = tmp_path / "bundle.zip"
+    archive.write_bytes(data)
+    return archive, {"bundle.zip": hashlib.sha256(data).hexdigest()}
+
+
+def test_digest_reused_across_instances(tmp_path, hash_calls):
+    archive, checksums = _archive(tmp_path)
+    cache_path = tmp_path / "cache.json"
+
+    cache = VerificationCache(cache_path)
+    modes.ArchiveVerifier.verify_checksums(archive, checksums, cache=cache)
+    cache.save()
+
+    cache = VerificationCache(cache_path)
+    modes.ArchiveVerifier.verify_checksums(archive, checksums, cache=cache)
+    assert len(hash_calls) == 1
+
+
+def test_modified_file_is_rehashed(tmp_path, hash_calls):
+    archive, checksums = _archive(tmp_path)
+    cache = VerificationCache(tmp_path / "cache.json")
+    modes.ArchiveVerifier.verify_checksums(archive, checksums, cache=cache)
+
+    archive.write_bytes(b"tampered")
+    with pytest.raises(ValueError, match="mismatch"):
+        modes.ArchiveVerifier.verify_checksums(archive, checksums, cache=cache)
+    assert len(hash_calls) == 2
+
+
+def test_restored_mtime_still_invalidates(tmp_path):
+    archive, _ = _archive(tmp_path)
+    cache = VerificationCache(tmp_path / "cache.json")
+    cache.put_digest(archive, "sha256", "digest")
+    st = archive.stat()
+    archive.write_bytes(b"bundlf")
+    os.utime(archive, ns=(st.st_atime_ns, st.st_mtime_ns))
+    assert cache.get_digest(archive, "sha256") is None
+
+
+def test_strict_mode_forces_rehash(tmp_path, hash_calls):
+    archive, checksums = _archive(tmp_path)
+    cache_path = tmp_path / "cache.json"
+    cache = VerificationCache(cache_path)
+    modes.ArchiveVerifier.verify_checksums(archive, checksums, cache=cache)
+    cache.save()
+
+    strict = VerificationCache(cache_path, strict=True)
+    modes.ArchiveVerifier.verify_checksums(archive, checksums, cache=strict)
+    assert len(hash_calls) == 2
+
+
+def test_signature_results(tmp_path):
+    archive, _ = _archive(tmp_path)
+    signature = tmp_path / "bundle.zip.sig"
+    signature.write_bytes(b"sig")
+    key = tmp_path / "key.asc"
+    key.write_text("key-1")
+    cache = VerificationCache(tmp_path / "cache.json")
+
+    assert not cache.is_signature_verified(archive, signature, key)
+    cache.record_signature(archive, signature, key)
+    assert cache.is_signature_verified(archive, signature, key)
+
+    key.write_text("key-2")
+    assert not cache.is_signature_verified(archive, signature, key)
+
+
+def test_archive_replaced_during_verification_is_not_cached(tmp_path, monkeypatch):
+    archive, _ = _archive(tmp_path)
+    signature = tmp_path / "bundle.zip.sig"
+    signature.write_bytes(b"sig")
+    key = tmp_path / "key.asc"
+    key.write_text("key-1")
+    cache = VerificationCache(tmp_path / "cache.json")
+
+    class SwappingService:
+        def verify(self, path, signature_path, public_key_path):
+            # The signed bundle passed; an unsigned one is dropped in place
+            path.write_bytes(b"tampered bundle")
+
+    monkeypatch.setattr(modes, "get_signature_service", SwappingService)
+    assert modes.ArchiveVerifier.verify_signature(archive, signature, key, cache=cache)
+    assert not cache.is_signature_verified(archive, signature, key)
+
+
+def test_archive_deploy_skips_rehash(tmp_path, hash_calls):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as zf:
+        zf.writestr("manifests/app.yaml", "apiVersion: v1\nkind: ConfigMap\nmetadata:\n  name: app\n")
+    archive, checksums = _archive(tmp_path, buffer.getvalue())
+    config = modes.SourceConfig(
+        archive_path=archive,
+        checksums=checksums,
+        verification_cache_path=tmp_path / "cache.json"
+    )
+    for _ in range(2):
+        modes.create_deployment(
+            modes.DeploymentMode.AIRGAPPED_ARCHIVE, config, work_dir=tmp_path / "work",
+            applier=RecordingApplier()
+        ).deploy()
+    assert len(hash_calls) == 1
@@ -0,0 +1,89 @@
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import List
+
+import pytest # type: ignore
+
+import cluster_snek.utils.watcher as watcher
+
+
+@dataclass
+class Cluster:
+    name: str
+    size: str = "small"
+
+
+@dataclass
+class Configuration:
+    project_name: str = "lab"
+    clusters: List[Cluster] = field(default_factory=list)
+
+
+def _write_later(*writes, delay=0.1):
+    def run():
+        for path, text in writes:
+            time.sleep(delay)
+            path.write_text(text)
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    return thread
+
+
+@pytest.fixture(params=[True, False], ids=["inotify", "polling"])
+def use_inotify(request):
+    return request.param
+
+
+def test_reports_changed_file_once_settled(tmp_path, use_inotify):
+    config = tmp_path / "config.yaml"
+    config.write_text("a: 1")
+    (tmp_path / "unrelated.txt").write_text("")
+    with watcher.FileWatcher([config], debounce=0.3, poll_interval=0.05,
+                             use_inotify=use_inotify) as w:
+        if use_inotify:
+            assert w.backend == "inotify"
+        writer = _write_later(
+            (config, "a: 2"), (tmp_path / "unrelated.txt", "x"), (config, "a: 3")
+        )
+        assert w.wait(timeout=5) == {config}
+        writer.join()
+        assert w.wait(timeout=0.3) == set()
+
+
+def test_watches_directory_trees_including_new_subdirectories(tmp_path, use_inotify):
+    values = tmp_path / "values"
+    values.mkdir()
+    with watcher.FileWatcher([values], debounce=0.2, poll_interval=0.05,
+                             use_inotify=use_inotify) as w:
+        (values / "lab").mkdir()
+        (values / "lab" / "cilium.yaml").write_text("replicas: 2")
+        (values / "lab" / ".cilium.yaml.swp").write_text("")
+        assert values / "lab" / "cilium.yaml" in w.wait(timeout=5)
+
+
+def test_wait_times_out_without_changes(tmp_path):
+    with watcher.FileWatcher([tmp_path], debounce=0.1) as w:
+        started = time.monotonic()
+        assert w.wait(timeout=0.2) == set()
+        assert time.monotonic() - started < 2
+
+
+def test_changed_clusters_uses_digests_and_paths(tmp_path):
+    config_path = tmp_path / "config.yaml"
+    base = Configuration(clusters=[Cluster("lab"), Cluster("prod")])
+    before = watcher.cluster_digests(base)
+
+    resized = Configuration(clusters=[Cluster("lab", "large"), Cluster("prod")])
+    after = watcher.cluster_digests(resized)
+    assert watcher.changed_clusters(before, after, [config_path], [config_path]) == {"lab"}
+    assert watcher.changed_clusters(before, before, [config_path], [config_path]) == set()
+
+    values = tmp_path / "values" / "prod" / "cilium.yaml"
+    assert watcher.changed_clusters(before, before, [values], [config_path]) == {"prod"}
+    assert watcher.changed_clusters(before, before, [tmp_path / ".env"], [config_path]) == {"lab", "prod"}
+
+    renamed = watcher.cluster_digests(Configuration("other", base.clusters))
+    assert watcher.changed_clusters(before, renamed) == {"lab", "prod"}
+    added = watcher.cluster_digests(Configuration(clusters=base.clusters + [Cluster("edge")]))
+    assert watcher.changed_clusters(before, added) == {"lab", "prod", "edge"}